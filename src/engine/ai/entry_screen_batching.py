@@ -0,0 +1,301 @@
+"""Cross-symbol micro-batching for bursty entry-screen provider calls.
+
+During opening rotation and scanner bursts several hot-path workers ask for an
+entry risk adjudication at almost the same moment, each carrying the same
+market-context preamble.  ``EntryScreenBatchCoalescer`` groups calls that share
+a prompt/model/schema route and arrive within a short window into one provider
+request: identical top-level payload fields become one ``shared_context``
+section and the remaining fields become a per-symbol ``candidates`` array.
+
+Batching never changes a decision contract.  Each per-symbol response is handed
+back to its caller, which runs the usual single-call normalization; a caller
+whose batch slice is missing or malformed simply makes its own single call.
+A batch that timed out is not retried per symbol: its budget already covered
+every caller, so each caller fails closed as a single timed-out call would.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+ENTRY_SCREEN_BATCH_VERSION = "entry_screen_batch_v1"
+ENTRY_SCREEN_BATCH_INPUT_SCHEMA = "entry_screen_batch_v1"
+ENTRY_SCREEN_BATCH_TIMEOUT_REASON = "entry_screen_batch_timeout"
+ENTRY_SCREEN_BATCH_INSTRUCTIONS = (
+    "BATCH MODE: the input holds shared_context (facts common to every "
+    "candidate) and candidates[] (one object per symbol). Judge every candidate "
+    "independently with the rules above, reading shared_context as part of each "
+    "candidate's input. Return JSON only as "
+    '{"results":[{"symbol":"<candidate symbol>", ...the exact single-candidate '
+    "response fields...}]} with exactly one result per candidate."
+)
+
+
+@dataclass(frozen=True, slots=True)
+class EntryScreenBatchItem:
+    symbol: str
+    payload: dict[str, Any]
+    setup_evidence: dict[str, Any] = field(default_factory=dict)
+    prompt: str = ""
+    route: dict[str, Any] = field(default_factory=dict)
+    user_input: str = ""
+    capture: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class EntryScreenBatchOutcome:
+    """Per-symbol slice of a batch; ``result is None`` means call individually."""
+
+    result: dict[str, Any] | None
+    transport_meta: dict[str, Any] = field(default_factory=dict)
+    fallback_reason: str = "-"
+
+
+def entry_screen_batch_group_key(
+    *,
+    prompt: Any,
+    model: str,
+    schema_name: str | None,
+    transport_mode: Any,
+    timeout_ms: Any,
+) -> tuple[str, str, str, str, str]:
+    prompt_sha256 = hashlib.sha256(str(prompt or "").encode("utf-8")).hexdigest()
+    return (
+        prompt_sha256,
+        str(model or "-"),
+        str(schema_name or "-"),
+        str(transport_mode or "-"),
+        str(timeout_ms or "-"),
+    )
+
+
+def entry_screen_batch_timeout_ms(
+    base_timeout_ms: int, item_count: int, *, per_item_ms: int, max_ms: int
+) -> int:
+    """Single-call budget plus ``per_item_ms`` per extra symbol, capped."""
+
+    base = max(1, int(base_timeout_ms))
+    scaled = base + max(0, int(per_item_ms)) * max(0, int(item_count) - 1)
+    return max(base, min(scaled, int(max_ms)))
+
+
+def split_shared_context(
+    payloads: list[dict[str, Any]],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Move top-level fields that are identical in every payload to one section."""
+
+    if len(payloads) < 2:
+        return {}, [dict(payload) for payload in payloads]
+    first = payloads[0]
+    shared = {
+        key: value
+        for key, value in first.items()
+        if all(key in payload and payload[key] == value for payload in payloads[1:])
+    }
+    candidates = [
+        {key: value for key, value in payload.items() if key not in shared}
+        for payload in payloads
+    ]
+    return shared, candidates
+
+
+def build_entry_screen_batch_input(items: list[EntryScreenBatchItem]) -> str:
+    shared, candidates = split_shared_context([item.payload for item in items])
+    body = {
+        "input_schema": ENTRY_SCREEN_BATCH_INPUT_SCHEMA,
+        "shared_context": shared,
+        "candidates": [
+            {"symbol": item.symbol, **candidate}
+            for item, candidate in zip(items, candidates)
+        ],
+    }
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def build_entry_screen_batch_prompt(prompt: Any) -> str:
+    return f"{str(prompt or '').rstrip()}\n\n{ENTRY_SCREEN_BATCH_INSTRUCTIONS}"
+
+
+def batch_only_transport_meta(meta: dict[str, Any] | None) -> dict[str, Any]:
+    """Batch provenance fields safe to merge into a single call's meta."""
+
+    return {
+        key: value
+        for key, value in dict(meta or {}).items()
+        if key.startswith("openai_entry_screen_batch_")
+    }
+
+
+def parse_entry_screen_batch_response(
+    response: Any, symbols: list[str]
+) -> dict[str, dict[str, Any] | None]:
+    """Map a batch response to per-symbol results (``None`` when unusable)."""
+
+    parsed: dict[str, dict[str, Any] | None] = {symbol: None for symbol in symbols}
+    rows = response.get("results") if isinstance(response, dict) else None
+    if not isinstance(rows, list):
+        return parsed
+    seen: dict[str, int] = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        symbol = str(row.get("symbol") or "").strip()
+        if symbol not in parsed:
+            continue
+        seen[symbol] = seen.get(symbol, 0) + 1
+        parsed[symbol] = {key: value for key, value in row.items() if key != "symbol"}
+    for symbol, count in seen.items():
+        if count > 1:
+            parsed[symbol] = None
+    return parsed
+
+
+@dataclass
+class _PendingBatch:
+    group_key: Hashable
+    opened_perf: float
+    items: list[EntryScreenBatchItem] = field(default_factory=list)
+    closed: bool = False
+    full: threading.Event = field(default_factory=threading.Event)
+    done: threading.Event = field(default_factory=threading.Event)
+    outcomes: list[EntryScreenBatchOutcome] = field(default_factory=list)
+
+
+class EntryScreenBatchCoalescer:
+    """Coalesce concurrent per-symbol calls into one batch per route.
+
+    The first caller of a route becomes the leader: it waits up to
+    ``window_ms`` (or until ``max_batch_size`` callers joined), runs
+    ``execute_batch`` once, and every caller receives its own outcome.
+
+    A leader outside a burst (no other call on the route within the last
+    window) only waits ``solo_wait_ms`` for a companion; if nobody joined it
+    is released as a singleton right away instead of paying the full window.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_ms: int,
+        max_batch_size: int,
+        execute_batch: Callable[
+            [Hashable, list[EntryScreenBatchItem]], list[EntryScreenBatchOutcome]
+        ],
+        solo_wait_ms: int = 10,
+    ):
+        self.window_sec = max(0.0, int(window_ms) / 1000.0)
+        self.solo_wait_sec = min(self.window_sec, max(0.0, int(solo_wait_ms) / 1000.0))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._execute_batch = execute_batch
+        self._lock = threading.Lock()
+        self._open: dict[Hashable, _PendingBatch] = {}
+        self._last_submit_perf: dict[Hashable, float] = {}
+        self._stats = {
+            "submitted": 0,
+            "batches": 0,
+            "batched_items": 0,
+            "singleton_windows": 0,
+            "solo_releases": 0,
+            "fallback_items": 0,
+            "provider_calls_saved": 0,
+        }
+
+    def submit(
+        self, group_key: Hashable, item: EntryScreenBatchItem
+    ) -> EntryScreenBatchOutcome:
+        submitted_perf = time.perf_counter()
+        with self._lock:
+            self._stats["submitted"] += 1
+            last_submit_perf = self._last_submit_perf.get(group_key)
+            self._last_submit_perf[group_key] = submitted_perf
+            in_burst = (
+                last_submit_perf is not None
+                and submitted_perf - last_submit_perf <= self.window_sec
+            )
+            batch = self._open.get(group_key)
+            leader = batch is None
+            if leader:
+                batch = _PendingBatch(group_key=group_key, opened_perf=submitted_perf)
+                self._open[group_key] = batch
+            slot = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_batch_size:
+                self._close_locked(batch)
+        if leader:
+            window_sec = self.window_sec
+            if not in_burst and self.solo_wait_sec < window_sec:
+                batch.full.wait(self.solo_wait_sec)
+                with self._lock:
+                    if len(batch.items) < 2:
+                        self._stats["solo_releases"] += 1
+                        self._close_locked(batch)
+                window_sec -= self.solo_wait_sec
+            batch.full.wait(window_sec)
+            with self._lock:
+                self._close_locked(batch)
+            self._run(batch)
+        else:
+            batch.done.wait()
+        outcome = batch.outcomes[slot]
+        wait_ms = max(0, int((time.perf_counter() - submitted_perf) * 1000))
+        return EntryScreenBatchOutcome(
+            result=outcome.result,
+            transport_meta={
+                **outcome.transport_meta,
+                "openai_entry_screen_batch_size": len(batch.items),
+                "openai_entry_screen_batch_wait_ms": wait_ms,
+            },
+            fallback_reason=outcome.fallback_reason,
+        )
+
+    def _close_locked(self, batch: _PendingBatch) -> None:
+        if batch.closed:
+            return
+        batch.closed = True
+        if self._open.get(batch.group_key) is batch:
+            del self._open[batch.group_key]
+        batch.full.set()
+
+    def _run(self, batch: _PendingBatch) -> None:
+        items = list(batch.items)
+        try:
+            if len(items) < 2:
+                outcomes = [EntryScreenBatchOutcome(None, fallback_reason="singleton")]
+            else:
+                outcomes = list(self._execute_batch(batch.group_key, items))
+                if len(outcomes) != len(items):
+                    raise ValueError("entry screen batch outcome count mismatch")
+        except Exception as exc:
+            outcomes = [
+                EntryScreenBatchOutcome(
+                    None, fallback_reason=f"batch_error:{type(exc).__name__}"
+                )
+                for _ in items
+            ]
+        with self._lock:
+            if len(items) < 2:
+                self._stats["singleton_windows"] += 1
+            else:
+                self._stats["batches"] += 1
+                self._stats["batched_items"] += len(items)
+                fallbacks = sum(1 for outcome in outcomes if outcome.result is None)
+                self._stats["fallback_items"] += fallbacks
+                self._stats["provider_calls_saved"] += max(
+                    0, len(items) - fallbacks - 1
+                )
+        batch.outcomes = outcomes
+        batch.done.set()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": ENTRY_SCREEN_BATCH_VERSION,
+                "window_ms": int(self.window_sec * 1000),
+                "max_batch_size": self.max_batch_size,
+                **self._stats,
+            }
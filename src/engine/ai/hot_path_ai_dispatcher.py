@@ -10,30 +10,18 @@ from __future__ import annotations
 from collections import deque
 from collections.abc import Callable, Mapping
 from concurrent.futures import Future, ThreadPoolExecutor
-from copy import deepcopy
 from dataclasses import dataclass, field
 import threading
 import time
-from types import MappingProxyType
 from typing import AbstractSet, Any
 
-HOT_PATH_AI_DISPATCHER_VERSION = "hot_path_ai_dispatcher_v1"
-
+from src.engine.infrastructure.frozen_values import frozen_mapping
 
-def _deep_freeze(value: Any) -> Any:
-    if isinstance(value, Mapping):
-        return MappingProxyType(
-            {str(key): _deep_freeze(item) for key, item in value.items()}
-        )
-    if isinstance(value, (list, tuple)):
-        return tuple(_deep_freeze(item) for item in value)
-    if isinstance(value, (set, frozenset)):
-        return frozenset(_deep_freeze(item) for item in value)
-    return deepcopy(value)
+HOT_PATH_AI_DISPATCHER_VERSION = "hot_path_ai_dispatcher_v1"
 
 
 def _immutable_mapping(value: Mapping[str, Any] | None) -> Mapping[str, Any]:
-    return _deep_freeze(dict(value or {}))
+    return frozen_mapping(value)
 
 
 @dataclass(frozen=True, slots=True)
@@ -204,7 +192,7 @@ class HotPathAIDispatcher:
             )
         try:
             raw_payload = request.execute()
-            payload = deepcopy(dict(raw_payload or {}))
+            payload = frozen_mapping(raw_payload)
             completed = time.time()
             late = completed > request.deadline_epoch
             return self._result(
@@ -0,0 +1,402 @@
+"""Byte/token-budgeted compact encoding for OpenAI prompt payloads.
+
+This module owns payload shape and size accounting only.  It never adds or
+removes contract fields: repeated window rows are re-encoded as a header row
+plus value rows, floats are rounded per field family, and budget trimming only
+shortens repeated window rows.  Provenance-bearing subtrees (entry candle
+context, market snapshot, AI input semantics) are transmitted unchanged so the
+hashes that describe them stay valid.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+PROMPT_PAYLOAD_ENCODING_VERSION = "prompt_payload_encoding_v1"
+TABULAR_WINDOW_SCHEMA = "cols_rows_v1"
+PROMPT_PAYLOAD_METRIC_SAMPLE_LIMIT = 512
+
+# Subtrees whose exact bytes are covered by payload hashes or exact-payload
+# provenance.  They are copied through verbatim.
+PROTECTED_PAYLOAD_KEYS = frozenset(
+    {
+        "entry_candle_context",
+        "ai_market_snapshot_v1",
+        "ai_input_semantics",
+        "null_aware_sources",
+    }
+)
+
+# Repeated row windows and the side that is kept when a budget forces a trim.
+# ``head`` keeps the first rows (latest-first windows), ``tail`` keeps the last
+# rows (oldest-to-latest windows).
+TABULAR_WINDOW_TRIM_SIDE = {
+    "recent_ticks_latest_first": "head",
+    "recent_candles_latest_window": "tail",
+    "asks": "head",
+    "bids": "head",
+}
+# Trim order under budget pressure: the least decision-relevant window first.
+TABULAR_WINDOW_TRIM_PRIORITY = (
+    "recent_candles_latest_window",
+    "recent_ticks_latest_first",
+    "asks",
+    "bids",
+)
+
+# Decimal places per field family, matched by key suffix.  Order matters: the
+# first matching suffix wins.
+FIELD_FAMILY_DECIMALS = (
+    ("_hash", None),
+    ("_ms", 0),
+    ("_bp", 2),
+    ("_pct", 3),
+    ("_ratio", 3),
+    ("_score", 2),
+    ("_sec", 3),
+    ("_seconds", 3),
+    ("_krw", 0),
+    ("_notional", 0),
+    ("price", 1),
+    ("_value", 1),
+    ("strength", 2),
+    ("confidence", 3),
+)
+DEFAULT_FLOAT_DECIMALS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class PromptPayloadBudget:
+    contract: str
+    max_bytes: int
+    max_tokens: int
+    min_window_rows: int = 1
+
+
+PROMPT_PAYLOAD_BUDGETS = {
+    "entry_screen_v2": PromptPayloadBudget("entry_screen_v2", 7168, 2600),
+    "entry_screen_hot_v1": PromptPayloadBudget("entry_screen_hot_v1", 4096, 1500),
+    "scalping_compact_v1": PromptPayloadBudget("scalping_compact_v1", 7168, 2600),
+    "realtime_quant_packet": PromptPayloadBudget("realtime_quant_packet", 8192, 4096),
+}
+DEFAULT_PROMPT_PAYLOAD_BUDGET = PromptPayloadBudget("default", 16384, 6144)
+
+
+def resolve_prompt_payload_budget(contract: str | None) -> PromptPayloadBudget:
+    key = str(contract or "").strip()
+    return PROMPT_PAYLOAD_BUDGETS.get(key, DEFAULT_PROMPT_PAYLOAD_BUDGET)
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """Cheap tokenizer-free estimate used for budgeting and instrumentation.
+
+    ASCII runs average about four bytes per token for JSON-like text; non-ASCII
+    characters (Korean labels) are counted as one token each, which is the
+    conservative end for the hot-path models.
+    """
+
+    value = str(text or "")
+    if not value:
+        return 0
+    non_ascii = sum(1 for char in value if ord(char) > 127)
+    ascii_count = len(value) - non_ascii
+    return int(math.ceil(ascii_count / 4.0)) + non_ascii
+
+
+def payload_byte_size(text: str) -> int:
+    return len(str(text or "").encode("utf-8"))
+
+
+def field_family_decimals(key: str) -> int | None:
+    normalized = str(key or "").strip().lower()
+    for suffix, decimals in FIELD_FAMILY_DECIMALS:
+        if normalized.endswith(suffix):
+            return decimals
+    return DEFAULT_FLOAT_DECIMALS
+
+
+def round_field_value(key: str, value: Any) -> Any:
+    if isinstance(value, bool) or not isinstance(value, float):
+        return value
+    if not math.isfinite(value):
+        return None
+    decimals = field_family_decimals(key)
+    if decimals is None:
+        return value
+    if decimals == 0:
+        return int(round(value))
+    rounded = round(value, decimals)
+    if rounded == int(rounded) and abs(rounded) < 1e15:
+        return int(rounded)
+    return rounded
+
+
+def round_payload_fields(value: Any, *, key: str = "") -> Any:
+    """Round floats in ``value`` by field family, leaving protected keys intact."""
+
+    if isinstance(value, Mapping):
+        rounded = {}
+        for item_key, item in value.items():
+            text_key = str(item_key)
+            if text_key in PROTECTED_PAYLOAD_KEYS:
+                rounded[text_key] = item
+                continue
+            rounded[text_key] = round_payload_fields(item, key=text_key)
+        return rounded
+    if isinstance(value, (list, tuple)):
+        return [round_payload_fields(item, key=key) for item in value]
+    return round_field_value(key, value)
+
+
+def encode_tabular_rows(rows: Any) -> dict[str, Any] | Any:
+    """Encode a list of flat dict rows as ``{"cols": [...], "rows": [[...]]}``.
+
+    Columns follow first-appearance order across rows; a key missing from a row
+    is encoded as ``null``.  Anything other than a non-empty list of dicts is
+    returned unchanged so callers can apply it blindly.
+    """
+
+    if not isinstance(rows, (list, tuple)) or not rows:
+        return rows
+    if not all(isinstance(row, Mapping) for row in rows):
+        return rows
+    columns: list[str] = []
+    seen = set()
+    for row in rows:
+        for column in row.keys():
+            column = str(column)
+            if column not in seen:
+                seen.add(column)
+                columns.append(column)
+    return {
+        "cols": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows],
+    }
+
+
+def decode_tabular_rows(table: Any) -> list[dict[str, Any]] | Any:
+    """Inverse of :func:`encode_tabular_rows` (used by tests and replay tools)."""
+
+    if not isinstance(table, Mapping) or set(table.keys()) != {"cols", "rows"}:
+        return table
+    columns = [str(column) for column in table.get("cols") or []]
+    return [
+        {column: row[index] for index, column in enumerate(columns)}
+        for row in table.get("rows") or []
+    ]
+
+
+def _encode_windows(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        encoded = {}
+        for key, item in value.items():
+            text_key = str(key)
+            if text_key in PROTECTED_PAYLOAD_KEYS:
+                encoded[text_key] = item
+            elif text_key in TABULAR_WINDOW_TRIM_SIDE:
+                encoded[text_key] = encode_tabular_rows(item)
+            else:
+                encoded[text_key] = _encode_windows(item)
+        return encoded
+    return value
+
+
+def _iter_window_tables(value: Any, name: str):
+    if not isinstance(value, dict):
+        return
+    for key, item in value.items():
+        if key in PROTECTED_PAYLOAD_KEYS:
+            continue
+        if key == name and isinstance(item, dict) and "rows" in item:
+            yield item
+        elif isinstance(item, dict):
+            yield from _iter_window_tables(item, name)
+
+
+def _trim_one_window_row(payload: dict, *, min_rows: int) -> str | None:
+    for name in TABULAR_WINDOW_TRIM_PRIORITY:
+        for table in _iter_window_tables(payload, name):
+            rows = table.get("rows")
+            if not isinstance(rows, list) or len(rows) <= max(0, min_rows):
+                continue
+            if TABULAR_WINDOW_TRIM_SIDE.get(name) == "tail":
+                del rows[0]
+            else:
+                del rows[-1]
+            return name
+    return None
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedPromptPayload:
+    text: str
+    contract: str
+    source_bytes: int
+    payload_bytes: int
+    estimated_tokens: int
+    budget_max_bytes: int
+    budget_max_tokens: int
+    within_budget: bool
+    trimmed_rows: Mapping[str, int]
+    encoding: str = PROMPT_PAYLOAD_ENCODING_VERSION
+
+    def log_fields(self, prefix: str = "prompt_payload") -> dict[str, Any]:
+        return {
+            f"{prefix}_encoding": self.encoding,
+            f"{prefix}_contract": self.contract,
+            f"{prefix}_source_bytes": int(self.source_bytes),
+            f"{prefix}_bytes": int(self.payload_bytes),
+            f"{prefix}_estimated_tokens": int(self.estimated_tokens),
+            f"{prefix}_budget_max_bytes": int(self.budget_max_bytes),
+            f"{prefix}_budget_max_tokens": int(self.budget_max_tokens),
+            f"{prefix}_within_budget": bool(self.within_budget),
+            f"{prefix}_trimmed_rows": sum(self.trimmed_rows.values()),
+        }
+
+
+def encode_prompt_payload(
+    payload: Mapping[str, Any],
+    *,
+    contract: str | None = None,
+    budget: PromptPayloadBudget | None = None,
+) -> EncodedPromptPayload:
+    """Compact-encode one JSON prompt payload and enforce its budget.
+
+    Every key present in ``payload`` is present in the encoded form.  When the
+    encoded text exceeds the contract budget, window rows are dropped one at a
+    time (oldest candles first, then oldest ticks, then deep book levels) until
+    the budget fits or each window reaches ``min_window_rows``.
+    """
+
+    source = dict(payload or {})
+    contract_name = str(contract or source.get("input_schema") or "default")
+    resolved_budget = budget or resolve_prompt_payload_budget(contract_name)
+    source_bytes = payload_byte_size(_dumps(source))
+    encoded = _encode_windows(round_payload_fields(source))
+    encoded["payload_encoding"] = {
+        "version": PROMPT_PAYLOAD_ENCODING_VERSION,
+        "windows": TABULAR_WINDOW_SCHEMA,
+    }
+    text = _dumps(encoded)
+    size = payload_byte_size(text)
+    tokens = estimate_prompt_tokens(text)
+    trimmed: dict[str, int] = {}
+    while size > resolved_budget.max_bytes or tokens > resolved_budget.max_tokens:
+        trimmed_name = _trim_one_window_row(
+            encoded, min_rows=resolved_budget.min_window_rows
+        )
+        if trimmed_name is None:
+            break
+        trimmed[trimmed_name] = trimmed.get(trimmed_name, 0) + 1
+        text = _dumps(encoded)
+        size = payload_byte_size(text)
+        tokens = estimate_prompt_tokens(text)
+    if trimmed:
+        encoded["payload_encoding"]["trimmed_rows"] = dict(trimmed)
+        text = _dumps(encoded)
+        size = payload_byte_size(text)
+        tokens = estimate_prompt_tokens(text)
+    return EncodedPromptPayload(
+        text=text,
+        contract=contract_name,
+        source_bytes=source_bytes,
+        payload_bytes=size,
+        estimated_tokens=tokens,
+        budget_max_bytes=resolved_budget.max_bytes,
+        budget_max_tokens=resolved_budget.max_tokens,
+        within_budget=(
+            size <= resolved_budget.max_bytes and tokens <= resolved_budget.max_tokens
+        ),
+        trimmed_rows=dict(trimmed),
+    )
+
+
+def compact_prompt_text(text: str) -> str:
+    """Whitespace-only compaction for line-oriented text packets.
+
+    Labels and values are untouched; trailing spaces and blank-line runs are
+    removed because they carry no information but cost input tokens.
+    """
+
+    lines = [line.rstrip() for line in str(text or "").splitlines()]
+    compacted: list[str] = []
+    for line in lines:
+        if not line and (not compacted or not compacted[-1]):
+            continue
+        compacted.append(line)
+    while compacted and not compacted[-1]:
+        compacted.pop()
+    return "\n".join(compacted)
+
+
+def _percentile(values: list[int], pct: float) -> int:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(math.ceil(pct * len(ordered))) - 1))
+    return int(ordered[index])
+
+
+class PromptPayloadMetrics:
+    """Process-local per-endpoint payload size samples."""
+
+    def __init__(self, *, sample_limit: int = PROMPT_PAYLOAD_METRIC_SAMPLE_LIMIT):
+        self._lock = threading.Lock()
+        self._sample_limit = max(1, int(sample_limit))
+        self._bytes: dict[str, deque[int]] = {}
+        self._tokens: dict[str, deque[int]] = {}
+        self._counts: dict[str, int] = {}
+        self._over_budget: dict[str, int] = {}
+
+    def record(
+        self,
+        endpoint: str,
+        *,
+        payload_bytes: int,
+        estimated_tokens: int,
+        within_budget: bool = True,
+    ) -> None:
+        name = str(endpoint or "unknown").strip().lower() or "unknown"
+        with self._lock:
+            self._bytes.setdefault(name, deque(maxlen=self._sample_limit)).append(
+                int(payload_bytes)
+            )
+            self._tokens.setdefault(name, deque(maxlen=self._sample_limit)).append(
+                int(estimated_tokens)
+            )
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if not within_budget:
+                self._over_budget[name] = self._over_budget.get(name, 0) + 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            result = {}
+            for name, samples in self._bytes.items():
+                byte_values = list(samples)
+                token_values = list(self._tokens.get(name) or [])
+                result[name] = {
+                    "count": int(self._counts.get(name, 0)),
+                    "over_budget": int(self._over_budget.get(name, 0)),
+                    "bytes_p50": _percentile(byte_values, 0.50),
+                    "bytes_p95": _percentile(byte_values, 0.95),
+                    "tokens_p50": _percentile(token_values, 0.50),
+                    "tokens_p95": _percentile(token_values, 0.95),
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._bytes.clear()
+            self._tokens.clear()
+            self._counts.clear()
+            self._over_budget.clear()
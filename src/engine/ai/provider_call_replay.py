@@ -0,0 +1,664 @@
+"""Record-and-replay harness for AI provider calls.
+
+Recording mode appends one compact row per provider call (request contract,
+transport meta, raw response text, latency, outcome) to a gzip JSONL archive.
+Replay mode serves those rows back to ``GPTSniperEngine`` without network
+access, with the original, scaled or zero latency.  Timeouts and invalid JSON
+responses are replayed as the same failure the live transport produced, so
+watching/holding decision paths can be load-tested offline.
+
+The decision driver closes the loop: the sniper handler wrappers record each
+WATCHING/HOLDING step (stock, ws_data, clock) they evaluate, and
+``run_decision_replay`` feeds a recorded day back through
+``handle_watching_state`` / ``handle_holding_state`` at full speed against a
+replaying engine, reporting decision throughput and latency.
+
+Recording is off unless ``KORSTOCKSCAN_AI_PROVIDER_RECORDING_ENABLED`` (provider
+calls) or ``KORSTOCKSCAN_AI_DECISION_RECORDING_ENABLED`` (decision steps) is
+set; replay is off unless ``KORSTOCKSCAN_AI_PROVIDER_REPLAY_ARCHIVE`` points to
+an archive (or a provider is installed on the engine explicitly).
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import copy
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from src.utils.constants import DATA_DIR
+
+AI_PROVIDER_RECORDING_VERSION = "ai_provider_call_recording_v1"
+PROVIDER_CALL_OUTCOMES = ("ok", "timeout", "invalid_json", "error")
+REPLAY_LATENCY_MODES = ("original", "scaled", "none")
+DECISION_STATES = ("WATCHING", "HOLDING")
+_TRUE_VALUES = {"1", "true", "yes", "y", "on"}
+# Per-request identifiers never match across runs; keep them out of replay meta.
+_VOLATILE_TRANSPORT_META_KEYS = {
+    "openai_request_id",
+    "ai_decision_request_id",
+    "ai_decision_request_sha256",
+}
+
+
+def recording_enabled() -> bool:
+    return (
+        str(os.getenv("KORSTOCKSCAN_AI_PROVIDER_RECORDING_ENABLED", "false"))
+        .strip()
+        .lower()
+        in _TRUE_VALUES
+    )
+
+
+def decision_recording_enabled() -> bool:
+    return (
+        str(os.getenv("KORSTOCKSCAN_AI_DECISION_RECORDING_ENABLED", "false"))
+        .strip()
+        .lower()
+        in _TRUE_VALUES
+    )
+
+
+def _recording_root() -> Path:
+    configured = str(os.getenv("KORSTOCKSCAN_AI_PROVIDER_RECORDING_DIR", "")).strip()
+    return Path(configured) if configured else DATA_DIR / "ai_provider_recordings"
+
+
+def default_recording_path(target_date: str | None = None) -> Path:
+    target = target_date or datetime.now().astimezone().strftime("%Y-%m-%d")
+    return _recording_root() / f"ai_provider_calls_{target}.jsonl.gz"
+
+
+def default_decision_recording_path(target_date: str | None = None) -> Path:
+    target = target_date or datetime.now().astimezone().strftime("%Y-%m-%d")
+    return _recording_root() / f"ai_decision_steps_{target}.jsonl.gz"
+
+
+def configured_replay_archive() -> Path | None:
+    configured = str(os.getenv("KORSTOCKSCAN_AI_PROVIDER_REPLAY_ARCHIVE", "")).strip()
+    return Path(configured) if configured else None
+
+
+def recordable_transport_meta(meta: dict[str, Any] | None) -> dict[str, Any]:
+    return {
+        key: value
+        for key, value in dict(meta or {}).items()
+        if key not in _VOLATILE_TRANSPORT_META_KEYS
+    }
+
+
+def provider_contract_sha256(
+    *,
+    endpoint_name: str,
+    schema_name: str | None,
+    model: str,
+    require_json: bool,
+    prompt: Any,
+    user_input: Any,
+) -> str:
+    """Exact request identity: same prompt, input and response contract."""
+
+    digest = hashlib.sha256()
+    for part in (
+        str(endpoint_name or "generic"),
+        str(schema_name or "-"),
+        str(model or "-"),
+        "json" if require_json else "text",
+        str(prompt or ""),
+        str(user_input or ""),
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderCallRecord:
+    contract_sha256: str
+    endpoint_name: str
+    schema_name: str
+    model: str
+    require_json: bool
+    symbol: str
+    timeout_ms: int
+    outcome: str
+    latency_ms: int
+    response_text: str = ""
+    error_type: str = "-"
+    error_message: str = ""
+    transport_meta: dict[str, Any] = field(default_factory=dict)
+    recorded_at: str = ""
+    version: str = AI_PROVIDER_RECORDING_VERSION
+
+    @property
+    def route_key(self) -> tuple[str, str, str]:
+        return (self.endpoint_name, self.schema_name, self.symbol)
+
+    def to_row(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "ProviderCallRecord":
+        outcome = str(row.get("outcome") or "error")
+        return cls(
+            contract_sha256=str(row.get("contract_sha256") or ""),
+            endpoint_name=str(row.get("endpoint_name") or "generic"),
+            schema_name=str(row.get("schema_name") or "-"),
+            model=str(row.get("model") or "-"),
+            require_json=bool(row.get("require_json", True)),
+            symbol=str(row.get("symbol") or "-"),
+            timeout_ms=int(row.get("timeout_ms") or 0),
+            outcome=outcome if outcome in PROVIDER_CALL_OUTCOMES else "error",
+            latency_ms=max(0, int(row.get("latency_ms") or 0)),
+            response_text=str(row.get("response_text") or ""),
+            error_type=str(row.get("error_type") or "-"),
+            error_message=str(row.get("error_message") or ""),
+            transport_meta=dict(row.get("transport_meta") or {}),
+            recorded_at=str(row.get("recorded_at") or ""),
+            version=str(row.get("version") or AI_PROVIDER_RECORDING_VERSION),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DecisionStep:
+    """One WATCHING/HOLDING handler evaluation as the live loop saw it."""
+
+    state: str
+    code: str
+    now_ts: float
+    stock: dict[str, Any]
+    ws_data: dict[str, Any]
+    market_regime: Any = None
+    recorded_at: str = ""
+    version: str = AI_PROVIDER_RECORDING_VERSION
+
+    def to_row(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "DecisionStep":
+        state = str(row.get("state") or "").upper()
+        return cls(
+            state=state if state in DECISION_STATES else "WATCHING",
+            code=str(row.get("code") or ""),
+            now_ts=float(row.get("now_ts") or 0.0),
+            stock=dict(row.get("stock") or {}),
+            ws_data=dict(row.get("ws_data") or {}),
+            market_regime=row.get("market_regime"),
+            recorded_at=str(row.get("recorded_at") or ""),
+            version=str(row.get("version") or AI_PROVIDER_RECORDING_VERSION),
+        )
+
+
+# Recorders buffer up to ``flush_every`` rows; flush every live one at exit.
+_LIVE_RECORDERS: "weakref.WeakSet[ProviderCallRecorder]" = weakref.WeakSet()
+
+
+class ProviderCallRecorder:
+    """Thread-safe appender for gzip JSONL recording archives.
+
+    Each flush appends a new gzip member, which ``gzip.open`` reads back as one
+    continuous stream, so the archive never has to be rewritten.  Provider
+    calls and decision steps share this appender; any row with ``to_row()``
+    can be recorded.
+    """
+
+    def __init__(self, path: Path | str | None = None, *, flush_every: int = 32):
+        self.path = Path(path) if path is not None else default_recording_path()
+        self._flush_every = max(1, int(flush_every))
+        self._lock = threading.Lock()
+        self._pending: list[str] = []
+        self._recorded = 0
+        _LIVE_RECORDERS.add(self)
+
+    def record(self, record: ProviderCallRecord | DecisionStep) -> None:
+        line = json.dumps(
+            record.to_row(), ensure_ascii=False, separators=(",", ":"), default=str
+        )
+        with self._lock:
+            self._pending.append(line)
+            self._recorded += 1
+            if len(self._pending) >= self._flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "at", encoding="utf-8") as handle:
+            handle.write("\n".join(self._pending) + "\n")
+        self._pending.clear()
+
+    @property
+    def recorded_count(self) -> int:
+        with self._lock:
+            return self._recorded
+
+
+def _flush_recorders_at_exit() -> None:
+    """process exit 시 남은 버퍼를 flush. best-effort."""
+    for recorder in list(_LIVE_RECORDERS):
+        try:
+            recorder.flush()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_recorders_at_exit)
+
+
+_DECISION_RECORDER: ProviderCallRecorder | None = None
+_DECISION_RECORDER_LOCK = threading.Lock()
+
+
+def decision_step_recorder() -> ProviderCallRecorder | None:
+    global _DECISION_RECORDER
+    if not decision_recording_enabled():
+        return None
+    with _DECISION_RECORDER_LOCK:
+        if _DECISION_RECORDER is None:
+            _DECISION_RECORDER = ProviderCallRecorder(default_decision_recording_path())
+        return _DECISION_RECORDER
+
+
+def record_decision_step(
+    state: str,
+    stock: dict[str, Any],
+    code: str,
+    ws_data: dict[str, Any] | None,
+    *,
+    now_ts: float | None = None,
+    market_regime: Any = None,
+) -> None:
+    """Append one handler evaluation when decision recording is enabled."""
+
+    recorder = decision_step_recorder()
+    if recorder is None:
+        return
+    try:
+        recorder.record(
+            DecisionStep(
+                state=state,
+                code=str(code),
+                now_ts=float(now_ts if now_ts is not None else time.time()),
+                stock=dict(stock or {}),
+                ws_data=dict(ws_data or {}),
+                market_regime=market_regime,
+                recorded_at=datetime.now().astimezone().isoformat(),
+            )
+        )
+    except Exception:
+        # Recording must never break the live decision loop.
+        pass
+
+
+def _load_gzip_rows(path: Path | str) -> Iterable[dict[str, Any]]:
+    with gzip.open(Path(path), "rt", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict):
+                yield row
+
+
+def load_provider_call_archive(path: Path | str) -> list[ProviderCallRecord]:
+    return [ProviderCallRecord.from_row(row) for row in _load_gzip_rows(path)]
+
+
+def load_decision_steps(path: Path | str) -> list[DecisionStep]:
+    return [DecisionStep.from_row(row) for row in _load_gzip_rows(path)]
+
+
+class AIProviderReplayMiss(RuntimeError):
+    """No recorded call matches the replayed request."""
+
+
+class AIProviderReplayTimeout(TimeoutError):
+    """A recorded (or scaled) call exceeded the request timeout budget."""
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayServe:
+    record: ProviderCallRecord
+    match: str
+    latency_ms: int
+
+
+def _percentile(values: list[int], pct: float) -> int:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round((len(ordered) - 1) * pct))))
+    return int(ordered[index])
+
+
+class AIProviderReplay:
+    """Serve recorded provider calls in place of the live transport.
+
+    Matching prefers the exact request contract, then the same
+    endpoint/schema/symbol route, then the endpoint/schema route, cycling
+    through recordings in order so a recorded day replays its latency and
+    failure distribution even when prompt inputs drift.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[ProviderCallRecord],
+        *,
+        latency_mode: str = "original",
+        latency_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if latency_mode not in REPLAY_LATENCY_MODES:
+            raise ValueError(f"unsupported replay latency mode: {latency_mode}")
+        self.latency_mode = latency_mode
+        self.latency_scale = max(0.0, float(latency_scale))
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._by_contract: dict[str, deque[ProviderCallRecord]] = defaultdict(deque)
+        self._by_route: dict[tuple, deque[ProviderCallRecord]] = defaultdict(deque)
+        self._by_schema: dict[tuple, deque[ProviderCallRecord]] = defaultdict(deque)
+        for record in records:
+            self._by_contract[record.contract_sha256].append(record)
+            self._by_route[record.route_key].append(record)
+            self._by_schema[record.route_key[:2]].append(record)
+        self._served_latency_ms: list[int] = []
+        self._counts: dict[str, int] = defaultdict(int)
+        self._started_perf: float | None = None
+
+    @classmethod
+    def from_archive(cls, path: Path | str, **kwargs) -> "AIProviderReplay":
+        return cls(load_provider_call_archive(path), **kwargs)
+
+    def _next(self, pool: deque[ProviderCallRecord]) -> ProviderCallRecord:
+        record = pool[0]
+        pool.rotate(-1)
+        return record
+
+    def match(
+        self,
+        *,
+        contract_sha256: str,
+        endpoint_name: str,
+        schema_name: str | None,
+        symbol: str,
+    ) -> tuple[ProviderCallRecord, str]:
+        route = (str(endpoint_name or "generic"), str(schema_name or "-"), str(symbol))
+        with self._lock:
+            for match, pool in (
+                ("contract", self._by_contract.get(contract_sha256)),
+                ("route", self._by_route.get(route)),
+                ("schema", self._by_schema.get(route[:2])),
+            ):
+                if pool:
+                    return self._next(pool), match
+            self._counts["miss"] += 1
+        raise AIProviderReplayMiss(
+            f"no recorded provider call for endpoint={route[0]} schema={route[1]}"
+        )
+
+    def replay_latency_ms(self, record: ProviderCallRecord) -> int:
+        if self.latency_mode == "none":
+            return 0
+        if self.latency_mode == "scaled":
+            return int(record.latency_ms * self.latency_scale)
+        return int(record.latency_ms)
+
+    def serve(
+        self,
+        *,
+        contract_sha256: str,
+        endpoint_name: str,
+        schema_name: str | None,
+        symbol: str,
+        timeout_ms: int,
+    ) -> ReplayServe:
+        """Wait out the replayed latency; raise on replayed timeouts.
+
+        Successful and invalid-JSON rows are returned to the caller, which
+        parses ``response_text`` exactly as the live transport would.
+        """
+
+        record, match = self.match(
+            contract_sha256=contract_sha256,
+            endpoint_name=endpoint_name,
+            schema_name=schema_name,
+            symbol=symbol,
+        )
+        latency_ms = self.replay_latency_ms(record)
+        budget_ms = max(1, int(timeout_ms or 0))
+        timed_out = record.outcome == "timeout" or latency_ms > budget_ms
+        wait_ms = min(latency_ms, budget_ms) if timed_out else latency_ms
+        with self._lock:
+            if self._started_perf is None:
+                self._started_perf = time.perf_counter()
+        if wait_ms > 0:
+            self._sleep(wait_ms / 1000.0)
+        with self._lock:
+            self._counts[f"match_{match}"] += 1
+            self._counts["timeout" if timed_out else record.outcome] += 1
+            self._served_latency_ms.append(wait_ms)
+        if timed_out:
+            raise AIProviderReplayTimeout(
+                f"replayed provider timeout: endpoint={record.endpoint_name}, "
+                f"latency_ms={latency_ms}, budget_ms={budget_ms}"
+            )
+        return ReplayServe(record=record, match=match, latency_ms=wait_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = list(self._served_latency_ms)
+            counts = dict(self._counts)
+            started = self._started_perf
+        served = len(latencies)
+        elapsed = max(0.0, time.perf_counter() - started) if started else 0.0
+        return {
+            "version": AI_PROVIDER_RECORDING_VERSION,
+            "latency_mode": self.latency_mode,
+            "latency_scale": self.latency_scale,
+            "served": served,
+            "counts": counts,
+            "elapsed_sec": round(elapsed, 4),
+            "throughput_per_sec": round(served / elapsed, 2) if elapsed else None,
+            "latency_ms_p50": _percentile(latencies, 0.50),
+            "latency_ms_p95": _percentile(latencies, 0.95),
+            "latency_ms_max": max(latencies) if latencies else 0,
+        }
+
+
+def replay_from_env() -> AIProviderReplay | None:
+    archive = configured_replay_archive()
+    if archive is None:
+        return None
+    latency_mode = str(
+        os.getenv("KORSTOCKSCAN_AI_PROVIDER_REPLAY_LATENCY_MODE", "original")
+    ).strip()
+    try:
+        latency_scale = float(
+            os.getenv("KORSTOCKSCAN_AI_PROVIDER_REPLAY_LATENCY_SCALE", "1.0")
+        )
+    except ValueError:
+        latency_scale = 1.0
+    return AIProviderReplay.from_archive(
+        archive,
+        latency_mode=(
+            latency_mode if latency_mode in REPLAY_LATENCY_MODES else "original"
+        ),
+        latency_scale=latency_scale,
+    )
+
+
+def classify_provider_error(exc: BaseException) -> tuple[str, str]:
+    """Return ``(outcome, raw_response_text)`` for a failed provider call."""
+
+    seen = set()
+    current: BaseException | None = exc
+    timeout_like = False
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        raw_text = getattr(current, "raw_response_text", None)
+        if raw_text is not None:
+            return "invalid_json", str(raw_text)
+        if isinstance(current, TimeoutError) or bool(
+            (getattr(current, "timing_meta", None) or {}).get(
+                "openai_http_timeout_budget_exhausted"
+            )
+        ):
+            timeout_like = True
+        current = current.__cause__ or current.__context__
+    return ("timeout" if timeout_like else "error"), ""
+
+
+def summarize_archive(records: Iterable[ProviderCallRecord]) -> dict[str, Any]:
+    by_endpoint: dict[str, dict[str, Any]] = {}
+    latencies: dict[str, list[int]] = defaultdict(list)
+    for record in records:
+        bucket = by_endpoint.setdefault(
+            record.endpoint_name,
+            {"calls": 0, **{outcome: 0 for outcome in PROVIDER_CALL_OUTCOMES}},
+        )
+        bucket["calls"] += 1
+        bucket[record.outcome] += 1
+        latencies[record.endpoint_name].append(record.latency_ms)
+    for endpoint, bucket in by_endpoint.items():
+        bucket["latency_ms_p50"] = _percentile(latencies[endpoint], 0.50)
+        bucket["latency_ms_p95"] = _percentile(latencies[endpoint], 0.95)
+    return {"version": AI_PROVIDER_RECORDING_VERSION, "endpoints": by_endpoint}
+
+
+def _sniper_decision_handlers() -> dict[str, Callable[..., Any]]:
+    from src.engine import kiwoom_sniper_v2
+
+    kiwoom_sniper_v2._ensure_state_handler_deps()
+    return {
+        "WATCHING": kiwoom_sniper_v2.handle_watching_state,
+        "HOLDING": kiwoom_sniper_v2.handle_holding_state,
+    }
+
+
+def run_decision_replay(
+    steps: Iterable[DecisionStep],
+    ai_engine: Any,
+    *,
+    admin_id: Any = None,
+    handlers: dict[str, Callable[..., Any]] | None = None,
+) -> dict[str, Any]:
+    """Run recorded decision steps through the sniper handlers at full speed.
+
+    Each step gets a fresh copy of its recorded stock so every evaluation sees
+    the context the live loop saw, regardless of what earlier replayed steps
+    did to their copies.  Provider calls are served by whatever replay is
+    installed on ``ai_engine``; a handler failure is counted, not raised.
+    """
+
+    handlers = handlers if handlers is not None else _sniper_decision_handlers()
+    latencies: dict[str, list[int]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    started = time.perf_counter()
+    for step in steps:
+        handler = handlers.get(step.state)
+        if handler is None:
+            continue
+        stock = copy.deepcopy(step.stock)
+        kwargs = {
+            "ai_engine": ai_engine,
+            "now_ts": step.now_ts,
+            "now_dt": datetime.fromtimestamp(step.now_ts),
+        }
+        args = [stock, step.code, dict(step.ws_data), admin_id]
+        if step.state == "HOLDING":
+            args.append(step.market_regime)
+        step_started = time.perf_counter()
+        try:
+            handler(*args, **kwargs)
+        except Exception:
+            errors[step.state] += 1
+        latencies[step.state].append(
+            int((time.perf_counter() - step_started) * 1_000_000)
+        )
+    elapsed = time.perf_counter() - started
+    total = sum(len(values) for values in latencies.values())
+    provider_snapshot = getattr(ai_engine, "get_ai_provider_replay_snapshot", None)
+    return {
+        "version": AI_PROVIDER_RECORDING_VERSION,
+        "steps": total,
+        "elapsed_sec": round(elapsed, 4),
+        "throughput_per_sec": round(total / elapsed, 2) if elapsed else None,
+        "states": {
+            state: {
+                "steps": len(values),
+                "errors": errors.get(state, 0),
+                "latency_us_p50": _percentile(values, 0.50),
+                "latency_us_p95": _percentile(values, 0.95),
+                "latency_us_max": max(values) if values else 0,
+            }
+            for state, values in latencies.items()
+        },
+        "provider": provider_snapshot() if callable(provider_snapshot) else {},
+    }
+
+
+def _replay_engine(replay: AIProviderReplay) -> Any:
+    from src.engine.ai_engine_openai import GPTSniperEngine
+
+    engine = GPTSniperEngine(["offline-replay"], announce_startup=False)
+    engine.install_ai_provider_replay(replay)
+    return engine
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Summarize a recorded AI provider-call archive, or replay a recorded "
+            "day of WATCHING/HOLDING decisions against it."
+        )
+    )
+    parser.add_argument("archive", type=Path)
+    parser.add_argument(
+        "--decision-steps",
+        type=Path,
+        default=None,
+        help="decision-step archive to run through the sniper handlers",
+    )
+    parser.add_argument(
+        "--latency-mode", choices=REPLAY_LATENCY_MODES, default="original"
+    )
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    args = parser.parse_args(argv)
+    if args.decision_steps is None:
+        report = summarize_archive(load_provider_call_archive(args.archive))
+    else:
+        replay = AIProviderReplay.from_archive(
+            args.archive,
+            latency_mode=args.latency_mode,
+            latency_scale=args.latency_scale,
+        )
+        report = run_decision_replay(
+            load_decision_steps(args.decision_steps), _replay_engine(replay)
+        )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
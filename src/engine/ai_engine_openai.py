@@ -27,6 +27,37 @@ from itertools import cycle
 from typing import Any
 from openai import OpenAI, RateLimitError
 
+from src.engine.ai.entry_screen_batching import (
+    ENTRY_SCREEN_BATCH_TIMEOUT_REASON,
+    EntryScreenBatchCoalescer,
+    EntryScreenBatchItem,
+    EntryScreenBatchOutcome,
+    batch_only_transport_meta,
+    build_entry_screen_batch_input,
+    build_entry_screen_batch_prompt,
+    entry_screen_batch_group_key,
+    entry_screen_batch_timeout_ms,
+    parse_entry_screen_batch_response,
+)
+from src.engine.ai.provider_call_replay import (
+    AIProviderReplayMiss,
+    AIProviderReplayTimeout,
+    ProviderCallRecord,
+    ProviderCallRecorder,
+    classify_provider_error,
+    provider_contract_sha256,
+    recordable_transport_meta,
+    recording_enabled,
+    replay_from_env,
+)
+from src.engine.ai.prompt_payload_encoding import (
+    PromptPayloadMetrics,
+    compact_prompt_text,
+    encode_prompt_payload,
+    estimate_prompt_tokens,
+    payload_byte_size,
+    resolve_prompt_payload_budget,
+)
 from src.engine.ai_response_contracts import (
     AI_RESPONSE_SCHEMA_REGISTRY,
     build_openai_response_text_format,
@@ -108,6 +139,7 @@ from src.engine.scalping.holding_decision_context import (  # noqa: E402
 )
 from src.utils.logger import log_error, log_info
 from src.utils.constants import TRADING_RULES
+from src.engine.sniper_time import is_scalping_prewarm_time_allowed
 from src.engine.macro_briefing_complete import build_scanner_data_input
 from src.engine.ai_prompt_contracts import (
     SCALPING_SYSTEM_PROMPT,
@@ -631,14 +663,31 @@ class OpenAIWSJob:
     error: Exception | None = None
 
 
+# Control markers handled on the worker thread, which owns the connection.
+_WS_WORKER_PREWARM = "prewarm"
+_WS_WORKER_HEALTH_CHECK = "health_check"
+_WS_WORKER_RETIRE = "retire"
+_WS_HEALTH_CHECK_MAX_STALE_EVENTS = 16
+# Latency metrics that keep a bounded sample window; every other name counts.
+_WS_METRIC_SAMPLE_WINDOWS = (
+    "openai_ws_queue_wait_ms",
+    "openai_ws_roundtrip_ms",
+    "openai_ws_connect_ms",
+)
+
+
 class OpenAIResponsesWSWorker:
     def __init__(self, *, worker_id: int, api_key: str, metrics_callback):
         self.worker_id = int(worker_id)
         self.api_key = str(api_key)
         self._metrics_callback = metrics_callback
-        self._queue: queue.Queue[OpenAIWSJob | None] = queue.Queue()
+        self._queue: queue.Queue[OpenAIWSJob | str | None] = queue.Queue()
         self._stop_event = threading.Event()
         self._connection = None
+        self._connect_count = 0
+        self._reconnect_count = 0
+        self._last_activity_perf = time.perf_counter()
+        self._health_check_timeout_sec = 2.0
         self._client = OpenAI(api_key=self.api_key, max_retries=OPENAI_SDK_MAX_RETRIES)
         self._thread = threading.Thread(
             target=self._run, daemon=True, name=f"openai-responses-ws-{worker_id}"
@@ -667,18 +716,116 @@ class OpenAIResponsesWSWorker:
         self._thread.join(timeout=1.0)
         self._close_connection()
 
+    def prewarm(self):
+        """Connect on the worker thread before the first request needs it."""
+
+        self._queue.put(_WS_WORKER_PREWARM)
+
+    def health_check(self, *, timeout_sec: float = 2.0):
+        self._health_check_timeout_sec = max(0.05, float(timeout_sec))
+        self._queue.put(_WS_WORKER_HEALTH_CHECK)
+
+    def retire(self):
+        """Finish already-queued jobs, then close the connection and exit."""
+
+        self._queue.put(_WS_WORKER_RETIRE)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def idle_sec(self) -> float:
+        return max(0.0, time.perf_counter() - self._last_activity_perf)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "connected": self._connection is not None,
+            "connect_count": self._connect_count,
+            "reconnect_count": self._reconnect_count,
+            "queue_depth": self.queue_depth(),
+            "idle_sec": round(self.idle_sec(), 3),
+        }
+
     def _record(self, metric_name, value=1):
         if self._metrics_callback:
             self._metrics_callback(metric_name, value)
 
+    def _handle_control(self, marker: str) -> bool:
+        """Run one control marker; return False when the worker should exit."""
+
+        if marker == _WS_WORKER_RETIRE:
+            self._stop_event.set()
+            self._close_connection()
+            return False
+        try:
+            if marker == _WS_WORKER_PREWARM:
+                self._ensure_connection()
+                self._record("openai_ws_prewarm_connected", 1)
+            elif marker == _WS_WORKER_HEALTH_CHECK and self._connection is not None:
+                if self._probe_connection():
+                    self._record("openai_ws_health_check_ok", 1)
+                else:
+                    self._close_connection()
+                    self._ensure_connection(open_timeout=self._health_check_timeout_sec)
+                    self._record("openai_ws_health_check_reconnected", 1)
+        except Exception:
+            self._record(f"openai_ws_{marker}_fail", 1)
+            self._close_connection()
+        return True
+
+    def _probe_connection(self) -> bool:
+        """Non-blocking liveness probe of the idle connection.
+
+        Keepalive pings run inside the websocket client and close the socket
+        when they go unanswered, so a zero-timeout receive returns at once on
+        a live socket and raises once it is closed.  Events left over from
+        cancelled requests are discarded.
+        """
+
+        for _ in range(_WS_HEALTH_CHECK_MAX_STALE_EVENTS):
+            try:
+                self._recv_event(self._connection, timeout_sec=0)
+            except TimeoutError:
+                return True
+            except Exception:
+                return False
+            self._record("openai_ws_health_check_stale_events", 1)
+        return True
+
+    def _websocket_connection_options(self, open_timeout=None) -> dict[str, Any]:
+        options = {
+            "ping_interval": float(
+                getattr(
+                    TRADING_RULES,
+                    "OPENAI_RESPONSES_WS_KEEPALIVE_PING_INTERVAL_SEC",
+                    20.0,
+                )
+            ),
+            "ping_timeout": float(
+                getattr(
+                    TRADING_RULES,
+                    "OPENAI_RESPONSES_WS_KEEPALIVE_PING_TIMEOUT_SEC",
+                    20.0,
+                )
+            ),
+        }
+        if open_timeout is not None:
+            options["open_timeout"] = float(open_timeout)
+        return options
+
     def _run(self):
         while not self._stop_event.is_set():
             job = self._queue.get()
             if job is None:
                 continue
+            if isinstance(job, str):
+                if not self._handle_control(job):
+                    return
+                continue
             if job.cancelled.is_set():
                 job.done.set()
                 continue
+            self._last_activity_perf = time.perf_counter()
             try:
                 queue_wait_ms = max(
                     0, int((time.perf_counter() - job.request.submitted_at_perf) * 1000)
@@ -697,13 +844,28 @@ class OpenAIResponsesWSWorker:
             except Exception as exc:
                 job.error = exc
             finally:
+                self._last_activity_perf = time.perf_counter()
                 job.done.set()
 
-    def _ensure_connection(self):
+    def _ensure_connection(self, *, open_timeout=None):
         if self._connection is not None:
             return self._connection
-        manager = self._client.responses.connect()
+        connect_started = time.perf_counter()
+        manager = self._client.responses.connect(
+            websocket_connection_options=self._websocket_connection_options(
+                open_timeout
+            )
+        )
         self._connection = manager.enter()
+        self._last_activity_perf = time.perf_counter()
+        self._connect_count += 1
+        self._record(
+            "openai_ws_connect_ms",
+            max(0, int((self._last_activity_perf - connect_started) * 1000)),
+        )
+        if self._connect_count > 1:
+            self._reconnect_count += 1
+            self._record("openai_ws_worker_reconnects", 1)
         return self._connection
 
     def _close_connection(self):
@@ -821,31 +983,206 @@ class OpenAIResponsesWSWorker:
 
 
 class OpenAIResponsesWSPool:
-    def __init__(self, *, api_keys, pool_size, metrics_callback):
+    """Responses WS worker pool with optional queue/latency autoscaling.
+
+    Without ``max_size`` the pool keeps the fixed ``pool_size`` it always had.
+    With autoscaling, workers are added when queue depth or the queue-wait
+    EWMA says requests are waiting, and retired after a quiet cooldown, always
+    within ``[min_size, max_size]``.  Each new worker takes the API key with
+    the fewest live workers; no key ever holds more than
+    ``max_workers_per_key`` workers.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_keys,
+        pool_size,
+        metrics_callback,
+        min_size=None,
+        max_size=None,
+        scale_up_queue_wait_ms=150,
+        scale_cooldown_sec=10.0,
+        max_workers_per_key=None,
+    ):
         keys = list(api_keys or [])
         if not keys:
             raise ValueError("OpenAIResponsesWSPool requires at least one API key")
         worker_count = max(1, int(pool_size or 1))
-        self._workers = [
-            OpenAIResponsesWSWorker(
-                worker_id=index,
-                api_key=keys[index % len(keys)],
-                metrics_callback=metrics_callback,
-            )
-            for index in range(worker_count)
-        ]
+        self._api_keys = keys
+        self._max_workers_per_key = (
+            max(1, int(max_workers_per_key)) if max_workers_per_key else None
+        )
+        self._metrics_callback = metrics_callback
+        self._autoscale = max_size is not None
+        self._min_size = max(1, int(min_size or 1)) if self._autoscale else worker_count
+        self._max_size = (
+            max(self._min_size, int(max_size)) if self._autoscale else worker_count
+        )
+        worker_count = min(max(worker_count, self._min_size), self._max_size)
+        self._scale_up_queue_wait_ms = max(1, int(scale_up_queue_wait_ms))
+        self._scale_cooldown_sec = max(0.0, float(scale_cooldown_sec))
+        self._queue_wait_ewma_ms = 0.0
+        self._last_scale_perf = time.perf_counter()
+        self._last_busy_perf = time.perf_counter()
+        self._next_worker_id = 0
+        self._workers = []
+        for _ in range(worker_count):
+            worker = self._new_worker()
+            if worker is None:
+                break
+            self._workers.append(worker)
         self._rr_index = 0
         self._rr_lock = threading.Lock()
 
+    def key_load(self) -> dict[str, int]:
+        """Live worker count per API key, in key order."""
+
+        load = {key: 0 for key in self._api_keys}
+        for worker in self._workers:
+            key = getattr(worker, "api_key", None)
+            if key in load:
+                load[key] += 1
+        return load
+
+    def _new_worker(self):
+        """Start a worker on the least-loaded key; ``None`` when every key is full."""
+
+        load = self.key_load()
+        api_key = min(self._api_keys, key=lambda key: load[key])
+        if (
+            self._max_workers_per_key is not None
+            and load[api_key] >= self._max_workers_per_key
+        ):
+            return None
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        return OpenAIResponsesWSWorker(
+            worker_id=worker_id,
+            api_key=api_key,
+            metrics_callback=self._metrics_callback,
+        )
+
+    def _record(self, metric_name, value=1):
+        if self._metrics_callback:
+            self._metrics_callback(metric_name, value)
+
     def submit(self, request: OpenAIResponseRequest, *, use_schema_registry: bool):
         with self._rr_lock:
+            self._maybe_scale_locked()
             worker = self._workers[self._rr_index % len(self._workers)]
             self._rr_index += 1
         job = OpenAIWSJob(request=request, use_schema_registry=use_schema_registry)
-        return worker.submit(job)
+        result = worker.submit(job)
+        if self._autoscale:
+            with self._rr_lock:
+                self._queue_wait_ewma_ms = 0.8 * self._queue_wait_ewma_ms + 0.2 * float(
+                    getattr(result, "queue_wait_ms", 0) or 0
+                )
+        return result
+
+    def _queue_depth_locked(self) -> int:
+        return sum(
+            int(getattr(worker, "queue_depth", lambda: 0)()) for worker in self._workers
+        )
+
+    def _maybe_scale_locked(self):
+        if not self._autoscale:
+            return
+        now = time.perf_counter()
+        depth = self._queue_depth_locked()
+        if depth > 0:
+            self._last_busy_perf = now
+        if now - self._last_scale_perf < self._scale_cooldown_sec:
+            return
+        active = len(self._workers)
+        pressured = (
+            depth >= active or self._queue_wait_ewma_ms >= self._scale_up_queue_wait_ms
+        )
+        if pressured and active < self._max_size:
+            worker = self._new_worker()
+            self._last_scale_perf = now
+            if worker is None:
+                self._record("openai_ws_pool_scale_up_key_limited", 1)
+                return
+            worker.prewarm()
+            self._workers.append(worker)
+            self._record("openai_ws_pool_scale_up", 1)
+        elif (
+            not pressured
+            and active > self._min_size
+            and depth == 0
+            and self._queue_wait_ewma_ms < self._scale_up_queue_wait_ms / 4
+            and now - self._last_busy_perf >= self._scale_cooldown_sec
+        ):
+            retired = self._workers.pop()
+            retired.retire()
+            self._last_scale_perf = now
+            self._record("openai_ws_pool_scale_down", 1)
+
+    def prewarm(self, *, target_size=None):
+        """Grow to ``target_size`` (within bounds) and connect every worker."""
+
+        with self._rr_lock:
+            if target_size is not None:
+                target = min(max(int(target_size), self._min_size), self._max_size)
+                while len(self._workers) < target:
+                    worker = self._new_worker()
+                    if worker is None:
+                        break
+                    self._workers.append(worker)
+            workers = list(self._workers)
+        for worker in workers:
+            prewarm = getattr(worker, "prewarm", None)
+            if callable(prewarm):
+                prewarm()
+        return len(workers)
+
+    def health_check_idle(self, *, idle_sec, timeout_sec=2.0):
+        with self._rr_lock:
+            workers = list(self._workers)
+        checked = 0
+        for worker in workers:
+            idle = getattr(worker, "idle_sec", None)
+            if callable(idle) and idle() >= float(idle_sec):
+                worker.health_check(timeout_sec=timeout_sec)
+                checked += 1
+        return checked
+
+    def maintain(self, *, prewarm=False, prewarm_size=None, idle_sec=30.0):
+        """Periodic upkeep: pre-warm, idle health checks, quiet scale-down."""
+
+        if prewarm:
+            self.prewarm(target_size=prewarm_size)
+        checked = self.health_check_idle(idle_sec=idle_sec)
+        with self._rr_lock:
+            self._maybe_scale_locked()
+        snapshot = self.snapshot()
+        snapshot["health_checked"] = checked
+        return snapshot
+
+    def snapshot(self):
+        with self._rr_lock:
+            workers = list(self._workers)
+            queue_wait_ewma_ms = self._queue_wait_ewma_ms
+        return {
+            "size": len(workers),
+            "min_size": self._min_size,
+            "max_size": self._max_size,
+            "autoscale": self._autoscale,
+            "queue_wait_ewma_ms": round(queue_wait_ewma_ms, 1),
+            "max_workers_per_key": self._max_workers_per_key,
+            "workers": [
+                worker.stats()
+                for worker in workers
+                if callable(getattr(worker, "stats", None))
+            ],
+        }
 
     def close(self):
-        for worker in self._workers:
+        with self._rr_lock:
+            workers = list(self._workers)
+        for worker in workers:
             worker.close()
 
 
@@ -918,6 +1255,10 @@ class GPTSniperEngine:
             "openai_ws_roundtrip_ms_values": [],
         }
         self._responses_ws_pool = None
+        if self._responses_ws_transport_enabled() and bool(
+            getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_PREWARM_ENABLED", False)
+        ):
+            self.start_responses_ws_maintenance()
 
         if announce_startup:
             print(
@@ -989,17 +1330,8 @@ class GPTSniperEngine:
                 "openai_ws_roundtrip_ms_values": [],
             }
         with self._ws_metrics_lock:
-            if metric_name == "openai_ws_queue_wait_ms":
-                values = self._ws_metrics.setdefault(
-                    "openai_ws_queue_wait_ms_values", []
-                )
-                values.append(int(value))
-                del values[:-512]
-                return
-            if metric_name == "openai_ws_roundtrip_ms":
-                values = self._ws_metrics.setdefault(
-                    "openai_ws_roundtrip_ms_values", []
-                )
+            if metric_name in _WS_METRIC_SAMPLE_WINDOWS:
+                values = self._ws_metrics.setdefault(f"{metric_name}_values", [])
                 values.append(int(value))
                 del values[:-512]
                 return
@@ -1019,6 +1351,431 @@ class GPTSniperEngine:
         self._transport_local.last_meta = {}
         return meta
 
+    def _prompt_payload_compact_encoding_enabled(self):
+        return bool(
+            getattr(
+                TRADING_RULES, "OPENAI_PROMPT_PAYLOAD_COMPACT_ENCODING_ENABLED", False
+            )
+        )
+
+    def _prompt_payload_metrics_enabled(self):
+        # Per-call payload sizing is opt-in; the compact-encoding canary needs it.
+        return (
+            bool(getattr(TRADING_RULES, "OPENAI_PROMPT_PAYLOAD_METRICS_ENABLED", False))
+            or self._prompt_payload_compact_encoding_enabled()
+        )
+
+    def _get_prompt_payload_metrics(self):
+        if not hasattr(self, "_prompt_payload_metrics"):
+            self._prompt_payload_metrics = PromptPayloadMetrics()
+        return self._prompt_payload_metrics
+
+    def _encode_prompt_json_payload(self, payload, *, contract):
+        """Serialize one JSON prompt payload, compact-encoded when enabled."""
+
+        if not self._prompt_payload_compact_encoding_enabled():
+            return json.dumps(
+                payload, ensure_ascii=False, separators=(",", ":"), default=str
+            )
+        return encode_prompt_payload(payload, contract=contract).text
+
+    def _record_prompt_payload_size(self, request):
+        """Record input payload bytes/estimated tokens for one provider request."""
+
+        user_input = str(getattr(request, "user_input", "") or "")
+        prompt = str(getattr(request, "prompt", "") or "")
+        input_bytes = payload_byte_size(user_input)
+        input_tokens = estimate_prompt_tokens(user_input)
+        prompt_tokens = estimate_prompt_tokens(prompt)
+        contract = "default"
+        if user_input.startswith("{"):
+            match = re.search(r'"input_schema":"([^"]+)"', user_input[:256])
+            if match:
+                contract = match.group(1)
+        budget = resolve_prompt_payload_budget(contract)
+        within_budget = (
+            input_bytes <= budget.max_bytes and input_tokens <= budget.max_tokens
+        )
+        self._get_prompt_payload_metrics().record(
+            getattr(request, "endpoint_name", "unknown"),
+            payload_bytes=input_bytes,
+            estimated_tokens=input_tokens + prompt_tokens,
+            within_budget=within_budget,
+        )
+        return {
+            "openai_input_payload_bytes": input_bytes,
+            "openai_input_estimated_tokens": input_tokens,
+            "openai_prompt_estimated_tokens": prompt_tokens,
+            "openai_input_payload_contract": contract,
+            "openai_input_payload_within_budget": bool(within_budget),
+            "openai_input_payload_compact_encoding": bool(
+                self._prompt_payload_compact_encoding_enabled()
+            ),
+        }
+
+    def get_prompt_payload_metrics_snapshot(self):
+        return self._get_prompt_payload_metrics().snapshot()
+
+    def _get_ai_provider_replay(self):
+        if not hasattr(self, "_ai_provider_replay"):
+            self._ai_provider_replay = replay_from_env()
+        return self._ai_provider_replay
+
+    def install_ai_provider_replay(self, replay):
+        """Serve provider calls from recordings instead of the network."""
+
+        self._ai_provider_replay = replay
+        return replay
+
+    def get_ai_provider_replay_snapshot(self):
+        replay = self._get_ai_provider_replay()
+        return replay.snapshot() if replay is not None else {}
+
+    def _get_ai_provider_recorder(self):
+        if not hasattr(self, "_ai_provider_recorder"):
+            self._ai_provider_recorder = (
+                ProviderCallRecorder() if recording_enabled() else None
+            )
+        return self._ai_provider_recorder
+
+    def start_ai_provider_recording(self, path=None):
+        self._ai_provider_recorder = ProviderCallRecorder(path)
+        return self._ai_provider_recorder
+
+    def stop_ai_provider_recording(self):
+        recorder = getattr(self, "_ai_provider_recorder", None)
+        self._ai_provider_recorder = None
+        if recorder is not None:
+            recorder.flush()
+        return recorder
+
+    def _ai_provider_contract_sha256(self, request):
+        return provider_contract_sha256(
+            endpoint_name=request.endpoint_name,
+            schema_name=request.schema_name,
+            model=request.model_name,
+            require_json=request.require_json,
+            prompt=request.prompt,
+            user_input=request.user_input,
+        )
+
+    def _record_ai_provider_call(
+        self,
+        recorder,
+        *,
+        request,
+        transport_meta,
+        started_perf,
+        payload=None,
+        error=None,
+    ):
+        latency_ms = max(0, int((time.perf_counter() - started_perf) * 1000))
+        if error is None:
+            outcome = "ok"
+            response_text = (
+                json.dumps(payload, ensure_ascii=False, default=str)
+                if isinstance(payload, dict)
+                else str(payload or "")
+            )
+        else:
+            outcome, response_text = classify_provider_error(error)
+        try:
+            recorder.record(
+                ProviderCallRecord(
+                    contract_sha256=self._ai_provider_contract_sha256(request),
+                    endpoint_name=str(request.endpoint_name or "generic"),
+                    schema_name=str(request.schema_name or "-"),
+                    model=str(request.model_name or "-"),
+                    require_json=bool(request.require_json),
+                    symbol=str(request.symbol or "-"),
+                    timeout_ms=int(request.timeout_ms),
+                    outcome=outcome,
+                    latency_ms=latency_ms,
+                    response_text=response_text,
+                    error_type=type(error).__name__ if error is not None else "-",
+                    error_message=str(error)[:500] if error is not None else "",
+                    transport_meta=recordable_transport_meta(transport_meta),
+                    recorded_at=datetime.now(timezone.utc).isoformat(),
+                )
+            )
+        except Exception as exc:
+            log_error(f"[AI provider recording] record failed: {exc}")
+
+    def _serve_ai_provider_replay(self, replay, *, request, transport_meta):
+        transport_meta.update(
+            {"openai_transport_mode": "replay", "ai_provider_replay": True}
+        )
+        try:
+            served = replay.serve(
+                contract_sha256=self._ai_provider_contract_sha256(request),
+                endpoint_name=request.endpoint_name,
+                schema_name=request.schema_name,
+                symbol=request.symbol,
+                timeout_ms=int(request.timeout_ms),
+            )
+        except (AIProviderReplayTimeout, AIProviderReplayMiss) as exc:
+            transport_meta["ai_provider_replay_outcome"] = (
+                "timeout" if isinstance(exc, TimeoutError) else "miss"
+            )
+            self._set_last_transport_meta(transport_meta)
+            raise
+        record = served.record
+        for key, value in record.transport_meta.items():
+            transport_meta.setdefault(key, value)
+        transport_meta.update(
+            {
+                "ai_provider_replay_outcome": record.outcome,
+                "ai_provider_replay_match": served.match,
+                "ai_provider_replay_latency_ms": served.latency_ms,
+                "openai_ws_roundtrip_ms": served.latency_ms,
+            }
+        )
+        self._set_last_transport_meta(transport_meta)
+        if record.outcome == "error":
+            raise RuntimeError(
+                f"replayed provider error ({record.error_type}): "
+                f"{record.error_message}"
+            )
+        try:
+            return self._parse_openai_transport_payload(
+                record.response_text, require_json=request.require_json
+            )
+        except ValueError as exc:
+            raise RuntimeError(f"OpenAI Responses HTTP 응답/파싱 실패: {exc}") from exc
+
+    def _entry_screen_batching_enabled(self):
+        return bool(getattr(TRADING_RULES, "OPENAI_ENTRY_SCREEN_BATCH_ENABLED", False))
+
+    def _get_entry_screen_batcher(self):
+        if getattr(self, "_entry_screen_batcher", None) is None:
+            self._entry_screen_batcher = EntryScreenBatchCoalescer(
+                window_ms=getattr(
+                    TRADING_RULES, "OPENAI_ENTRY_SCREEN_BATCH_WINDOW_MS", 150
+                ),
+                solo_wait_ms=getattr(
+                    TRADING_RULES, "OPENAI_ENTRY_SCREEN_BATCH_SOLO_WAIT_MS", 10
+                ),
+                max_batch_size=getattr(
+                    TRADING_RULES, "OPENAI_ENTRY_SCREEN_BATCH_MAX_SIZE", 6
+                ),
+                execute_batch=self._execute_entry_screen_batch,
+            )
+        return self._entry_screen_batcher
+
+    def get_entry_screen_batch_snapshot(self):
+        batcher = getattr(self, "_entry_screen_batcher", None)
+        return batcher.snapshot() if batcher is not None else {}
+
+    def _call_analyze_target_provider(
+        self, prompt, formatted_data, *, batch_setup_evidence=None, **call_kwargs
+    ):
+        """Entry-screen provider call, joined to a burst batch when enabled."""
+
+        if batch_setup_evidence is None or not self._entry_screen_batching_enabled():
+            return self._call_openai_safe(prompt, formatted_data, **call_kwargs)
+        try:
+            payload = json.loads(formatted_data)
+        except (TypeError, ValueError):
+            payload = None
+        if not isinstance(payload, dict):
+            return self._call_openai_safe(prompt, formatted_data, **call_kwargs)
+        route = {
+            key: call_kwargs.get(key)
+            for key in (
+                "model_override",
+                "schema_name",
+                "transport_mode_override",
+                "timeout_ms_override",
+            )
+        }
+        outcome = self._get_entry_screen_batcher().submit(
+            entry_screen_batch_group_key(
+                prompt=prompt,
+                model=route["model_override"],
+                schema_name=route["schema_name"],
+                transport_mode=route["transport_mode_override"],
+                timeout_ms=route["timeout_ms_override"],
+            ),
+            EntryScreenBatchItem(
+                symbol=str(call_kwargs.get("symbol") or "-"),
+                payload=payload,
+                setup_evidence=dict(batch_setup_evidence or {}),
+                prompt=str(prompt or ""),
+                route=route,
+                user_input=str(formatted_data),
+                capture={
+                    key: call_kwargs.get(key)
+                    for key in (
+                        "context_name",
+                        "temperature_override",
+                        "cache_key",
+                        "metadata_extra",
+                        "replay_context",
+                    )
+                },
+            ),
+        )
+        if outcome.result is not None:
+            self._set_last_transport_meta(outcome.transport_meta)
+            return dict(outcome.result)
+        if outcome.fallback_reason == ENTRY_SCREEN_BATCH_TIMEOUT_REASON:
+            # The batch budget already covered this symbol; a serial retry
+            # would stack a second full timeout on the hot path.
+            meta = dict(outcome.transport_meta)
+            meta["openai_entry_screen_batch_fallback"] = outcome.fallback_reason
+            self._set_last_transport_meta(meta)
+            raise TimeoutError(
+                "entry screen batch timed out after "
+                f"{meta.get('openai_entry_screen_batch_timeout_ms', '-')}ms"
+            )
+        result = self._call_openai_safe(prompt, formatted_data, **call_kwargs)
+        meta = self._consume_last_transport_meta()
+        meta.update(batch_only_transport_meta(outcome.transport_meta))
+        meta["openai_entry_screen_batch_fallback"] = outcome.fallback_reason
+        self._set_last_transport_meta(meta)
+        return result
+
+    def _execute_entry_screen_batch(self, group_key, items):
+        """One provider call for a burst; fan results back out per symbol."""
+
+        first = items[0]
+        batch_id = uuid.uuid4().hex[:12]
+        symbols = [item.symbol for item in items]
+        base_timeout_ms = first.route.get("timeout_ms_override")
+        if base_timeout_ms is None:
+            base_timeout_ms = self._get_openai_timeout_ms(
+                endpoint_name="analyze_target", require_json=True
+            )
+        timeout_ms = entry_screen_batch_timeout_ms(
+            base_timeout_ms,
+            len(items),
+            per_item_ms=getattr(
+                TRADING_RULES, "OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_PER_ITEM_MS", 500
+            ),
+            max_ms=getattr(
+                TRADING_RULES, "OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_MAX_MS", 8000
+            ),
+        )
+        try:
+            response = self._call_openai_safe(
+                build_entry_screen_batch_prompt(first.prompt),
+                build_entry_screen_batch_input(items),
+                require_json=True,
+                context_name=f"entry_screen_batch({len(items)})",
+                model_override=first.route.get("model_override"),
+                schema_name=None,
+                endpoint_name="analyze_target_batch",
+                symbol=",".join(symbols)[:64],
+                cache_key=f"entry_screen_batch:{batch_id}",
+                transport_mode_override=first.route.get("transport_mode_override"),
+                timeout_ms_override=timeout_ms,
+            )
+        except Exception as exc:
+            if not self._is_openai_timeout_like_error(exc):
+                raise
+            response = None
+            fallback_reason = ENTRY_SCREEN_BATCH_TIMEOUT_REASON
+        else:
+            fallback_reason = "entry_screen_batch_result_missing"
+        batch_meta = self._consume_last_transport_meta()
+        batch_meta["openai_entry_screen_batch_id"] = batch_id
+        batch_meta["openai_entry_screen_batch_timeout_ms"] = timeout_ms
+        per_symbol = parse_entry_screen_batch_response(response, symbols)
+        outcomes = []
+        for item in items:
+            risk = per_symbol.get(item.symbol)
+            if risk is None:
+                outcomes.append(
+                    EntryScreenBatchOutcome(
+                        None,
+                        transport_meta=(
+                            self._capture_entry_screen_batch_item(
+                                item, batch_id=batch_id, batch_meta=batch_meta
+                            )
+                            if fallback_reason == ENTRY_SCREEN_BATCH_TIMEOUT_REASON
+                            else batch_meta
+                        ),
+                        fallback_reason=fallback_reason,
+                    )
+                )
+                continue
+            # Setup-ledger errors are the caller's to report; only response
+            # drift makes the batch slice unusable.
+            setup_errors = set(validate_entry_setup_evidence(item.setup_evidence))
+            response_errors = [
+                error
+                for error in validate_entry_risk_adjudication(
+                    risk, setup_evidence=item.setup_evidence
+                )
+                if error not in setup_errors
+            ]
+            outcomes.append(
+                EntryScreenBatchOutcome(
+                    None if response_errors else risk,
+                    transport_meta=(
+                        batch_meta
+                        if response_errors
+                        else self._capture_entry_screen_batch_item(
+                            item, batch_id=batch_id, batch_meta=batch_meta
+                        )
+                    ),
+                    fallback_reason=response_errors[0] if response_errors else "-",
+                )
+            )
+        return outcomes
+
+    def _capture_entry_screen_batch_item(self, item, *, batch_id, batch_meta):
+        """Per-symbol capture row for a batch slice that settles this caller.
+
+        Slices that fall back to their own single call are captured there.
+        """
+
+        capture = dict(item.capture or {})
+        model_name = item.route.get("model_override") or self.current_model_name
+        metadata_extra = dict(capture.get("metadata_extra") or {})
+        metadata_extra["entry_screen_batch_id"] = batch_id
+        request = self._build_openai_response_request(
+            prompt=item.prompt,
+            user_input=item.user_input,
+            require_json=True,
+            context_name=capture.get("context_name") or "Unknown",
+            model_name=model_name,
+            temperature=self._resolve_openai_temperature(
+                require_json=True,
+                temperature_override=capture.get("temperature_override"),
+                model_name=model_name,
+            ),
+            max_output_tokens=self._resolve_openai_max_output_tokens(require_json=True),
+            reasoning_effort=self._resolve_openai_reasoning_effort(
+                model_name=model_name
+            ),
+            schema_name=item.route.get("schema_name"),
+            endpoint_name="analyze_target",
+            symbol=item.symbol,
+            cache_key=capture.get("cache_key") or "-",
+            metadata_extra=metadata_extra,
+            timeout_ms_override=item.route.get("timeout_ms_override"),
+        )
+        meta = dict(batch_meta)
+        meta.update(
+            capture_ai_request(
+                prompt=request.prompt,
+                user_input=request.user_input,
+                endpoint_name=request.endpoint_name,
+                symbol=request.symbol,
+                request_id=request.request_id,
+                model=request.model_name,
+                schema_name=request.schema_name,
+                require_json=request.require_json,
+                temperature=request.temperature,
+                max_output_tokens=request.max_output_tokens,
+                reasoning_effort=request.reasoning_effort,
+                metadata=request.metadata,
+                replay_context=capture.get("replay_context"),
+            )
+        )
+        return meta
+
     def _get_openai_timeout_ms(self, *, endpoint_name, require_json):
         endpoint = str(endpoint_name or "").strip()
         if endpoint == "analyze_target":
@@ -1347,13 +2104,110 @@ class GPTSniperEngine:
         if not hasattr(self, "_responses_ws_pool"):
             self._responses_ws_pool = None
         if self._responses_ws_pool is None:
+            autoscale = bool(
+                getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_AUTOSCALE_ENABLED", False)
+            )
+            max_workers_per_key = max(
+                1,
+                int(
+                    getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_MAX_WORKERS_PER_KEY", 2)
+                    or 1
+                ),
+            )
+            key_budget = len(self.api_keys) * max_workers_per_key
             self._responses_ws_pool = OpenAIResponsesWSPool(
                 api_keys=self.api_keys,
                 pool_size=getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_POOL_SIZE", 2),
                 metrics_callback=self._record_ws_metric,
+                min_size=(
+                    getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_POOL_MIN_SIZE", 1)
+                    if autoscale
+                    else None
+                ),
+                max_size=(
+                    min(
+                        key_budget,
+                        int(
+                            getattr(
+                                TRADING_RULES, "OPENAI_RESPONSES_WS_POOL_MAX_SIZE", 4
+                            )
+                        ),
+                    )
+                    if autoscale
+                    else None
+                ),
+                scale_up_queue_wait_ms=getattr(
+                    TRADING_RULES, "OPENAI_RESPONSES_WS_SCALE_UP_QUEUE_WAIT_MS", 150
+                ),
+                scale_cooldown_sec=getattr(
+                    TRADING_RULES, "OPENAI_RESPONSES_WS_SCALE_COOLDOWN_SEC", 10.0
+                ),
+                max_workers_per_key=max_workers_per_key if autoscale else None,
             )
         return self._responses_ws_pool
 
+    def _responses_ws_transport_enabled(self):
+        return self._resolve_openai_transport_mode() == "responses_ws" and bool(
+            getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_ENABLED", False)
+        )
+
+    def maintain_responses_ws_pool(self, now_value=None):
+        """Pre-warm before the scalping buy window and health-check idle workers."""
+
+        if not self._responses_ws_transport_enabled():
+            return {}
+        prewarm = bool(
+            getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_PREWARM_ENABLED", False)
+        ) and is_scalping_prewarm_time_allowed(now_value)
+        if getattr(self, "_responses_ws_pool", None) is None and not prewarm:
+            return {}
+        snapshot = self._get_responses_ws_pool().maintain(
+            prewarm=prewarm,
+            prewarm_size=getattr(TRADING_RULES, "OPENAI_RESPONSES_WS_POOL_SIZE", 2),
+            idle_sec=getattr(
+                TRADING_RULES, "OPENAI_RESPONSES_WS_HEALTH_CHECK_IDLE_SEC", 30.0
+            ),
+        )
+        self._record_ws_metric("openai_ws_pool_maintenance_runs", 1)
+        with self._ws_metrics_lock:
+            self._ws_metrics["openai_ws_pool_size"] = int(snapshot.get("size", 0))
+        return snapshot
+
+    def start_responses_ws_maintenance(self):
+        """Start the daemon loop that drives ``maintain_responses_ws_pool``."""
+
+        thread = getattr(self, "_responses_ws_maintenance_thread", None)
+        if thread is not None and thread.is_alive():
+            return thread
+        self._responses_ws_maintenance_stop = threading.Event()
+        interval_sec = max(
+            0.5,
+            float(
+                getattr(
+                    TRADING_RULES, "OPENAI_RESPONSES_WS_MAINTENANCE_INTERVAL_SEC", 5.0
+                )
+                or 5.0
+            ),
+        )
+
+        def _loop():
+            while not self._responses_ws_maintenance_stop.wait(interval_sec):
+                try:
+                    self.maintain_responses_ws_pool()
+                except Exception as exc:
+                    log_error(f"[OpenAI WS pool maintenance] {exc}")
+
+        thread = threading.Thread(
+            target=_loop, daemon=True, name="openai-responses-ws-maintenance"
+        )
+        thread.start()
+        self._responses_ws_maintenance_thread = thread
+        return thread
+
+    def get_responses_ws_pool_snapshot(self):
+        pool = getattr(self, "_responses_ws_pool", None)
+        return pool.snapshot() if pool is not None else {}
+
     # ==========================================
     # 캐시 유틸리티
     # ==========================================
@@ -4095,7 +4949,11 @@ class GPTSniperEngine:
 
     def _parse_openai_transport_payload(self, raw_text, *, require_json):
         if require_json:
-            return self._parse_json_response_text(raw_text)
+            try:
+                return self._parse_json_response_text(raw_text)
+            except ValueError as exc:
+                exc.raw_response_text = str(raw_text or "")
+                raise
         return str(raw_text or "").strip()
 
     def _is_invalid_prompt_error(self, exc) -> bool:
@@ -4459,6 +5317,8 @@ class GPTSniperEngine:
                 and entry_setup_schema_evidence
             ),
         }
+        if self._prompt_payload_metrics_enabled():
+            transport_meta.update(self._record_prompt_payload_size(request))
         transport_meta.update(
             capture_ai_request(
                 prompt=request.prompt,
@@ -4476,6 +5336,52 @@ class GPTSniperEngine:
                 replay_context=replay_context,
             )
         )
+        replay = self._get_ai_provider_replay()
+        if replay is not None:
+            return self._serve_ai_provider_replay(
+                replay, request=request, transport_meta=transport_meta
+            )
+        route_kwargs = {
+            "request": request,
+            "transport_meta": transport_meta,
+            "context_name": context_name,
+            "transport_mode_override": transport_mode_override,
+            "response_schema_registry_used": response_schema_registry_used,
+        }
+        recorder = self._get_ai_provider_recorder()
+        if recorder is None:
+            return self._route_openai_provider_call(**route_kwargs)
+        started_perf = time.perf_counter()
+        try:
+            payload = self._route_openai_provider_call(**route_kwargs)
+        except Exception as exc:
+            self._record_ai_provider_call(
+                recorder,
+                request=request,
+                transport_meta=transport_meta,
+                started_perf=started_perf,
+                error=exc,
+            )
+            raise
+        self._record_ai_provider_call(
+            recorder,
+            request=request,
+            transport_meta=transport_meta,
+            started_perf=started_perf,
+            payload=payload,
+        )
+        return payload
+
+    def _route_openai_provider_call(
+        self,
+        *,
+        request: OpenAIResponseRequest,
+        transport_meta: dict[str, Any],
+        context_name,
+        transport_mode_override,
+        response_schema_registry_used,
+    ):
+        """Bedrock/OpenAI WS/HTTP provider routing for one built request."""
         bedrock_primary_payload = self._try_bedrock_primary_provider(
             request=request, transport_meta=transport_meta
         )
@@ -5878,9 +6784,7 @@ class GPTSniperEngine:
             candle_context=candle_context,
             **runtime,
         )
-        return json.dumps(
-            payload, ensure_ascii=False, separators=(",", ":"), default=str
-        )
+        return self._encode_prompt_json_payload(payload, contract="entry_screen_hot_v1")
 
     def _format_market_data(
         self,
@@ -5913,7 +6817,7 @@ class GPTSniperEngine:
             )
 
         if bool(getattr(TRADING_RULES, "OPENAI_ENTRY_SCREEN_V2_INPUT_ENABLED", False)):
-            return json.dumps(
+            return self._encode_prompt_json_payload(
                 self._build_entry_screen_v2_payload(
                     ws_data,
                     recent_ticks,
@@ -5921,9 +6825,7 @@ class GPTSniperEngine:
                     feature_packet=feature_packet,
                     candle_context=candle_context,
                 ),
-                ensure_ascii=False,
-                separators=(",", ":"),
-                default=str,
+                contract="entry_screen_v2",
             )
 
         if bool(getattr(TRADING_RULES, "OPENAI_SCALPING_COMPACT_INPUT_ENABLED", True)):
@@ -6027,8 +6929,8 @@ class GPTSniperEngine:
             }
             if self._attach_entry_candle_inputs(compact_payload, candle_context):
                 compact_payload.pop("recent_candles_latest_window", None)
-            return json.dumps(
-                compact_payload, ensure_ascii=False, separators=(",", ":"), default=str
+            return self._encode_prompt_json_payload(
+                compact_payload, contract="scalping_compact_v1"
             )
 
         imbalance_str = "데이터 없음"
@@ -6544,6 +7446,8 @@ class GPTSniperEngine:
                 separators=(",", ":"),
                 default=str,
             )
+        if self._prompt_payload_compact_encoding_enabled():
+            packet = compact_prompt_text(packet)
         return packet
 
     # ==========================================
@@ -8662,9 +9566,16 @@ class GPTSniperEngine:
                 or "-"
             ).strip()
             provider_attempted = True
-            result = self._call_openai_safe(
+            result = self._call_analyze_target_provider(
                 prompt,
                 formatted_data,
+                batch_setup_evidence=(
+                    entry_setup_evidence
+                    if decision_quality_v2_14_selected
+                    and is_scalping_entry_call
+                    and isinstance(entry_setup_evidence, dict)
+                    else None
+                ),
                 require_json=True,
                 context_name=f"{target_name}({strategy}:{prompt_type})",
                 model_override=target_model,
@@ -834,74 +834,78 @@ def _ws_snapshot_last_trade_tick(value: Any) -> dict[str, Any]:
     return result
 
 
-def write_ws_snapshot(
-    realtime_data: dict[str, Any], *, now_ts: float | None = None
+def build_ws_snapshot_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Timestamp-only dashboard row for one realtime target (no age fields)."""
+    orderbook = row.get("orderbook") if isinstance(row.get("orderbook"), dict) else {}
+    asks = orderbook.get("asks") or []
+    bids = orderbook.get("bids") or []
+    best_ask = _safe_int((asks[0] or {}).get("price")) if asks else 0
+    best_bid = _safe_int((bids[0] or {}).get("price")) if bids else 0
+    realtime_type_ts = _ws_snapshot_realtime_type_ts(row.get("last_realtime_type_ts"))
+    return {
+        "curr": _safe_int(row.get("curr")),
+        "foreign_broker_net_est_qty": _safe_int(row.get("foreign_broker_net_est_qty")),
+        "foreign_broker_net_est_delta_qty": _safe_int(
+            row.get("foreign_broker_net_est_delta_qty")
+        ),
+        "last_foreign_broker_update_ts": _safe_float(
+            row.get("last_foreign_broker_update_ts")
+        ),
+        "last_ws_update_ts": _safe_float(row.get("last_ws_update_ts")),
+        "best_bid": best_bid,
+        "best_ask": best_ask,
+        "received_types": _ws_snapshot_received_types(row.get("received_types")),
+        "last_realtime_type_ts": realtime_type_ts,
+        "last_ws_item": str(row.get("last_ws_item") or ""),
+        "last_ws_market_suffix": str(row.get("last_ws_market_suffix") or ""),
+        "last_ws_market_route": str(row.get("last_ws_market_route") or "unknown"),
+        "last_realtime_type_item": _ws_snapshot_string_map(
+            row.get("last_realtime_type_item")
+        ),
+        "last_realtime_type_market_suffix": _ws_snapshot_string_map(
+            row.get("last_realtime_type_market_suffix")
+        ),
+        "last_realtime_type_market_route": _ws_snapshot_string_map(
+            row.get("last_realtime_type_market_route")
+        ),
+        "market_session_state": str(row.get("market_session_state") or ""),
+        "market_session_remaining": str(row.get("market_session_remaining") or ""),
+        "last_0b_ts": realtime_type_ts.get("0B", 0.0),
+        "last_trade_tick": _ws_snapshot_last_trade_tick(row.get("last_trade_tick")),
+    }
+
+
+def _ws_snapshot_row_with_ages(row: dict[str, Any], now_ts: float) -> dict[str, Any]:
+    realtime_type_ts = row.get("last_realtime_type_ts") or {}
+    last_trade_tick = row.get("last_trade_tick") or {}
+    return {
+        **row,
+        "last_realtime_type_ages_ms": {
+            real_type: _ws_snapshot_age_ms(ts, now_ts)
+            for real_type, ts in realtime_type_ts.items()
+        },
+        "last_0b_age_ms": _ws_snapshot_age_ms(realtime_type_ts.get("0B"), now_ts),
+        "last_trade_tick_age_ms": _ws_snapshot_age_ms(
+            last_trade_tick.get("ts"), now_ts
+        ),
+    }
+
+
+def write_ws_snapshot_rows(
+    rows: dict[str, dict[str, Any]], now_ts: float | None = None
 ) -> Path | None:
-    """Persist a read-only WS snapshot for dashboard and source-quality consumers."""
+    """Persist already-built ``build_ws_snapshot_row`` rows as ``latest.json``."""
     now_ts = now_ts or time.time()
-    stocks: dict[str, Any] = {}
-    for code, row in (realtime_data or {}).items():
-        if not isinstance(row, dict):
-            continue
-        orderbook = (
-            row.get("orderbook") if isinstance(row.get("orderbook"), dict) else {}
-        )
-        asks = orderbook.get("asks") or []
-        bids = orderbook.get("bids") or []
-        best_ask = _safe_int((asks[0] or {}).get("price")) if asks else 0
-        best_bid = _safe_int((bids[0] or {}).get("price")) if bids else 0
-        realtime_type_ts = _ws_snapshot_realtime_type_ts(
-            row.get("last_realtime_type_ts")
-        )
-        last_trade_tick = _ws_snapshot_last_trade_tick(row.get("last_trade_tick"))
-        stocks[str(code)] = {
-            "curr": _safe_int(row.get("curr")),
-            "foreign_broker_net_est_qty": _safe_int(
-                row.get("foreign_broker_net_est_qty")
-            ),
-            "foreign_broker_net_est_delta_qty": _safe_int(
-                row.get("foreign_broker_net_est_delta_qty")
-            ),
-            "last_foreign_broker_update_ts": _safe_float(
-                row.get("last_foreign_broker_update_ts")
-            ),
-            "last_ws_update_ts": _safe_float(row.get("last_ws_update_ts")),
-            "best_bid": best_bid,
-            "best_ask": best_ask,
-            "received_types": _ws_snapshot_received_types(row.get("received_types")),
-            "last_realtime_type_ts": realtime_type_ts,
-            "last_ws_item": str(row.get("last_ws_item") or ""),
-            "last_ws_market_suffix": str(row.get("last_ws_market_suffix") or ""),
-            "last_ws_market_route": str(row.get("last_ws_market_route") or "unknown"),
-            "last_realtime_type_item": _ws_snapshot_string_map(
-                row.get("last_realtime_type_item")
-            ),
-            "last_realtime_type_market_suffix": _ws_snapshot_string_map(
-                row.get("last_realtime_type_market_suffix")
-            ),
-            "last_realtime_type_market_route": _ws_snapshot_string_map(
-                row.get("last_realtime_type_market_route")
-            ),
-            "market_session_state": str(row.get("market_session_state") or ""),
-            "market_session_remaining": str(row.get("market_session_remaining") or ""),
-            "last_realtime_type_ages_ms": {
-                real_type: _ws_snapshot_age_ms(ts, now_ts)
-                for real_type, ts in realtime_type_ts.items()
-            },
-            "last_0b_ts": realtime_type_ts.get("0B", 0.0),
-            "last_0b_age_ms": _ws_snapshot_age_ms(realtime_type_ts.get("0B"), now_ts),
-            "last_trade_tick": last_trade_tick,
-            "last_trade_tick_age_ms": _ws_snapshot_age_ms(
-                last_trade_tick.get("ts"), now_ts
-            ),
-        }
     payload = {
         "schema_version": "kiwoom_ws_dashboard_snapshot_v1",
         "generated_at_epoch": now_ts,
         "generated_at": datetime.fromtimestamp(now_ts).isoformat(timespec="seconds"),
         "decision_authority": "source_quality_only",
         "runtime_effect": False,
-        "stocks": stocks,
+        "stocks": {
+            str(code): _ws_snapshot_row_with_ages(row, now_ts)
+            for code, row in (rows or {}).items()
+        },
     }
     try:
         WS_SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -916,6 +920,18 @@ def write_ws_snapshot(
         return None
 
 
+def write_ws_snapshot(
+    realtime_data: dict[str, Any], *, now_ts: float | None = None
+) -> Path | None:
+    """Persist a read-only WS snapshot for dashboard and source-quality consumers."""
+    rows = {
+        str(code): build_ws_snapshot_row(row)
+        for code, row in (realtime_data or {}).items()
+        if isinstance(row, dict)
+    }
+    return write_ws_snapshot_rows(rows, now_ts)
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Build BD_FBUY_ACCUM_PRE_V1 DB-first candidate artifact."
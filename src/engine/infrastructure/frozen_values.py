@@ -0,0 +1,433 @@
+"""Persistent, structurally shared immutable values for cross-thread handoff.
+
+Worker handoff (scanner async evaluation, hot-path AI dispatch, main-thread
+commit validation) needs snapshots that no thread can mutate.  Wrapping every
+mapping in ``MappingProxyType`` and deep-copying every leaf makes each handoff
+cost a full copy, and the copy is repeated at every hop.  This module freezes a
+value once:
+
+* already-frozen subtrees are returned by reference, so later hops are free;
+* immutable scalars are shared instead of deep-copied;
+* freezing against a previous frozen version reuses every unchanged subtree,
+  so an unchanged WS snapshot resolves to the very same object.
+
+``thaw`` returns fresh mutable containers for callers that need a private
+working copy; immutable leaves are shared because they cannot be mutated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from copy import deepcopy
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Iterator
+
+FROZEN_VALUES_VERSION = "frozen_values_structural_sharing_v1"
+_MISSING = object()
+_IMMUTABLE_SCALARS = (
+    str,
+    int,
+    float,
+    complex,
+    bool,
+    bytes,
+    type(None),
+    Decimal,
+    date,
+    datetime,
+    dt_time,
+    timedelta,
+    Enum,
+)
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None), bytes})
+
+
+class FrozenMap(Mapping):
+    """Read-only mapping whose values are all frozen.
+
+    Derivation helpers (``set``/``discard``/``update``) return a new map that
+    shares every untouched child by reference.
+    """
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, value: Mapping[str, Any] | Iterable | None = None):
+        source = {} if value is None else dict(value)
+        self._data = {str(key): freeze(item) for key, item in source.items()}
+        self._hash = None
+
+    @classmethod
+    def _from_frozen(cls, data: dict[str, Any]) -> "FrozenMap":
+        instance = cls.__new__(cls)
+        instance._data = data
+        instance._hash = None
+        return instance
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f"FrozenMap({self._data!r})"
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __reduce__(self):
+        return (FrozenMap, (self._data,))
+
+    def __copy__(self) -> "FrozenMap":
+        return self
+
+    def __deepcopy__(self, memo) -> "FrozenMap":
+        return self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> "FrozenMap":
+        text_key = str(key)
+        previous = self._data.get(text_key, _MISSING)
+        frozen = freeze(value, previous=None if previous is _MISSING else previous)
+        if frozen is previous:
+            return self
+        data = dict(self._data)
+        data[text_key] = frozen
+        return FrozenMap._from_frozen(data)
+
+    def discard(self, key: str) -> "FrozenMap":
+        text_key = str(key)
+        if text_key not in self._data:
+            return self
+        data = dict(self._data)
+        del data[text_key]
+        return FrozenMap._from_frozen(data)
+
+    def update(self, values: Mapping[str, Any]) -> "FrozenMap":
+        result = self
+        for key, value in dict(values or {}).items():
+            result = result.set(key, value)
+        return result
+
+
+class FrozenList(tuple):
+    """Tuple marker for sequences whose items are all frozen."""
+
+    __slots__ = ()
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo) -> "FrozenList":
+        return self
+
+    def set(self, index: int, value: Any) -> "FrozenList":
+        items = list(self)
+        items[index] = freeze(value, previous=items[index])
+        if items[index] is self[index]:
+            return self
+        return FrozenList(items)
+
+    def extend(self, values: Iterable[Any]) -> "FrozenList":
+        return FrozenList((*self, *(freeze(item) for item in values)))
+
+
+EMPTY_FROZEN_MAP = FrozenMap._from_frozen({})
+
+
+def is_frozen(value: Any) -> bool:
+    return isinstance(value, (FrozenMap, FrozenList)) or (
+        isinstance(value, _IMMUTABLE_SCALARS)
+    )
+
+
+def freeze(value: Any, *, previous: Any = None) -> Any:
+    """Return an immutable, structurally shared form of ``value``.
+
+    ``previous`` is an earlier frozen version of the same logical value.  Any
+    subtree that compares equal is reused from ``previous`` by reference, and
+    when nothing changed ``previous`` itself is returned.
+    """
+
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        if type(previous) is value_type and previous == value:
+            return previous
+        return value
+    if value_type is FrozenMap or value_type is FrozenList:
+        return value
+    if value_type is dict or isinstance(value, Mapping):
+        return _freeze_mapping(value, previous)
+    if value_type is list or isinstance(value, (list, tuple)):
+        return _freeze_sequence(value, previous)
+    if isinstance(value, (set, frozenset)):
+        frozen_set = frozenset(freeze(item) for item in value)
+        if isinstance(previous, frozenset) and previous == frozen_set:
+            return previous
+        return frozen_set
+    if isinstance(value, _IMMUTABLE_SCALARS):
+        if type(previous) is value_type and previous == value:
+            return previous
+        return value
+    return deepcopy(value)
+
+
+def _freeze_mapping(value: Mapping, previous: Any) -> Any:
+    prior = previous._data if type(previous) is FrozenMap else None
+    if prior is not None and len(prior) == len(value):
+        # Walk without allocating until the first changed child.
+        unchanged_keys = []
+        for key, item in value.items():
+            prior_item = prior.get(key, _MISSING)
+            if prior_item is _MISSING:
+                break
+            frozen_item = freeze(item, previous=prior_item)
+            if frozen_item is not prior_item:
+                break
+            unchanged_keys.append(key)
+        else:
+            return previous
+        data = {str(key): prior[key] for key in unchanged_keys}
+        remaining = list(value.items())[len(unchanged_keys) :]
+    else:
+        data = {}
+        remaining = value.items()
+    for key, item in remaining:
+        text_key = str(key)
+        prior_item = prior.get(text_key) if prior is not None else None
+        data[text_key] = freeze(item, previous=prior_item)
+    return FrozenMap._from_frozen(data)
+
+
+def _freeze_sequence(value: list | tuple, previous: Any) -> Any:
+    prior = previous if type(previous) is FrozenList else None
+    if prior is None:
+        return FrozenList([freeze(item) for item in value])
+    prior_len = len(prior)
+    items = [
+        freeze(item, previous=prior[index] if index < prior_len else None)
+        for index, item in enumerate(value)
+    ]
+    if len(items) == prior_len and all(
+        item is prior_item for item, prior_item in zip(items, prior)
+    ):
+        return prior
+    return FrozenList(items)
+
+
+def thaw(value: Any) -> Any:
+    """Return a private mutable copy; immutable leaves are shared."""
+
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return value
+    if value_type is FrozenMap:
+        return {key: thaw(item) for key, item in value._data.items()}
+    if isinstance(value, Mapping):
+        return {str(key): thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {thaw(item) for item in value}
+    if isinstance(value, _IMMUTABLE_SCALARS):
+        return value
+    return deepcopy(value)
+
+
+def frozen_mapping(value: Mapping[str, Any] | None) -> FrozenMap:
+    """Freeze an optional mapping argument (``None`` becomes an empty map)."""
+
+    if value is None:
+        return EMPTY_FROZEN_MAP
+    if not isinstance(value, Mapping):
+        value = dict(value)
+    return freeze(value)
+
+
+class FrozenSnapshotInterner:
+    """Keep the last frozen version per key so unchanged snapshots are shared.
+
+    The interner is bounded (LRU) and thread-safe.  ``freeze`` returns the
+    previously frozen object when the new snapshot is unchanged, or a new
+    root that shares every unchanged subtree otherwise.
+    """
+
+    def __init__(self, *, max_entries: int = 512):
+        self._lock = threading.Lock()
+        self._max_entries = max(1, int(max_entries))
+        self._latest: OrderedDict[Any, FrozenMap] = OrderedDict()
+        self._stats = {"reused": 0, "shared_rebuild": 0, "cold": 0}
+
+    def freeze(self, key: Any, value: Mapping[str, Any] | None) -> FrozenMap:
+        with self._lock:
+            previous = self._latest.get(key)
+        if value is None:
+            value = {}
+        elif not isinstance(value, Mapping):
+            value = dict(value)
+        frozen = freeze(value, previous=previous)
+        with self._lock:
+            if previous is None:
+                self._stats["cold"] += 1
+            elif frozen is previous:
+                self._stats["reused"] += 1
+            else:
+                self._stats["shared_rebuild"] += 1
+            self._latest[key] = frozen
+            self._latest.move_to_end(key)
+            while len(self._latest) > self._max_entries:
+                self._latest.popitem(last=False)
+        return frozen
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._latest)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._latest.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+
+def _legacy_deep_freeze(value: Any) -> Any:
+    """The MappingProxyType + deepcopy path replaced by ``freeze``."""
+
+    if isinstance(value, Mapping):
+        return MappingProxyType(
+            {str(key): _legacy_deep_freeze(item) for key, item in value.items()}
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_legacy_deep_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_legacy_deep_freeze(item) for item in value)
+    return deepcopy(value)
+
+
+def _legacy_thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {str(key): _legacy_thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_legacy_thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return {_legacy_thaw(item) for item in value}
+    return deepcopy(value)
+
+
+def build_benchmark_ws_snapshot(
+    *, levels: int = 10, ticks: int = 30, extra_fields: int = 120
+) -> dict[str, Any]:
+    """Synthetic WS snapshot shaped like ``KiwoomWSManager.get_latest_data``."""
+
+    snapshot: dict[str, Any] = {
+        "curr": 10100,
+        "v_pw": 132.5,
+        "fluctuation": 2.31,
+        "ask_tot": 180000,
+        "bid_tot": 150000,
+        "last_ws_update_ts": 1_760_000_000.123,
+        "orderbook": {
+            "asks": [
+                {"price": 10110 + index * 10, "volume": 4500 + index}
+                for index in range(levels)
+            ],
+            "bids": [
+                {"price": 10100 - index * 10, "volume": 3000 + index}
+                for index in range(levels)
+            ],
+        },
+        "recent_ticks": [
+            {
+                "time": f"09:00:{59 - index % 60:02d}",
+                "price": 10100 - index % 3 * 5,
+                "volume": 100 + index,
+                "dir": "BUY" if index % 2 else "SELL",
+                "aggressor_source": "trusted_declared_side",
+                "strength": 131.0 + index / 10,
+            }
+            for index in range(ticks)
+        ],
+    }
+    for index in range(extra_fields):
+        snapshot[f"field_{index:03d}"] = index * 1.5 if index % 2 else f"v{index}"
+    return snapshot
+
+
+def benchmark_snapshot_handoff(
+    snapshot: Mapping[str, Any], *, iterations: int = 2000
+) -> dict[str, Any]:
+    """Time freeze -> dispatcher re-freeze -> commit thaw, old vs new path.
+
+    The legacy path freezes the snapshot at context creation and again when the
+    dispatcher wraps it, then thaws it on commit.  The structural path interns
+    the snapshot (an unchanged snapshot is reused), re-freezing is a no-op, and
+    thaw shares immutable leaves.
+    """
+
+    iterations = max(1, int(iterations))
+    started = time.perf_counter()
+    for _ in range(iterations):
+        first = _legacy_deep_freeze(dict(snapshot))
+        second = _legacy_deep_freeze(dict(first))
+        _legacy_thaw(second)
+    legacy_sec = time.perf_counter() - started
+
+    interner = FrozenSnapshotInterner(max_entries=4)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        first = interner.freeze("bench", snapshot)
+        second = freeze(first)
+        thaw(second)
+    structural_sec = time.perf_counter() - started
+    return {
+        "version": FROZEN_VALUES_VERSION,
+        "iterations": iterations,
+        "legacy_us_per_handoff": round(legacy_sec / iterations * 1e6, 2),
+        "structural_us_per_handoff": round(structural_sec / iterations * 1e6, 2),
+        "speedup": round(legacy_sec / structural_sec, 2) if structural_sec else None,
+        "interner": interner.stats(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark structural-sharing freeze against the legacy path."
+    )
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--levels", type=int, default=10)
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--extra-fields", type=int, default=120)
+    args = parser.parse_args(argv)
+    snapshot = build_benchmark_ws_snapshot(
+        levels=args.levels, ticks=args.ticks, extra_fields=args.extra_fields
+    )
+    print(
+        json.dumps(
+            benchmark_snapshot_handoff(snapshot, iterations=args.iterations),
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,746 @@
+"""Precompiled FID parse plans for Kiwoom REAL 0B/0D/0w items.
+
+The realtime handler used to walk each ``values`` dict field by field, calling
+``str()``/sign-stripping helpers several times for the same FID (``15``, ``13``
+and ``1030``/``1031`` are each converted three or four ways per 0B tick).  A
+``FidParsePlan`` is a precomputed table of ``(fid, converter, missing value)``
+steps applied in one pass; it yields one slotted record per item that every
+downstream consumer reads instead of re-parsing the raw strings.
+
+The converters reproduce the legacy helpers exactly, including their failure
+defaults: ``None`` marks a present-but-unparseable value (the caller keeps its
+own default) and ``MISSING`` marks a FID that was absent from the frame, which
+matters for fields the handler only assigns when present.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+FID_PARSE_PLAN_VERSION = "kiwoom_realtime_fid_plan_v1"
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+
+MISSING: Any = _Missing()
+
+
+# ----------------------------------------------------------------------
+# converters (exact legacy semantics)
+# ----------------------------------------------------------------------
+def safe_digits_int(value: Any, default: Any = 0) -> Any:
+    """Sign-stripped digit parse used for prices/volumes (no comma support)."""
+
+    text = str(value).replace("+", "").replace("-", "").strip()
+    return int(text) if text.isdigit() else default
+
+
+def safe_abs_int(value: Any, default: Any = 0) -> Any:
+    try:
+        return abs(int(float(str(value).replace(",", "").strip())))
+    except Exception:
+        return default
+
+
+def safe_signed_int(value: Any, default: Any = 0) -> Any:
+    try:
+        return int(float(str(value).replace(",", "").replace("+", "").strip()))
+    except Exception:
+        return default
+
+
+def safe_float(value: Any, default: Any = 0.0) -> Any:
+    try:
+        return float(str(value).replace(",", "").replace("+", "").strip())
+    except Exception:
+        return default
+
+
+# Fast paths: Kiwoom sends most numeric FIDs as plain digit strings, for which
+# every legacy helper reduces to ``int(text)``.  The length guard keeps the
+# float round-trip of ``safe_abs_int``/``safe_signed_int`` exact.
+def _digits_or_none(value: Any) -> Any:
+    if value.__class__ is str and value.isdigit():
+        return int(value)
+    return safe_digits_int(value, None)
+
+
+def _abs_or_none(value: Any) -> Any:
+    if value.__class__ is str and value.isdigit() and len(value) < 16:
+        return int(value)
+    return safe_abs_int(value, None)
+
+
+def _abs_or_zero(value: Any) -> Any:
+    if value.__class__ is str and value.isdigit() and len(value) < 16:
+        return int(value)
+    return safe_abs_int(value, 0)
+
+
+def _signed_or_none(value: Any) -> Any:
+    if value.__class__ is str and value.isdigit() and len(value) < 16:
+        return int(value)
+    return safe_signed_int(value, None)
+
+
+def _signed_or_zero(value: Any) -> Any:
+    if value.__class__ is str and value.isdigit() and len(value) < 16:
+        return int(value)
+    return safe_signed_int(value, 0)
+
+
+def _float_or_none(value: Any) -> Any:
+    if value.__class__ is str and "," not in value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return safe_float(value, None)
+
+
+def _float_or_zero(value: Any) -> Any:
+    if value.__class__ is str and "," not in value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return safe_float(value, 0.0)
+
+
+def _digits_or_zero(value: Any) -> Any:
+    if value.__class__ is str and value.isdigit():
+        return int(value)
+    return safe_digits_int(value, 0)
+
+
+def _plus_stripped_float(value: Any) -> Any:
+    # FID 12 legacy parse: ``float(raw.replace("+", ""))`` guarded by ValueError.
+    try:
+        return float(value.replace("+", ""))
+    except ValueError:
+        return None
+
+
+def _plain_float(value: Any) -> Any:
+    # FID 228 legacy parse: ``float(raw)`` guarded by ValueError.
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _text(value: Any) -> str:
+    return str(value or "")
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def signed_trade_volume_side(value: Any) -> tuple[str, str]:
+    text = str(value or "").replace(",", "").strip()
+    if text.startswith("+"):
+        return "BUY", "signed_trade_volume_positive_auxiliary"
+    if text.startswith("-"):
+        return "SELL", "signed_trade_volume_negative_auxiliary"
+    return "UNKNOWN", "signed_trade_volume_missing_or_neutral"
+
+
+# ----------------------------------------------------------------------
+# slotted per-item records
+# ----------------------------------------------------------------------
+@dataclass(slots=True)
+class KiwoomQuoteFields:
+    """Fields every 0B/0D/0w item may carry (``MISSING`` when absent)."""
+
+    curr: Any
+    open: Any
+    high: Any
+    low: Any
+    volume: Any
+    fluctuation: Any
+    v_pw: Any
+    cum_trade_value: Any
+    tick_trade_value: Any
+    sell_exec_volume: Any
+    buy_exec_volume: Any
+    buy_ratio: Any
+    net_buy_exec_volume: Any
+    sell_exec_single: Any
+    buy_exec_single: Any
+    ask_tot: Any
+    bid_tot: Any
+    net_bid_depth: Any
+    bid_depth_ratio: Any
+    net_ask_depth: Any
+    ask_depth_ratio: Any
+
+
+@dataclass(slots=True)
+class Kiwoom0BFields(KiwoomQuoteFields):
+    signed_qty: int
+    signed_qty_abs: Any
+    signed_qty_text: str
+    signed_side: tuple[str, str]
+    price_abs: int
+    cum_volume_abs: Any
+    buy_qty_abs: Any
+    sell_qty_abs: Any
+    trade_value_abs: Any
+    strength: float
+    buy_ratio_text: str
+    best_ask: int
+    best_bid: int
+    exchange_time_raw: str
+    exchange_code_9081: str
+
+
+@dataclass(slots=True)
+class Kiwoom0DFields(KiwoomQuoteFields):
+    expected_price_291: Any
+    expected_price_23: Any
+    expected_qty_292: Any
+    expected_qty_24: Any
+    expected_vs_prev_294: Any
+    expected_vs_prev_200: Any
+    expected_rate_295: Any
+    expected_rate_201: Any
+    expected_sign_293: Any
+    expected_sign_238: Any
+    expected_volume_rate_299: Any
+    # Levels 1..5; ``None`` where the raw price or volume was blank.
+    ask_prices: tuple[Any, ...]
+    ask_volumes: tuple[Any, ...]
+    bid_prices: tuple[Any, ...]
+    bid_volumes: tuple[Any, ...]
+
+
+@dataclass(slots=True)
+class Kiwoom0WFields(KiwoomQuoteFields):
+    prog_sell_qty: Any
+    prog_sell_amt: Any
+    prog_buy_qty: Any
+    prog_buy_amt: Any
+    prog_net_qty: Any
+    prog_delta_qty: Any
+    prog_net_amt: Any
+    prog_delta_amt: Any
+
+
+# Target assignment policy for the shared block, applied in this order:
+#   KEEP     - leave the target untouched when the FID is unparseable
+#   "<num>"  - fall back to ``target.get(key, default)``
+#   ZERO     - assign 0 when unparseable (legacy ``safe_int(values[fid])``)
+KEEP = "keep"
+ZERO = "zero"
+
+# (fid, record slot / target key, converter, unparseable policy)
+_QUOTE_STEPS: tuple[tuple[str, str, Callable[[Any], Any], Any], ...] = (
+    ("10", "curr", _digits_or_none, KEEP),
+    ("16", "open", _digits_or_none, 0),
+    ("17", "high", _digits_or_none, 0),
+    ("18", "low", _digits_or_none, 0),
+    ("13", "volume", _digits_or_none, 0),
+    ("12", "fluctuation", _plus_stripped_float, KEEP),
+    ("228", "v_pw", _plain_float, KEEP),
+    ("14", "cum_trade_value", _digits_or_none, 0),
+    ("1313", "tick_trade_value", _digits_or_none, 0),
+    ("1030", "sell_exec_volume", _digits_or_none, 0),
+    ("1031", "buy_exec_volume", _digits_or_none, 0),
+    ("1032", "buy_ratio", _float_or_none, 0.0),
+    ("1314", "net_buy_exec_volume", _signed_or_none, 0),
+    ("1315", "sell_exec_single", _digits_or_none, 0),
+    ("1316", "buy_exec_single", _digits_or_none, 0),
+    ("121", "ask_tot", _digits_or_none, ZERO),
+    ("125", "bid_tot", _digits_or_none, ZERO),
+    ("128", "net_bid_depth", _signed_or_none, 0),
+    ("129", "bid_depth_ratio", _float_or_none, 0.0),
+    ("138", "net_ask_depth", _signed_or_none, 0),
+    ("139", "ask_depth_ratio", _float_or_none, 0.0),
+)
+QUOTE_FIELD_POLICIES: tuple[tuple[str, Any], ...] = tuple(
+    (slot, policy) for _fid, slot, _converter, policy in _QUOTE_STEPS
+)
+
+# 0B steps read with ``values.get(fid)`` semantics, so an absent FID is
+# converted exactly like ``None`` was by the legacy helpers.  0w program fields
+# are only assigned when present, so they keep ``MISSING``.
+_0B_STEPS: tuple[tuple[str, Callable[[Any], Any]], ...] = (
+    ("15", _signed_or_zero),
+    ("15", _abs_or_none),
+    ("15", _text),
+    ("15", signed_trade_volume_side),
+    ("10", _abs_or_zero),
+    ("13", _abs_or_none),
+    ("1031", _abs_or_none),
+    ("1030", _abs_or_none),
+    ("1313", _abs_or_none),
+    ("228", _float_or_zero),
+    ("1032", _text),
+    ("27", _digits_or_zero),
+    ("28", _digits_or_zero),
+    ("20", _text),
+    ("9081", _text),
+)
+_0W_STEPS: tuple[tuple[str, Callable[[Any], Any]], ...] = tuple(
+    (fid, _signed_or_zero)
+    for fid in ("202", "204", "206", "208", "210", "211", "212", "213")
+)
+_0D_STEPS: tuple[tuple[str, Callable[[Any], Any]], ...] = tuple(
+    (fid, _identity)
+    for fid in (
+        "291",
+        "23",
+        "292",
+        "24",
+        "294",
+        "200",
+        "295",
+        "201",
+        "293",
+        "238",
+        "299",
+    )
+)
+_0D_LEVEL_FIDS = tuple(
+    str(base + level) for base in (40, 60, 50, 70) for level in range(1, 6)
+)
+
+
+# Digit-family converters all agree on plain digit strings, so the compiled
+# parser converts each such FID once and only falls back per converter.
+_DIGIT_FAMILY = frozenset(
+    {
+        _digits_or_none,
+        _digits_or_zero,
+        _abs_or_none,
+        _abs_or_zero,
+        _signed_or_none,
+        _signed_or_zero,
+    }
+)
+_SHARED_DIGIT_PARSE = (
+    "int({r}) if {r}.__class__ is str and {r}.isdigit() and len({r}) < 16 "
+    "else NOFAST"
+)
+# Inline expressions for the compiled parser; other converters are called.
+_INLINE_TEMPLATES: dict[Callable[[Any], Any], str] = {
+    _text: 'str({r} or "")',
+    _identity: "{r}",
+}
+_NO_FAST_VALUE = object()
+
+
+def _compile_parse_function(
+    record_type: type,
+    steps: tuple[tuple[str, Callable[[Any], Any], Any], ...],
+    level_fids: tuple[str, ...],
+) -> tuple[Callable[[dict[str, Any]], Any], str]:
+    """Generate one straight-line parser: each FID is read and digit-parsed
+    once, conversions are inlined, and the record is built in one call."""
+
+    namespace: dict[str, Any] = {
+        "MISSING": MISSING,
+        "NOFAST": _NO_FAST_VALUE,
+        "RECORD": record_type,
+    }
+    raw_names: dict[str, str] = {}
+    digit_names: dict[str, str] = {}
+    lines = ["def parse(values):", "    get = values.get"]
+
+    def raw_name(fid: str) -> str:
+        if fid not in raw_names:
+            raw_names[fid] = f"r{len(raw_names)}"
+            lines.append(f"    {raw_names[fid]} = get({fid!r}, MISSING)")
+        return raw_names[fid]
+
+    def digit_name(fid: str) -> str:
+        if fid not in digit_names:
+            raw = raw_name(fid)
+            digit_names[fid] = f"d{len(digit_names)}"
+            expr = _SHARED_DIGIT_PARSE.format(r=raw)
+            lines.append(f"    {digit_names[fid]} = {expr}")
+        return digit_names[fid]
+
+    args = []
+    for index, (fid, convert, absent) in enumerate(steps):
+        name = raw_name(fid)
+        namespace[f"C{index}"] = convert
+        namespace[f"A{index}"] = absent
+        if convert in _DIGIT_FAMILY:
+            digits = digit_name(fid)
+            expr = f"{digits} if {digits} is not NOFAST else C{index}({name})"
+        else:
+            template = _INLINE_TEMPLATES.get(convert, "{fn}({r})")
+            expr = template.format(r=name, fn=f"C{index}")
+        args.append(f"A{index} if {name} is MISSING else ({expr})")
+    if level_fids:
+        namespace["LEVEL"] = _digits_or_zero
+        levels = []
+        for fid in level_fids:
+            name = raw_name(fid)
+            digits = digit_name(fid)
+            expr = f"{digits} if {digits} is not NOFAST else LEVEL({name})"
+            levels.append(f"(({expr}) if {name} else None)")
+        for offset in range(0, len(levels), 5):
+            args.append("(" + ", ".join(levels[offset : offset + 5]) + ",)")
+    lines.append("    return RECORD(")
+    lines.extend(f"        {arg}," for arg in args)
+    lines.append("    )")
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, f"<fid_parse_plan:{record_type.__name__}>", "exec"), namespace)
+    return namespace["parse"], source
+
+
+@dataclass(frozen=True, slots=True)
+class FidParsePlan:
+    realtime_type: str
+    record_type: type
+    # (fid, converter, value stored when the FID is absent).  Shared quote
+    # fields store ``MISSING``; typed ``values.get`` fields store the
+    # converter's result for ``None``.
+    steps: tuple[tuple[str, Callable[[Any], Any], Any], ...]
+    # Ask prices, ask volumes, bid prices, bid volumes in groups of five.
+    level_fids: tuple[str, ...] = ()
+    parse: Callable[[dict[str, Any]], Any] = field(init=False, repr=False)
+    source: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        parse, source = _compile_parse_function(
+            self.record_type, self.steps, self.level_fids
+        )
+        object.__setattr__(self, "parse", parse)
+        object.__setattr__(self, "source", source)
+
+
+def _compile_typed_steps(
+    steps: tuple[tuple[str, Callable[[Any], Any]], ...],
+    *,
+    keep_missing: bool = False,
+) -> tuple[tuple[str, Callable[[Any], Any], Any], ...]:
+    return tuple(
+        (fid, convert, MISSING if keep_missing else convert(None))
+        for fid, convert in steps
+    )
+
+
+def value_or(value: Any, default: Any) -> Any:
+    """Collapse ``MISSING``/unparseable record values to a caller default."""
+
+    return default if value is None or value is MISSING else value
+
+
+def compile_fid_parse_plans() -> dict[str, FidParsePlan]:
+    quote_steps = tuple(
+        (fid, convert, MISSING) for fid, _slot, convert, _ in _QUOTE_STEPS
+    )
+    return {
+        "0B": FidParsePlan(
+            "0B", Kiwoom0BFields, quote_steps + _compile_typed_steps(_0B_STEPS)
+        ),
+        "0D": FidParsePlan(
+            "0D",
+            Kiwoom0DFields,
+            quote_steps + _compile_typed_steps(_0D_STEPS),
+            level_fids=_0D_LEVEL_FIDS,
+        ),
+        "0w": FidParsePlan(
+            "0w",
+            Kiwoom0WFields,
+            quote_steps + _compile_typed_steps(_0W_STEPS, keep_missing=True),
+        ),
+    }
+
+
+FID_PARSE_PLANS = compile_fid_parse_plans()
+_GENERIC_PLAN = FidParsePlan(
+    "*",
+    KiwoomQuoteFields,
+    tuple((fid, convert, MISSING) for fid, _slot, convert, _ in _QUOTE_STEPS),
+)
+
+
+def parse_realtime_fields(realtime_type: Any, values: dict[str, Any]):
+    return FID_PARSE_PLANS.get(realtime_type, _GENERIC_PLAN).parse(values)
+
+
+def apply_quote_fields(target: dict[str, Any], fields: KiwoomQuoteFields) -> None:
+    """Assign the shared FID block onto a realtime target (legacy semantics)."""
+
+    for slot, policy in QUOTE_FIELD_POLICIES:
+        value = getattr(fields, slot)
+        if value is MISSING:
+            continue
+        if value is None:
+            if policy is KEEP:
+                continue
+            value = 0 if policy is ZERO else target.get(slot, policy)
+        target[slot] = value
+
+
+# ----------------------------------------------------------------------
+# 0B derived fields from a parsed record
+# ----------------------------------------------------------------------
+def parse_0b_auxiliary_fields(
+    fields: Kiwoom0BFields, *, trade_price: int = 0, previous_tick=None
+) -> dict[str, Any]:
+    """Record-based twin of ``KiwoomWSManager._parse_0b_auxiliary_fields``."""
+
+    previous_tick = previous_tick if isinstance(previous_tick, dict) else {}
+    buy_qty = fields.buy_qty_abs
+    sell_qty = fields.sell_qty_abs
+    signed_qty_abs = fields.signed_qty_abs
+    cum_volume = fields.cum_volume_abs
+    prev_cum_volume = safe_abs_int(previous_tick.get("cum_volume"), None)
+    cum_volume_delta = (
+        int(cum_volume - prev_cum_volume)
+        if cum_volume is not None
+        and prev_cum_volume is not None
+        and cum_volume > prev_cum_volume
+        else None
+    )
+    price = safe_abs_int(trade_price, 0) if trade_price else fields.price_abs
+    split_qty_available = buy_qty is not None and sell_qty is not None
+    split_qty_sum = (
+        int((buy_qty or 0) + (sell_qty or 0)) if split_qty_available else None
+    )
+
+    if signed_qty_abs is not None and signed_qty_abs > 0:
+        trade_volume = signed_qty_abs
+        trade_volume_source = "15_abs"
+    elif cum_volume_delta is not None and cum_volume_delta > 0:
+        trade_volume = cum_volume_delta
+        trade_volume_source = "13_delta"
+    else:
+        trade_volume = 0
+        trade_volume_source = "unknown"
+
+    trade_value = fields.trade_value_abs
+    trade_value_source = (
+        "1313" if trade_value is not None and trade_value > 0 else "unknown"
+    )
+    fallback_volume_source = "none"
+    if trade_value_source == "unknown":
+        if trade_volume > 0:
+            fallback_volume_source = trade_volume_source
+        if price > 0 and trade_volume > 0:
+            trade_value = int(price * trade_volume)
+            trade_value_source = f"calc_price_x_{fallback_volume_source}"
+        else:
+            trade_value = 0
+
+    evaluable = split_qty_sum is not None and signed_qty_abs is not None
+    return {
+        "buy_qty": int(buy_qty or 0),
+        "sell_qty": int(sell_qty or 0),
+        "signed_qty_abs": int(signed_qty_abs or 0),
+        "cum_volume": int(cum_volume or 0),
+        "prev_cum_volume": int(prev_cum_volume or 0),
+        "cum_volume_delta": (
+            int(cum_volume_delta) if cum_volume_delta is not None else None
+        ),
+        "split_qty_sum": int(split_qty_sum or 0),
+        "split_qty_available": bool(split_qty_available),
+        "split_qty_advisory_only": True,
+        "trade_volume": int(trade_volume or 0),
+        "trade_volume_source": trade_volume_source,
+        "trade_value": int(trade_value or 0),
+        "trade_value_source": trade_value_source,
+        "trade_value_fallback_volume_source": fallback_volume_source,
+        "split_qty_vs_15_evaluable": bool(evaluable),
+        "split_qty_vs_15_mismatch": bool(evaluable and split_qty_sum != signed_qty_abs),
+        "split_qty_vs_15_delta": (
+            int(split_qty_sum - signed_qty_abs) if evaluable else None
+        ),
+    }
+
+
+def infer_trade_auxiliary_score(
+    fields: Kiwoom0BFields, *, previous_tick=None
+) -> dict[str, Any]:
+    """Record-based twin of ``KiwoomWSManager._infer_trade_auxiliary_score``."""
+
+    previous_tick = previous_tick if isinstance(previous_tick, dict) else {}
+    score = 0.0
+    reasons = []
+    components: dict[str, Any] = {}
+
+    signed_side, signed_quality = fields.signed_side
+    components["signed_volume_side"] = signed_side
+    if signed_side == "BUY":
+        score += 3.0
+        reasons.append("signed_volume_positive")
+    elif signed_side == "SELL":
+        score -= 3.0
+        reasons.append("signed_volume_negative")
+
+    buy_qty = fields.buy_qty_abs if fields.buy_qty_abs is not None else 0
+    sell_qty = fields.sell_qty_abs if fields.sell_qty_abs is not None else 0
+    total_qty = buy_qty + sell_qty
+    components["buy_exec_qty_1031"] = buy_qty
+    components["sell_exec_qty_1030"] = sell_qty
+    if total_qty > 0:
+        imbalance = (buy_qty - sell_qty) / float(total_qty)
+        score += imbalance * 5.0
+        components["exec_qty_imbalance"] = round(imbalance, 6)
+        reasons.append("exec_qty_imbalance")
+
+    cum_volume = fields.cum_volume_abs if fields.cum_volume_abs is not None else 0
+    prev_cum_volume = safe_abs_int(previous_tick.get("cum_volume"), 0)
+    components["cum_volume_13"] = cum_volume
+    components["prev_cum_volume_13"] = prev_cum_volume
+    if cum_volume > 0 and prev_cum_volume > 0:
+        delta = cum_volume - prev_cum_volume
+        components["cum_volume_delta"] = delta
+        if delta > 0 and signed_side in {"BUY", "SELL"}:
+            delta_score = min(2.0, float(delta) * 0.001)
+            score += delta_score if signed_side == "BUY" else -delta_score
+            reasons.append("cum_volume_delta_with_signed_volume")
+
+    strength = fields.strength
+    components["trade_strength_228"] = strength
+    if strength > 0:
+        strength_bias = max(-2.0, min(2.0, ((strength - 100.0) / 100.0) * 2.0))
+        score += strength_bias
+        components["trade_strength_bias"] = round(strength_bias, 6)
+        reasons.append("trade_strength_bias")
+
+    price = fields.price_abs
+    prev_price = safe_abs_int(previous_tick.get("price"), 0)
+    components["prev_trade_price"] = prev_price
+    if price > 0 and prev_price > 0:
+        if price > prev_price:
+            score += 1.0
+            reasons.append("price_up_vs_prev")
+        elif price < prev_price:
+            score -= 1.0
+            reasons.append("price_down_vs_prev")
+
+    if score >= 1.5:
+        side = "BUY"
+    elif score <= -1.5:
+        side = "SELL"
+    else:
+        side = "UNKNOWN"
+    if reasons in (["signed_volume_positive"], ["signed_volume_negative"]):
+        quality = signed_quality
+    elif reasons:
+        quality = "weighted_auxiliary_observation"
+    else:
+        quality = "auxiliary_observation_missing_or_neutral"
+    return {
+        "side": side,
+        "quality": quality,
+        "score": round(score, 6),
+        "reason": ";".join(reasons) if reasons else "insufficient_auxiliary_data",
+        "components": components,
+    }
+
+
+# ----------------------------------------------------------------------
+# microbenchmark
+# ----------------------------------------------------------------------
+def build_benchmark_values(realtime_type: str) -> dict[str, str]:
+    if realtime_type == "0D":
+        values = {"21": "090001", "121": "30000", "125": "28000", "128": "-120"}
+        for level in range(1, 6):
+            values[str(40 + level)] = f"+{10110 + level * 10}"
+            values[str(60 + level)] = str(1_000 + level)
+            values[str(50 + level)] = f"-{10100 - level * 10}"
+            values[str(70 + level)] = str(900 + level)
+        return values
+    return {
+        "10": "+10110",
+        "12": "+1.05",
+        "13": "1200000",
+        "14": "12345",
+        "15": "+120",
+        "16": "10000",
+        "17": "+10250",
+        "18": "-9950",
+        "20": "090001",
+        "27": "+10110",
+        "28": "+10100",
+        "228": "135.50",
+        "1030": "500000",
+        "1031": "700000",
+        "1032": "55.10",
+        "1313": "1213",
+        "1314": "+2000",
+        "1315": "30",
+        "1316": "31",
+        "9081": "1",
+    }
+
+
+def _apply_cost_manager():
+    from src.engine import kiwoom_websocket
+
+    manager = kiwoom_websocket.KiwoomWSManager("benchmark-token")
+    manager.subscribed_codes = {"005930"}
+    manager._queue_tick_event = lambda *args, **kwargs: None
+    manager._maybe_write_dashboard_snapshot = lambda: None
+    return manager
+
+
+def benchmark_fid_parse(
+    realtime_type: str = "0B", *, iterations: int = 20_000
+) -> dict[str, Any]:
+    """Per-tick cost of the parse plan alone and of the full item apply."""
+
+    values = build_benchmark_values(realtime_type)
+    iterations = max(1, int(iterations))
+    plan = FID_PARSE_PLANS[realtime_type]
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fields = plan.parse(values)
+        apply_quote_fields({"curr": 0}, fields)
+        if realtime_type == "0B":
+            parse_0b_auxiliary_fields(fields, trade_price=10110)
+            infer_trade_auxiliary_score(fields)
+    parse_elapsed = time.perf_counter() - started
+
+    manager = _apply_cost_manager()
+    items = [{"type": realtime_type, "item": "005930", "values": values}]
+    started = time.perf_counter()
+    for _ in range(iterations):
+        manager._apply_realtime_items(items)
+    apply_elapsed = time.perf_counter() - started
+    return {
+        "version": FID_PARSE_PLAN_VERSION,
+        "realtime_type": realtime_type,
+        "iterations": iterations,
+        "parse_us_per_tick": round(parse_elapsed / iterations * 1e6, 3),
+        "apply_us_per_tick": round(apply_elapsed / iterations * 1e6, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--types", default="0B,0D")
+    args = parser.parse_args(argv)
+    for realtime_type in [part.strip() for part in args.types.split(",") if part]:
+        print(
+            json.dumps(
+                benchmark_fid_parse(realtime_type, iterations=args.iterations),
+                ensure_ascii=False,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,1007 @@
+"""Local stand-in for the Kiwoom REST and websocket APIs.
+
+Load tests of the whole bot need more symbols and more order traffic than the
+mock broker allows, and must never touch the real one.  ``KiwoomStandinServer``
+serves the subset of the API the bot uses on localhost:
+
+* REST (``/oauth2/token`` and ``/api/dostk/*`` by ``api-id``): ka10004
+  orderbook, ka10003 trade ticks, ka10080 minute bars, ka10027 ranking (paged
+  with ``cont-yn``/``next-key``), kt10000/kt10001 order submit and kt10003
+  cancel.  Other api-ids answer an empty success and are counted.
+* Websocket: LOGIN, REG/REMOVE with a per-connection item budget, PING,
+  CNSRLST/CNSRREQ, and REAL pushes of 0B/0D/0w, condition ``02`` and order
+  execution ``00`` notices.
+
+Market data is a seeded random walk per symbol (``SyntheticMarket``), or REAL
+items read from a ``kiwoom_ws_capture`` file and replayed with their original
+spacing.  REST latency and jitter, random 429s and per-api rate limits are
+configurable, so retry and backoff paths get exercised too.
+
+Point the bot at it with ``KORSTOCKSCAN_KIWOOM_BASE_URL`` and
+``KORSTOCKSCAN_KIWOOM_WS_URI``::
+
+    python -m src.engine.infrastructure.kiwoom_standin_server --symbols 1500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable, Mapping
+
+import websockets
+
+from src.engine.infrastructure.kiwoom_ws_capture import iter_capture_frames
+from src.utils.kiwoom_utils import get_tick_size
+
+STANDIN_SERVER_VERSION = "kiwoom_standin_server_v1"
+WS_PATH = "/api/dostk/websocket"
+REALTIME_MARKET_TYPES = ("0B", "0D", "0w")
+_RANK_PAGE_SIZE = 20
+_OK_MSG = "정상적으로 처리되었습니다"
+
+
+@dataclass(frozen=True, slots=True)
+class StandinConfig:
+    host: str = "127.0.0.1"
+    rest_port: int = 0
+    ws_port: int = 0
+    symbol_count: int = 200
+    codes: tuple[str, ...] = ()
+    seed: int = 7
+    tick_hz: float = 2.0
+    rest_latency_ms: float = 0.0
+    rest_jitter_ms: float = 0.0
+    ws_latency_ms: float = 0.0
+    inject_429_rate: float = 0.0
+    rate_limits: Mapping[str, float] = field(default_factory=dict)
+    max_registered_items: int = 100
+    fill_latency_ms: float = 50.0
+    ping_interval_sec: float = 20.0
+    condition_names: tuple[str, ...] = ("scalp_candid_normal_01",)
+    condition_push_hz: float = 0.0
+    capture_paths: tuple[str, ...] = ()
+
+
+def _hhmmss(now: float | None = None) -> str:
+    return datetime.fromtimestamp(time.time() if now is None else now).strftime(
+        "%H%M%S"
+    )
+
+
+def _signed(value: float, digits: int | None = None) -> str:
+    text = f"{abs(value):.{digits}f}" if digits is not None else str(abs(int(value)))
+    return ("-" if value < 0 else "+") + text
+
+
+@dataclass(slots=True)
+class _SymbolState:
+    code: str
+    name: str
+    prev_close: int
+    price: int
+    open: int
+    high: int
+    low: int
+    volume: int = 0
+    trade_value: int = 0
+    buy_volume: int = 0
+    sell_volume: int = 0
+    last_qty: int = 0
+    ticks: deque = field(default_factory=lambda: deque(maxlen=100))
+    minute_bars: deque = field(default_factory=lambda: deque(maxlen=400))
+
+
+class SyntheticMarket:
+    """Seeded per-symbol random walk that renders Kiwoom REST/REAL payloads."""
+
+    def __init__(self, codes: Iterable[str], *, seed: int = 7):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.symbols: dict[str, _SymbolState] = {}
+        for code in codes:
+            self._add_symbol(code)
+
+    def _add_symbol(self, code: str) -> _SymbolState:
+        rng = self._rng
+        prev_close = rng.choice((1_500, 4_000, 9_000, 30_000, 80_000, 250_000))
+        prev_close -= prev_close % get_tick_size(prev_close)
+        state = _SymbolState(
+            code=code,
+            name=f"STANDIN{code}",
+            prev_close=prev_close,
+            price=prev_close,
+            open=prev_close,
+            high=prev_close,
+            low=prev_close,
+        )
+        start = datetime.now().replace(second=0, microsecond=0)
+        price = prev_close
+        for minutes_ago in range(120, 0, -1):
+            bar_open = price
+            for _ in range(3):
+                price = max(get_tick_size(price), price + self._price_step(price))
+            state.minute_bars.append(
+                {
+                    "cntr_tm": (start - timedelta(minutes=minutes_ago)).strftime(
+                        "%Y%m%d%H%M%S"
+                    ),
+                    "open_pric": bar_open,
+                    "high_pric": max(bar_open, price),
+                    "low_pric": min(bar_open, price),
+                    "cur_prc": price,
+                    "trde_qty": rng.randint(100, 20_000),
+                }
+            )
+        state.price = state.open = state.high = state.low = price
+        self.symbols[code] = state
+        return state
+
+    def _price_step(self, price: int) -> int:
+        return get_tick_size(price) * self._rng.choice((-1, 0, 0, 1))
+
+    def symbol(self, code: str) -> _SymbolState:
+        code = str(code or "").strip().upper().lstrip("A")[:6]
+        with self._lock:
+            state = self.symbols.get(code)
+            if state is None:
+                state = self._add_symbol(code)
+            return state
+
+    def step(self, code: str, now: float | None = None) -> _SymbolState:
+        """Advance one trade print for ``code``."""
+
+        state = self.symbol(code)
+        now = time.time() if now is None else now
+        with self._lock:
+            rng = self._rng
+            price = max(
+                get_tick_size(state.price), state.price + self._price_step(state.price)
+            )
+            qty = rng.randint(1, 500)
+            signed_qty = qty if price >= state.price else -qty
+            state.price = price
+            state.high = max(state.high, price)
+            state.low = min(state.low, price)
+            state.volume += qty
+            state.trade_value += price * qty
+            if signed_qty > 0:
+                state.buy_volume += qty
+            else:
+                state.sell_volume += qty
+            state.last_qty = signed_qty
+            tm = _hhmmss(now)
+            state.ticks.appendleft((tm, price, signed_qty, state.volume))
+            minute = datetime.fromtimestamp(now).strftime("%Y%m%d%H%M00")
+            bar = state.minute_bars[-1] if state.minute_bars else None
+            if bar is None or bar["cntr_tm"] != minute:
+                state.minute_bars.append(
+                    {
+                        "cntr_tm": minute,
+                        "open_pric": price,
+                        "high_pric": price,
+                        "low_pric": price,
+                        "cur_prc": price,
+                        "trde_qty": qty,
+                    }
+                )
+            else:
+                bar["high_pric"] = max(bar["high_pric"], price)
+                bar["low_pric"] = min(bar["low_pric"], price)
+                bar["cur_prc"] = price
+                bar["trde_qty"] += qty
+        return state
+
+    @staticmethod
+    def _flu_rt(state: _SymbolState) -> float:
+        return (state.price - state.prev_close) / state.prev_close * 100.0
+
+    def _strength(self, state: _SymbolState) -> float:
+        return round(state.buy_volume / max(1, state.sell_volume) * 100.0, 2)
+
+    def _depth(self, state: _SymbolState, levels: int) -> tuple[list, list]:
+        tick = get_tick_size(state.price)
+        asks = [(state.price + tick * i, 100 * (i + 1)) for i in range(1, levels + 1)]
+        bids = [(state.price - tick * i, 120 * (i + 1)) for i in range(levels)]
+        return asks, bids
+
+    def best_quotes(self, code: str) -> tuple[int, int]:
+        state = self.symbol(code)
+        asks, bids = self._depth(state, 1)
+        return asks[0][0], bids[0][0]
+
+    def real_values(self, code: str, realtime_type: str) -> dict[str, str]:
+        state = self.symbol(code)
+        if realtime_type == "0B":
+            state = self.step(code)
+            asks, bids = self._depth(state, 1)
+            return {
+                "20": _hhmmss(),
+                "10": _signed(
+                    state.price if state.price >= state.prev_close else -state.price
+                ),
+                "11": _signed(state.price - state.prev_close),
+                "12": _signed(self._flu_rt(state), 2),
+                "13": str(state.volume),
+                "14": str(state.trade_value // 1_000_000),
+                "15": _signed(state.last_qty),
+                "16": str(state.open),
+                "17": str(state.high),
+                "18": str(state.low),
+                "27": _signed(asks[0][0]),
+                "28": _signed(bids[0][0]),
+                "228": f"{self._strength(state):.2f}",
+                "1030": str(state.sell_volume),
+                "1031": str(state.buy_volume),
+                "1032": f"{state.buy_volume / max(1, state.volume) * 100:.2f}",
+                "1313": str(abs(state.last_qty) * state.price // 1_000_000),
+                "9081": "1",
+            }
+        if realtime_type == "0D":
+            asks, bids = self._depth(state, 5)
+            values = {"21": _hhmmss()}
+            for level, ((ask, ask_qty), (bid, bid_qty)) in enumerate(
+                zip(asks, bids), start=1
+            ):
+                values[str(40 + level)] = _signed(ask)
+                values[str(60 + level)] = str(ask_qty)
+                values[str(50 + level)] = _signed(-bid)
+                values[str(70 + level)] = str(bid_qty)
+            values["121"] = str(sum(qty for _, qty in asks))
+            values["125"] = str(sum(qty for _, qty in bids))
+            return values
+        if realtime_type == "0w":
+            net = state.buy_volume - state.sell_volume
+            return {
+                "202": str(state.sell_volume // 10),
+                "204": _signed(-state.sell_volume * state.price // 10_000_000),
+                "206": str(state.buy_volume // 10),
+                "208": _signed(state.buy_volume * state.price // 10_000_000),
+                "210": _signed(net // 10),
+                "211": _signed(self._rng.randint(-50, 50)),
+                "212": _signed(net * state.price // 10_000_000),
+                "213": _signed(self._rng.randint(-5, 5)),
+            }
+        return {}
+
+    def ka10004(self, code: str) -> dict[str, Any]:
+        state = self.symbol(code)
+        asks, bids = self._depth(state, 10)
+        row: dict[str, Any] = {"bid_req_base_tm": _hhmmss()}
+        for level, ((ask, ask_qty), (bid, bid_qty)) in enumerate(
+            zip(asks, bids), start=1
+        ):
+            if level == 1:
+                keys = ("sel_fpr_bid", "sel_fpr_req", "buy_fpr_bid", "buy_fpr_req")
+            else:
+                keys = (
+                    f"sel_{level}th_pre_bid",
+                    f"sel_{level}th_pre_req",
+                    f"buy_{level}th_pre_bid",
+                    f"buy_{level}th_pre_req",
+                )
+            row.update(
+                dict(zip(keys, (str(ask), str(ask_qty), str(bid), str(bid_qty))))
+            )
+        row["tot_sel_req"] = str(sum(qty for _, qty in asks))
+        row["tot_buy_req"] = str(sum(qty for _, qty in bids))
+        return row
+
+    def ka10003(self, code: str) -> dict[str, Any]:
+        state = self.step(code)
+        strength = self._strength(state)
+        with self._lock:
+            ticks = list(state.ticks)
+        return {
+            "cntr_infr": [
+                {
+                    "tm": tm,
+                    "cur_prc": _signed(price),
+                    "pred_pre": _signed(price - state.prev_close),
+                    "pre_rt": _signed(
+                        (price - state.prev_close) / state.prev_close * 100, 2
+                    ),
+                    "cntr_trde_qty": _signed(qty),
+                    "acc_trde_qty": str(acc_volume),
+                    "cntr_str": f"{strength:.2f}",
+                    "stex_tp": "KRX",
+                }
+                for tm, price, qty, acc_volume in ticks
+            ]
+        }
+
+    def ka10080(self, code: str) -> dict[str, Any]:
+        state = self.symbol(code)
+        with self._lock:
+            bars = [dict(bar) for bar in reversed(state.minute_bars)]
+        return {
+            "stk_cd": state.code,
+            "stk_min_pole_chart_qry": [
+                {key: str(value) for key, value in bar.items()} for bar in bars
+            ],
+        }
+
+    def ka10027_rows(self) -> list[dict[str, Any]]:
+        with self._lock:
+            states = sorted(
+                self.symbols.values(), key=lambda state: -self._flu_rt(state)
+            )
+        return [
+            {
+                "stk_cls": "0",
+                "stk_cd": state.code,
+                "stk_nm": state.name,
+                "cur_prc": _signed(state.price),
+                "pred_pre_sig": "2" if state.price >= state.prev_close else "5",
+                "pred_pre": _signed(state.price - state.prev_close),
+                "flu_rt": _signed(self._flu_rt(state), 2),
+                "now_trde_qty": str(state.volume),
+                "cntr_str": f"{self._strength(state):.2f}",
+            }
+            for state in states
+        ]
+
+
+class _RateLimiter:
+    """Per-api token buckets; a bucket holds one second of burst."""
+
+    def __init__(self, limits: Mapping[str, float]):
+        self._limits = {key: float(value) for key, value in limits.items() if value}
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, api_id: str, now: float | None = None) -> bool:
+        rate = self._limits.get(api_id, self._limits.get("*"))
+        if not rate:
+            return True
+        now = time.monotonic() if now is None else now
+        key = api_id if api_id in self._limits else "*"
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (rate, now))
+            tokens = min(rate, tokens + (now - updated) * rate)
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (tokens - 1.0, now)
+            return True
+
+
+@dataclass(slots=True)
+class _Order:
+    order_no: str
+    code: str
+    side: str
+    qty: int
+    price: int
+    market: bool
+    filled: int = 0
+    cancelled: bool = False
+
+
+class _WSSession:
+    __slots__ = ("ws", "groups", "outbox", "condition_seqs", "peak_outbox")
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.groups: dict[str, dict[str, set[str]]] = {}
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.condition_seqs: set[str] = set()
+        self.peak_outbox = 0
+
+    def registered(self, realtime_type: str) -> set[str]:
+        items: set[str] = set()
+        for by_type in self.groups.values():
+            items |= by_type.get(realtime_type, set())
+        return items
+
+    def market_items(self) -> set[str]:
+        items: set[str] = set()
+        for by_type in self.groups.values():
+            for realtime_type, codes in by_type.items():
+                if realtime_type in REALTIME_MARKET_TYPES:
+                    items |= codes
+        return items
+
+    def item_count(self) -> int:
+        return len(self.market_items())
+
+    def wants_executions(self) -> bool:
+        return any("00" in by_type for by_type in self.groups.values())
+
+    def push(self, frame: str) -> None:
+        self.outbox.put_nowait(frame)
+        depth = self.outbox.qsize()
+        if depth > self.peak_outbox:
+            self.peak_outbox = depth
+
+
+class KiwoomStandinServer:
+    """REST + websocket stand-in; ``start()`` returns once both are listening."""
+
+    def __init__(self, config: StandinConfig | None = None):
+        self.config = config or StandinConfig()
+        codes = self.config.codes or tuple(
+            f"{900000 + index:06d}" for index in range(self.config.symbol_count)
+        )
+        self.market = SyntheticMarket(codes, seed=self.config.seed)
+        self._rng = random.Random(self.config.seed + 1)
+        self._rate_limiter = _RateLimiter(self.config.rate_limits)
+        self._order_seq = itertools.count(1)
+        self._exec_seq = itertools.count(1)
+        self._token_seq = itertools.count(1)
+        self._orders: dict[str, _Order] = {}
+        self._orders_lock = threading.Lock()
+        self._resting: set[str] = set()
+        self._counters_lock = threading.Lock()
+        self.counters: dict[str, int] = {}
+        self._sessions: set[_WSSession] = set()
+        self._http: ThreadingHTTPServer | None = None
+        self._http_thread: threading.Thread | None = None
+        self._ws_thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._ws_stop: asyncio.Future | None = None
+        self._ws_ready = threading.Event()
+        self.rest_port = 0
+        self.ws_port = 0
+
+    # ------------------------------------------------------------------ utils
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._counters_lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.config.host}:{self.rest_port}"
+
+    @property
+    def ws_uri(self) -> str:
+        return f"ws://{self.config.host}:{self.ws_port}{WS_PATH}"
+
+    # -------------------------------------------------------------- lifecycle
+    def start(self, timeout: float = 5.0) -> "KiwoomStandinServer":
+        self._http = ThreadingHTTPServer(
+            (self.config.host, self.config.rest_port), _make_rest_handler(self)
+        )
+        self._http.daemon_threads = True
+        self.rest_port = self._http.server_address[1]
+        self._http_thread = threading.Thread(
+            target=self._http.serve_forever, name="standin-rest", daemon=True
+        )
+        self._http_thread.start()
+        self._ws_thread = threading.Thread(
+            target=lambda: asyncio.run(self._serve_ws()),
+            name="standin-ws",
+            daemon=True,
+        )
+        self._ws_thread.start()
+        if not self._ws_ready.wait(timeout):
+            raise RuntimeError("stand-in websocket server did not start")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        loop = self._loop
+        if loop is not None and self._ws_stop is not None:
+            loop.call_soon_threadsafe(
+                lambda: self._ws_stop.done() or self._ws_stop.set_result(None)
+            )
+        for thread in (self._http_thread, self._ws_thread):
+            if thread is not None and thread.is_alive():
+                thread.join(timeout=timeout)
+
+    def __enter__(self) -> "KiwoomStandinServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._counters_lock:
+            counters = dict(self.counters)
+        sessions = list(self._sessions)
+        return {
+            "version": STANDIN_SERVER_VERSION,
+            "base_url": self.base_url,
+            "ws_uri": self.ws_uri,
+            "symbols": len(self.market.symbols),
+            "counters": counters,
+            "ws_sessions": [
+                {
+                    "registered_items": session.item_count(),
+                    "outbox": session.outbox.qsize(),
+                    "peak_outbox": session.peak_outbox,
+                }
+                for session in sessions
+            ],
+        }
+
+    # ------------------------------------------------------------------- REST
+    def handle_rest(
+        self, path: str, headers: Mapping[str, str], body: dict
+    ) -> tuple[int, dict[str, str], dict]:
+        config = self.config
+        if config.rest_latency_ms or config.rest_jitter_ms:
+            time.sleep(
+                (config.rest_latency_ms + self._rng.random() * config.rest_jitter_ms)
+                / 1000.0
+            )
+        if path.rstrip("/") == "/oauth2/token":
+            self._count("rest:token")
+            expires = (datetime.now() + timedelta(hours=24)).strftime("%Y%m%d%H%M%S")
+            return (
+                200,
+                {},
+                {
+                    "token": f"standin-token-{next(self._token_seq)}",
+                    "token_type": "bearer",
+                    "expires_dt": expires,
+                    "return_code": 0,
+                    "return_msg": _OK_MSG,
+                },
+            )
+        api_id = str(headers.get("api-id") or "").strip()
+        if config.inject_429_rate and self._rng.random() < config.inject_429_rate:
+            self._count(f"rest_429_injected:{api_id}")
+            return 429, {}, {"return_code": 5, "return_msg": "injected rate limit"}
+        if not self._rate_limiter.allow(api_id):
+            self._count(f"rest_429_rate_limited:{api_id}")
+            return 429, {}, {"return_code": 5, "return_msg": "rate limit exceeded"}
+        self._count(f"rest:{api_id}")
+        code = str(body.get("stk_cd") or "").strip()
+        response_headers: dict[str, str] = {}
+        if api_id == "ka10004":
+            payload = self.market.ka10004(code)
+        elif api_id == "ka10003":
+            payload = self.market.ka10003(code)
+        elif api_id == "ka10080":
+            payload = self.market.ka10080(code)
+        elif api_id == "ka10027":
+            rows = self.market.ka10027_rows()
+            page = (
+                int(headers.get("next-key") or 0)
+                if headers.get("cont-yn") == "Y"
+                else 0
+            )
+            start = page * _RANK_PAGE_SIZE
+            payload = {"pred_pre_flu_rt_upper": rows[start : start + _RANK_PAGE_SIZE]}
+            has_more = start + _RANK_PAGE_SIZE < len(rows)
+            response_headers = {
+                "cont-yn": "Y" if has_more else "N",
+                "next-key": str(page + 1) if has_more else "",
+            }
+        elif api_id in {"kt10000", "kt10001"}:
+            payload = self._submit_order(api_id, body)
+        elif api_id == "kt10003":
+            payload = self._cancel_order(body)
+        else:
+            self._count(f"rest_unhandled:{api_id}")
+            payload = {}
+        payload.setdefault("return_code", 0)
+        payload.setdefault("return_msg", _OK_MSG)
+        return 200, response_headers, payload
+
+    # ----------------------------------------------------------------- orders
+    def _submit_order(self, api_id: str, body: dict) -> dict:
+        code = str(body.get("stk_cd") or "").strip()[:6]
+        qty = int(str(body.get("ord_qty") or "0") or 0)
+        price_text = str(body.get("ord_uv") or "").strip()
+        if not code or qty <= 0:
+            return {"return_code": 1, "return_msg": "invalid order"}
+        order = _Order(
+            order_no=f"{next(self._order_seq):07d}",
+            code=code,
+            side="BUY" if api_id == "kt10000" else "SELL",
+            qty=qty,
+            price=int(price_text) if price_text else 0,
+            market=not price_text,
+        )
+        with self._orders_lock:
+            self._orders[order.order_no] = order
+        self._publish_execution(order, status="접수")
+        self._schedule_fill(order)
+        return {"ord_no": order.order_no, "dmst_stex_tp": body.get("dmst_stex_tp", "")}
+
+    def _cancel_order(self, body: dict) -> dict:
+        orig = str(body.get("orig_ord_no") or "").strip()
+        with self._orders_lock:
+            order = self._orders.get(orig)
+            if order is None or order.cancelled or order.filled >= order.qty:
+                return {"return_code": 1, "return_msg": "no cancellable quantity"}
+            order.cancelled = True
+        cancel_no = f"{next(self._order_seq):07d}"
+        self._publish_execution(order, status="확인", cancel_no=cancel_no)
+        return {"ord_no": cancel_no, "base_orig_ord_no": orig}
+
+    def _schedule_fill(self, order: _Order) -> None:
+        timer = threading.Timer(
+            self.config.fill_latency_ms / 1000.0, self._try_fill, args=(order,)
+        )
+        timer.daemon = True
+        timer.start()
+
+    def _try_fill(self, order: _Order) -> None:
+        best_ask, best_bid = self.market.best_quotes(order.code)
+        touch = best_ask if order.side == "BUY" else best_bid
+        marketable = order.market or (
+            order.price >= best_ask if order.side == "BUY" else order.price <= best_bid
+        )
+        with self._orders_lock:
+            if order.cancelled or order.filled >= order.qty:
+                self._resting.discard(order.order_no)
+                return
+            if not marketable:
+                # Resting limit orders are re-checked by the market loop.
+                self._resting.add(order.order_no)
+                return
+            order.filled = order.qty
+            self._resting.discard(order.order_no)
+        self._publish_execution(order, status="체결", exec_price=touch)
+
+    def _sweep_resting_orders(self) -> None:
+        with self._orders_lock:
+            resting = [self._orders[order_no] for order_no in self._resting]
+        for order in resting:
+            self._try_fill(order)
+
+    def _publish_execution(
+        self,
+        order: _Order,
+        *,
+        status: str,
+        exec_price: int = 0,
+        cancel_no: str = "",
+    ) -> None:
+        side_text = "매수" if order.side == "BUY" else "매도"
+        if status == "확인":
+            side_text += "취소"
+        exec_qty = order.qty if status == "체결" else 0
+        values = {
+            "9201": "standin",
+            "9203": cancel_no or order.order_no,
+            "9001": f"A{order.code}",
+            "913": status,
+            "302": f"STANDIN{order.code}",
+            "900": str(order.qty),
+            "901": str(order.price),
+            "902": str(order.qty - order.filled if not order.cancelled else 0),
+            "904": order.order_no if cancel_no else "",
+            "905": ("+" if order.side == "BUY" else "-") + side_text,
+            "908": _hhmmss(),
+            "909": f"{next(self._exec_seq):07d}" if exec_qty else "",
+            "910": str(exec_price) if exec_qty else "",
+            "911": str(exec_qty) if exec_qty else "",
+            "914": str(exec_price) if exec_qty else "",
+            "915": str(exec_qty) if exec_qty else "",
+            "2134": "1",
+            "2135": "KRX",
+        }
+        self._count(f"execution_notice:{status}")
+        frame = json.dumps(
+            {
+                "trnm": "REAL",
+                "data": [
+                    {"type": "00", "name": "주문체결", "item": "", "values": values}
+                ],
+            },
+            ensure_ascii=False,
+        )
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._push_executions, frame)
+
+    def _push_executions(self, frame: str) -> None:
+        for session in list(self._sessions):
+            if session.wants_executions():
+                session.push(frame)
+
+    # -------------------------------------------------------------- websocket
+    async def _serve_ws(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._ws_stop = self._loop.create_future()
+        async with websockets.serve(
+            self._ws_handler, self.config.host, self.config.ws_port, ping_interval=None
+        ) as server:
+            self.ws_port = next(iter(server.sockets)).getsockname()[1]
+            tasks = [asyncio.create_task(self._market_loop())]
+            if self.config.capture_paths:
+                tasks.append(asyncio.create_task(self._recorded_loop()))
+            self._ws_ready.set()
+            try:
+                await self._ws_stop
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _ws_handler(self, ws) -> None:
+        session = _WSSession(ws)
+        self._sessions.add(session)
+        self._count("ws_connections")
+        sender = asyncio.create_task(self._ws_sender(session))
+        pinger = asyncio.create_task(self._ws_pinger(session))
+        try:
+            async for message in ws:
+                await self._handle_ws_message(session, message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._sessions.discard(session)
+            for task in (sender, pinger):
+                task.cancel()
+
+    async def _ws_sender(self, session: _WSSession) -> None:
+        latency = self.config.ws_latency_ms / 1000.0
+        while True:
+            frame = await session.outbox.get()
+            if latency:
+                await asyncio.sleep(latency)
+            try:
+                await session.ws.send(frame)
+            except websockets.ConnectionClosed:
+                return
+            self._count("ws_frames_sent")
+
+    async def _ws_pinger(self, session: _WSSession) -> None:
+        while True:
+            await asyncio.sleep(self.config.ping_interval_sec)
+            session.push(json.dumps({"trnm": "PING"}))
+
+    async def _handle_ws_message(self, session: _WSSession, message) -> None:
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            self._count("ws_bad_message")
+            return
+        trnm = str(msg.get("trnm") or "").upper()
+        self._count(f"ws:{trnm}")
+        if trnm == "LOGIN":
+            reply = {"trnm": "LOGIN", "return_code": 0, "return_msg": _OK_MSG}
+        elif trnm == "PING":
+            return
+        elif trnm == "REG":
+            reply = self._register(session, msg)
+        elif trnm == "REMOVE":
+            reply = self._remove(session, msg)
+        elif trnm == "CNSRLST":
+            reply = {
+                "trnm": "CNSRLST",
+                "return_code": 0,
+                "data": [
+                    [str(seq), name]
+                    for seq, name in enumerate(self.config.condition_names)
+                ],
+            }
+        elif trnm == "CNSRREQ":
+            seq = str(msg.get("seq") or "")
+            session.condition_seqs.add(seq)
+            sample = self._rng.sample(
+                sorted(self.market.symbols), min(5, len(self.market.symbols))
+            )
+            reply = {
+                "trnm": "CNSRREQ",
+                "seq": seq,
+                "return_code": 0,
+                "data": [{"jmcode": f"A{code}"} for code in sample],
+            }
+        else:
+            reply = {"trnm": trnm, "return_code": 0, "return_msg": _OK_MSG}
+        session.push(json.dumps(reply, ensure_ascii=False))
+
+    def _register(self, session: _WSSession, msg: dict) -> dict:
+        group = session.groups.setdefault(str(msg.get("grp_no") or "1"), {})
+        if str(msg.get("refresh") or "1") == "0":
+            group.clear()
+        rejected = 0
+        market_items = session.market_items()
+        for entry in msg.get("data") or []:
+            items = [str(item or "").strip() for item in entry.get("item") or []]
+            for realtime_type in entry.get("type") or []:
+                codes = group.setdefault(str(realtime_type), set())
+                for item in items:
+                    if (
+                        realtime_type in REALTIME_MARKET_TYPES
+                        and item not in market_items
+                    ):
+                        if len(market_items) >= self.config.max_registered_items:
+                            rejected += 1
+                            continue
+                        market_items.add(item)
+                    codes.add(item)
+        if rejected:
+            self._count("ws_reg_items_rejected", rejected)
+            return {
+                "trnm": "REG",
+                "return_code": 1,
+                "return_msg": f"registration budget exceeded ({rejected} items)",
+            }
+        return {"trnm": "REG", "return_code": 0, "return_msg": _OK_MSG}
+
+    def _remove(self, session: _WSSession, msg: dict) -> dict:
+        group = session.groups.get(str(msg.get("grp_no") or "1"), {})
+        for entry in msg.get("data") or []:
+            items = {str(item or "").strip() for item in entry.get("item") or []}
+            for realtime_type in entry.get("type") or []:
+                group.get(str(realtime_type), set()).difference_update(items)
+        return {"trnm": "REMOVE", "return_code": 0, "return_msg": _OK_MSG}
+
+    async def _market_loop(self) -> None:
+        interval = 1.0 / max(0.01, self.config.tick_hz)
+        condition_every = (
+            max(1, round(self.config.tick_hz / self.config.condition_push_hz))
+            if self.config.condition_push_hz
+            else 0
+        )
+        for cycle in itertools.count(1):
+            await asyncio.sleep(interval)
+            self._sweep_resting_orders()
+            for session in list(self._sessions):
+                items = []
+                for realtime_type in REALTIME_MARKET_TYPES:
+                    if realtime_type == "0D" and cycle % 2:
+                        continue
+                    if realtime_type == "0w" and cycle % 10:
+                        continue
+                    for item in sorted(session.registered(realtime_type)):
+                        if item and not self.config.capture_paths:
+                            items.append(
+                                {
+                                    "type": realtime_type,
+                                    "name": realtime_type,
+                                    "item": item,
+                                    "values": self.market.real_values(
+                                        item, realtime_type
+                                    ),
+                                }
+                            )
+                if condition_every and not cycle % condition_every:
+                    for seq in session.condition_seqs:
+                        code = self._rng.choice(sorted(self.market.symbols))
+                        items.append(
+                            {
+                                "type": "02",
+                                "name": "조건검색",
+                                "item": code,
+                                "values": {
+                                    "841": seq,
+                                    "9001": f"A{code}",
+                                    "843": "I",
+                                },
+                            }
+                        )
+                for start in range(0, len(items), 100):
+                    session.push(
+                        json.dumps(
+                            {"trnm": "REAL", "data": items[start : start + 100]},
+                            ensure_ascii=False,
+                        )
+                    )
+                if items:
+                    self._count("ws_real_items", len(items))
+
+    async def _recorded_loop(self) -> None:
+        """Replay REAL items from capture files to the sessions that REG them."""
+
+        first_perf = None
+        started = time.perf_counter()
+        for perf, frame in iter_capture_frames(self.config.capture_paths):
+            if '"REAL"' not in frame:
+                continue
+            if first_perf is None:
+                first_perf = perf
+            delay = started + (perf - first_perf) - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            payload = json.loads(frame)
+            for session in list(self._sessions):
+                items = [
+                    item
+                    for item in payload.get("data") or []
+                    if item.get("item") in session.registered(item.get("type"))
+                ]
+                if items:
+                    session.push(json.dumps({"trnm": "REAL", "data": items}))
+                    self._count("ws_real_items", len(items))
+
+
+def _make_rest_handler(server: KiwoomStandinServer):
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                body = {}
+            headers = {key.lower(): value for key, value in self.headers.items()}
+            status, extra_headers, payload = server.handle_rest(
+                self.path, headers, body if isinstance(body, dict) else {}
+            )
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in extra_headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+            return
+
+    return _Handler
+
+
+def _parse_rate_limits(values: list[str]) -> dict[str, float]:
+    limits = {}
+    for value in values or []:
+        api_id, _, rate = value.partition("=")
+        limits[api_id.strip()] = float(rate)
+    return limits
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--rest-port", type=int, default=18080)
+    parser.add_argument("--ws-port", type=int, default=18081)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--tick-hz", type=float, default=2.0)
+    parser.add_argument("--rest-latency-ms", type=float, default=0.0)
+    parser.add_argument("--rest-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--ws-latency-ms", type=float, default=0.0)
+    parser.add_argument("--inject-429", type=float, default=0.0)
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        default=[],
+        help="API_ID=PER_SEC (use * for every api-id); repeatable",
+    )
+    parser.add_argument("--max-registered-items", type=int, default=100)
+    parser.add_argument("--condition-push-hz", type=float, default=0.0)
+    parser.add_argument("--capture", action="append", default=[])
+    args = parser.parse_args(argv)
+    config = StandinConfig(
+        host=args.host,
+        rest_port=args.rest_port,
+        ws_port=args.ws_port,
+        symbol_count=args.symbols,
+        tick_hz=args.tick_hz,
+        rest_latency_ms=args.rest_latency_ms,
+        rest_jitter_ms=args.rest_jitter_ms,
+        ws_latency_ms=args.ws_latency_ms,
+        inject_429_rate=args.inject_429,
+        rate_limits=_parse_rate_limits(args.rate_limit),
+        max_registered_items=args.max_registered_items,
+        condition_push_hz=args.condition_push_hz,
+        capture_paths=tuple(args.capture),
+    )
+    server = KiwoomStandinServer(config).start()
+    print(f"KORSTOCKSCAN_KIWOOM_BASE_URL={server.base_url}")
+    print(f"KORSTOCKSCAN_KIWOOM_WS_URI={server.ws_uri}")
+    try:
+        while True:
+            time.sleep(10)
+            print(json.dumps(server.snapshot()["counters"], ensure_ascii=False))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,263 @@
+"""Priority lanes for the WS ``REALTIME_TICK_ARRIVED`` dispatcher.
+
+The tick dispatcher used to swap out every coalesced tick and publish them in
+arrival order, so a burst on watch-only symbols delayed the tick a real
+holding's exit logic was waiting for.  ``TickPriorityLanes`` keeps one FIFO
+lane per priority class and hands the dispatcher one code at a time, highest
+class first, so a holding tick that lands mid-burst is published next.
+
+Classes, highest first: real holdings, pending orders, entry-armed targets,
+and plain watch/observation symbols.  Membership comes from the sniper's
+``ACTIVE_TARGETS`` (``classify_target``); unknown codes fall into ``WATCH``.
+
+Starvation guard: once ``max_consecutive`` ticks in a row were served from a
+higher class while a lower lane was waiting, or a lower lane's head has waited
+longer than ``max_wait_ms``, the oldest waiting head is served instead.
+
+Per-class dispatch latency (enqueue to pick, measured from the first
+unserved arrival of a coalesced code) is kept as a bucket histogram.
+
+The lanes are not thread-safe on their own; the manager calls every method
+under its ``_tick_lock``.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Mapping
+
+TICK_PRIORITY_VERSION = "kiwoom_tick_priority_v1"
+TICK_PRIORITY_MAX_CONSECUTIVE_ENV = "KORSTOCKSCAN_WS_TICK_PRIORITY_MAX_CONSECUTIVE"
+TICK_PRIORITY_MAX_WAIT_MS_ENV = "KORSTOCKSCAN_WS_TICK_PRIORITY_MAX_WAIT_MS"
+DEFAULT_MAX_CONSECUTIVE = 32
+DEFAULT_MAX_WAIT_MS = 250.0
+
+HOLDING = 0
+PENDING_ORDER = 1
+ENTRY_ARMED = 2
+WATCH = 3
+PRIORITY_CLASS_NAMES = ("holding", "pending_order", "entry_armed", "watch")
+
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0)
+
+_PENDING_ORDER_STATUSES = frozenset(
+    {
+        "BUY_ORDERED",
+        "SELL_ORDERED",
+        "BUY_CANCEL_RECONCILING",
+        "SELL_CANCEL_RECONCILING",
+    }
+)
+_ENTRY_ARMED_FIELDS = (
+    "entry_armed_at_epoch",
+    "entry_opportunity_recheck_armed",
+    "entry_armed_target_buy_price",
+)
+_SIMULATION_FLAGS = (
+    "swing_live_order_dry_run",
+    "scalp_live_simulator",
+    "simulation_owner",
+    "simulation_book",
+    "simulated_order",
+    "swing_intraday_probe",
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(str(os.getenv(name, "") or "").strip())
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(str(os.getenv(name, "") or "").strip())
+    except (TypeError, ValueError):
+        return default
+
+
+def _is_simulated_target(stock: Mapping[str, Any]) -> bool:
+    return (
+        any(bool(stock.get(flag)) for flag in _SIMULATION_FLAGS)
+        or stock.get("actual_order_submitted") is False
+    )
+
+
+def classify_target(stock: Mapping[str, Any] | None) -> int:
+    """Priority class of one ``ACTIVE_TARGETS`` row."""
+
+    stock = stock or {}
+    status = str(stock.get("status") or "").strip().upper()
+    simulated = _is_simulated_target(stock)
+    if status == "HOLDING" and not simulated:
+        return HOLDING
+    if status in _PENDING_ORDER_STATUSES and not simulated:
+        return PENDING_ORDER
+    if status == "WATCHING" and any(stock.get(field) for field in _ENTRY_ARMED_FIELDS):
+        return ENTRY_ARMED
+    return WATCH
+
+
+def build_tick_priority_map(targets) -> dict[str, int]:
+    """``{code: class}`` for the non-``WATCH`` codes; a code keeps its best class."""
+
+    priorities: dict[str, int] = {}
+    for stock in targets or []:
+        if not isinstance(stock, Mapping):
+            continue
+        code = str(stock.get("code") or "").strip()[:6]
+        if not code:
+            continue
+        priority = classify_target(stock)
+        if priority < priorities.get(code, WATCH):
+            priorities[code] = priority
+    return priorities
+
+
+class TickPriorityLanes:
+    """Per-class FIFO lanes of coalesced tick codes with a starvation guard."""
+
+    def __init__(
+        self,
+        *,
+        max_consecutive: int | None = None,
+        max_wait_ms: float | None = None,
+    ):
+        if max_consecutive is None:
+            max_consecutive = _env_int(
+                TICK_PRIORITY_MAX_CONSECUTIVE_ENV, DEFAULT_MAX_CONSECUTIVE
+            )
+        if max_wait_ms is None:
+            max_wait_ms = _env_float(TICK_PRIORITY_MAX_WAIT_MS_ENV, DEFAULT_MAX_WAIT_MS)
+        self.max_consecutive = max(1, int(max_consecutive))
+        self.max_wait_ns = int(max(0.0, float(max_wait_ms)) * 1e6)
+        self._lanes = tuple(OrderedDict() for _ in PRIORITY_CLASS_NAMES)
+        self._lane_of: dict[Any, int] = {}
+        self._priorities: dict[str, int] = {}
+        self._consecutive_high = 0
+        self._dispatched = [0] * len(PRIORITY_CLASS_NAMES)
+        self._starvation_picks = [0] * len(PRIORITY_CLASS_NAMES)
+        self._latency_ns_total = [0] * len(PRIORITY_CLASS_NAMES)
+        self._latency_ns_max = [0] * len(PRIORITY_CLASS_NAMES)
+        self._histograms = [
+            [0] * (len(LATENCY_BUCKETS_MS) + 1) for _ in PRIORITY_CLASS_NAMES
+        ]
+
+    def __len__(self) -> int:
+        return len(self._lane_of)
+
+    def priority_for(self, code: Any) -> int:
+        return self._priorities.get(str(code or "").strip()[:6], WATCH)
+
+    def set_priorities(self, priorities: Mapping[str, int]) -> bool:
+        """Replace class membership; queued codes move lanes keeping their age."""
+
+        normalized = {
+            str(code or "").strip()[:6]: max(HOLDING, min(WATCH, int(priority)))
+            for code, priority in (priorities or {}).items()
+            if str(code or "").strip() and int(priority) != WATCH
+        }
+        if normalized == self._priorities:
+            return False
+        self._priorities = normalized
+        for key, lane_index in list(self._lane_of.items()):
+            new_index = self.priority_for(key)
+            if new_index == lane_index:
+                continue
+            enqueued_ns = self._lanes[lane_index].pop(key)
+            self._insert_by_age(self._lanes[new_index], key, enqueued_ns)
+            self._lane_of[key] = new_index
+        return True
+
+    @staticmethod
+    def _insert_by_age(lane: OrderedDict, key: Any, enqueued_ns: int) -> None:
+        lane[key] = enqueued_ns
+        # Reclassification is rare; keep the lane in age order so its head is
+        # always the oldest waiting code.
+        for other in [k for k, ns in lane.items() if k != key and ns > enqueued_ns]:
+            lane.move_to_end(other)
+
+    def push(self, key: Any, *, now_ns: int | None = None) -> None:
+        """Queue ``key``; a code already queued keeps its original age."""
+
+        if key in self._lane_of:
+            return
+        lane_index = self.priority_for(key)
+        self._lanes[lane_index][key] = (
+            time.perf_counter_ns() if now_ns is None else now_ns
+        )
+        self._lane_of[key] = lane_index
+
+    def pop(self, *, now_ns: int | None = None) -> tuple[Any, int] | None:
+        """Next ``(key, class)`` to publish, or ``None`` when all lanes are empty."""
+
+        if not self._lane_of:
+            return None
+        now_ns = time.perf_counter_ns() if now_ns is None else now_ns
+        top = next(index for index, lane in enumerate(self._lanes) if lane)
+        chosen = top
+        starved = None
+        oldest_ns = None
+        for index in range(top + 1, len(self._lanes)):
+            lane = self._lanes[index]
+            if not lane:
+                continue
+            head_ns = next(iter(lane.values()))
+            if oldest_ns is None or head_ns < oldest_ns:
+                starved, oldest_ns = index, head_ns
+        if starved is not None and (
+            self._consecutive_high >= self.max_consecutive
+            or now_ns - oldest_ns >= self.max_wait_ns
+        ):
+            chosen = starved
+            self._starvation_picks[chosen] += 1
+        if chosen == top and starved is not None:
+            self._consecutive_high += 1
+        else:
+            self._consecutive_high = 0
+        key, enqueued_ns = self._lanes[chosen].popitem(last=False)
+        del self._lane_of[key]
+        self._record_latency(chosen, max(0, now_ns - enqueued_ns))
+        return key, chosen
+
+    def _record_latency(self, index: int, latency_ns: int) -> None:
+        self._dispatched[index] += 1
+        self._latency_ns_total[index] += latency_ns
+        if latency_ns > self._latency_ns_max[index]:
+            self._latency_ns_max[index] = latency_ns
+        latency_ms = latency_ns / 1e6
+        bucket = len(LATENCY_BUCKETS_MS)
+        for position, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                bucket = position
+                break
+        self._histograms[index][bucket] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{bound:g}ms" for bound in LATENCY_BUCKETS_MS] + ["gt_max"]
+        classes = {}
+        for index, name in enumerate(PRIORITY_CLASS_NAMES):
+            dispatched = self._dispatched[index]
+            classes[name] = {
+                "queued": len(self._lanes[index]),
+                "members": sum(1 for p in self._priorities.values() if p == index),
+                "dispatched": dispatched,
+                "starvation_picks": self._starvation_picks[index],
+                "latency_ms_avg": (
+                    round(self._latency_ns_total[index] / dispatched / 1e6, 3)
+                    if dispatched
+                    else 0.0
+                ),
+                "latency_ms_max": round(self._latency_ns_max[index] / 1e6, 3),
+                "latency_histogram": dict(zip(labels, self._histograms[index])),
+            }
+        return {
+            "version": TICK_PRIORITY_VERSION,
+            "max_consecutive": self.max_consecutive,
+            "max_wait_ms": round(self.max_wait_ns / 1e6, 3),
+            "queued": len(self._lane_of),
+            "classes": classes,
+        }
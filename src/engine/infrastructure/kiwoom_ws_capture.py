@@ -0,0 +1,264 @@
+"""Raw Kiwoom WS frame capture log.
+
+A heavy open cannot be reproduced offline from the parsed ``realtime_data``
+state, so ``WSFrameCaptureWriter`` appends every raw inbound frame, unchanged,
+with its ``time.perf_counter()`` receive timestamp.  ``kiwoom_ws_replay``
+feeds a capture back into a ``KiwoomWSManager``.
+
+File layout (one file per WS session, rotated by size)::
+
+    header  b"KWSCAP1\\0" | <dd wall_epoch, perf_at_open | <H len | session_id
+    block*  <II compressed_len, raw_len | zlib(record*)
+    record  <dI received_perf, frame_len | frame utf-8 bytes
+
+Frames are buffered into blocks on the receive path; a background thread
+compresses and writes full blocks (and any partial block once per
+``flush_interval_sec``), so ``append`` never touches the disk.  A crash loses
+at most the unflushed block, and a truncated trailing block is skipped by the
+reader.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from queue import Empty, Queue
+from typing import Iterable, Iterator
+
+from src.utils.constants import DATA_DIR
+from src.utils.logger import log_error
+
+WS_CAPTURE_VERSION = "kiwoom_ws_capture_v1"
+WS_CAPTURE_ENABLED_ENV = "KORSTOCKSCAN_WS_FRAME_CAPTURE_ENABLED"
+WS_CAPTURE_DIR_ENV = "KORSTOCKSCAN_WS_FRAME_CAPTURE_DIR"
+WS_CAPTURE_ROTATE_MB_ENV = "KORSTOCKSCAN_WS_FRAME_CAPTURE_ROTATE_MB"
+WS_CAPTURE_DIR = DATA_DIR / "runtime" / "kiwoom_ws_capture"
+WS_CAPTURE_SUFFIX = ".kwscap"
+
+_MAGIC = b"KWSCAP1\0"
+_HEADER = struct.Struct("<dd")
+_SESSION_LEN = struct.Struct("<H")
+_BLOCK = struct.Struct("<II")
+_RECORD = struct.Struct("<dI")
+DEFAULT_BLOCK_BYTES = 256 * 1024
+DEFAULT_ROTATE_BYTES = 256 * 1024 * 1024
+_STOP = object()
+
+
+def ws_frame_capture_enabled() -> bool:
+    raw = str(os.getenv(WS_CAPTURE_ENABLED_ENV, "") or "").strip().lower()
+    return raw in {"1", "true", "t", "yes", "y", "on"}
+
+
+def ws_frame_capture_dir() -> Path:
+    raw = str(os.getenv(WS_CAPTURE_DIR_ENV, "") or "").strip()
+    return Path(raw) if raw else WS_CAPTURE_DIR
+
+
+def ws_frame_capture_rotate_bytes() -> int:
+    try:
+        mb = float(str(os.getenv(WS_CAPTURE_ROTATE_MB_ENV, "") or "").strip())
+    except (TypeError, ValueError):
+        return DEFAULT_ROTATE_BYTES
+    return max(1024 * 1024, int(mb * 1024 * 1024))
+
+
+class WSFrameCaptureWriter:
+    """Append-only, block-compressed capture of one WS session."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        session_id: str | None = None,
+        block_bytes: int = DEFAULT_BLOCK_BYTES,
+        rotate_bytes: int | None = None,
+        compress_level: int = 1,
+        flush_interval_sec: float = 1.0,
+    ):
+        self.directory = Path(directory) if directory else ws_frame_capture_dir()
+        self.session_id = session_id or time.strftime("%Y%m%d_%H%M%S")
+        self.block_bytes = max(1024, int(block_bytes))
+        self.rotate_bytes = (
+            ws_frame_capture_rotate_bytes() if rotate_bytes is None else rotate_bytes
+        )
+        self.compress_level = int(compress_level)
+        self.flush_interval_sec = max(0.05, float(flush_interval_sec))
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._queue: Queue = Queue()
+        self._thread: threading.Thread | None = None
+        self._file = None
+        self._file_bytes = 0
+        self._part = 0
+        self.paths: list[Path] = []
+        self.frames = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+        self.write_errors = 0
+
+    def start(self) -> "WSFrameCaptureWriter":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._writer_loop, name="ws-frame-capture", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def append(self, frame: str | bytes, received_perf: float | None = None) -> None:
+        data = frame.encode("utf-8") if isinstance(frame, str) else bytes(frame)
+        perf = time.perf_counter() if received_perf is None else received_perf
+        with self._lock:
+            self._buffer += _RECORD.pack(perf, len(data))
+            self._buffer += data
+            self.frames += 1
+            self.raw_bytes += len(data)
+            if len(self._buffer) < self.block_bytes:
+                return
+            block = bytes(self._buffer)
+            self._buffer.clear()
+        self._queue.put(block)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._buffer:
+                return
+            block = bytes(self._buffer)
+            self._buffer.clear()
+        self._queue.put(block)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self.flush()
+        self._queue.put(_STOP)
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=timeout)
+        self._thread = None
+
+    def _open_next_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._part += 1
+        path = self.directory / (
+            f"ws_capture_{self.session_id}_{self._part:04d}{WS_CAPTURE_SUFFIX}"
+        )
+        session = self.session_id.encode("utf-8")
+        handle = open(path, "wb")
+        header = (
+            _MAGIC
+            + _HEADER.pack(time.time(), time.perf_counter())
+            + _SESSION_LEN.pack(len(session))
+            + session
+        )
+        handle.write(header)
+        self._file = handle
+        self._file_bytes = len(header)
+        self.paths.append(path)
+
+    def _write_block(self, block: bytes) -> None:
+        if self._file is None or self._file_bytes >= self.rotate_bytes:
+            self._open_next_file()
+        compressed = zlib.compress(block, self.compress_level)
+        self._file.write(_BLOCK.pack(len(compressed), len(block)))
+        self._file.write(compressed)
+        self._file.flush()
+        written = _BLOCK.size + len(compressed)
+        self._file_bytes += written
+        self.written_bytes += written
+
+    def _writer_loop(self) -> None:
+        try:
+            while True:
+                try:
+                    block = self._queue.get(timeout=self.flush_interval_sec)
+                except Empty:
+                    self.flush()
+                    continue
+                if block is _STOP:
+                    break
+                try:
+                    self._write_block(block)
+                except OSError as exc:
+                    self.write_errors += 1
+                    log_error(f"[WS_CAPTURE] block write failed: {exc}")
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def snapshot(self) -> dict:
+        return {
+            "version": WS_CAPTURE_VERSION,
+            "session_id": self.session_id,
+            "frames": self.frames,
+            "raw_bytes": self.raw_bytes,
+            "written_bytes": self.written_bytes,
+            "compression_ratio": (
+                round(self.written_bytes / self.raw_bytes, 4) if self.raw_bytes else 0.0
+            ),
+            "pending_blocks": self._queue.qsize(),
+            "write_errors": self.write_errors,
+            "paths": [str(path) for path in self.paths],
+        }
+
+
+def read_capture_header(path: str | Path) -> dict:
+    with open(path, "rb") as handle:
+        return _read_header(handle, path)
+
+
+def _read_header(handle, path) -> dict:
+    magic = handle.read(len(_MAGIC))
+    if magic != _MAGIC:
+        raise ValueError(f"not a WS capture file: {path}")
+    wall_epoch, perf_at_open = _HEADER.unpack(handle.read(_HEADER.size))
+    (session_len,) = _SESSION_LEN.unpack(handle.read(_SESSION_LEN.size))
+    session_id = handle.read(session_len).decode("utf-8")
+    return {
+        "wall_epoch": wall_epoch,
+        "perf_at_open": perf_at_open,
+        "session_id": session_id,
+    }
+
+
+def iter_capture_frames(
+    paths: str | Path | Iterable[str | Path],
+) -> Iterator[tuple[float, str]]:
+    """Yield ``(received_perf, frame)`` from one or more capture files in order."""
+
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    for path in paths:
+        with open(path, "rb") as handle:
+            _read_header(handle, path)
+            while True:
+                head = handle.read(_BLOCK.size)
+                if len(head) < _BLOCK.size:
+                    break
+                compressed_len, raw_len = _BLOCK.unpack(head)
+                compressed = handle.read(compressed_len)
+                if len(compressed) < compressed_len:
+                    break
+                block = zlib.decompress(compressed)
+                if len(block) != raw_len:
+                    raise ValueError(f"corrupt WS capture block in {path}")
+                offset = 0
+                while offset < raw_len:
+                    perf, frame_len = _RECORD.unpack_from(block, offset)
+                    offset += _RECORD.size
+                    yield perf, block[offset : offset + frame_len].decode("utf-8")
+                    offset += frame_len
+
+
+def list_capture_files(
+    directory: str | Path | None = None, session_id: str | None = None
+) -> list[Path]:
+    """Capture files in ``directory`` (optionally one session), in write order."""
+
+    directory = Path(directory) if directory else ws_frame_capture_dir()
+    pattern = f"ws_capture_{session_id}_*" if session_id else "ws_capture_*"
+    return sorted(directory.glob(pattern + WS_CAPTURE_SUFFIX))
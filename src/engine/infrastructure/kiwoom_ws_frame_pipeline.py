@@ -0,0 +1,337 @@
+"""Receive/parse split for the Kiwoom realtime websocket.
+
+``KiwoomWSManager._run_ws`` used to decode and apply every frame inline, so a
+slow frame delayed the next ``recv()`` and bursts piled up in the socket
+buffer.  ``KiwoomWSFramePipeline`` keeps the receive stage to a timestamp and a
+bounded ``put``; a router thread decodes each frame once and fans REAL ``data``
+items out to symbol-sharded apply workers, so per-symbol order is preserved
+while different symbols are applied independently.  Non-REAL frames (PING,
+condition lists, REG acks) are handed back to the event loop unchanged.
+
+Receive-to-apply lag is measured from the receive timestamp to the end of the
+apply call, and a rate-limited backlog alarm fires when the queued depth or the
+observed lag crosses its threshold.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from queue import Full, Queue
+from typing import Any, Callable
+
+from src.utils.logger import log_error
+
+WS_FRAME_PIPELINE_VERSION = "kiwoom_ws_frame_pipeline_v1"
+WS_FRAME_PIPELINE_ENABLED_ENV = "KORSTOCKSCAN_WS_FRAME_PIPELINE_ENABLED"
+WS_FRAME_PIPELINE_SHARDS_ENV = "KORSTOCKSCAN_WS_FRAME_PIPELINE_SHARDS"
+WS_FRAME_QUEUE_MAXSIZE_ENV = "KORSTOCKSCAN_WS_FRAME_QUEUE_MAXSIZE"
+WS_FRAME_BACKLOG_ALARM_DEPTH_ENV = "KORSTOCKSCAN_WS_FRAME_BACKLOG_ALARM_DEPTH"
+WS_FRAME_BACKLOG_ALARM_LAG_MS_ENV = "KORSTOCKSCAN_WS_FRAME_BACKLOG_ALARM_LAG_MS"
+_LAG_SAMPLE_LIMIT = 2048
+_ALARM_MIN_INTERVAL_SEC = 10.0
+_STOP = object()
+
+
+def _env_int(name: str, default: int, *, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(str(os.getenv(name, "") or default).strip()))
+    except (TypeError, ValueError):
+        return default
+
+
+def ws_frame_pipeline_enabled() -> bool:
+    raw = str(os.getenv(WS_FRAME_PIPELINE_ENABLED_ENV, "") or "").strip().lower()
+    return raw in {"1", "true", "t", "yes", "y", "on"}
+
+
+@dataclass(frozen=True, slots=True)
+class WSFramePipelineConfig:
+    shard_count: int = 2
+    queue_maxsize: int = 4096
+    backlog_alarm_depth: int = 512
+    backlog_alarm_lag_ms: int = 250
+
+    @classmethod
+    def from_env(cls) -> "WSFramePipelineConfig":
+        return cls(
+            shard_count=_env_int(WS_FRAME_PIPELINE_SHARDS_ENV, 2),
+            queue_maxsize=_env_int(WS_FRAME_QUEUE_MAXSIZE_ENV, 4096),
+            backlog_alarm_depth=_env_int(WS_FRAME_BACKLOG_ALARM_DEPTH_ENV, 512),
+            backlog_alarm_lag_ms=_env_int(WS_FRAME_BACKLOG_ALARM_LAG_MS_ENV, 250),
+        )
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+class KiwoomWSFramePipeline:
+    """Bounded receive queue, one decode router and symbol-sharded appliers.
+
+    ``apply_items(items)`` receives the REAL ``data`` items routed to one
+    shard, in frame order.  ``handle_control(frame)`` receives every other
+    frame as the raw text.  ``shard_key(item)`` returns the symbol used for
+    sharding; items without a symbol (order notices, condition pushes, market
+    session) all go to shard 0 so their relative order is kept too.
+    """
+
+    def __init__(
+        self,
+        *,
+        apply_items: Callable[[list[dict[str, Any]]], None],
+        handle_control: Callable[[str], None],
+        shard_key: Callable[[dict[str, Any]], str],
+        config: WSFramePipelineConfig | None = None,
+        after_shard_batch: Callable[[int], None] | None = None,
+        alarm_callback: Callable[[str], None] | None = None,
+    ):
+        self.config = config or WSFramePipelineConfig()
+        self.shard_count = max(1, int(self.config.shard_count))
+        maxsize = max(1, int(self.config.queue_maxsize))
+        self._apply_items = apply_items
+        self._handle_control = handle_control
+        self._shard_key = shard_key
+        self._after_shard_batch = after_shard_batch
+        self._alarm_callback = alarm_callback or log_error
+        self._frames: Queue = Queue(maxsize=maxsize)
+        self._shards: list[Queue] = [
+            Queue(maxsize=maxsize) for _ in range(self.shard_count)
+        ]
+        self._threads: list[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._lag_samples: deque[float] = deque(maxlen=_LAG_SAMPLE_LIMIT)
+        self._last_alarm_perf = 0.0
+        self._stats = {
+            "received": 0,
+            "receive_backpressure": 0,
+            "routed_real_frames": 0,
+            "control_frames": 0,
+            "decode_errors": 0,
+            "dispatched_batches": 0,
+            "applied_batches": 0,
+            "applied_items": 0,
+            "apply_errors": 0,
+            "backlog_alarms": 0,
+            "max_backlog": 0,
+            "max_lag_ms": 0.0,
+        }
+        self._applied_by_shard = [0] * self.shard_count
+
+    # ------------------------------------------------------------------
+    # receive stage
+    # ------------------------------------------------------------------
+    def submit_nowait(self, frame: str, received_perf: float | None = None) -> bool:
+        """Queue one raw frame; ``False`` means the caller must ``put`` it."""
+
+        item = (frame, time.perf_counter() if received_perf is None else received_perf)
+        with self._stats_lock:
+            self._stats["received"] += 1
+        try:
+            self._frames.put_nowait(item)
+        except Full:
+            with self._stats_lock:
+                self._stats["received"] -= 1
+                self._stats["receive_backpressure"] += 1
+            return False
+        return True
+
+    def put(self, frame: str, received_perf: float) -> None:
+        """Blocking put used off the event loop when the queue is full."""
+
+        with self._stats_lock:
+            self._stats["received"] += 1
+        self._frames.put((frame, received_perf))
+
+    # ------------------------------------------------------------------
+    # router and apply stage
+    # ------------------------------------------------------------------
+    def shard_for(self, item: dict[str, Any]) -> int:
+        if self.shard_count == 1:
+            return 0
+        try:
+            key = str(self._shard_key(item) or "")
+        except Exception:
+            key = ""
+        if not key:
+            return 0
+        return hash(key) % self.shard_count
+
+    def _route(self, frame: str, received_perf: float) -> None:
+        try:
+            decoded = json.loads(frame)
+        except (TypeError, ValueError):
+            decoded = None
+            with self._stats_lock:
+                self._stats["decode_errors"] += 1
+        data = decoded.get("data") if isinstance(decoded, dict) else None
+        if (
+            not isinstance(decoded, dict)
+            or decoded.get("trnm") != "REAL"
+            or not isinstance(data, list)
+        ):
+            with self._stats_lock:
+                self._stats["control_frames"] += 1
+            self._handle_control(frame)
+            return
+        batches: dict[int, list[dict[str, Any]]] = {}
+        for item in data:
+            if isinstance(item, dict):
+                batches.setdefault(self.shard_for(item), []).append(item)
+        with self._stats_lock:
+            self._stats["dispatched_batches"] += len(batches)
+        for shard_index, items in batches.items():
+            self._shards[shard_index].put((items, received_perf))
+        with self._stats_lock:
+            self._stats["routed_real_frames"] += 1
+        self._check_backlog(received_perf)
+
+    def _router_loop(self) -> None:
+        while True:
+            entry = self._frames.get()
+            if entry is _STOP:
+                break
+            try:
+                self._route(*entry)
+            except Exception as exc:
+                log_error(f"[WS_FRAME_PIPELINE] router failure: {exc}")
+        for shard in self._shards:
+            shard.put(_STOP)
+
+    def _shard_loop(self, shard_index: int) -> None:
+        shard = self._shards[shard_index]
+        while True:
+            entry = shard.get()
+            if entry is _STOP:
+                break
+            items, received_perf = entry
+            try:
+                self._apply_items(items)
+                if self._after_shard_batch is not None:
+                    self._after_shard_batch(shard_index)
+            except Exception as exc:
+                with self._stats_lock:
+                    self._stats["apply_errors"] += 1
+                log_error(f"[WS_FRAME_PIPELINE] shard {shard_index} apply: {exc}")
+            lag_ms = (time.perf_counter() - received_perf) * 1000.0
+            with self._stats_lock:
+                self._stats["applied_batches"] += 1
+                self._stats["applied_items"] += len(items)
+                self._applied_by_shard[shard_index] += len(items)
+                self._lag_samples.append(lag_ms)
+                if lag_ms > self._stats["max_lag_ms"]:
+                    self._stats["max_lag_ms"] = round(lag_ms, 3)
+
+    def backlog(self) -> int:
+        return self._frames.qsize() + sum(shard.qsize() for shard in self._shards)
+
+    def _check_backlog(self, received_perf: float) -> None:
+        depth = self.backlog()
+        now_perf = time.perf_counter()
+        routed_lag_ms = (now_perf - received_perf) * 1000.0
+        with self._stats_lock:
+            if depth > self._stats["max_backlog"]:
+                self._stats["max_backlog"] = depth
+            breached = (
+                depth >= self.config.backlog_alarm_depth
+                or routed_lag_ms >= self.config.backlog_alarm_lag_ms
+            )
+            if not breached or (
+                self._last_alarm_perf
+                and now_perf - self._last_alarm_perf < _ALARM_MIN_INTERVAL_SEC
+            ):
+                return
+            self._last_alarm_perf = now_perf
+            self._stats["backlog_alarms"] += 1
+        self._alarm_callback(
+            "[WS_FRAME_BACKLOG_ALARM] "
+            f"backlog={depth} threshold={self.config.backlog_alarm_depth} "
+            f"route_lag_ms={routed_lag_ms:.1f} "
+            f"lag_threshold_ms={self.config.backlog_alarm_lag_ms}"
+        )
+
+    # ------------------------------------------------------------------
+    # lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._threads.append(
+            threading.Thread(
+                target=self._router_loop, name="kiwoom-ws-frame-router", daemon=True
+            )
+        )
+        for shard_index in range(self.shard_count):
+            self._threads.append(
+                threading.Thread(
+                    target=self._shard_loop,
+                    args=(shard_index,),
+                    name=f"kiwoom-ws-apply-{shard_index}",
+                    daemon=True,
+                )
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Drain queued frames, then stop the router and shard workers."""
+
+        if not self._threads:
+            return
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        try:
+            self._frames.put(_STOP, timeout=max(0.01, timeout))
+        except Full:
+            log_error("[WS_FRAME_PIPELINE] stop marker dropped: frame queue full")
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def drain(self, timeout: float = 2.0) -> bool:
+        """Wait until every queued frame has been applied (tests, shutdown)."""
+
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        while time.monotonic() < deadline:
+            if self.backlog() == 0 and not self._inflight():
+                return True
+            time.sleep(0.001)
+        return False
+
+    def _inflight(self) -> bool:
+        with self._stats_lock:
+            stats = self._stats
+            routed = stats["routed_real_frames"] + stats["control_frames"]
+            return (
+                routed < stats["received"]
+                or stats["applied_batches"] < stats["dispatched_batches"]
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+            lags = sorted(self._lag_samples)
+            applied_by_shard = list(self._applied_by_shard)
+        return {
+            "version": WS_FRAME_PIPELINE_VERSION,
+            "shard_count": self.shard_count,
+            "queue_maxsize": self._frames.maxsize,
+            "backlog": self.backlog(),
+            "frame_queue_depth": self._frames.qsize(),
+            "shard_queue_depths": [shard.qsize() for shard in self._shards],
+            "applied_items_by_shard": applied_by_shard,
+            "receive_to_apply_lag_ms": {
+                "count": len(lags),
+                "p50": _percentile(lags, 0.50),
+                "p95": _percentile(lags, 0.95),
+                "p99": _percentile(lags, 0.99),
+                "max": stats.pop("max_lag_ms"),
+            },
+            **stats,
+        }
@@ -0,0 +1,228 @@
+"""Shard planner for the multi-connection Kiwoom WS pool.
+
+A single Kiwoom WS connection only accepts a limited number of REG items, so
+``KiwoomWSManager`` can run ``KORSTOCKSCAN_WS_POOL_SIZE`` authenticated
+connections and spread symbol registrations across them.  Slot 0 is the
+manager's primary connection (order notices, market session, condition
+search); slots 1..N-1 only carry symbol REGs.  Frames from every connection go
+through the same ingest path into one ``realtime_data``.
+
+``WSPoolShardPlanner`` owns the code -> slot assignment and the per-slot REG
+item budget:
+
+* a code keeps its slot while that slot is healthy;
+* a new code goes to the healthy slot with room that holds the fewest codes of
+  its priority class, so holdings are spread over sockets and one drop does
+  not blind every position; ties go to a stable symbol hash;
+* ``mark_down`` releases a slot's codes so the caller can re-REG them on the
+  remaining connections.
+
+The planner is not thread-safe; the manager calls it under ``self.lock``.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import zlib
+from dataclasses import dataclass, field
+
+from src.engine.infrastructure.kiwoom_tick_priority import (
+    PRIORITY_CLASS_NAMES,
+    WATCH,
+)
+
+WS_POOL_VERSION = "kiwoom_ws_pool_v1"
+WS_POOL_SIZE_ENV = "KORSTOCKSCAN_WS_POOL_SIZE"
+MAX_WS_POOL_SIZE = 8
+PRIMARY_SLOT = 0
+
+
+def ws_pool_size() -> int:
+    """Configured connection count; 1 (the default) keeps single-socket mode."""
+
+    try:
+        value = int(str(os.getenv(WS_POOL_SIZE_ENV, "") or "").strip())
+    except (TypeError, ValueError):
+        return 1
+    return max(1, min(value, MAX_WS_POOL_SIZE))
+
+
+def _symbol_hash(code: str, slot: int) -> int:
+    # Rendezvous weight: stable across processes, unlike ``hash()``.
+    return zlib.crc32(f"{code}:{slot}".encode("utf-8"))
+
+
+@dataclass(slots=True)
+class _PoolSlot:
+    index: int
+    healthy: bool = False
+    items_by_code: dict[str, int] = field(default_factory=dict)
+    class_by_code: dict[str, int] = field(default_factory=dict)
+    connects: int = 0
+    disconnects: int = 0
+    rebalanced_codes: int = 0
+    frames: int = 0
+    last_up_ts: float = 0.0
+    last_down_ts: float = 0.0
+
+    @property
+    def item_count(self) -> int:
+        return sum(self.items_by_code.values())
+
+    def class_count(self, priority: int) -> int:
+        return sum(1 for value in self.class_by_code.values() if value == priority)
+
+
+class WSPoolShardPlanner:
+    """Assign symbol registrations to pool connections within each budget."""
+
+    def __init__(self, size: int):
+        self.size = max(1, int(size))
+        self._slots = [_PoolSlot(index) for index in range(self.size)]
+        self._slot_by_code: dict[str, int] = {}
+        self.budget_skips = 0
+        self.over_budget_assignments = 0
+
+    def slot_for(self, code: str) -> int | None:
+        return self._slot_by_code.get(code)
+
+    def is_healthy(self, slot: int) -> bool:
+        return 0 <= slot < self.size and self._slots[slot].healthy
+
+    def healthy_slots(self) -> list[int]:
+        return [slot.index for slot in self._slots if slot.healthy]
+
+    def item_count(self, slot: int) -> int:
+        return self._slots[slot].item_count
+
+    def codes_for(self, slot: int) -> list[str]:
+        return list(self._slots[slot].items_by_code)
+
+    def assign(
+        self,
+        code: str,
+        item_count: int,
+        priority: int = WATCH,
+        *,
+        max_items: int = 0,
+        enforce: bool = True,
+    ) -> int | None:
+        """Place ``code`` and charge ``item_count`` items to its slot.
+
+        Returns the slot, or ``None`` when ``enforce`` is set and no healthy
+        slot has room.  ``max_items <= 0`` disables the per-slot budget.
+        Unenforced registrations that fit nowhere go to the least-loaded slot.
+        """
+
+        item_count = max(0, int(item_count))
+        current = self._slot_by_code.get(code)
+        if current is not None and self._slots[current].healthy:
+            slot = self._slots[current]
+            used = slot.item_count - slot.items_by_code.get(code, 0)
+            if enforce and 0 < max_items < used + item_count:
+                self.budget_skips += 1
+                return None
+            slot.items_by_code[code] = item_count
+            slot.class_by_code[code] = priority
+            return current
+        if current is not None:
+            self.release(code)
+
+        candidates = [slot for slot in self._slots if slot.healthy]
+        if not candidates:
+            # Nothing is connected yet: park on the primary, whose login
+            # bootstrap re-REGs every subscribed code.
+            candidates = [self._slots[PRIMARY_SLOT]]
+        fitting = [
+            slot
+            for slot in candidates
+            if max_items <= 0 or slot.item_count + item_count <= max_items
+        ]
+        if fitting:
+            chosen = min(
+                fitting,
+                key=lambda slot: (
+                    slot.class_count(priority),
+                    slot.item_count,
+                    -_symbol_hash(code, slot.index),
+                ),
+            )
+        elif enforce:
+            self.budget_skips += 1
+            return None
+        else:
+            self.over_budget_assignments += 1
+            chosen = min(candidates, key=lambda slot: slot.item_count)
+        chosen.items_by_code[code] = item_count
+        chosen.class_by_code[code] = priority
+        self._slot_by_code[code] = chosen.index
+        return chosen.index
+
+    def release(self, code: str) -> int | None:
+        slot_index = self._slot_by_code.pop(code, None)
+        if slot_index is not None:
+            slot = self._slots[slot_index]
+            slot.items_by_code.pop(code, None)
+            slot.class_by_code.pop(code, None)
+        return slot_index
+
+    def mark_up(self, slot_index: int, now_ts: float | None = None) -> None:
+        slot = self._slots[slot_index]
+        if not slot.healthy:
+            slot.healthy = True
+            slot.connects += 1
+            slot.last_up_ts = time.time() if now_ts is None else now_ts
+
+    def mark_down(self, slot_index: int, now_ts: float | None = None) -> list[str]:
+        """Mark a slot unhealthy and release its codes for rebalancing."""
+
+        slot = self._slots[slot_index]
+        if slot.healthy:
+            slot.healthy = False
+            slot.disconnects += 1
+            slot.last_down_ts = time.time() if now_ts is None else now_ts
+        orphans = list(slot.items_by_code)
+        for code in orphans:
+            self._slot_by_code.pop(code, None)
+        slot.items_by_code.clear()
+        slot.class_by_code.clear()
+        slot.rebalanced_codes += len(orphans)
+        return orphans
+
+    def record_frame(self, slot_index: int) -> None:
+        self._slots[slot_index].frames += 1
+
+    def snapshot(self, max_items: int = 0) -> dict:
+        return {
+            "version": WS_POOL_VERSION,
+            "size": self.size,
+            "max_items_per_connection": max_items,
+            "healthy": len(self.healthy_slots()),
+            "assigned_codes": len(self._slot_by_code),
+            "budget_skips": self.budget_skips,
+            "over_budget_assignments": self.over_budget_assignments,
+            "connections": [
+                {
+                    "slot": slot.index,
+                    "role": "primary" if slot.index == PRIMARY_SLOT else "symbols",
+                    "healthy": slot.healthy,
+                    "codes": len(slot.items_by_code),
+                    "items": slot.item_count,
+                    "items_free": (
+                        max(0, max_items - slot.item_count) if max_items > 0 else None
+                    ),
+                    "by_class": {
+                        name: slot.class_count(index)
+                        for index, name in enumerate(PRIORITY_CLASS_NAMES)
+                    },
+                    "connects": slot.connects,
+                    "disconnects": slot.disconnects,
+                    "rebalanced_codes": slot.rebalanced_codes,
+                    "frames": slot.frames,
+                    "last_up_ts": slot.last_up_ts,
+                    "last_down_ts": slot.last_down_ts,
+                }
+                for slot in self._slots
+            ],
+        }
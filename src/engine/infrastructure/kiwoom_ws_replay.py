@@ -0,0 +1,287 @@
+"""Time-accurate replay of a raw WS frame capture into ``KiwoomWSManager``.
+
+``replay_capture`` builds a real ``KiwoomWSManager`` whose transport is a local
+``CaptureReplaySocket``: the manager runs its normal login, bootstrap, receive,
+parse, apply and tick-dispatch path, and the EventBus stays live, so any
+consumer subscribed in this process sees the replayed events.  Frames are paced
+by their captured receive timestamps at 1x, Nx (``speed``), or as fast as
+possible (``speed=0``).
+
+The report covers parse/apply throughput, frame-pipeline lag when enabled, and
+delivery-to-``REALTIME_TICK_ARRIVED`` latency per priority class, which is the
+delay a main-loop consumer sees.  Captured LOGIN replies are dropped and the
+socket answers the manager's own LOGIN, so any rotated capture part replays.
+
+The manager's side effects (observers, runtime files) are the live ones; run
+replays from a scratch checkout or with the relevant env gates off.  The
+dashboard snapshot publisher is not started.
+
+Usage::
+
+    python -m src.engine.infrastructure.kiwoom_ws_replay CAPTURE... --speed 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.engine.infrastructure.kiwoom_tick_priority import PRIORITY_CLASS_NAMES
+from src.engine.infrastructure.kiwoom_ws_capture import iter_capture_frames
+
+WS_REPLAY_VERSION = "kiwoom_ws_replay_v1"
+_LOGIN_ACK = json.dumps({"trnm": "LOGIN", "return_code": 0, "return_msg": "replay"})
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+def _latency_summary(values_ms: list[float]) -> dict[str, Any]:
+    ordered = sorted(values_ms)
+    return {
+        "count": len(ordered),
+        "p50_ms": _percentile(ordered, 0.50),
+        "p95_ms": _percentile(ordered, 0.95),
+        "p99_ms": _percentile(ordered, 0.99),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def _frame_item_codes(frame: str) -> tuple[str, ...]:
+    try:
+        payload = json.loads(frame)
+    except ValueError:
+        return ()
+    if not isinstance(payload, dict) or payload.get("trnm") != "REAL":
+        return ()
+    codes = []
+    for item in payload.get("data") or []:
+        if isinstance(item, dict) and item.get("type") != "00":
+            code = str(item.get("item") or "").strip()
+            if code:
+                codes.append(code)
+    return tuple(codes)
+
+
+def _is_login_frame(frame: str) -> bool:
+    if '"LOGIN"' not in frame:
+        return False
+    try:
+        payload = json.loads(frame)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get("trnm") == "LOGIN"
+
+
+class CaptureReplaySocket:
+    """Fake websocket serving captured frames with their original spacing.
+
+    It is also the ``connect`` factory: every (re)connect returns the same
+    socket, so a reconnect resumes at the next frame instead of replaying.
+    """
+
+    def __init__(
+        self,
+        frames: list[tuple[float, str]],
+        *,
+        speed: float = 1.0,
+        normalize_code=None,
+    ):
+        self.frames = frames
+        self.speed = float(speed or 0.0)
+        self.normalize_code = normalize_code or (lambda code: code)
+        self.frame_codes = [_frame_item_codes(frame) for _, frame in frames]
+        self.sent: list[str] = []
+        self.delivered = 0
+        self.last_delivery_perf: dict[str, float] = {}
+        self.started_perf: float | None = None
+        self.exhausted_perf: float | None = None
+        self.exhausted = threading.Event()
+        self._replies: list[str] = []
+        self._closed: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __call__(self, uri, **kwargs):
+        return self
+
+    async def __aenter__(self):
+        self._loop = asyncio.get_running_loop()
+        self._closed = asyncio.Event()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def send(self, payload):
+        self.sent.append(payload)
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if isinstance(message, dict) and message.get("trnm") == "LOGIN":
+            self._replies.append(_LOGIN_ACK)
+
+    async def close(self):
+        if self._closed is not None:
+            self._closed.set()
+
+    def close_threadsafe(self):
+        if self._loop is not None and self._closed is not None:
+            self._loop.call_soon_threadsafe(self._closed.set)
+
+    async def recv(self):
+        if self._replies:
+            return self._replies.pop(0)
+        if self.delivered >= len(self.frames):
+            if self.exhausted_perf is None:
+                # The previous frame has been handled once recv() is re-entered.
+                self.exhausted_perf = time.perf_counter()
+                self.exhausted.set()
+            await self._closed.wait()
+            raise ConnectionError("replay socket closed")
+        captured_perf, frame = self.frames[self.delivered]
+        now = time.perf_counter()
+        if self.started_perf is None:
+            self.started_perf = now
+        elif self.speed > 0:
+            due = self.started_perf + (captured_perf - self.frames[0][0]) / self.speed
+            if due > now:
+                await asyncio.sleep(due - now)
+                now = time.perf_counter()
+        for code in self.frame_codes[self.delivered]:
+            self.last_delivery_perf[self.normalize_code(code)] = now
+        self.delivered += 1
+        return frame
+
+
+def load_capture_frames(paths: str | Path | Iterable[str | Path]):
+    return [
+        (perf, frame)
+        for perf, frame in iter_capture_frames(paths)
+        if not _is_login_frame(frame)
+    ]
+
+
+def _wait_for_idle(manager, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    pipeline = getattr(manager, "_ws_frame_pipeline", None)
+    if pipeline is not None and not pipeline.drain(timeout=timeout):
+        return False
+    while time.perf_counter() < deadline:
+        with manager._tick_lock:
+            idle = not manager._pending_tick_events
+        if idle:
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def replay_capture(
+    paths: str | Path | Iterable[str | Path],
+    *,
+    speed: float = 1.0,
+    codes: Iterable[str] | None = None,
+    tick_priorities: dict[str, int] | None = None,
+    timeout: float = 600.0,
+    manager_factory=None,
+) -> dict[str, Any]:
+    """Replay a capture through a live ``KiwoomWSManager`` and report timings."""
+
+    from src.engine.kiwoom_websocket import KiwoomWSManager
+
+    frames = load_capture_frames(paths)
+    socket = CaptureReplaySocket(
+        frames, speed=speed, normalize_code=KiwoomWSManager._normalize_code
+    )
+    if manager_factory is None:
+        manager = KiwoomWSManager(
+            "replay-token", connect=socket, publish_dashboard_snapshot=False
+        )
+    else:
+        manager = manager_factory(socket)
+    if codes is None:
+        codes = {code for frame_codes in socket.frame_codes for code in frame_codes}
+    manager.subscribed_codes = {manager._normalize_code(code) for code in codes}
+    if tick_priorities:
+        manager.set_tick_priorities(tick_priorities)
+
+    tick_latency_ms: dict[int, list[float]] = {
+        index: [] for index in range(len(PRIORITY_CLASS_NAMES))
+    }
+    tick_count = {"value": 0}
+
+    def on_tick(payload):
+        now = time.perf_counter()
+        code = str((payload or {}).get("code") or "")
+        delivered = socket.last_delivery_perf.get(code)
+        tick_count["value"] += 1
+        if delivered is not None:
+            priority = manager._tick_lanes.priority_for(code)
+            tick_latency_ms[priority].append((now - delivered) * 1000.0)
+
+    manager.event_bus.subscribe("REALTIME_TICK_ARRIVED", on_tick)
+    try:
+        manager.start()
+        finished = socket.exhausted.wait(timeout=timeout)
+        idle = _wait_for_idle(manager, timeout=min(30.0, timeout))
+        pipeline_snapshot = manager.get_ws_frame_pipeline_snapshot()
+        dispatch_snapshot = manager.get_tick_dispatch_snapshot()
+    finally:
+        socket.close_threadsafe()
+        manager.stop()
+        manager.event_bus.unsubscribe("REALTIME_TICK_ARRIVED", on_tick)
+
+    started = socket.started_perf or 0.0
+    elapsed = max(0.0, (socket.exhausted_perf or time.perf_counter()) - started)
+    captured_span = frames[-1][0] - frames[0][0] if len(frames) > 1 else 0.0
+    items = sum(len(frame_codes) for frame_codes in socket.frame_codes)
+    return {
+        "version": WS_REPLAY_VERSION,
+        "speed": speed,
+        "completed": bool(finished),
+        "drained": bool(idle),
+        "frames": len(frames),
+        "frames_delivered": socket.delivered,
+        "realtime_items": items,
+        "captured_span_sec": round(captured_span, 3),
+        "replay_elapsed_sec": round(elapsed, 3),
+        "frames_per_sec": round(socket.delivered / elapsed, 1) if elapsed else 0.0,
+        "items_per_sec": round(items / elapsed, 1) if elapsed else 0.0,
+        "tick_events": tick_count["value"],
+        "tick_latency": {
+            name: _latency_summary(tick_latency_ms[index])
+            for index, name in enumerate(PRIORITY_CLASS_NAMES)
+        },
+        "frame_pipeline": pipeline_snapshot,
+        "tick_dispatch": dispatch_snapshot,
+        "sent_frames": len(socket.sent),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("captures", nargs="+", help="capture files, in order")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed multiplier; 0 replays as fast as possible",
+    )
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args(argv)
+    report = replay_capture(args.captures, speed=args.speed, timeout=args.timeout)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if report["completed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,374 @@
+"""Incremental, slot-addressed WS dashboard snapshot.
+
+The dashboard snapshot used to be rebuilt from every live ``realtime_data``
+row (without the market-data lock) by a fresh thread each interval and written
+as one JSON document that readers re-parsed in full.  This module replaces
+that hot path with:
+
+* ``WSSnapshotSlotFile`` - a memory-mapped file of fixed-size slots, one per
+  symbol.  Each slot is ``seq:u32 | length:u32 | row-json``; the single writer
+  bumps ``seq`` to odd before rewriting a slot and to the next even value after,
+  so readers detect torn reads and retry (a seqlock).  ``slots.index.json``
+  maps codes to slots and is rewritten only when a new code is assigned.
+* ``read_ws_snapshot_row`` - O(1) lookup of one symbol: one index lookup (the
+  index is cached by mtime) and one ``pread`` of the slot.
+* ``WSSnapshotPublisher`` - one long-lived writer thread.  The apply path only
+  marks codes dirty; each interval the thread rebuilds the dirty rows through
+  ``build_row(code)`` (which takes the symbol lock), rewrites their slots and,
+  on a slower cadence, the legacy ``latest.json`` from its cached rows.
+
+Slot rows hold timestamps only; ``latest.json`` adds the age fields when it is
+written.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from src.utils.constants import DATA_DIR
+from src.utils.logger import log_error
+
+WS_SNAPSHOT_STORE_VERSION = "kiwoom_ws_snapshot_slots_v1"
+WS_SNAPSHOT_DIR = DATA_DIR / "runtime" / "kiwoom_ws_snapshot"
+WS_SNAPSHOT_SLOT_FILENAME = "slots.bin"
+WS_SNAPSHOT_INDEX_FILENAME = "slots.index.json"
+WS_DASHBOARD_SNAPSHOT_JSON_INTERVAL_SEC_ENV = (
+    "KORSTOCKSCAN_WS_DASHBOARD_SNAPSHOT_JSON_INTERVAL_SEC"
+)
+DEFAULT_SLOT_SIZE = 4096
+DEFAULT_SLOT_CAPACITY = 256
+
+_MAGIC = b"KWSS"
+# magic, layout version, slot size, capacity, published-at epoch
+_HEADER = struct.Struct("<4sHIId")
+_HEADER_SIZE = 64
+_SLOT_HEADER = struct.Struct("<II")
+_READ_RETRIES = 4
+# Optional string maps dropped first when a row does not fit its slot.
+_OVERFLOW_DROP_KEYS = (
+    "last_realtime_type_market_route",
+    "last_realtime_type_market_suffix",
+    "last_realtime_type_item",
+)
+
+
+def ws_dashboard_snapshot_json_interval_sec() -> float:
+    raw = os.getenv(WS_DASHBOARD_SNAPSHOT_JSON_INTERVAL_SEC_ENV, "5.0")
+    try:
+        return max(0.25, min(60.0, float(raw)))
+    except (TypeError, ValueError):
+        return 5.0
+
+
+def _encode_row(row: dict[str, Any]) -> bytes:
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class WSSnapshotSlotFile:
+    """Single-writer slot table backed by ``mmap`` (grows by doubling)."""
+
+    def __init__(
+        self,
+        directory: Path = WS_SNAPSHOT_DIR,
+        *,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+        capacity: int = DEFAULT_SLOT_CAPACITY,
+    ):
+        self.directory = Path(directory)
+        self.slot_path = self.directory / WS_SNAPSHOT_SLOT_FILENAME
+        self.index_path = self.directory / WS_SNAPSHOT_INDEX_FILENAME
+        self.slot_size = max(256, int(slot_size))
+        self.capacity = max(1, int(capacity))
+        self.slots: dict[str, int] = {}
+        self.overflow_rows = 0
+        self._file = None
+        self._map: mmap.mmap | None = None
+
+    def open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # A new writer starts from an empty table; stale rows from a previous
+        # process must not look live.
+        self._file = open(self.slot_path, "w+b")
+        self._resize(self.capacity)
+        self._write_index()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _resize(self, capacity: int) -> None:
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+        self.capacity = capacity
+        self._file.truncate(_HEADER_SIZE + capacity * self.slot_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self.write_header(0.0)
+
+    def write_header(self, published_at: float) -> None:
+        _HEADER.pack_into(
+            self._map, 0, _MAGIC, 1, self.slot_size, self.capacity, published_at
+        )
+
+    def _write_index(self) -> None:
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "version": WS_SNAPSHOT_STORE_VERSION,
+                    "slot_size": self.slot_size,
+                    "header_size": _HEADER_SIZE,
+                    "slots": self.slots,
+                },
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(self.index_path)
+
+    def write_row(self, code: str, row: dict[str, Any] | None) -> None:
+        slot = self.slots.get(code)
+        if slot is None:
+            if row is None:
+                return
+            slot = len(self.slots)
+            if slot >= self.capacity:
+                self._resize(self.capacity * 2)
+            self.slots[code] = slot
+            self._write_index()
+        payload = b"" if row is None else _encode_row(row)
+        limit = self.slot_size - _SLOT_HEADER.size
+        if len(payload) > limit:
+            self.overflow_rows += 1
+            trimmed = {k: v for k, v in row.items() if k not in _OVERFLOW_DROP_KEYS}
+            payload = _encode_row({**trimmed, "slot_overflow": True})
+            if len(payload) > limit:
+                payload = b""
+        offset = _HEADER_SIZE + slot * self.slot_size
+        seq, _length = _SLOT_HEADER.unpack_from(self._map, offset)
+        writing_seq = seq + 1 if seq % 2 == 0 else seq
+        _SLOT_HEADER.pack_into(self._map, offset, writing_seq, 0)
+        start = offset + _SLOT_HEADER.size
+        self._map[start : start + len(payload)] = payload
+        _SLOT_HEADER.pack_into(
+            self._map, offset, (writing_seq + 1) % (1 << 32), len(payload)
+        )
+
+
+_INDEX_CACHE: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def _load_index(index_path: Path) -> dict[str, Any] | None:
+    try:
+        stat = index_path.stat()
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _INDEX_CACHE_LOCK:
+        cached = _INDEX_CACHE.get(index_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or not isinstance(index.get("slots"), dict):
+        return None
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE[index_path] = (key, index)
+    return index
+
+
+def read_ws_snapshot_row(
+    code: str, *, directory: Path = WS_SNAPSHOT_DIR
+) -> tuple[dict[str, Any], float] | None:
+    """Return ``(row, published_at)`` for one symbol, or ``None``.
+
+    ``None`` means the slot store is absent, the code has no slot, or the slot
+    could not be read consistently; callers fall back to ``latest.json``.
+    """
+    directory = Path(directory)
+    index = _load_index(directory / WS_SNAPSHOT_INDEX_FILENAME)
+    if index is None:
+        return None
+    slot = index["slots"].get(str(code))
+    if not isinstance(slot, int):
+        return None
+    slot_size = int(index.get("slot_size") or DEFAULT_SLOT_SIZE)
+    header_size = int(index.get("header_size") or _HEADER_SIZE)
+    offset = header_size + slot * slot_size
+    try:
+        fd = os.open(directory / WS_SNAPSHOT_SLOT_FILENAME, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        header = os.pread(fd, _HEADER.size, 0)
+        if len(header) < _HEADER.size:
+            return None
+        magic, _layout, _slot_size, _capacity, published_at = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            return None
+        for _ in range(_READ_RETRIES):
+            raw = os.pread(fd, slot_size, offset)
+            if len(raw) < _SLOT_HEADER.size:
+                return None
+            seq, length = _SLOT_HEADER.unpack_from(raw, 0)
+            if seq % 2:
+                time.sleep(0)
+                continue
+            payload = raw[_SLOT_HEADER.size : _SLOT_HEADER.size + length]
+            check = os.pread(fd, _SLOT_HEADER.size, offset)
+            if _SLOT_HEADER.unpack(check)[0] != seq:
+                continue
+            if not length:
+                return None
+            try:
+                row = json.loads(payload.decode("utf-8"))
+            except (UnicodeDecodeError, ValueError):
+                return None
+            return (row, float(published_at)) if isinstance(row, dict) else None
+        return None
+    finally:
+        os.close(fd)
+
+
+class WSSnapshotPublisher:
+    """Long-lived dirty-set writer for the slot table and ``latest.json``.
+
+    ``build_row(code)`` returns the timestamp-only snapshot row for a code (or
+    ``None`` once it is gone); ``write_json(rows, now_ts)`` persists the legacy
+    full snapshot from the cached rows.
+    """
+
+    def __init__(
+        self,
+        *,
+        build_row: Callable[[str], dict[str, Any] | None],
+        write_json: Callable[[dict[str, dict[str, Any]], float], Any] | None = None,
+        interval_sec: float = 1.0,
+        json_interval_sec: float = 5.0,
+        slot_file: WSSnapshotSlotFile | None = None,
+    ):
+        self._build_row = build_row
+        self._write_json = write_json
+        self.interval_sec = max(0.01, float(interval_sec))
+        self.json_interval_sec = max(self.interval_sec, float(json_interval_sec))
+        self.slot_file = slot_file or WSSnapshotSlotFile()
+        self._rows: dict[str, dict[str, Any]] = {}
+        self._dirty: set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_json_at = 0.0
+        self._json_dirty = False
+        self._stats = {
+            "publishes": 0,
+            "rows_written": 0,
+            "rows_removed": 0,
+            "json_writes": 0,
+            "errors": 0,
+            "last_publish_ms": 0.0,
+            "max_publish_ms": 0.0,
+        }
+
+    def mark_dirty(self, code: str) -> None:
+        with self._dirty_lock:
+            self._dirty.add(code)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.slot_file.open()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="kiwoom-ws-snapshot-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+        self._thread = None
+        self.slot_file.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_sec)
+            self._wake.clear()
+            self.publish()
+        self.publish(force_json=True)
+
+    def publish(self, *, now_ts: float | None = None, force_json: bool = False):
+        """Write every dirty row; returns the number of slots rewritten."""
+
+        started = time.perf_counter()
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        now_ts = time.time() if now_ts is None else float(now_ts)
+        written = 0
+        try:
+            for code in dirty:
+                row = self._build_row(code)
+                if row is None:
+                    if self._rows.pop(code, None) is not None:
+                        self._stats["rows_removed"] += 1
+                else:
+                    self._rows[code] = row
+                self.slot_file.write_row(code, row)
+                written += 1
+            if written:
+                self.slot_file.write_header(now_ts)
+                self._json_dirty = True
+            if (
+                self._write_json is not None
+                and self._json_dirty
+                and (
+                    force_json or now_ts - self._last_json_at >= self.json_interval_sec
+                )
+            ):
+                self._write_json(dict(self._rows), now_ts)
+                self._last_json_at = now_ts
+                self._json_dirty = False
+                self._stats["json_writes"] += 1
+        except Exception as exc:
+            self._stats["errors"] += 1
+            log_error(f"[WS] dashboard snapshot publish failed: {exc}")
+        elapsed_ms = round((time.perf_counter() - started) * 1000.0, 3)
+        self._stats["publishes"] += 1
+        self._stats["rows_written"] += written
+        self._stats["last_publish_ms"] = elapsed_ms
+        self._stats["max_publish_ms"] = max(self._stats["max_publish_ms"], elapsed_ms)
+        return written
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._dirty_lock:
+            pending = len(self._dirty)
+        return {
+            "version": WS_SNAPSHOT_STORE_VERSION,
+            "running": bool(self._thread is not None and self._thread.is_alive()),
+            "interval_sec": self.interval_sec,
+            "json_interval_sec": self.json_interval_sec,
+            "symbols": len(self._rows),
+            "pending_dirty": pending,
+            "slot_capacity": self.slot_file.capacity,
+            "slot_overflow_rows": self.slot_file.overflow_rows,
+            **self._stats,
+        }
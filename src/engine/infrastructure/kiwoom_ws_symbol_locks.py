@@ -0,0 +1,179 @@
+"""Striped per-symbol locks for ``KiwoomWSManager.realtime_data``.
+
+A single manager lock used to guard every symbol's realtime target together
+with the subscription bookkeeping, so the WS apply path, the sniper's bulk
+``get_all_data`` reads and REG/UNREG handling all queued behind each other.
+``SymbolLockStripes`` maps each code onto one of a fixed number of stripes;
+readers and the apply path for different symbols rarely meet, and a bulk read
+takes each stripe once instead of holding one lock for the whole batch.
+
+Lock order: the subscription lock may be held while a stripe is taken, never
+the reverse, and at most one stripe is held at a time.
+
+``InstrumentedLock`` counts acquisitions, contended acquisitions and timeouts,
+and accumulates wait and hold time so the stripes (and the subscription lock)
+can be checked for contention in production.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Hashable, Iterable
+
+WS_SYMBOL_LOCK_VERSION = "kiwoom_ws_symbol_locks_v1"
+WS_SYMBOL_LOCK_STRIPES_ENV = "KORSTOCKSCAN_WS_SYMBOL_LOCK_STRIPES"
+DEFAULT_SYMBOL_LOCK_STRIPES = 16
+
+
+def ws_symbol_lock_stripe_count() -> int:
+    try:
+        value = int(str(os.getenv(WS_SYMBOL_LOCK_STRIPES_ENV, "") or "").strip())
+    except (TypeError, ValueError):
+        return DEFAULT_SYMBOL_LOCK_STRIPES
+    return max(1, min(256, value))
+
+
+class InstrumentedLock:
+    """``threading.Lock`` with acquisition, contention and hold-time counters.
+
+    Counters are updated while the lock is held, so they need no extra
+    synchronization; only ``timeouts`` is a best-effort count.
+    """
+
+    __slots__ = (
+        "name",
+        "_lock",
+        "_acquired_ns",
+        "acquisitions",
+        "contended",
+        "timeouts",
+        "wait_ns_total",
+        "wait_ns_max",
+        "hold_ns_total",
+        "hold_ns_max",
+    )
+
+    def __init__(self, name: str = "lock"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._acquired_ns = 0
+        self.acquisitions = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.wait_ns_total = 0
+        self.wait_ns_max = 0
+        self.hold_ns_total = 0
+        self.hold_ns_max = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            self._acquired_ns = time.perf_counter_ns()
+            return True
+        if not blocking:
+            self.timeouts += 1
+            return False
+        started_ns = time.perf_counter_ns()
+        if not self._lock.acquire(True, timeout):
+            self.timeouts += 1
+            return False
+        acquired_ns = time.perf_counter_ns()
+        waited_ns = acquired_ns - started_ns
+        self.acquisitions += 1
+        self.contended += 1
+        self.wait_ns_total += waited_ns
+        if waited_ns > self.wait_ns_max:
+            self.wait_ns_max = waited_ns
+        self._acquired_ns = acquired_ns
+        return True
+
+    def release(self) -> None:
+        held_ns = time.perf_counter_ns() - self._acquired_ns
+        self.hold_ns_total += held_ns
+        if held_ns > self.hold_ns_max:
+            self.hold_ns_max = held_ns
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def snapshot(self) -> dict[str, Any]:
+        acquisitions = int(self.acquisitions)
+        return {
+            "name": self.name,
+            "acquisitions": acquisitions,
+            "contended": int(self.contended),
+            "contention_rate": (
+                round(self.contended / acquisitions, 6) if acquisitions else 0.0
+            ),
+            "timeouts": int(self.timeouts),
+            "wait_ms_total": round(self.wait_ns_total / 1e6, 3),
+            "wait_ms_max": round(self.wait_ns_max / 1e6, 3),
+            "hold_ms_total": round(self.hold_ns_total / 1e6, 3),
+            "hold_ms_max": round(self.hold_ns_max / 1e6, 3),
+            "hold_us_avg": (
+                round(self.hold_ns_total / acquisitions / 1e3, 3)
+                if acquisitions
+                else 0.0
+            ),
+        }
+
+
+class SymbolLockStripes:
+    """Fixed set of ``InstrumentedLock`` stripes keyed by symbol code."""
+
+    def __init__(self, stripe_count: int = DEFAULT_SYMBOL_LOCK_STRIPES):
+        count = max(1, int(stripe_count))
+        self._locks = tuple(InstrumentedLock(f"symbol[{i}]") for i in range(count))
+
+    @classmethod
+    def from_env(cls) -> "SymbolLockStripes":
+        return cls(ws_symbol_lock_stripe_count())
+
+    @property
+    def stripe_count(self) -> int:
+        return len(self._locks)
+
+    def stripe_index(self, code: Hashable) -> int:
+        return hash(code) % len(self._locks)
+
+    def for_code(self, code: Hashable) -> InstrumentedLock:
+        return self._locks[hash(code) % len(self._locks)]
+
+    def group(
+        self, codes: Iterable[Hashable]
+    ) -> list[tuple[InstrumentedLock, list[Hashable]]]:
+        """Group codes by stripe (stripe order) so a bulk read takes each once."""
+
+        grouped: dict[int, list[Hashable]] = {}
+        for code in codes:
+            grouped.setdefault(self.stripe_index(code), []).append(code)
+        return [(self._locks[index], grouped[index]) for index in sorted(grouped)]
+
+    def snapshot(self) -> dict[str, Any]:
+        stripes = [lock.snapshot() for lock in self._locks]
+        acquisitions = sum(row["acquisitions"] for row in stripes)
+        contended = sum(row["contended"] for row in stripes)
+        return {
+            "version": WS_SYMBOL_LOCK_VERSION,
+            "stripe_count": len(stripes),
+            "acquisitions": acquisitions,
+            "contended": contended,
+            "contention_rate": (
+                round(contended / acquisitions, 6) if acquisitions else 0.0
+            ),
+            "timeouts": sum(row["timeouts"] for row in stripes),
+            "wait_ms_total": round(sum(row["wait_ms_total"] for row in stripes), 3),
+            "wait_ms_max": max((row["wait_ms_max"] for row in stripes), default=0.0),
+            "hold_ms_total": round(sum(row["hold_ms_total"] for row in stripes), 3),
+            "hold_ms_max": max((row["hold_ms_max"] for row in stripes), default=0.0),
+            "stripes": stripes,
+        }
@@ -101,6 +101,7 @@ from src.engine.scalping.scanner_runtime_scheduler import (
     parse_scanner_scheduler_venues,
 )
 from src.engine.ai.hot_path_ai_dispatcher import HotPathAIDispatcher
+from src.engine.ai.provider_call_replay import record_decision_step
 from src.engine.scalping.scanner_async_eval import ScannerAsyncEvalCoordinator
 from src.engine.scalping.entry_ai_gate import (
     entry_buy_decision_allowed,
@@ -203,6 +204,7 @@ from src.engine.sniper_post_sell_feedback import should_retain_ws_subscription
 
 # 💡 뇌(AI)와 눈(웹소켓, 레이더) 임포트
 from src.engine import kiwoom_orders
+from src.engine.infrastructure.kiwoom_tick_priority import build_tick_priority_map
 from src.engine.kiwoom_websocket import (
     COMMAND_MICRO_REVERSION_OBSERVATION_SET,
     KiwoomWSManager,
@@ -988,6 +990,7 @@ def handle_watching_state(
     scanner_async_generation=None,
     scanner_async_commit_phase=False,
 ):
+    record_decision_step("WATCHING", stock, code, ws_data, now_ts=now_ts)
     return sniper_state_handlers.handle_watching_state(
         stock,
         code,
@@ -1016,6 +1019,9 @@ def handle_holding_state(
     now_ts=None,
     now_dt=None,
 ):
+    record_decision_step(
+        "HOLDING", stock, code, ws_data, now_ts=now_ts, market_regime=market_regime
+    )
     return sniper_state_handlers.handle_holding_state(
         stock,
         code,
@@ -6463,8 +6469,21 @@ def _scanner_promotion_latency_trace_fields(
     }
 
 
+def _sync_ws_tick_priorities(targets):
+    """Feed ACTIVE_TARGETS state into the WS tick dispatcher's priority lanes."""
+    manager = WS_MANAGER
+    setter = getattr(manager, "set_tick_priorities", None)
+    if not callable(setter):
+        return False
+    try:
+        return bool(setter(build_tick_priority_map(targets)))
+    except Exception as exc:
+        log_error(f"[WS_TICK_PRIORITY] priority sync failed: {exc}")
+        return False
+
+
 def _runtime_scanner_ws_snapshot_cache(iteration_targets):
-    """Fetch scanner WATCHING snapshots in one WS-manager lock acquisition."""
+    """Fetch scanner WATCHING snapshots with bounded WS-manager lock waits."""
     manager = WS_MANAGER
     if manager is None or not hasattr(manager, "get_all_data"):
         return {}
@@ -6486,6 +6505,15 @@ def _runtime_scanner_ws_snapshot_cache(iteration_targets):
     except Exception:
         lock_wait_ms = 25.0
     lock_wait_sec = max(0.0, min(0.2, lock_wait_ms / 1000.0))
+    if getattr(manager, "_symbol_locks", None) is not None:
+        # Striped manager: each symbol stripe is taken once with the same
+        # bounded wait, so a busy stripe only blanks its own codes.
+        try:
+            snapshots = manager.get_all_data(codes, lock_timeout=lock_wait_sec)
+        except Exception as exc:
+            log_error(f"[SCANNER_WS_CACHE] striped snapshot lookup failed: {exc}")
+            return {code: {} for code in codes}
+        return snapshots if isinstance(snapshots, dict) else {}
     manager_lock = getattr(manager, "lock", None)
     realtime_data = getattr(manager, "realtime_data", None)
     snapshot_target = getattr(manager, "_snapshot_target", None)
@@ -12029,6 +12057,7 @@ def run_sniper(is_test_mode=False):
             for stale_code in list(scanner_ws_repair_cycle_state_by_code.keys()):
                 if stale_code not in active_scanner_watch_codes:
                     scanner_ws_repair_cycle_state_by_code.pop(stale_code, None)
+            _sync_ws_tick_priorities(targets)
             scanner_ws_snapshot_cache = _runtime_scanner_ws_snapshot_cache(
                 queue_context["iteration_targets"]
             )
@@ -14807,10 +14836,7 @@ def run_sniper(is_test_mode=False):
 
             _sniper_final_heartbeat("sniper_engine", alive=False)
         except Exception as heartbeat_error:
-            log_error(
-                "[SNIPER_HEARTBEAT_FINALIZE_FAILED] "
-                f"error={heartbeat_error}"
-            )
+            log_error("[SNIPER_HEARTBEAT_FINALIZE_FAILED] " f"error={heartbeat_error}")
         smoothing_source_only_observer.stop()
         fast_exit_monitor.stop()
         async_coordinator = getattr(
@@ -19,7 +19,10 @@ from src.utils.logger import log_error
 from src.core.event_bus import EventBus
 from src.utils.constants import CONFIG_PATH, DEV_PATH, TRADING_RULES
 from src.database.db_manager import is_swing_real_watching_enabled
-from src.engine.bd_fbuy_accum_pre_scanner import write_ws_snapshot
+from src.engine.bd_fbuy_accum_pre_scanner import (
+    build_ws_snapshot_row,
+    write_ws_snapshot_rows,
+)
 from src.engine.monitoring.market_halt_windows import append_market_session_event
 from src.engine.sniper_time import (
     describe_scalping_buy_windows,
@@ -30,8 +33,47 @@ from src.engine.sniper_time import (
 from src.engine.scalping.micro_estimator_state import (
     DEFAULT_STORE as MICRO_ESTIMATOR_STORE,
 )
+from src.engine.scalping.micro_estimator_arrays import WSQuoteBatch
 from src.engine.scalping.limit_down_watch import observe_raw_market_data
 from src.trading.entry.orderbook_stability_observer import ORDERBOOK_STABILITY_OBSERVER
+from src.engine.infrastructure.kiwoom_realtime_fid_plan import (
+    FID_PARSE_PLANS,
+    Kiwoom0BFields,
+    MISSING,
+    apply_quote_fields,
+    infer_trade_auxiliary_score,
+    parse_0b_auxiliary_fields,
+    parse_realtime_fields,
+    safe_abs_int,
+    safe_digits_int,
+    safe_float,
+    safe_signed_int,
+    signed_trade_volume_side,
+    value_or,
+)
+from src.engine.infrastructure.kiwoom_tick_priority import TickPriorityLanes
+from src.engine.infrastructure.kiwoom_ws_capture import (
+    WSFrameCaptureWriter,
+    ws_frame_capture_enabled,
+)
+from src.engine.infrastructure.kiwoom_ws_pool import (
+    PRIMARY_SLOT as WS_POOL_PRIMARY_SLOT,
+    WSPoolShardPlanner,
+    ws_pool_size,
+)
+from src.engine.infrastructure.kiwoom_ws_frame_pipeline import (
+    KiwoomWSFramePipeline,
+    WSFramePipelineConfig,
+    ws_frame_pipeline_enabled,
+)
+from src.engine.infrastructure.kiwoom_ws_snapshot_store import (
+    WSSnapshotPublisher,
+    ws_dashboard_snapshot_json_interval_sec,
+)
+from src.engine.infrastructure.kiwoom_ws_symbol_locks import (
+    InstrumentedLock,
+    SymbolLockStripes,
+)
 
 
 class _LoginAckFailure(RuntimeError):
@@ -43,6 +85,22 @@ class _LoginAckFailure(RuntimeError):
         )
 
 
+class _DataArrivalWaiter:
+    """One blocked ``wait_for_data``/``wait_for_any`` caller.
+
+    Registered under each awaited code; the apply path appends the arriving
+    code and sets ``event`` while holding the market-data lock.
+    """
+
+    __slots__ = ("codes", "types", "event", "arrived")
+
+    def __init__(self, codes, types):
+        self.codes = tuple(codes)
+        self.types = frozenset(types) if types else None
+        self.event = threading.Event()
+        self.arrived = deque()
+
+
 def _load_system_config():
     """웹소켓 매니저 전용 설정 로더 (의존성 분리)"""
     target = CONFIG_PATH if CONFIG_PATH.exists() else DEV_PATH
@@ -317,25 +375,39 @@ def _micro_estimator_ws_observation_enabled():
 
 
 class KiwoomWSManager:
-    def __init__(self, token):
+    def __init__(self, token, *, connect=None, publish_dashboard_snapshot=True):
         # 💡 [우아한 아키텍처] 하드코딩 파괴! 설정 파일에서 URI를 동적으로 읽어옵니다.
         conf = _load_system_config()
         self.conf = conf
         # config에 URI가 없으면 안전하게 Mock API를 기본값으로 사용합니다.
-        self.uri = conf.get(
-            "KIWOOM_WS_URI", "wss://mockapi.kiwoom.com:10000/api/dostk/websocket"
+        self.uri = str(os.getenv("KORSTOCKSCAN_KIWOOM_WS_URI", "") or "").strip() or (
+            conf.get(
+                "KIWOOM_WS_URI", "wss://mockapi.kiwoom.com:10000/api/dostk/websocket"
+            )
         )
 
         self.token = token
+        # ``connect`` swaps the websocket transport (capture replay uses a
+        # local fake socket); defaults to ``websockets.connect``.
+        self._ws_connect = connect or websockets.connect
+        self._ws_frame_capture = None
+        self._ws_frame_capture_sessions = 0
+        self._publish_dashboard_snapshot = publish_dashboard_snapshot
         self.realtime_data = {}
         self.subscribed_codes = set()
         self.websocket = None
-        self.lock = threading.Lock()
+        # ``lock`` guards subscription/registration bookkeeping only; each
+        # realtime_data target is guarded by its symbol stripe (see
+        # ``_symbol_lock``).  Take ``lock`` before a stripe, never after.
+        self.lock = InstrumentedLock("subscription")
+        self._symbol_locks = SymbolLockStripes.from_env()
         self.loop = None
         self._stop_event = threading.Event()
         self._state_event_queue = Queue()
         self._tick_dispatch_event = threading.Event()
+        # Latest coalesced tick per code; ``_tick_lanes`` decides publish order.
         self._pending_tick_events = {}
+        self._tick_lanes = TickPriorityLanes()
         self._tick_lock = threading.Lock()
         self._state_dispatch_thread = None
         self._tick_dispatch_thread = None
@@ -346,8 +418,7 @@ class KiwoomWSManager:
         self._session_ready = threading.Event()
         self._last_token_refresh_at = 0.0
         self._pending_token_handoff = None
-        self._last_dashboard_snapshot_at = 0.0
-        self._dashboard_snapshot_write_inflight = False
+        self._dashboard_snapshot_publisher = None
         self._recent_reg_request_ts = {}
         self._alternate_route_request_ts = {}
         self._persistent_repair_request_ts = {}
@@ -376,6 +447,18 @@ class KiwoomWSManager:
         self._micro_reversion_canary_snapshot_lock = threading.Lock()
         self._micro_reversion_canary_monitor_stop_event = threading.Event()
         self._micro_reversion_canary_monitor_thread = None
+        self._ws_frame_pipeline = None
+        # Pool mode (KORSTOCKSCAN_WS_POOL_SIZE > 1): slot -> live secondary
+        # socket; ``_ws_pool`` assignments are guarded by ``lock``.
+        pool_size = ws_pool_size()
+        self._ws_pool = WSPoolShardPlanner(pool_size) if pool_size > 1 else None
+        self._ws_pool_sockets = {}
+        # Codes placed on a pool connection whose REG has not been sent yet;
+        # a rebalance moves these along with the subscribed ones.
+        self._ws_pool_unsent_codes = set()
+        # code -> set[_DataArrivalWaiter]; each code's set is guarded by that
+        # code's symbol stripe.
+        self._data_arrival_waiters = {}
 
         # 전역 EventBus 인스턴스 획득 및 외부 명령 수신기 장착
         self.event_bus = EventBus()
@@ -400,12 +483,7 @@ class KiwoomWSManager:
         for idx in range(0, len(items), chunk_size):
             yield items[idx : idx + chunk_size]
 
-    @staticmethod
-    def _safe_abs_int(val, default=0):
-        try:
-            return abs(int(float(str(val).replace(",", "").strip())))
-        except Exception:
-            return default
+    _safe_abs_int = staticmethod(safe_abs_int)
 
     @classmethod
     def _optional_abs_int(cls, values, fid):
@@ -424,19 +502,8 @@ class KiwoomWSManager:
         except (TypeError, ValueError):
             return None
 
-    @staticmethod
-    def _safe_signed_int(val, default=0):
-        try:
-            return int(float(str(val).replace(",", "").replace("+", "").strip()))
-        except Exception:
-            return default
-
-    @staticmethod
-    def _safe_float(val, default=0.0):
-        try:
-            return float(str(val).replace(",", "").replace("+", "").strip())
-        except Exception:
-            return default
+    _safe_signed_int = staticmethod(safe_signed_int)
+    _safe_float = staticmethod(safe_float)
 
     @staticmethod
     def _flag_enabled(value, *, default=False):
@@ -466,14 +533,7 @@ class KiwoomWSManager:
             return "SELL", "touch_or_crossed_bid"
         return "UNKNOWN", "inside_spread_or_uncertain"
 
-    @staticmethod
-    def _infer_signed_trade_volume_auxiliary(value):
-        text = str(value or "").replace(",", "").strip()
-        if text.startswith("+"):
-            return "BUY", "signed_trade_volume_positive_auxiliary"
-        if text.startswith("-"):
-            return "SELL", "signed_trade_volume_negative_auxiliary"
-        return "UNKNOWN", "signed_trade_volume_missing_or_neutral"
+    _infer_signed_trade_volume_auxiliary = staticmethod(signed_trade_volume_side)
 
     @staticmethod
     def _primary_signed_trade_volume_quality(auxiliary_quality):
@@ -484,88 +544,14 @@ class KiwoomWSManager:
 
     @staticmethod
     def _parse_0b_auxiliary_fields(values, *, trade_price=0, previous_tick=None):
-        values = values if isinstance(values, dict) else {}
-        previous_tick = previous_tick if isinstance(previous_tick, dict) else {}
-        buy_qty = KiwoomWSManager._safe_abs_int(values.get("1031"), None)
-        sell_qty = KiwoomWSManager._safe_abs_int(values.get("1030"), None)
-        signed_qty_abs = KiwoomWSManager._safe_abs_int(values.get("15"), None)
-        cum_volume = KiwoomWSManager._safe_abs_int(values.get("13"), None)
-        prev_cum_volume = KiwoomWSManager._safe_abs_int(
-            previous_tick.get("cum_volume"), None
-        )
-        cum_volume_delta = (
-            int(cum_volume - prev_cum_volume)
-            if cum_volume is not None
-            and prev_cum_volume is not None
-            and cum_volume > prev_cum_volume
-            else None
-        )
-        price = KiwoomWSManager._safe_abs_int(trade_price or values.get("10"), 0)
-        split_qty_available = buy_qty is not None and sell_qty is not None
-        split_qty_sum = (
-            int((buy_qty or 0) + (sell_qty or 0)) if split_qty_available else None
-        )
-
-        # Kiwoom 1030/1031 are cumulative execution totals in the live 0B
-        # stream.  Preserve them for source-quality diagnostics, but never use
-        # their sum as a per-tick volume or trade-value multiplier.
-        if signed_qty_abs is not None and signed_qty_abs > 0:
-            trade_volume = signed_qty_abs
-            trade_volume_source = "15_abs"
-        elif cum_volume_delta is not None and cum_volume_delta > 0:
-            trade_volume = cum_volume_delta
-            trade_volume_source = "13_delta"
-        else:
-            trade_volume = 0
-            trade_volume_source = "unknown"
-
-        trade_value = KiwoomWSManager._safe_abs_int(values.get("1313"), None)
-        trade_value_source = (
-            "1313" if trade_value is not None and trade_value > 0 else "unknown"
-        )
-        fallback_volume_source = "none"
-        if trade_value_source == "unknown":
-            if trade_volume > 0:
-                fallback_volume_source = trade_volume_source
-            if price > 0 and trade_volume > 0:
-                trade_value = int(price * trade_volume)
-                trade_value_source = f"calc_price_x_{fallback_volume_source}"
-            else:
-                trade_value = 0
-
-        mismatch = (
-            split_qty_sum is not None
-            and signed_qty_abs is not None
-            and split_qty_sum != signed_qty_abs
-        )
-        mismatch_delta = (
-            int(split_qty_sum - signed_qty_abs)
-            if split_qty_sum is not None and signed_qty_abs is not None
-            else None
+        fields = values if isinstance(values, Kiwoom0BFields) else None
+        if fields is None:
+            fields = FID_PARSE_PLANS["0B"].parse(
+                values if isinstance(values, dict) else {}
+            )
+        return parse_0b_auxiliary_fields(
+            fields, trade_price=trade_price, previous_tick=previous_tick
         )
-        return {
-            "buy_qty": int(buy_qty or 0),
-            "sell_qty": int(sell_qty or 0),
-            "signed_qty_abs": int(signed_qty_abs or 0),
-            "cum_volume": int(cum_volume or 0),
-            "prev_cum_volume": int(prev_cum_volume or 0),
-            "cum_volume_delta": (
-                int(cum_volume_delta) if cum_volume_delta is not None else None
-            ),
-            "split_qty_sum": int(split_qty_sum or 0),
-            "split_qty_available": bool(split_qty_available),
-            "split_qty_advisory_only": True,
-            "trade_volume": int(trade_volume or 0),
-            "trade_volume_source": trade_volume_source,
-            "trade_value": int(trade_value or 0),
-            "trade_value_source": trade_value_source,
-            "trade_value_fallback_volume_source": fallback_volume_source,
-            "split_qty_vs_15_evaluable": bool(
-                split_qty_sum is not None and signed_qty_abs is not None
-            ),
-            "split_qty_vs_15_mismatch": bool(mismatch),
-            "split_qty_vs_15_delta": mismatch_delta,
-        }
 
     @staticmethod
     def _increment_counter_dict(counter, key):
@@ -577,89 +563,12 @@ class KiwoomWSManager:
 
     @staticmethod
     def _infer_trade_auxiliary_score(values, *, previous_tick=None):
-        values = values if isinstance(values, dict) else {}
-        previous_tick = previous_tick if isinstance(previous_tick, dict) else {}
-        score = 0.0
-        reasons = []
-        components = {}
-
-        signed_side, signed_quality = (
-            KiwoomWSManager._infer_signed_trade_volume_auxiliary(values.get("15"))
-        )
-        components["signed_volume_side"] = signed_side
-        if signed_side == "BUY":
-            score += 3.0
-            reasons.append("signed_volume_positive")
-        elif signed_side == "SELL":
-            score -= 3.0
-            reasons.append("signed_volume_negative")
-
-        buy_qty = KiwoomWSManager._safe_abs_int(values.get("1031"), 0)
-        sell_qty = KiwoomWSManager._safe_abs_int(values.get("1030"), 0)
-        total_qty = buy_qty + sell_qty
-        components["buy_exec_qty_1031"] = buy_qty
-        components["sell_exec_qty_1030"] = sell_qty
-        if total_qty > 0:
-            imbalance = (buy_qty - sell_qty) / float(total_qty)
-            score += imbalance * 5.0
-            components["exec_qty_imbalance"] = round(imbalance, 6)
-            reasons.append("exec_qty_imbalance")
-
-        cum_volume = KiwoomWSManager._safe_abs_int(values.get("13"), 0)
-        prev_cum_volume = KiwoomWSManager._safe_abs_int(
-            previous_tick.get("cum_volume"), 0
-        )
-        components["cum_volume_13"] = cum_volume
-        components["prev_cum_volume_13"] = prev_cum_volume
-        if cum_volume > 0 and prev_cum_volume > 0:
-            delta = cum_volume - prev_cum_volume
-            components["cum_volume_delta"] = delta
-            if delta > 0 and signed_side in {"BUY", "SELL"}:
-                delta_score = min(2.0, float(delta) * 0.001)
-                score += delta_score if signed_side == "BUY" else -delta_score
-                reasons.append("cum_volume_delta_with_signed_volume")
-
-        strength = KiwoomWSManager._safe_float(values.get("228"), 0.0)
-        components["trade_strength_228"] = strength
-        if strength > 0:
-            # Kiwoom trade strength is generally interpreted around 100 as neutral.
-            strength_bias = max(-2.0, min(2.0, ((strength - 100.0) / 100.0) * 2.0))
-            score += strength_bias
-            components["trade_strength_bias"] = round(strength_bias, 6)
-            reasons.append("trade_strength_bias")
-
-        price = KiwoomWSManager._safe_abs_int(values.get("10"), 0)
-        prev_price = KiwoomWSManager._safe_abs_int(previous_tick.get("price"), 0)
-        components["prev_trade_price"] = prev_price
-        if price > 0 and prev_price > 0:
-            if price > prev_price:
-                score += 1.0
-                reasons.append("price_up_vs_prev")
-            elif price < prev_price:
-                score -= 1.0
-                reasons.append("price_down_vs_prev")
-
-        if score >= 1.5:
-            side = "BUY"
-        elif score <= -1.5:
-            side = "SELL"
-        else:
-            side = "UNKNOWN"
-        if reasons == ["signed_volume_positive"]:
-            quality = signed_quality
-        elif reasons == ["signed_volume_negative"]:
-            quality = signed_quality
-        elif reasons:
-            quality = "weighted_auxiliary_observation"
-        else:
-            quality = "auxiliary_observation_missing_or_neutral"
-        return {
-            "side": side,
-            "quality": quality,
-            "score": round(score, 6),
-            "reason": ";".join(reasons) if reasons else "insufficient_auxiliary_data",
-            "components": components,
-        }
+        fields = values if isinstance(values, Kiwoom0BFields) else None
+        if fields is None:
+            fields = FID_PARSE_PLANS["0B"].parse(
+                values if isinstance(values, dict) else {}
+            )
+        return infer_trade_auxiliary_score(fields, previous_tick=previous_tick)
 
     @staticmethod
     def _tick_time_to_epoch_ms(tick_time, *, now_ts=None):
@@ -747,9 +656,7 @@ class KiwoomWSManager:
         quote_source = (
             "0B_inline_best_quote"
             if inline_complete
-            else "partial_inline_best_quote"
-            if inline_partial
-            else "missing_best_quote"
+            else "partial_inline_best_quote" if inline_partial else "missing_best_quote"
         )
 
         if inline_complete:
@@ -1155,6 +1062,10 @@ class KiwoomWSManager:
         enforce=False,
         replacement_codes=(),
     ):
+        if getattr(self, "_ws_pool", None) is not None:
+            return self._apply_ws_pool_item_budget(
+                normalized_codes, register_items, enforce=enforce
+            )
         if not enforce:
             return normalized_codes, register_items, []
         max_items = self._max_registered_item_count()
@@ -1204,6 +1115,46 @@ class KiwoomWSManager:
 
         return allowed_codes, list(OrderedDict.fromkeys(allowed_items)), skipped_codes
 
+    def _apply_ws_pool_item_budget(self, normalized_codes, register_items, *, enforce):
+        """Pool mode: place each code on a connection within its own budget.
+
+        Unlike the single-socket budget, placement always runs (REG routing
+        needs a slot); ``enforce`` only decides whether a code that fits no
+        connection is skipped or over-committed to the least-loaded one.
+        """
+        max_items = self._max_registered_item_count()
+        items_by_code = self._items_by_code(normalized_codes, register_items)
+        with self._tick_lock:
+            priorities = {
+                code: self._tick_lanes.priority_for(code)
+                for code in normalized_codes or []
+            }
+        allowed_codes = []
+        allowed_items = []
+        skipped_codes = []
+        with self.lock:
+            for code in normalized_codes or []:
+                candidate_items = tuple(items_by_code.get(code) or ())
+                if not candidate_items:
+                    continue
+                slot = self._ws_pool.assign(
+                    code,
+                    len(candidate_items),
+                    priorities[code],
+                    max_items=max_items,
+                    enforce=enforce
+                    and not is_pinned_ws_observation_registration(
+                        code, candidate_items
+                    ),
+                )
+                if slot is None:
+                    skipped_codes.append(code)
+                    continue
+                self._ws_pool_unsent_codes.add(code)
+                allowed_codes.append(code)
+                allowed_items.extend(candidate_items)
+        return allowed_codes, list(OrderedDict.fromkeys(allowed_items)), skipped_codes
+
     @staticmethod
     def _recent_reg_ttl_sec():
         raw = _ws_hot_or_env_value("KORSTOCKSCAN_WS_REG_RECENT_TTL_SEC")
@@ -1428,6 +1379,26 @@ class KiwoomWSManager:
                 self._persistent_repair_request_ts[code] = now_ts
         return True, merged_targets
 
+    @staticmethod
+    def _freshness_target_view(target):
+        """Copy the few fields the freshness snapshot reads from a target."""
+        if not target:
+            return {}
+        type_ts = target.get("last_realtime_type_ts")
+        last_trade_tick = target.get("last_trade_tick")
+        return {
+            "last_realtime_type_ts": (
+                dict(type_ts) if isinstance(type_ts, dict) else type_ts
+            ),
+            "last_ws_update_ts": target.get("last_ws_update_ts"),
+            "last_trade_tick": (
+                {"cum_volume": last_trade_tick.get("cum_volume")}
+                if isinstance(last_trade_tick, dict)
+                else last_trade_tick
+            ),
+            "received_types": set(target.get("received_types") or ()),
+        }
+
     def get_subscription_freshness_snapshot(self, codes=None, *, now_ts=None):
         """Return client-side freshness state for subscribed websocket symbols."""
         now_value = time.time() if now_ts is None else float(now_ts)
@@ -1438,7 +1409,8 @@ class KiwoomWSManager:
             target_codes = requested_codes or sorted(self.subscribed_codes)
             registered_item_count = self._registered_item_count_locked()
             for code in target_codes:
-                target = self.realtime_data.get(code) or {}
+                with self._symbol_lock(code):
+                    target = self._freshness_target_view(self.realtime_data.get(code))
                 type_ts = target.get("last_realtime_type_ts")
                 type_ts = type_ts if isinstance(type_ts, dict) else {}
                 numeric_type_ts = [
@@ -1687,12 +1659,17 @@ class KiwoomWSManager:
         return allowed, skipped
 
     def _note_persistent_repair_attempt_locked(self, code, now_ts):
-        target = self.realtime_data.get(code) or {}
-        required_received = self._required_realtime_types_received_locked(code, target)
-        if required_received and (
-            target.get("_first_tick_logged")
-            or self._is_ws_ready(target, require_trade=False)
-        ):
+        with self._symbol_lock(code):
+            target = self.realtime_data.get(code) or {}
+            required_received = self._required_realtime_types_received_locked(
+                code, target
+            )
+            target_ready = bool(
+                target.get("_first_tick_logged")
+                or self._is_ws_ready(target, require_trade=False)
+            )
+            any_receipt = self._has_any_realtime_receipt(target)
+        if required_received and target_ready:
             self._persistent_repair_no_tick_attempts.pop(code, None)
             self._persistent_repair_stuck_until_ts.pop(code, None)
             return
@@ -1703,7 +1680,7 @@ class KiwoomWSManager:
         # quote receipt resets the counter and REMOVE/REG repair can run
         # forever.
         required_types = tuple(self._required_realtime_types_by_code.get(code) or ())
-        if not required_types and self._has_any_realtime_receipt(target):
+        if not required_types and any_receipt:
             self._persistent_repair_no_tick_attempts.pop(code, None)
             self._persistent_repair_stuck_until_ts.pop(code, None)
             return
@@ -1900,7 +1877,14 @@ class KiwoomWSManager:
             }
         return self.realtime_data[item_code]
 
-    def _update_micro_estimator_from_orderbook(self, item_code, target, *, now_ts):
+    def _update_micro_estimator_from_orderbook(
+        self, item_code, target, *, now_ts, deferred_quotes=None
+    ):
+        """Feed one 0D orderbook to the micro estimator store.
+
+        With ``deferred_quotes`` the quote is queued instead and the frame's
+        quotes are applied together by ``_flush_micro_estimator_quotes``.
+        """
         if not _micro_estimator_ws_observation_enabled():
             return
 
@@ -1939,6 +1923,9 @@ class KiwoomWSManager:
             "quote_stale": False,
             "source_quality_state": "fresh_ws_orderbook_observation",
         }
+        if deferred_quotes is not None:
+            deferred_quotes.append((item_code, quote))
+            return
         try:
             state = MICRO_ESTIMATOR_STORE.update_from_ws_quote(
                 item_code,
@@ -1951,6 +1938,35 @@ class KiwoomWSManager:
                 f"[MICRO_ESTIMATOR_WS_OBSERVATION] update failed code={item_code}: {exc}"
             )
             return
+        self._stamp_micro_estimator_observation(target, state, now_ts=now_ts)
+
+    @staticmethod
+    def _micro_estimator_batches_ws_quotes():
+        return hasattr(MICRO_ESTIMATOR_STORE, "update_ws_quotes")
+
+    def _flush_micro_estimator_quotes(self, deferred_quotes):
+        """Apply one frame's queued 0D quotes with a single batched update."""
+        now_ts = time.time()
+        try:
+            MICRO_ESTIMATOR_STORE.update_ws_quotes(
+                WSQuoteBatch.from_quotes(deferred_quotes),
+                now_ts=now_ts,
+                tier="warm",
+            )
+        except Exception as exc:
+            log_error(f"[MICRO_ESTIMATOR_WS_OBSERVATION] batch update failed: {exc}")
+            return
+        for item_code in OrderedDict.fromkeys(code for code, _ in deferred_quotes):
+            state = MICRO_ESTIMATOR_STORE.state(item_code)
+            with self._symbol_lock(item_code):
+                target = self.realtime_data.get(item_code)
+                if target is not None:
+                    self._stamp_micro_estimator_observation(
+                        target, state, now_ts=now_ts
+                    )
+
+    @staticmethod
+    def _stamp_micro_estimator_observation(target, state, *, now_ts):
         target["micro_estimator_ws_observation_ts"] = float(now_ts)
         target["micro_estimator_ws_observation_source"] = "0D_orderbook"
         target["micro_estimator_ws_observation_sample_count"] = int(
@@ -1981,22 +1997,111 @@ class KiwoomWSManager:
             return has_trade
         return has_trade or has_orderbook or has_program or has_timestamp
 
-    def wait_for_data(self, code, timeout=2.0, require_trade=False, poll_interval=0.05):
-        """REG 전송 후 첫 WS 데이터가 실제로 들어올 때까지 대기합니다."""
+    def _is_ws_ready_for(self, target, require_trade=False, types=None):
+        if types:
+            received_types = (target or {}).get("received_types") or set()
+            return all(realtime_type in received_types for realtime_type in types)
+        return self._is_ws_ready(target, require_trade=require_trade)
+
+    def _notify_data_arrival_locked(self, code, realtime_type):
+        for waiter in self._data_arrival_waiters.get(code, ()):
+            if waiter.types is None or realtime_type in waiter.types:
+                waiter.arrived.append(code)
+                waiter.event.set()
+
+    def _register_data_waiter_locked(self, waiter, code):
+        self._data_arrival_waiters.setdefault(code, set()).add(waiter)
+
+    def _unregister_data_waiter_locked(self, waiter, code):
+        waiters = self._data_arrival_waiters.get(code)
+        if waiters is None:
+            return
+        waiters.discard(waiter)
+        if not waiters:
+            del self._data_arrival_waiters[code]
+
+    def _wake_data_waiters(self):
+        for code in list(self._data_arrival_waiters):
+            with self._symbol_lock(code):
+                for waiter in self._data_arrival_waiters.get(code, ()):
+                    waiter.event.set()
+
+    def wait_for_any(
+        self, codes, types=None, timeout=2.0, require_trade=False, min_ready=1
+    ):
+        """Block until at least ``min_ready`` of ``codes`` are WS-ready.
+
+        ``types`` requires every listed realtime type (e.g. ``("0B",)``) to have
+        arrived; without it the ``wait_for_data`` readiness rule applies.
+        Waiters are woken by the apply path for their own codes only, so no
+        polling or snapshot copies happen while nothing arrives.  Returns
+        ``{code: snapshot}`` for every code ready at wake-up (possibly fewer
+        than ``min_ready`` on timeout or stop).
+        """
+        if isinstance(codes, str):
+            codes = [codes]
+        normalized = []
+        for code in codes or ():
+            code = self._normalize_code(code)
+            if code and code not in normalized:
+                normalized.append(code)
+        if not normalized:
+            return {}
+        types = tuple(types or ())
+        need = max(1, min(int(min_ready or 1), len(normalized)))
+        deadline = time.monotonic() + max(0.0, float(timeout or 0.0))
+        waiter = _DataArrivalWaiter(normalized, types)
+        ready = []
+
+        # Check and register per code under its stripe, so a frame applied
+        # between the check and the registration cannot be missed.
+        for code in normalized:
+            with self._symbol_lock(code):
+                if self._is_ws_ready_for(
+                    self.realtime_data.get(code), require_trade, types
+                ):
+                    ready.append(code)
+                else:
+                    self._register_data_waiter_locked(waiter, code)
+        try:
+            while len(ready) < need and not self._stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not waiter.event.wait(remaining):
+                    break
+                waiter.event.clear()
+                while waiter.arrived:
+                    code = waiter.arrived.popleft()
+                    if code in ready:
+                        continue
+                    with self._symbol_lock(code):
+                        if self._is_ws_ready_for(
+                            self.realtime_data.get(code), require_trade, types
+                        ):
+                            ready.append(code)
+        finally:
+            for code in normalized:
+                with self._symbol_lock(code):
+                    self._unregister_data_waiter_locked(waiter, code)
+        snapshots = {}
+        for code in ready:
+            with self._symbol_lock(code):
+                target = self.realtime_data.get(code)
+                if target:
+                    snapshots[code] = self._snapshot_target(target)
+        return snapshots
+
+    def wait_for_data(self, code, timeout=2.0, require_trade=False, poll_interval=None):
+        """REG 전송 후 첫 WS 데이터가 실제로 들어올 때까지 대기합니다.
+
+        해당 종목 프레임 적용 시점에 깨어나므로 폴링하지 않습니다.
+        ``poll_interval`` 은 하위 호환용으로만 남아 있습니다.
+        """
         code = self._normalize_code(code)
         if not code:
             return {}
 
-        deadline = time.time() + max(0.0, float(timeout or 0.0))
-        latest = {}
-
-        while time.time() < deadline and not self._stop_event.is_set():
-            latest = self.get_latest_data(code) or {}
-            if self._is_ws_ready(latest, require_trade=require_trade):
-                return latest
-            time.sleep(max(0.01, float(poll_interval or 0.05)))
-
-        return self.get_latest_data(code) or latest or {}
+        ready = self.wait_for_any([code], timeout=timeout, require_trade=require_trade)
+        return ready.get(code) or self.get_latest_data(code) or {}
 
     def _snapshot_target(self, target):
         snapshot = copy.deepcopy(target)
@@ -2022,28 +2127,43 @@ class KiwoomWSManager:
             }
         return snapshot
 
-    def _maybe_write_dashboard_snapshot(self):
-        now_ts = time.time()
-        if (
-            self._dashboard_snapshot_write_inflight
-            or now_ts - float(self._last_dashboard_snapshot_at or 0.0)
-            < _ws_dashboard_snapshot_interval_sec()
-        ):
+    def _mark_dashboard_snapshot_dirty(self, code):
+        publisher = self._dashboard_snapshot_publisher
+        if publisher is not None:
+            publisher.mark_dirty(code)
+
+    def _dashboard_snapshot_row(self, code):
+        with self._symbol_lock(code):
+            target = self.realtime_data.get(code)
+            return build_ws_snapshot_row(target) if target else None
+
+    def _start_dashboard_snapshot_publisher(self):
+        if not self._publish_dashboard_snapshot:
             return
-        self._last_dashboard_snapshot_at = now_ts
-        self._dashboard_snapshot_write_inflight = True
+        publisher = WSSnapshotPublisher(
+            build_row=self._dashboard_snapshot_row,
+            write_json=write_ws_snapshot_rows,
+            interval_sec=_ws_dashboard_snapshot_interval_sec(),
+            json_interval_sec=ws_dashboard_snapshot_json_interval_sec(),
+        )
+        try:
+            publisher.start()
+        except OSError as e:
+            log_error(f"[WS] dashboard snapshot publisher start failed: {e}")
+            return
+        self._dashboard_snapshot_publisher = publisher
 
-        def _write_snapshot_async():
-            try:
-                write_ws_snapshot(self.realtime_data, now_ts=now_ts)
-            except Exception as e:
-                log_error(f"[WS] dashboard snapshot write failed: {e}")
-            finally:
-                self._dashboard_snapshot_write_inflight = False
+    def _stop_dashboard_snapshot_publisher(self):
+        publisher = self._dashboard_snapshot_publisher
+        self._dashboard_snapshot_publisher = None
+        if publisher is not None:
+            publisher.stop(timeout=2.0)
 
-        threading.Thread(
-            target=_write_snapshot_async, name="bd-fbuy-ws-snapshot", daemon=True
-        ).start()
+    def get_dashboard_snapshot_publisher_snapshot(self):
+        publisher = self._dashboard_snapshot_publisher
+        if publisher is None:
+            return {"running": False}
+        return publisher.snapshot()
 
     def _enqueue_state_event(self, event_type, payload):
         if self._stop_event.is_set():
@@ -2158,8 +2278,22 @@ class KiwoomWSManager:
                 )
         with self._tick_lock:
             self._pending_tick_events[code] = {"code": code, "data": data}
+            self._tick_lanes.push(code)
         self._tick_dispatch_event.set()
 
+    def set_tick_priorities(self, priorities):
+        """Replace tick dispatch priority classes (``{code: class}``).
+
+        Codes not listed are dispatched as plain watches; see
+        ``kiwoom_tick_priority`` for the classes.
+        """
+        with self._tick_lock:
+            return self._tick_lanes.set_priorities(priorities or {})
+
+    def get_tick_dispatch_snapshot(self):
+        with self._tick_lock:
+            return self._tick_lanes.snapshot()
+
     def _start_micro_reversion_forward_collector(self):
         """Lazy-load the default-off observer without changing subscriptions."""
 
@@ -2402,11 +2536,18 @@ class KiwoomWSManager:
                 continue
 
             with self._tick_lock:
-                pending_items = list(self._pending_tick_events.values())
-                self._pending_tick_events.clear()
                 self._tick_dispatch_event.clear()
 
-            for payload in pending_items:
+            # One code per lock round-trip so a holding tick queued while a
+            # watch burst is being published goes out next.
+            while not self._stop_event.is_set():
+                with self._tick_lock:
+                    picked = self._tick_lanes.pop()
+                    if picked is None:
+                        break
+                    payload = self._pending_tick_events.pop(picked[0], None)
+                if payload is None:
+                    continue
                 try:
                     self.event_bus.publish("REALTIME_TICK_ARRIVED", payload)
                 except Exception as e:
@@ -2423,6 +2564,7 @@ class KiwoomWSManager:
         self._stop_event.set()
         self._micro_reversion_canary_monitor_stop_event.set()
         self._started = False
+        self._wake_data_waiters()
         self._session_ready.clear()
         self._tick_dispatch_event.set()
         self._cancel_pending_futures()
@@ -2451,6 +2593,12 @@ class KiwoomWSManager:
                 asyncio.run_coroutine_threadsafe(ws.close(), self.loop)
             except Exception as e:
                 log_error(f"[WS] stop() websocket close failed: {e}")
+        for pool_ws in list(getattr(self, "_ws_pool_sockets", {}).values()):
+            if self.loop and self.loop.is_running():
+                try:
+                    asyncio.run_coroutine_threadsafe(pool_ws.close(), self.loop)
+                except Exception as e:
+                    log_error(f"[WS_POOL] stop() websocket close failed: {e}")
 
         current_thread = threading.current_thread()
         for thread in [
@@ -2462,6 +2610,9 @@ class KiwoomWSManager:
             if thread and thread is not current_thread and thread.is_alive():
                 thread.join(timeout=2)
 
+        self._stop_ws_frame_pipeline()
+        self._stop_ws_frame_capture()
+        self._stop_dashboard_snapshot_publisher()
         self._close_micro_reversion_forward_collector()
         self.websocket = None
 
@@ -2589,6 +2740,7 @@ class KiwoomWSManager:
                 message = await asyncio.wait_for(ws.recv(), timeout=remaining)
             except asyncio.TimeoutError:
                 break
+            self._capture_ws_frame(message, time.perf_counter())
 
             try:
                 msg_dict = json.loads(message)
@@ -2664,6 +2816,7 @@ class KiwoomWSManager:
         # the readiness boundary. Reconnect restoration below intentionally uses
         # _send_reg(), whose normal safety gate waits for this event. Publish
         # readiness before restoring the prior symbol inventory.
+        self._mark_ws_pool_slot_up(WS_POOL_PRIMARY_SLOT)
         self._session_ready.set()
 
         if self.subscribed_codes:
@@ -2717,13 +2870,124 @@ class KiwoomWSManager:
         except Exception:
             pass
 
+    async def _ingest_ws_frame(self, message, received_perf):
+        if self._ws_frame_capture is not None:
+            self._capture_ws_frame(message, received_perf)
+        pipeline = self._ws_frame_pipeline
+        if pipeline is None:
+            await self._handle_message(message)
+            return
+        # Receive stage only timestamps and enqueues; a full queue parks the
+        # receiving coroutine instead of dropping frames.
+        if not pipeline.submit_nowait(message, received_perf):
+            await asyncio.to_thread(pipeline.put, message, received_perf)
+
+    def _mark_ws_pool_slot_up(self, slot):
+        pool = getattr(self, "_ws_pool", None)
+        if pool is None:
+            return
+        with self.lock:
+            pool.mark_up(slot)
+
+    def _mark_ws_pool_slot_down(self, slot):
+        """Release a dropped connection's codes and re-REG them elsewhere.
+
+        Must run on the WS event loop.
+        """
+        pool = getattr(self, "_ws_pool", None)
+        if pool is None:
+            return
+        with self.lock:
+            orphan_codes = pool.mark_down(slot)
+        if orphan_codes and not self._stop_event.is_set():
+            print(f"🔀 [WS_POOL] 연결 {slot} 끊김: {len(orphan_codes)}개 종목 재배치")
+            asyncio.ensure_future(self._rebalance_ws_pool(orphan_codes, slot))
+
+    async def _rebalance_ws_pool(self, codes, from_slot):
+        with self.lock:
+            live_codes = sorted(
+                set(codes).intersection(
+                    self.subscribed_codes | self._ws_pool_unsent_codes
+                )
+            )
+            observation_only_codes = self._micro_reversion_observation_only_codes
+            observation_items = [
+                self._micro_reversion_observation_items_by_code[code]
+                for code in live_codes
+                if code in observation_only_codes
+                and code in self._micro_reversion_observation_items_by_code
+            ]
+            trading_codes = [
+                code for code in live_codes if code not in observation_only_codes
+            ]
+        source = f"ws_pool_rebalance_slot{from_slot}"
+        if trading_codes:
+            await self._send_reg(trading_codes, enforce_item_budget=True, source=source)
+        if observation_items:
+            await self._send_reg(
+                observation_items,
+                enforce_item_budget=True,
+                realtime_types=("0B", "0D"),
+                source=source,
+            )
+
+    async def _run_ws_pool_connection(self, slot):
+        """Run one symbol-only pool connection until stop.
+
+        It logs in with the manager's current token, answers PING itself and
+        hands every other frame to the primary's ingest path.
+        """
+        while not self._stop_event.is_set():
+            try:
+                async with self._ws_connect(self.uri, ping_interval=None) as ws:
+                    await ws.send(json.dumps({"trnm": "LOGIN", "token": self.token}))
+                    await self._await_login_ack(ws)
+                    self._ws_pool_sockets[slot] = ws
+                    self._mark_ws_pool_slot_up(slot)
+                    print(f"✅ [WS_POOL] 보조 연결 {slot} 로그인 완료")
+                    while True:
+                        message = await ws.recv()
+                        received_perf = time.perf_counter()
+                        self._ws_pool.record_frame(slot)
+                        if '"PING"' in message:
+                            msg_dict = json.loads(message)
+                            if msg_dict.get("trnm") == "PING":
+                                await ws.send(
+                                    self._ping_echo_payload(message, msg_dict)
+                                )
+                                continue
+                        await self._ingest_ws_frame(message, received_perf)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                log_error(f"[WS_POOL] 보조 연결 {slot} 끊김: {e}")
+            finally:
+                self._ws_pool_sockets.pop(slot, None)
+                self._mark_ws_pool_slot_down(slot)
+            await asyncio.sleep(3)
+
+    def get_ws_pool_snapshot(self):
+        pool = getattr(self, "_ws_pool", None)
+        if pool is None:
+            return {"enabled": False}
+        with self.lock:
+            snapshot = pool.snapshot(self._max_registered_item_count())
+        return {"enabled": True, **snapshot}
+
     async def _run_ws(self):
+        pool_tasks = [
+            asyncio.ensure_future(self._run_ws_pool_connection(slot))
+            for slot in range(1, getattr(self._ws_pool, "size", 1))
+        ]
         while not self._stop_event.is_set():
             try:
                 print(f"🔌 [WS] 키움 서버({self.uri})에 연결을 시도합니다...")
-                async with websockets.connect(self.uri, ping_interval=None) as ws:
+                async with self._ws_connect(self.uri, ping_interval=None) as ws:
                     self.websocket = ws
                     self._session_ready.clear()
+                    self._start_ws_frame_capture()
                     print("✅ [WS] 웹소켓 연결 성공!")
 
                     login_packet = {"trnm": "LOGIN", "token": self.token}
@@ -2735,7 +2999,7 @@ class KiwoomWSManager:
 
                     while True:
                         message = await ws.recv()
-                        await self._handle_message(message)
+                        await self._ingest_ws_frame(message, time.perf_counter())
 
             except websockets.ConnectionClosed as e:
                 if self._stop_event.is_set():
@@ -2747,6 +3011,7 @@ class KiwoomWSManager:
                 )
                 self.websocket = None
                 self._session_ready.clear()
+                self._mark_ws_pool_slot_down(WS_POOL_PRIMARY_SLOT)
                 await asyncio.sleep(3)
             except _LoginAckFailure as e:
                 if self._stop_event.is_set():
@@ -2754,6 +3019,7 @@ class KiwoomWSManager:
 
                 self.websocket = None
                 self._session_ready.clear()
+                self._mark_ws_pool_slot_down(WS_POOL_PRIMARY_SLOT)
 
                 if self._is_auth_token_failure(e.code, e.message):
                     print(
@@ -2772,9 +3038,15 @@ class KiwoomWSManager:
                 print(f"🚨 [WS] 예상치 못한 오류: {e}")
                 self.websocket = None
                 self._session_ready.clear()
+                self._mark_ws_pool_slot_down(WS_POOL_PRIMARY_SLOT)
                 await asyncio.sleep(3)
         self.websocket = None
         self._session_ready.clear()
+        for task in pool_tasks:
+            task.cancel()
+        if pool_tasks:
+            await asyncio.gather(*pool_tasks, return_exceptions=True)
+        self._stop_ws_frame_capture()
 
     async def _handle_message(self, message):
         try:
@@ -2902,110 +3174,180 @@ class KiwoomWSManager:
             # 📈 [기존 트랙] 실시간 주가 / 호가 / 체결 / 조건검색 데이터 처리
             # =========================================================
             if trnm == "REAL" and "data" in msg_dict:
-                for d in msg_dict["data"]:
-                    values = d.get("values", {})
-                    if not values:
-                        continue
+                self._apply_realtime_items(msg_dict["data"])
+                self._flush_deferred_scalp_condition_matches_if_allowed()
 
-                    real_type = d.get("type")
-
-                    # 🚀 실시간 조건검색 편입/이탈 통보 가로채기 (02)
-                    if real_type == "02" or d.get("name") == "조건검색":
-                        if not is_ws_condition_search_enabled():
-                            continue
-                        seq = str(values.get("841", "")).strip()  # 💡 일련번호 추출
-                        code = str(values.get("9001", "")).replace("A", "").strip()
-                        insert_type = str(values.get("843", "")).strip()
-
-                        # 기억해둔 번호로 검색식 이름을 알아냅니다.
-                        cnd_name = self.condition_dict.get(seq) or "UNKNOWN_CONDITION"
-
-                        if insert_type == "I":
-                            if not _condition_match_intake_allowed(cnd_name):
-                                self._defer_scalp_condition_match(
-                                    {
-                                        "code": code,
-                                        "type": "REALTIME",
-                                        "condition_name": cnd_name,
-                                    }
-                                )
-                                continue
-                            # 💡 스나이퍼에게 출처(이름표)를 함께 보냅니다!
-                            self._enqueue_state_event(
-                                "CONDITION_MATCHED",
-                                {
-                                    "code": code,
-                                    "type": "REALTIME",
-                                    "condition_name": cnd_name,
-                                },
-                            )
-                        elif insert_type == "D":
-                            self._drop_deferred_scalp_condition_match(code, cnd_name)
-                            self._enqueue_state_event(
-                                "CONDITION_UNMATCHED",
-                                {
-                                    "code": code,
-                                    "type": "REALTIME",
-                                    "condition_name": cnd_name,
-                                },
-                            )
-                        continue
+        except websockets.ConnectionClosed:
+            pass
+        except Exception as e:
+            log_error(f"🚨 [WS] 메시지 파싱 에러 발생: {e} | Payload: {message[:150]}")
+
+    def _apply_realtime_items(self, items):
+        """Apply the ``data`` items of one REAL frame in arrival order."""
 
-                    # ===================================================
-                    # [트랙 A] 🚨 주문/체결 통보 가로채기 (ORDER_EXECUTED)
-                    # ===================================================
-                    if real_type == "00" or d.get("name") == "주문체결":
-                        notice = self._parse_order_execution_notice(
-                            values,
-                            source_type=real_type,
+        micro_quotes = [] if self._micro_estimator_batches_ws_quotes() else None
+        for d in items:
+            values = d.get("values", {})
+            if not values:
+                continue
+
+            real_type = d.get("type")
+
+            # 🚀 실시간 조건검색 편입/이탈 통보 가로채기 (02)
+            if real_type == "02" or d.get("name") == "조건검색":
+                if not is_ws_condition_search_enabled():
+                    continue
+                seq = str(values.get("841", "")).strip()  # 💡 일련번호 추출
+                code = str(values.get("9001", "")).replace("A", "").strip()
+                insert_type = str(values.get("843", "")).strip()
+
+                # 기억해둔 번호로 검색식 이름을 알아냅니다.
+                cnd_name = self.condition_dict.get(seq) or "UNKNOWN_CONDITION"
+
+                if insert_type == "I":
+                    if not _condition_match_intake_allowed(cnd_name):
+                        self._defer_scalp_condition_match(
+                            {
+                                "code": code,
+                                "type": "REALTIME",
+                                "condition_name": cnd_name,
+                            }
                         )
-                        status = notice["status"]
-                        code = notice["code"]
-                        order_no = notice["order_no"]
-                        order_type_str = notice["order_type_str"]
-                        broker_reject_reason_raw = notice[
-                            "broker_reject_reason_raw"
-                        ]
+                        continue
+                    # 💡 스나이퍼에게 출처(이름표)를 함께 보냅니다!
+                    self._enqueue_state_event(
+                        "CONDITION_MATCHED",
+                        {
+                            "code": code,
+                            "type": "REALTIME",
+                            "condition_name": cnd_name,
+                        },
+                    )
+                elif insert_type == "D":
+                    self._drop_deferred_scalp_condition_match(code, cnd_name)
+                    self._enqueue_state_event(
+                        "CONDITION_UNMATCHED",
+                        {
+                            "code": code,
+                            "type": "REALTIME",
+                            "condition_name": cnd_name,
+                        },
+                    )
+                continue
 
-                        print(
-                            f"📩 [WS 주문상태] {code} | 주문번호: '{order_no}' | "
-                            f"상태: '{status}' | 구분: '{order_type_str}' | "
-                            f"거부사유: '"
-                            f"{broker_reject_reason_raw if status == '거부' else '-'}'"
+            # ===================================================
+            # [트랙 A] 🚨 주문/체결 통보 가로채기 (ORDER_EXECUTED)
+            # ===================================================
+            if real_type == "00" or d.get("name") == "주문체결":
+                notice = self._parse_order_execution_notice(
+                    values,
+                    source_type=real_type,
+                )
+                status = notice["status"]
+                code = notice["code"]
+                order_no = notice["order_no"]
+                order_type_str = notice["order_type_str"]
+                broker_reject_reason_raw = notice["broker_reject_reason_raw"]
+
+                print(
+                    f"📩 [WS 주문상태] {code} | 주문번호: '{order_no}' | "
+                    f"상태: '{status}' | 구분: '{order_type_str}' | "
+                    f"거부사유: '"
+                    f"{broker_reject_reason_raw if status == '거부' else '-'}'"
+                )
+                if not notice["exec_type"]:
+                    log_error(
+                        "[WS_ORDER_RECEIPT_SOURCE_GAP] "
+                        f"code={code or '-'} order_no={order_no or '-'} "
+                        f"reason={notice['source_gap_reason']} "
+                        f"fid905={order_type_str or '-'}"
+                    )
+                    self._enqueue_state_event(
+                        "ORDER_EXECUTION_SOURCE_GAP",
+                        {
+                            "code": code,
+                            "order_no": order_no,
+                            "reason": notice["source_gap_reason"],
+                            "order_type_str": order_type_str,
+                            "broker_snapshot_refresh_required": True,
+                            "runtime_effect": False,
+                        },
+                    )
+                    continue
+                self._enqueue_state_event(
+                    "ORDER_NOTICE",
+                    {
+                        "code": code,
+                        "order_no": order_no,
+                        "type": notice["exec_type"],
+                        "status": status,
+                        "order_type_str": order_type_str,
+                        "broker_reject_reason_raw": (broker_reject_reason_raw),
+                        "broker_execution_raw_fields": notice[
+                            "broker_execution_raw_fields"
+                        ],
+                        "broker_execution_time_raw": notice[
+                            "broker_execution_time_raw"
+                        ],
+                        "actual_exchange_code": notice["actual_exchange_code"],
+                        "actual_exchange_name": notice["actual_exchange_name"],
+                        "actual_execution_venue": notice["actual_execution_venue"],
+                        "sor_flag": notice["sor_flag"],
+                        "time": datetime.now().strftime("%H:%M:%S"),
+                    },
+                )
+
+                if status == "체결":
+                    exec_price = notice["exec_price"]
+                    exec_qty = notice["exec_qty"]
+                    exec_type = notice["exec_type"]
+
+                    print(
+                        f"🔔 [WS 실제체결] {code} {exec_type} {exec_qty}주 @ {exec_price}원 (주문번호: {order_no})"
+                    )
+
+                    malformed_fids = set(notice.get("numeric_contract_errors") or [])
+                    if malformed_fids:
+                        log_error(
+                            "[WS_ORDER_RECEIPT_NUMERIC_SOURCE_GAP] "
+                            f"code={code} order_no={order_no or '-'} "
+                            f"fids={','.join(sorted(malformed_fids))}"
                         )
-                        if not notice["exec_type"]:
-                            log_error(
-                                "[WS_ORDER_RECEIPT_SOURCE_GAP] "
-                                f"code={code or '-'} order_no={order_no or '-'} "
-                                f"reason={notice['source_gap_reason']} "
-                                f"fid905={order_type_str or '-'}"
-                            )
-                            self._enqueue_state_event(
-                                "ORDER_EXECUTION_SOURCE_GAP",
-                                {
-                                    "code": code,
-                                    "order_no": order_no,
-                                    "reason": notice["source_gap_reason"],
-                                    "order_type_str": order_type_str,
-                                    "broker_snapshot_refresh_required": True,
-                                    "runtime_effect": False,
-                                },
-                            )
-                            continue
                         self._enqueue_state_event(
-                            "ORDER_NOTICE",
+                            "ORDER_EXECUTION_SOURCE_GAP",
                             {
                                 "code": code,
                                 "order_no": order_no,
-                                "type": notice["exec_type"],
-                                "status": status,
-                                "order_type_str": order_type_str,
-                                "broker_reject_reason_raw": (
-                                    broker_reject_reason_raw
-                                ),
-                                "broker_execution_raw_fields": notice[
-                                    "broker_execution_raw_fields"
+                                "reason": "official_integer_fid_malformed",
+                                "malformed_fids": sorted(malformed_fids),
+                                "broker_snapshot_refresh_required": True,
+                                "runtime_effect": False,
+                            },
+                        )
+
+                    # FID 910 is not custody authority.  When it is
+                    # blank/malformed but 903 supplies exact cumulative
+                    # notional, the receipt consumer can reconstruct the
+                    # leg price while marking unit/source provenance as
+                    # incomplete.  FID 911 remains mandatory for any
+                    # custody mutation.
+                    if exec_qty > 0 and exec_type in {"BUY", "SELL"}:
+                        self._enqueue_state_event(
+                            "ORDER_EXECUTED",
+                            {
+                                "code": code,
+                                "order_no": order_no,
+                                "type": exec_type,
+                                "price": exec_price,
+                                "qty": exec_qty,
+                                "order_qty": notice["order_qty"],
+                                "remaining_qty": notice["remaining_qty"],
+                                "cumulative_exec_amount": notice[
+                                    "cumulative_exec_amount"
                                 ],
+                                "execution_no": notice["execution_no"],
+                                "unit_exec_price": notice["unit_exec_price"],
+                                "unit_exec_qty": notice["unit_exec_qty"],
                                 "broker_execution_time_raw": notice[
                                     "broker_execution_time_raw"
                                 ],
@@ -3015,915 +3357,760 @@ class KiwoomWSManager:
                                     "actual_execution_venue"
                                 ],
                                 "sor_flag": notice["sor_flag"],
+                                **notice["broker_execution_raw_fields"],
+                                "execution_economics_reconstructable": bool(
+                                    exec_price > 0
+                                    or (
+                                        notice["cumulative_exec_amount"] is not None
+                                        and notice["cumulative_exec_amount"] > 0
+                                    )
+                                ),
                                 "time": datetime.now().strftime("%H:%M:%S"),
                             },
                         )
+                continue
 
-                        if status == "체결":
-                            exec_price = notice["exec_price"]
-                            exec_qty = notice["exec_qty"]
-                            exec_type = notice["exec_type"]
+            if real_type == "0s" or d.get("name") == "장시작시간":
+                self.market_session_state = str(values.get("215", "") or "").strip()
+                self.market_session_remaining = str(values.get("214", "") or "").strip()
+                event_key = (
+                    self.market_session_state,
+                    self.market_session_remaining,
+                    str(real_type or ""),
+                )
+                if event_key != self._last_market_session_event_key:
+                    self._last_market_session_event_key = event_key
+                    try:
+                        append_market_session_event(
+                            target_date=datetime.now().strftime("%Y-%m-%d"),
+                            event={
+                                "source": "kiwoom_websocket_0s",
+                                "real_type": real_type,
+                                "name": d.get("name"),
+                                "market_session_state": self.market_session_state,
+                                "market_session_remaining": self.market_session_remaining,
+                                "raw_values": dict(values),
+                            },
+                        )
+                    except Exception as exc:
+                        log_error(
+                            f"🚨 [WS] 장운영구분 source-quality artifact 기록 실패: {exc}"
+                        )
+                continue
 
-                            print(
-                                f"🔔 [WS 실제체결] {code} {exec_type} {exec_qty}주 @ {exec_price}원 (주문번호: {order_no})"
+            # ===================================================
+            # [트랙 B] 실시간 주가/호가 데이터 처리
+            # ===================================================
+            raw_item_code = d.get("item", "")
+            item_code = self._normalize_code(raw_item_code)
+            if item_code and real_type != "00":
+                if item_code not in self.subscribed_codes:
+                    continue
+                tick_event_snapshot = None
+                with self._symbol_lock(item_code):
+                    # 1. 초기 데이터 구조 생성
+                    target = self._ensure_target_defaults(item_code)
+
+                    # 💡 사전 컴파일된 FID 파싱 플랜으로 한 번에 변환
+                    fields = parse_realtime_fields(real_type, values)
+                    apply_quote_fields(target, fields)
+                    target["market_session_state"] = self.market_session_state
+                    target["market_session_remaining"] = self.market_session_remaining
+
+                    # '0B' 체결 데이터는 필드가 문서/계정에 따라 달라질 수 있어
+                    if real_type == "0B":
+                        signed_qty = fields.signed_qty
+                        current_price = target.get("curr", 0)
+                        trade_price = value_or(fields.curr, current_price)
+                        current_vpw = target.get("v_pw", 0.0)
+                        current_tick_suffix = self._ws_item_market_suffix(raw_item_code)
+                        current_tick_route = self._ws_item_route(raw_item_code)
+                        previous_tick = (
+                            target["recent_trade_ticks"][0]
+                            if isinstance(target.get("recent_trade_ticks"), deque)
+                            and len(target.get("recent_trade_ticks")) > 0
+                            else None
+                        )
+                        if previous_tick and (
+                            str(previous_tick.get("market_suffix") or "")
+                            != current_tick_suffix
+                            or str(previous_tick.get("market_route") or "")
+                            != current_tick_route
+                        ):
+                            previous_tick = None
+                        aux_fields = parse_0b_auxiliary_fields(
+                            fields,
+                            trade_price=trade_price,
+                            previous_tick=previous_tick,
+                        )
+                        tick_value = aux_fields["trade_value"]
+                        buy_qty = aux_fields["buy_qty"]
+                        sell_qty = aux_fields["sell_qty"]
+                        trade_volume = aux_fields["trade_volume"]
+                        buy_ratio = value_or(fields.buy_ratio, 0.0)
+                        target["tick_trade_value"] = tick_value
+                        target["tick_trade_value_source"] = aux_fields[
+                            "trade_value_source"
+                        ]
+                        target["tick_trade_value_fallback_volume_source"] = aux_fields[
+                            "trade_value_fallback_volume_source"
+                        ]
+                        target["trade_volume_source"] = aux_fields[
+                            "trade_volume_source"
+                        ]
+                        target["trade_volume_1030_1031_vs_15_mismatch"] = aux_fields[
+                            "split_qty_vs_15_mismatch"
+                        ]
+                        target["trade_volume_1030_1031_vs_15_delta"] = aux_fields[
+                            "split_qty_vs_15_delta"
+                        ]
+                        target["kiwoom_0b_aux_observed_count"] = (
+                            int(target.get("kiwoom_0b_aux_observed_count") or 0) + 1
+                        )
+                        if aux_fields["trade_value_source"] == "1313":
+                            target["kiwoom_0b_1313_present_count"] = (
+                                int(target.get("kiwoom_0b_1313_present_count") or 0) + 1
                             )
-
-                            malformed_fids = set(
-                                notice.get("numeric_contract_errors") or []
+                        else:
+                            target["kiwoom_0b_1313_missing_count"] = (
+                                int(target.get("kiwoom_0b_1313_missing_count") or 0) + 1
+                            )
+                        target["kiwoom_0b_trade_value_source_counts"] = (
+                            self._increment_counter_dict(
+                                target.get("kiwoom_0b_trade_value_source_counts"),
+                                aux_fields["trade_value_source"],
                             )
-                            if malformed_fids:
-                                log_error(
-                                    "[WS_ORDER_RECEIPT_NUMERIC_SOURCE_GAP] "
-                                    f"code={code} order_no={order_no or '-'} "
-                                    f"fids={','.join(sorted(malformed_fids))}"
-                                )
-                                self._enqueue_state_event(
-                                    "ORDER_EXECUTION_SOURCE_GAP",
-                                    {
-                                        "code": code,
-                                        "order_no": order_no,
-                                        "reason": "official_integer_fid_malformed",
-                                        "malformed_fids": sorted(malformed_fids),
-                                        "broker_snapshot_refresh_required": True,
-                                        "runtime_effect": False,
-                                    },
-                                )
-
-                            # FID 910 is not custody authority.  When it is
-                            # blank/malformed but 903 supplies exact cumulative
-                            # notional, the receipt consumer can reconstruct the
-                            # leg price while marking unit/source provenance as
-                            # incomplete.  FID 911 remains mandatory for any
-                            # custody mutation.
-                            if exec_qty > 0 and exec_type in {"BUY", "SELL"}:
-                                self._enqueue_state_event(
-                                    "ORDER_EXECUTED",
-                                    {
-                                        "code": code,
-                                        "order_no": order_no,
-                                        "type": exec_type,
-                                        "price": exec_price,
-                                        "qty": exec_qty,
-                                        "order_qty": notice["order_qty"],
-                                        "remaining_qty": notice["remaining_qty"],
-                                        "cumulative_exec_amount": notice[
-                                            "cumulative_exec_amount"
-                                        ],
-                                        "execution_no": notice["execution_no"],
-                                        "unit_exec_price": notice["unit_exec_price"],
-                                        "unit_exec_qty": notice["unit_exec_qty"],
-                                        "broker_execution_time_raw": notice[
-                                            "broker_execution_time_raw"
-                                        ],
-                                        "actual_exchange_code": notice[
-                                            "actual_exchange_code"
-                                        ],
-                                        "actual_exchange_name": notice[
-                                            "actual_exchange_name"
-                                        ],
-                                        "actual_execution_venue": notice[
-                                            "actual_execution_venue"
-                                        ],
-                                        "sor_flag": notice["sor_flag"],
-                                        **notice["broker_execution_raw_fields"],
-                                        "execution_economics_reconstructable": bool(
-                                            exec_price > 0
-                                            or (
-                                                notice["cumulative_exec_amount"]
-                                                is not None
-                                                and notice["cumulative_exec_amount"] > 0
-                                            )
-                                        ),
-                                        "time": datetime.now().strftime("%H:%M:%S"),
-                                    },
-                                )
-                        continue
-
-                    if real_type == "0s" or d.get("name") == "장시작시간":
-                        self.market_session_state = str(
-                            values.get("215", "") or ""
-                        ).strip()
-                        self.market_session_remaining = str(
-                            values.get("214", "") or ""
-                        ).strip()
-                        event_key = (
-                            self.market_session_state,
-                            self.market_session_remaining,
-                            str(real_type or ""),
                         )
-                        if event_key != self._last_market_session_event_key:
-                            self._last_market_session_event_key = event_key
-                            try:
-                                append_market_session_event(
-                                    target_date=datetime.now().strftime("%Y-%m-%d"),
-                                    event={
-                                        "source": "kiwoom_websocket_0s",
-                                        "real_type": real_type,
-                                        "name": d.get("name"),
-                                        "market_session_state": self.market_session_state,
-                                        "market_session_remaining": self.market_session_remaining,
-                                        "raw_values": dict(values),
-                                    },
-                                )
-                            except Exception as exc:
-                                log_error(
-                                    f"🚨 [WS] 장운영구분 source-quality artifact 기록 실패: {exc}"
-                                )
-                        continue
-
-                    # ===================================================
-                    # [트랙 B] 실시간 주가/호가 데이터 처리
-                    # ===================================================
-                    raw_item_code = d.get("item", "")
-                    item_code = self._normalize_code(raw_item_code)
-                    if item_code and real_type != "00":
-                        if item_code not in self.subscribed_codes:
-                            continue
-                        tick_event_snapshot = None
-                        with self.lock:
-                            # 1. 초기 데이터 구조 생성
-                            target = self._ensure_target_defaults(item_code)
-
-                            # 💡 안전한 파싱 헬퍼 (ValueError 방어막)
-                            def safe_int(val, default=0):
-                                val_str = (
-                                    str(val).replace("+", "").replace("-", "").strip()
-                                )
-                                return int(val_str) if val_str.isdigit() else default
-
-                            # 데이터 추출 및 할당
-                            if "10" in values:
-                                target["curr"] = safe_int(values["10"], target["curr"])
-                            if "16" in values:
-                                target["open"] = safe_int(
-                                    values["16"], target.get("open", 0)
-                                )
-                            if "17" in values:
-                                target["high"] = safe_int(
-                                    values["17"], target.get("high", 0)
-                                )
-                            if "18" in values:
-                                target["low"] = safe_int(
-                                    values["18"], target.get("low", 0)
-                                )
-                            if "13" in values:
-                                target["volume"] = safe_int(
-                                    values["13"], target.get("volume", 0)
-                                )
-
-                            if "12" in values:
-                                try:
-                                    target["fluctuation"] = float(
-                                        values["12"].replace("+", "")
-                                    )
-                                except ValueError:
-                                    pass
-
-                            if "228" in values:
-                                try:
-                                    target["v_pw"] = float(values["228"])
-                                except ValueError:
-                                    pass
-                            if "14" in values:
-                                target["cum_trade_value"] = safe_int(
-                                    values["14"], target.get("cum_trade_value", 0)
-                                )
-                            if "1313" in values:
-                                target["tick_trade_value"] = safe_int(
-                                    values["1313"], target.get("tick_trade_value", 0)
-                                )
-                            if "1030" in values:
-                                target["sell_exec_volume"] = safe_int(
-                                    values["1030"], target.get("sell_exec_volume", 0)
-                                )
-                            if "1031" in values:
-                                target["buy_exec_volume"] = safe_int(
-                                    values["1031"], target.get("buy_exec_volume", 0)
-                                )
-                            if "1032" in values:
-                                target["buy_ratio"] = self._safe_float(
-                                    values["1032"], target.get("buy_ratio", 0.0)
-                                )
-                            if "1314" in values:
-                                target["net_buy_exec_volume"] = self._safe_signed_int(
-                                    values["1314"], target.get("net_buy_exec_volume", 0)
-                                )
-                            if "1315" in values:
-                                target["sell_exec_single"] = safe_int(
-                                    values["1315"], target.get("sell_exec_single", 0)
-                                )
-                            if "1316" in values:
-                                target["buy_exec_single"] = safe_int(
-                                    values["1316"], target.get("buy_exec_single", 0)
-                                )
-
-                            if "121" in values:
-                                target["ask_tot"] = safe_int(values["121"])
-                            if "125" in values:
-                                target["bid_tot"] = safe_int(values["125"])
-                            if "128" in values:
-                                target["net_bid_depth"] = self._safe_signed_int(
-                                    values["128"], target.get("net_bid_depth", 0)
-                                )
-                            if "129" in values:
-                                target["bid_depth_ratio"] = self._safe_float(
-                                    values["129"], target.get("bid_depth_ratio", 0.0)
-                                )
-                            if "138" in values:
-                                target["net_ask_depth"] = self._safe_signed_int(
-                                    values["138"], target.get("net_ask_depth", 0)
-                                )
-                            if "139" in values:
-                                target["ask_depth_ratio"] = self._safe_float(
-                                    values["139"], target.get("ask_depth_ratio", 0.0)
-                                )
-                            target["market_session_state"] = self.market_session_state
-                            target["market_session_remaining"] = (
-                                self.market_session_remaining
+                        target["kiwoom_0b_trade_volume_source_counts"] = (
+                            self._increment_counter_dict(
+                                target.get("kiwoom_0b_trade_volume_source_counts"),
+                                aux_fields["trade_volume_source"],
                             )
-
-                            # '0B' 체결 데이터는 필드가 문서/계정에 따라 달라질 수 있어
-                            if real_type == "0B":
-                                signed_qty = self._safe_signed_int(values.get("15"), 0)
-                                current_price = target.get("curr", 0)
-                                trade_price = safe_int(values.get("10"), current_price)
-                                current_vpw = target.get("v_pw", 0.0)
-                                current_tick_suffix = self._ws_item_market_suffix(
-                                    raw_item_code
-                                )
-                                current_tick_route = self._ws_item_route(raw_item_code)
-                                previous_tick = (
-                                    target["recent_trade_ticks"][0]
-                                    if isinstance(
-                                        target.get("recent_trade_ticks"), deque
-                                    )
-                                    and len(target.get("recent_trade_ticks")) > 0
-                                    else None
-                                )
-                                if previous_tick and (
-                                    str(previous_tick.get("market_suffix") or "")
-                                    != current_tick_suffix
-                                    or str(previous_tick.get("market_route") or "")
-                                    != current_tick_route
-                                ):
-                                    previous_tick = None
-                                aux_fields = self._parse_0b_auxiliary_fields(
-                                    values,
-                                    trade_price=trade_price,
-                                    previous_tick=previous_tick,
-                                )
-                                tick_value = aux_fields["trade_value"]
-                                buy_qty = aux_fields["buy_qty"]
-                                sell_qty = aux_fields["sell_qty"]
-                                trade_volume = aux_fields["trade_volume"]
-                                buy_ratio = self._safe_float(values.get("1032"), 0.0)
-                                target["tick_trade_value"] = tick_value
-                                target["tick_trade_value_source"] = aux_fields[
-                                    "trade_value_source"
-                                ]
-                                target["tick_trade_value_fallback_volume_source"] = (
-                                    aux_fields["trade_value_fallback_volume_source"]
-                                )
-                                target["trade_volume_source"] = aux_fields[
-                                    "trade_volume_source"
-                                ]
-                                target["trade_volume_1030_1031_vs_15_mismatch"] = (
-                                    aux_fields["split_qty_vs_15_mismatch"]
-                                )
-                                target["trade_volume_1030_1031_vs_15_delta"] = (
-                                    aux_fields["split_qty_vs_15_delta"]
-                                )
-                                target["kiwoom_0b_aux_observed_count"] = (
-                                    int(target.get("kiwoom_0b_aux_observed_count") or 0)
-                                    + 1
-                                )
-                                if aux_fields["trade_value_source"] == "1313":
-                                    target["kiwoom_0b_1313_present_count"] = (
-                                        int(
-                                            target.get("kiwoom_0b_1313_present_count")
-                                            or 0
-                                        )
-                                        + 1
-                                    )
-                                else:
-                                    target["kiwoom_0b_1313_missing_count"] = (
-                                        int(
-                                            target.get("kiwoom_0b_1313_missing_count")
-                                            or 0
-                                        )
-                                        + 1
-                                    )
-                                target["kiwoom_0b_trade_value_source_counts"] = (
-                                    self._increment_counter_dict(
-                                        target.get(
-                                            "kiwoom_0b_trade_value_source_counts"
-                                        ),
-                                        aux_fields["trade_value_source"],
+                        )
+                        if aux_fields["split_qty_vs_15_evaluable"]:
+                            target["kiwoom_0b_1030_1031_vs_15_evaluable_count"] = (
+                                int(
+                                    target.get(
+                                        "kiwoom_0b_1030_1031_vs_15_evaluable_count"
                                     )
+                                    or 0
                                 )
-                                target["kiwoom_0b_trade_volume_source_counts"] = (
-                                    self._increment_counter_dict(
+                                + 1
+                            )
+                            if aux_fields["split_qty_vs_15_mismatch"]:
+                                target["kiwoom_0b_1030_1031_vs_15_mismatch_count"] = (
+                                    int(
                                         target.get(
-                                            "kiwoom_0b_trade_volume_source_counts"
-                                        ),
-                                        aux_fields["trade_volume_source"],
-                                    )
-                                )
-                                if aux_fields["split_qty_vs_15_evaluable"]:
-                                    target[
-                                        "kiwoom_0b_1030_1031_vs_15_evaluable_count"
-                                    ] = (
-                                        int(
-                                            target.get(
-                                                "kiwoom_0b_1030_1031_vs_15_evaluable_count"
-                                            )
-                                            or 0
-                                        )
-                                        + 1
-                                    )
-                                    if aux_fields["split_qty_vs_15_mismatch"]:
-                                        target[
                                             "kiwoom_0b_1030_1031_vs_15_mismatch_count"
-                                        ] = (
-                                            int(
-                                                target.get(
-                                                    "kiwoom_0b_1030_1031_vs_15_mismatch_count"
-                                                )
-                                                or 0
-                                            )
-                                            + 1
                                         )
-                                inline_best_ask = safe_int(values.get("27"), 0)
-                                inline_best_bid = safe_int(values.get("28"), 0)
-                                tick_time = str(
-                                    values.get("20")
-                                    or datetime.now().strftime("%H%M%S")
-                                )
-                                received_ts = time.time()
-                                quote_resolution = self._resolve_0b_touch_quote(
-                                    item_code,
-                                    inline_best_ask=inline_best_ask,
-                                    inline_best_bid=inline_best_bid,
-                                    tick_time=tick_time,
-                                    received_ts=received_ts,
-                                )
-                                best_ask = quote_resolution["best_ask"]
-                                best_bid = quote_resolution["best_bid"]
-                                quote_complete = (
-                                    best_ask > 0
-                                    and best_bid > 0
-                                    and quote_resolution["quote_source"]
-                                    in {
-                                        "0B_inline_best_quote",
-                                        "cached_top_of_book_ttl",
-                                    }
-                                )
-                                if quote_complete:
-                                    touch_side, touch_quality = (
-                                        self._infer_trade_aggressor_from_touch(
-                                            trade_price,
-                                            best_ask,
-                                            best_bid,
-                                        )
-                                    )
-                                else:
-                                    touch_side = "UNKNOWN"
-                                    touch_quality = "missing_best_quote"
-                                aux_context = self._infer_trade_auxiliary_score(
-                                    values,
-                                    previous_tick=previous_tick,
-                                )
-                                signed_side, signed_quality = (
-                                    self._infer_signed_trade_volume_auxiliary(
-                                        values.get("15")
-                                    )
-                                )
-                                touch_source = (
-                                    "orderbook_touch"
-                                    if quote_resolution["quote_source"]
-                                    == "0B_inline_best_quote"
-                                    else (
-                                        "cached_orderbook_touch"
-                                        if quote_resolution["cache_used"]
-                                        else "missing_best_quote"
-                                    )
-                                )
-                                touch_quality_value = (
-                                    touch_quality
-                                    if quote_resolution["quote_source"]
-                                    == "0B_inline_best_quote"
-                                    else (
-                                        f"cached_quote_{touch_quality}"
-                                        if quote_resolution["cache_used"]
-                                        else touch_quality
-                                    )
-                                )
-                                if signed_side in {"BUY", "SELL"}:
-                                    aggressor_side = signed_side
-                                    aggressor_source = "kiwoom_0b_signed_trade_volume"
-                                    aggressor_quality = (
-                                        self._primary_signed_trade_volume_quality(
-                                            signed_quality
-                                        )
-                                    )
-                                else:
-                                    aggressor_side = touch_side
-                                    aggressor_source = touch_source
-                                    aggressor_quality = touch_quality_value
-                                touch_confirms_signed = None
-                                if signed_side in {"BUY", "SELL"} and touch_side in {
-                                    "BUY",
-                                    "SELL",
-                                }:
-                                    touch_confirms_signed = signed_side == touch_side
-                                trusted_buy_volume = (
-                                    trade_volume if aggressor_side == "BUY" else 0
-                                )
-                                trusted_sell_volume = (
-                                    trade_volume if aggressor_side == "SELL" else 0
-                                )
-                                normalized_tick = {
-                                    "time": tick_time,
-                                    "exchange_time_raw": str(values.get("20") or ""),
-                                    "exchange_code_9081": str(values.get("9081") or ""),
-                                    "price": trade_price,
-                                    "volume": int(trade_volume or 0),
-                                    "market_suffix": current_tick_suffix,
-                                    "market_route": current_tick_route,
-                                    "volume_source": aux_fields["trade_volume_source"],
-                                    "dir": aggressor_side,
-                                    "aggressor_side": aggressor_side,
-                                    "aggressor_source": aggressor_source,
-                                    "aggressor_quality": aggressor_quality,
-                                    "aggressor_quote_source": quote_resolution[
-                                        "quote_source"
-                                    ],
-                                    "aggressor_tick_sync": quote_resolution[
-                                        "tick_sync"
-                                    ],
-                                    "aggressor_cache_used": quote_resolution[
-                                        "cache_used"
-                                    ],
-                                    "aggressor_quote_age_ms": quote_resolution[
-                                        "quote_age_ms"
-                                    ],
-                                    "aggressor_tob_miss_count": quote_resolution[
-                                        "tob_miss_count"
-                                    ],
-                                    "aggressor_backoff_active": quote_resolution[
-                                        "backoff_active"
-                                    ],
-                                    "aggressor_touch_side": touch_side,
-                                    "aggressor_touch_source": touch_source,
-                                    "aggressor_touch_quality": touch_quality_value,
-                                    "aggressor_touch_confirms_signed": touch_confirms_signed,
-                                    "aggressor_aux_side": aux_context["side"],
-                                    "aggressor_aux_source": (
-                                        "weighted_auxiliary_observation"
-                                        if aux_context["reason"]
-                                        != "insufficient_auxiliary_data"
-                                        else "none"
-                                    ),
-                                    "aggressor_aux_quality": aux_context["quality"],
-                                    "aggressor_aux_score": aux_context["score"],
-                                    "aggressor_aux_reason": aux_context["reason"],
-                                    "aggressor_aux_components": aux_context[
-                                        "components"
-                                    ],
-                                    "aggressor_aux_pressure_usable": False,
-                                    "aggressor_aux_raw_15": str(values.get("15") or ""),
-                                    "signed_trade_volume": str(values.get("15") or ""),
-                                    "buyer_vol": trusted_buy_volume,
-                                    "seller_vol": trusted_sell_volume,
-                                    "buy_exec_cum_1031": buy_qty,
-                                    "sell_exec_cum_1030": sell_qty,
-                                    "buy_ratio_1032": str(values.get("1032") or ""),
-                                    "tick_trade_value": tick_value,
-                                    "tick_trade_value_source": aux_fields[
-                                        "trade_value_source"
-                                    ],
-                                    "tick_trade_value_fallback_volume_source": aux_fields[
-                                        "trade_value_fallback_volume_source"
-                                    ],
-                                    "trade_volume_1030_1031_sum": aux_fields[
-                                        "split_qty_sum"
-                                    ],
-                                    "trade_volume_1030_1031_available": aux_fields[
-                                        "split_qty_available"
-                                    ],
-                                    "trade_volume_1030_1031_advisory_only": aux_fields[
-                                        "split_qty_advisory_only"
-                                    ],
-                                    "trade_volume_1030_1031_vs_15_mismatch": aux_fields[
-                                        "split_qty_vs_15_mismatch"
-                                    ],
-                                    "trade_volume_1030_1031_vs_15_delta": aux_fields[
-                                        "split_qty_vs_15_delta"
-                                    ],
-                                    "best_ask": best_ask,
-                                    "best_bid": best_bid,
-                                    "cum_volume": safe_int(values.get("13"), 0),
-                                    "prev_cum_volume": aux_fields["prev_cum_volume"],
-                                    "cum_volume_delta": aux_fields["cum_volume_delta"],
-                                    "quote_age_ms": quote_resolution["quote_age_ms"],
-                                    "strength": current_vpw,
-                                    "received_at_ms": int(received_ts * 1000),
-                                }
-                                target["last_trade_tick"] = {
-                                    "ts": received_ts,
-                                    "values": values,
-                                    **normalized_tick,
-                                }
-                                if isinstance(target.get("recent_trade_ticks"), deque):
-                                    target["recent_trade_ticks"].appendleft(
-                                        normalized_tick
+                                        or 0
                                     )
-                                route_tick_buffers = target.setdefault(
-                                    "recent_trade_ticks_by_route", {}
+                                    + 1
                                 )
-                                if isinstance(route_tick_buffers, dict):
-                                    route_key = (
-                                        f"{normalized_tick['market_suffix'] or 'KRX'}"
-                                        f"|{normalized_tick['market_route'] or 'unknown'}"
-                                    )
-                                    route_buffer = route_tick_buffers.get(route_key)
-                                    if not isinstance(route_buffer, deque):
-                                        route_buffer = deque(maxlen=120)
-                                        route_tick_buffers[route_key] = route_buffer
-                                    route_buffer.appendleft(normalized_tick)
-                                ORDERBOOK_STABILITY_OBSERVER.record_trade(
-                                    item_code,
-                                    price=trade_price,
-                                    ts=target["last_trade_tick"]["ts"],
+                        inline_best_ask = fields.best_ask
+                        inline_best_bid = fields.best_bid
+                        tick_time = fields.exchange_time_raw or datetime.now().strftime(
+                            "%H%M%S"
+                        )
+                        received_ts = time.time()
+                        quote_resolution = self._resolve_0b_touch_quote(
+                            item_code,
+                            inline_best_ask=inline_best_ask,
+                            inline_best_bid=inline_best_bid,
+                            tick_time=tick_time,
+                            received_ts=received_ts,
+                        )
+                        best_ask = quote_resolution["best_ask"]
+                        best_bid = quote_resolution["best_bid"]
+                        quote_complete = (
+                            best_ask > 0
+                            and best_bid > 0
+                            and quote_resolution["quote_source"]
+                            in {
+                                "0B_inline_best_quote",
+                                "cached_top_of_book_ttl",
+                            }
+                        )
+                        if quote_complete:
+                            touch_side, touch_quality = (
+                                self._infer_trade_aggressor_from_touch(
+                                    trade_price,
+                                    best_ask,
+                                    best_bid,
                                 )
-                                self._append_strength_momentum(
-                                    target,
-                                    current_price=current_price,
-                                    current_vpw=current_vpw,
-                                    signed_qty=signed_qty,
-                                    tick_value=tick_value,
-                                    tick_value_source=aux_fields["trade_value_source"],
-                                    buy_ratio=buy_ratio,
-                                    buy_qty=buy_qty,
-                                    sell_qty=sell_qty,
-                                    aggressor_side=aggressor_side,
+                            )
+                        else:
+                            touch_side = "UNKNOWN"
+                            touch_quality = "missing_best_quote"
+                        aux_context = infer_trade_auxiliary_score(
+                            fields,
+                            previous_tick=previous_tick,
+                        )
+                        signed_side, signed_quality = fields.signed_side
+                        touch_source = (
+                            "orderbook_touch"
+                            if quote_resolution["quote_source"]
+                            == "0B_inline_best_quote"
+                            else (
+                                "cached_orderbook_touch"
+                                if quote_resolution["cache_used"]
+                                else "missing_best_quote"
+                            )
+                        )
+                        touch_quality_value = (
+                            touch_quality
+                            if quote_resolution["quote_source"]
+                            == "0B_inline_best_quote"
+                            else (
+                                f"cached_quote_{touch_quality}"
+                                if quote_resolution["cache_used"]
+                                else touch_quality
+                            )
+                        )
+                        if signed_side in {"BUY", "SELL"}:
+                            aggressor_side = signed_side
+                            aggressor_source = "kiwoom_0b_signed_trade_volume"
+                            aggressor_quality = (
+                                self._primary_signed_trade_volume_quality(
+                                    signed_quality
                                 )
+                            )
+                        else:
+                            aggressor_side = touch_side
+                            aggressor_source = touch_source
+                            aggressor_quality = touch_quality_value
+                        touch_confirms_signed = None
+                        if signed_side in {"BUY", "SELL"} and touch_side in {
+                            "BUY",
+                            "SELL",
+                        }:
+                            touch_confirms_signed = signed_side == touch_side
+                        trusted_buy_volume = (
+                            trade_volume if aggressor_side == "BUY" else 0
+                        )
+                        trusted_sell_volume = (
+                            trade_volume if aggressor_side == "SELL" else 0
+                        )
+                        normalized_tick = {
+                            "time": tick_time,
+                            "exchange_time_raw": fields.exchange_time_raw,
+                            "exchange_code_9081": fields.exchange_code_9081,
+                            "price": trade_price,
+                            "volume": int(trade_volume or 0),
+                            "market_suffix": current_tick_suffix,
+                            "market_route": current_tick_route,
+                            "volume_source": aux_fields["trade_volume_source"],
+                            "dir": aggressor_side,
+                            "aggressor_side": aggressor_side,
+                            "aggressor_source": aggressor_source,
+                            "aggressor_quality": aggressor_quality,
+                            "aggressor_quote_source": quote_resolution["quote_source"],
+                            "aggressor_tick_sync": quote_resolution["tick_sync"],
+                            "aggressor_cache_used": quote_resolution["cache_used"],
+                            "aggressor_quote_age_ms": quote_resolution["quote_age_ms"],
+                            "aggressor_tob_miss_count": quote_resolution[
+                                "tob_miss_count"
+                            ],
+                            "aggressor_backoff_active": quote_resolution[
+                                "backoff_active"
+                            ],
+                            "aggressor_touch_side": touch_side,
+                            "aggressor_touch_source": touch_source,
+                            "aggressor_touch_quality": touch_quality_value,
+                            "aggressor_touch_confirms_signed": touch_confirms_signed,
+                            "aggressor_aux_side": aux_context["side"],
+                            "aggressor_aux_source": (
+                                "weighted_auxiliary_observation"
+                                if aux_context["reason"]
+                                != "insufficient_auxiliary_data"
+                                else "none"
+                            ),
+                            "aggressor_aux_quality": aux_context["quality"],
+                            "aggressor_aux_score": aux_context["score"],
+                            "aggressor_aux_reason": aux_context["reason"],
+                            "aggressor_aux_components": aux_context["components"],
+                            "aggressor_aux_pressure_usable": False,
+                            "aggressor_aux_raw_15": fields.signed_qty_text,
+                            "signed_trade_volume": fields.signed_qty_text,
+                            "buyer_vol": trusted_buy_volume,
+                            "seller_vol": trusted_sell_volume,
+                            "buy_exec_cum_1031": buy_qty,
+                            "sell_exec_cum_1030": sell_qty,
+                            "buy_ratio_1032": fields.buy_ratio_text,
+                            "tick_trade_value": tick_value,
+                            "tick_trade_value_source": aux_fields["trade_value_source"],
+                            "tick_trade_value_fallback_volume_source": aux_fields[
+                                "trade_value_fallback_volume_source"
+                            ],
+                            "trade_volume_1030_1031_sum": aux_fields["split_qty_sum"],
+                            "trade_volume_1030_1031_available": aux_fields[
+                                "split_qty_available"
+                            ],
+                            "trade_volume_1030_1031_advisory_only": aux_fields[
+                                "split_qty_advisory_only"
+                            ],
+                            "trade_volume_1030_1031_vs_15_mismatch": aux_fields[
+                                "split_qty_vs_15_mismatch"
+                            ],
+                            "trade_volume_1030_1031_vs_15_delta": aux_fields[
+                                "split_qty_vs_15_delta"
+                            ],
+                            "best_ask": best_ask,
+                            "best_bid": best_bid,
+                            "cum_volume": value_or(fields.volume, 0),
+                            "prev_cum_volume": aux_fields["prev_cum_volume"],
+                            "cum_volume_delta": aux_fields["cum_volume_delta"],
+                            "quote_age_ms": quote_resolution["quote_age_ms"],
+                            "strength": current_vpw,
+                            "received_at_ms": int(received_ts * 1000),
+                        }
+                        target["last_trade_tick"] = {
+                            "ts": received_ts,
+                            "values": values,
+                            **normalized_tick,
+                        }
+                        if isinstance(target.get("recent_trade_ticks"), deque):
+                            target["recent_trade_ticks"].appendleft(normalized_tick)
+                        route_tick_buffers = target.setdefault(
+                            "recent_trade_ticks_by_route", {}
+                        )
+                        if isinstance(route_tick_buffers, dict):
+                            route_key = (
+                                f"{normalized_tick['market_suffix'] or 'KRX'}"
+                                f"|{normalized_tick['market_route'] or 'unknown'}"
+                            )
+                            route_buffer = route_tick_buffers.get(route_key)
+                            if not isinstance(route_buffer, deque):
+                                route_buffer = deque(maxlen=120)
+                                route_tick_buffers[route_key] = route_buffer
+                            route_buffer.appendleft(normalized_tick)
+                        ORDERBOOK_STABILITY_OBSERVER.record_trade(
+                            item_code,
+                            price=trade_price,
+                            ts=target["last_trade_tick"]["ts"],
+                        )
+                        self._append_strength_momentum(
+                            target,
+                            current_price=current_price,
+                            current_vpw=current_vpw,
+                            signed_qty=signed_qty,
+                            tick_value=tick_value,
+                            tick_value_source=aux_fields["trade_value_source"],
+                            buy_ratio=buy_ratio,
+                            buy_qty=buy_qty,
+                            sell_qty=sell_qty,
+                            aggressor_side=aggressor_side,
+                        )
 
-                            # '0D' 주식호가잔량 데이터 파싱 (1~5호가)
-                            if real_type == "0D":
-                                if self._micro_reversion_depth_capture_requested():
-                                    target["last_depth_tick"] = (
-                                        self._build_micro_reversion_depth_tick(
-                                            raw_item_code, values
-                                        )
-                                    )
-                                else:
-                                    target.pop("last_depth_tick", None)
-                                asks, bids = [], []
-                                for i in range(1, 6):
-                                    ask_p = values.get(str(40 + i))
-                                    ask_v = values.get(str(60 + i))
-                                    bid_p = values.get(str(50 + i))
-                                    bid_v = values.get(str(70 + i))
-
-                                    if ask_p and ask_v:
-                                        asks.append(
-                                            {
-                                                "price": safe_int(ask_p),
-                                                "volume": safe_int(ask_v),
-                                            }
-                                        )
-                                    if bid_p and bid_v:
-                                        bids.append(
-                                            {
-                                                "price": safe_int(bid_p),
-                                                "volume": safe_int(bid_v),
-                                            }
-                                        )
-
-                                target["orderbook"]["asks"] = asks[::-1]
-                                target["orderbook"]["bids"] = bids
-                                best_ask = (
-                                    target["orderbook"]["asks"][0].get("price", 0)
-                                    if target["orderbook"]["asks"]
-                                    else 0
-                                )
-                                best_bid = (
-                                    target["orderbook"]["bids"][0].get("price", 0)
-                                    if target["orderbook"]["bids"]
-                                    else 0
-                                )
-                                best_ask_qty = (
-                                    target["orderbook"]["asks"][0].get("volume", 0)
-                                    if target["orderbook"]["asks"]
-                                    else 0
-                                )
-                                best_bid_qty = (
-                                    target["orderbook"]["bids"][0].get("volume", 0)
-                                    if target["orderbook"]["bids"]
-                                    else 0
-                                )
-                                ask_depth_l = sum(
-                                    int(level.get("volume", 0) or 0)
-                                    for level in target["orderbook"]["asks"]
-                                )
-                                bid_depth_l = sum(
-                                    int(level.get("volume", 0) or 0)
-                                    for level in target["orderbook"]["bids"]
-                                )
-                                expected_price = safe_int(
-                                    values.get("291") or values.get("23")
-                                )
-                                expected_qty = safe_int(
-                                    values.get("292") or values.get("24")
-                                )
-                                if expected_price > 0 or expected_qty > 0:
-                                    target["expected_open"] = {
-                                        "price": expected_price,
-                                        "qty": expected_qty,
-                                        "price_vs_prev": safe_int(
-                                            values.get("294") or values.get("200")
-                                        ),
-                                        "price_vs_prev_rate": self._safe_float(
-                                            values.get("295") or values.get("201"), 0.0
-                                        ),
-                                        "sign": values.get("293")
-                                        or values.get("238")
-                                        or "",
-                                        "volume_vs_prev_rate": self._safe_float(
-                                            values.get("299"), 0.0
-                                        ),
-                                        "source": "0D_expected_open",
-                                        "valid_during_expected_session": True,
-                                        "raw_field_ids": [
-                                            "291",
-                                            "292",
-                                            "293",
-                                            "294",
-                                            "295",
-                                            "299",
-                                        ],
-                                    }
-                                ORDERBOOK_STABILITY_OBSERVER.record_quote(
-                                    item_code,
-                                    best_bid=best_bid,
-                                    best_ask=best_ask,
-                                    best_bid_qty=best_bid_qty,
-                                    best_ask_qty=best_ask_qty,
-                                    bid_depth_l=bid_depth_l,
-                                    ask_depth_l=ask_depth_l,
-                                )
-                                self._update_tob_cache(
-                                    item_code,
-                                    best_ask=best_ask,
-                                    best_bid=best_bid,
-                                    now_ms=int(time.time() * 1000),
-                                )
-                                self._update_micro_estimator_from_orderbook(
-                                    item_code,
-                                    target,
-                                    now_ts=time.time(),
+                    # '0D' 주식호가잔량 데이터 파싱 (1~5호가)
+                    if real_type == "0D":
+                        if self._micro_reversion_depth_capture_requested():
+                            target["last_depth_tick"] = (
+                                self._build_micro_reversion_depth_tick(
+                                    raw_item_code, values
                                 )
+                            )
+                        else:
+                            target.pop("last_depth_tick", None)
+                        asks = [
+                            {"price": price, "volume": volume}
+                            for price, volume in zip(
+                                fields.ask_prices, fields.ask_volumes
+                            )
+                            if price is not None and volume is not None
+                        ]
+                        bids = [
+                            {"price": price, "volume": volume}
+                            for price, volume in zip(
+                                fields.bid_prices, fields.bid_volumes
+                            )
+                            if price is not None and volume is not None
+                        ]
 
-                            # '0w' 프로그램 매매 데이터 파싱
-                            if real_type == "0w":
-                                program_observed_at = time.time()
-                                program_requested_at = self._safe_float(
-                                    target.get("program_subscription_requested_at"),
+                        target["orderbook"]["asks"] = asks[::-1]
+                        target["orderbook"]["bids"] = bids
+                        best_ask = (
+                            target["orderbook"]["asks"][0].get("price", 0)
+                            if target["orderbook"]["asks"]
+                            else 0
+                        )
+                        best_bid = (
+                            target["orderbook"]["bids"][0].get("price", 0)
+                            if target["orderbook"]["bids"]
+                            else 0
+                        )
+                        best_ask_qty = (
+                            target["orderbook"]["asks"][0].get("volume", 0)
+                            if target["orderbook"]["asks"]
+                            else 0
+                        )
+                        best_bid_qty = (
+                            target["orderbook"]["bids"][0].get("volume", 0)
+                            if target["orderbook"]["bids"]
+                            else 0
+                        )
+                        ask_depth_l = sum(
+                            int(level.get("volume", 0) or 0)
+                            for level in target["orderbook"]["asks"]
+                        )
+                        bid_depth_l = sum(
+                            int(level.get("volume", 0) or 0)
+                            for level in target["orderbook"]["bids"]
+                        )
+                        expected_price = safe_digits_int(
+                            fields.expected_price_291 or fields.expected_price_23
+                        )
+                        expected_qty = safe_digits_int(
+                            fields.expected_qty_292 or fields.expected_qty_24
+                        )
+                        if expected_price > 0 or expected_qty > 0:
+                            target["expected_open"] = {
+                                "price": expected_price,
+                                "qty": expected_qty,
+                                "price_vs_prev": safe_digits_int(
+                                    fields.expected_vs_prev_294
+                                    or fields.expected_vs_prev_200
+                                ),
+                                "price_vs_prev_rate": safe_float(
+                                    fields.expected_rate_295
+                                    or fields.expected_rate_201,
                                     0.0,
-                                )
-                                if (
-                                    self._safe_float(
-                                        target.get("program_first_observed_at"),
+                                ),
+                                "sign": fields.expected_sign_293
+                                or fields.expected_sign_238
+                                or "",
+                                "volume_vs_prev_rate": safe_float(
+                                    fields.expected_volume_rate_299, 0.0
+                                ),
+                                "source": "0D_expected_open",
+                                "valid_during_expected_session": True,
+                                "raw_field_ids": [
+                                    "291",
+                                    "292",
+                                    "293",
+                                    "294",
+                                    "295",
+                                    "299",
+                                ],
+                            }
+                        ORDERBOOK_STABILITY_OBSERVER.record_quote(
+                            item_code,
+                            best_bid=best_bid,
+                            best_ask=best_ask,
+                            best_bid_qty=best_bid_qty,
+                            best_ask_qty=best_ask_qty,
+                            bid_depth_l=bid_depth_l,
+                            ask_depth_l=ask_depth_l,
+                        )
+                        self._update_tob_cache(
+                            item_code,
+                            best_ask=best_ask,
+                            best_bid=best_bid,
+                            now_ms=int(time.time() * 1000),
+                        )
+                        self._update_micro_estimator_from_orderbook(
+                            item_code,
+                            target,
+                            now_ts=time.time(),
+                            deferred_quotes=micro_quotes,
+                        )
+
+                    # '0w' 프로그램 매매 데이터 파싱
+                    if real_type == "0w":
+                        program_observed_at = time.time()
+                        program_requested_at = self._safe_float(
+                            target.get("program_subscription_requested_at"),
+                            0.0,
+                        )
+                        if (
+                            self._safe_float(
+                                target.get("program_first_observed_at"),
+                                0.0,
+                            )
+                            <= 0.0
+                        ):
+                            target["program_first_observed_at"] = program_observed_at
+                            target["program_first_observed_latency_ms"] = (
+                                round(
+                                    max(
                                         0.0,
+                                        program_observed_at - program_requested_at,
                                     )
-                                    <= 0.0
-                                ):
-                                    target["program_first_observed_at"] = (
-                                        program_observed_at
-                                    )
-                                    target["program_first_observed_latency_ms"] = (
-                                        round(
-                                            max(
-                                                0.0,
-                                                program_observed_at
-                                                - program_requested_at,
-                                            )
-                                            * 1000.0,
-                                            3,
-                                        )
-                                        if program_requested_at > 0.0
-                                        else None
-                                    )
-                                target.pop("program_missing_reason", None)
-                                if "202" in values:
-                                    target["prog_sell_qty"] = self._safe_signed_int(
-                                        values["202"]
-                                    )
-                                if "204" in values:
-                                    target["prog_sell_amt"] = self._safe_signed_int(
-                                        values["204"]
-                                    )
-                                if "206" in values:
-                                    target["prog_buy_qty"] = self._safe_signed_int(
-                                        values["206"]
-                                    )
-                                if "208" in values:
-                                    target["prog_buy_amt"] = self._safe_signed_int(
-                                        values["208"]
-                                    )
-                                if "210" in values:
-                                    target["prog_net_qty"] = self._safe_signed_int(
-                                        values["210"]
-                                    )
-                                if "211" in values:
-                                    target["prog_delta_qty"] = self._safe_signed_int(
-                                        values["211"]
-                                    )
-                                if "212" in values:
-                                    target["prog_net_amt"] = self._safe_signed_int(
-                                        values["212"]
-                                    )
-                                if "213" in values:
-                                    target["prog_delta_amt"] = self._safe_signed_int(
-                                        values["213"]
-                                    )
-                                # 프로그램 히스토리 업데이트
-                                target["program_history"].append(
-                                    {
-                                        "ts": time.time(),
-                                        "net_qty": target["prog_net_qty"],
-                                        "delta_qty": target["prog_delta_qty"],
-                                        "net_amt": target["prog_net_amt"],
-                                        "delta_amt": target["prog_delta_amt"],
-                                    }
+                                    * 1000.0,
+                                    3,
                                 )
-                                target["last_prog_update_ts"] = program_observed_at
+                                if program_requested_at > 0.0
+                                else None
+                            )
+                        target.pop("program_missing_reason", None)
+                        for program_key in (
+                            "prog_sell_qty",
+                            "prog_sell_amt",
+                            "prog_buy_qty",
+                            "prog_buy_amt",
+                            "prog_net_qty",
+                            "prog_delta_qty",
+                            "prog_net_amt",
+                            "prog_delta_amt",
+                        ):
+                            program_value = getattr(fields, program_key)
+                            if program_value is not MISSING:
+                                target[program_key] = program_value
+                        # 프로그램 히스토리 업데이트
+                        target["program_history"].append(
+                            {
+                                "ts": time.time(),
+                                "net_qty": target["prog_net_qty"],
+                                "delta_qty": target["prog_delta_qty"],
+                                "net_amt": target["prog_net_amt"],
+                                "delta_amt": target["prog_delta_amt"],
+                            }
+                        )
+                        target["last_prog_update_ts"] = program_observed_at
 
-                            # '0F' 주식당일거래원: 외국계 거래원 추정 수급
-                            if real_type == "0F":
-                                if "261" in values:
-                                    target["foreign_broker_sell_est_qty"] = (
-                                        self._safe_signed_int(values["261"])
-                                    )
-                                if "262" in values:
-                                    target["foreign_broker_sell_est_delta_qty"] = (
-                                        self._safe_signed_int(values["262"])
-                                    )
-                                if "263" in values:
-                                    target["foreign_broker_buy_est_qty"] = (
-                                        self._safe_signed_int(values["263"])
-                                    )
-                                if "264" in values:
-                                    target["foreign_broker_buy_est_delta_qty"] = (
-                                        self._safe_signed_int(values["264"])
-                                    )
-                                if "267" in values:
-                                    target["foreign_broker_net_est_qty"] = (
-                                        self._safe_signed_int(values["267"])
-                                    )
-                                if "268" in values:
-                                    target["foreign_broker_net_est_delta_qty"] = (
-                                        self._safe_signed_int(values["268"])
-                                    )
-                                target["last_foreign_broker_update_ts"] = time.time()
-
-                            target["received_types"].add(real_type)
-                            now_update_ts = time.time()
-                            target["last_ws_update_ts"] = now_update_ts
-                            market_suffix = self._ws_item_market_suffix(raw_item_code)
-                            market_route = self._ws_item_route(raw_item_code)
-                            target["last_ws_item"] = str(raw_item_code or "")
-                            target["last_ws_market_suffix"] = market_suffix
-                            target["last_ws_market_route"] = market_route
-                            type_ts = target.setdefault("last_realtime_type_ts", {})
-                            if isinstance(type_ts, dict):
-                                type_ts[real_type] = now_update_ts
-                            type_items = target.setdefault(
-                                "last_realtime_type_item", {}
+                    # '0F' 주식당일거래원: 외국계 거래원 추정 수급
+                    if real_type == "0F":
+                        if "261" in values:
+                            target["foreign_broker_sell_est_qty"] = (
+                                self._safe_signed_int(values["261"])
                             )
-                            if isinstance(type_items, dict):
-                                type_items[real_type] = str(raw_item_code or "")
-                            type_suffixes = target.setdefault(
-                                "last_realtime_type_market_suffix", {}
+                        if "262" in values:
+                            target["foreign_broker_sell_est_delta_qty"] = (
+                                self._safe_signed_int(values["262"])
                             )
-                            if isinstance(type_suffixes, dict):
-                                type_suffixes[real_type] = market_suffix
-                            type_routes = target.setdefault(
-                                "last_realtime_type_market_route", {}
+                        if "263" in values:
+                            target["foreign_broker_buy_est_qty"] = (
+                                self._safe_signed_int(values["263"])
                             )
-                            if isinstance(type_routes, dict):
-                                type_routes[real_type] = market_route
-                            type_venues = target.setdefault(
-                                "last_realtime_type_effective_venue", {}
+                        if "264" in values:
+                            target["foreign_broker_buy_est_delta_qty"] = (
+                                self._safe_signed_int(values["264"])
                             )
-                            if isinstance(type_venues, dict):
-                                type_venues[real_type] = self._ws_item_effective_venue(
-                                    raw_item_code
-                                )
-                            route_snapshots = target.setdefault(
-                                "realtime_type_snapshots_by_route", {}
+                        if "267" in values:
+                            target["foreign_broker_net_est_qty"] = (
+                                self._safe_signed_int(values["267"])
+                            )
+                        if "268" in values:
+                            target["foreign_broker_net_est_delta_qty"] = (
+                                self._safe_signed_int(values["268"])
                             )
-                            if isinstance(route_snapshots, dict):
-                                route_key = (
-                                    f"{market_suffix or 'KRX'}"
-                                    f"|{market_route or 'unknown'}"
+                        target["last_foreign_broker_update_ts"] = time.time()
+
+                    target["received_types"].add(real_type)
+                    now_update_ts = time.time()
+                    target["last_ws_update_ts"] = now_update_ts
+                    market_suffix = self._ws_item_market_suffix(raw_item_code)
+                    market_route = self._ws_item_route(raw_item_code)
+                    target["last_ws_item"] = str(raw_item_code or "")
+                    target["last_ws_market_suffix"] = market_suffix
+                    target["last_ws_market_route"] = market_route
+                    type_ts = target.setdefault("last_realtime_type_ts", {})
+                    if isinstance(type_ts, dict):
+                        type_ts[real_type] = now_update_ts
+                    type_items = target.setdefault("last_realtime_type_item", {})
+                    if isinstance(type_items, dict):
+                        type_items[real_type] = str(raw_item_code or "")
+                    type_suffixes = target.setdefault(
+                        "last_realtime_type_market_suffix", {}
+                    )
+                    if isinstance(type_suffixes, dict):
+                        type_suffixes[real_type] = market_suffix
+                    type_routes = target.setdefault(
+                        "last_realtime_type_market_route", {}
+                    )
+                    if isinstance(type_routes, dict):
+                        type_routes[real_type] = market_route
+                    type_venues = target.setdefault(
+                        "last_realtime_type_effective_venue", {}
+                    )
+                    if isinstance(type_venues, dict):
+                        type_venues[real_type] = self._ws_item_effective_venue(
+                            raw_item_code
+                        )
+                    route_snapshots = target.setdefault(
+                        "realtime_type_snapshots_by_route", {}
+                    )
+                    if isinstance(route_snapshots, dict):
+                        route_key = (
+                            f"{market_suffix or 'KRX'}" f"|{market_route or 'unknown'}"
+                        )
+                        route_snapshot = route_snapshots.setdefault(route_key, {})
+                        if isinstance(route_snapshot, dict):
+                            realtime_snapshot = {
+                                "realtime_type": real_type,
+                                "observed_epoch": now_update_ts,
+                                "item": str(raw_item_code or ""),
+                                "market_suffix": market_suffix,
+                                "market_route": market_route,
+                                "effective_venue": (
+                                    self._ws_item_effective_venue(raw_item_code)
+                                ),
+                            }
+                            if real_type == "0B":
+                                realtime_snapshot["current_price"] = safe_digits_int(
+                                    target.get("curr")
                                 )
-                                route_snapshot = route_snapshots.setdefault(
-                                    route_key, {}
+                            elif real_type == "0D":
+                                current_orderbook = target.get("orderbook")
+                                current_orderbook = (
+                                    current_orderbook
+                                    if isinstance(current_orderbook, dict)
+                                    else {}
                                 )
-                                if isinstance(route_snapshot, dict):
-                                    realtime_snapshot = {
-                                        "realtime_type": real_type,
-                                        "observed_epoch": now_update_ts,
-                                        "item": str(raw_item_code or ""),
-                                        "market_suffix": market_suffix,
-                                        "market_route": market_route,
-                                        "effective_venue": (
-                                            self._ws_item_effective_venue(raw_item_code)
-                                        ),
-                                    }
-                                    if real_type == "0B":
-                                        realtime_snapshot["current_price"] = safe_int(
-                                            target.get("curr")
-                                        )
-                                    elif real_type == "0D":
-                                        current_orderbook = target.get("orderbook")
-                                        current_orderbook = (
-                                            current_orderbook
-                                            if isinstance(current_orderbook, dict)
-                                            else {}
-                                        )
-                                        current_asks = current_orderbook.get("asks")
-                                        current_bids = current_orderbook.get("bids")
-                                        current_asks = (
-                                            current_asks
-                                            if isinstance(current_asks, list)
-                                            else []
-                                        )
-                                        current_bids = (
-                                            current_bids
-                                            if isinstance(current_bids, list)
-                                            else []
-                                        )
-                                        realtime_snapshot["orderbook"] = {
-                                            "asks": copy.deepcopy(current_asks[:1]),
-                                            "bids": copy.deepcopy(current_bids[:1]),
-                                        }
-                                        current_depth_tick = target.get(
-                                            "last_depth_tick"
-                                        )
-                                        if isinstance(current_depth_tick, dict) and str(
-                                            current_depth_tick.get("item") or ""
-                                        ) == str(raw_item_code or ""):
-                                            route_depth_totals = current_depth_tick.get(
-                                                "route_depth_totals"
-                                            )
-                                            if isinstance(route_depth_totals, dict):
-                                                realtime_snapshot[
-                                                    "route_depth_totals"
-                                                ] = copy.deepcopy(route_depth_totals)
-                                            realtime_snapshot["orderbook_time_raw"] = (
-                                                str(
-                                                    current_depth_tick.get(
-                                                        "orderbook_time_raw"
-                                                    )
-                                                    or ""
-                                                )
-                                            )
-                                    route_snapshot[real_type] = realtime_snapshot
-                            target["time"] = datetime.now().strftime("%H:%M:%S")
-
-                            if not target.get(
-                                "_first_tick_logged"
-                            ) and self._is_ws_ready(target, require_trade=False):
-                                received = sorted(
-                                    list(target.get("received_types") or [])
+                                current_asks = current_orderbook.get("asks")
+                                current_bids = current_orderbook.get("bids")
+                                current_asks = (
+                                    current_asks
+                                    if isinstance(current_asks, list)
+                                    else []
                                 )
-                                print(
-                                    f"✅ [WS] 첫 실시간 데이터 수신 확인: {item_code} / types={received}"
+                                current_bids = (
+                                    current_bids
+                                    if isinstance(current_bids, list)
+                                    else []
                                 )
-                                target["_first_tick_logged"] = True
-                            self._persistent_repair_no_tick_attempts.pop(
-                                item_code, None
-                            )
-                            self._persistent_repair_stuck_until_ts.pop(item_code, None)
-                            self._maybe_write_dashboard_snapshot()
+                                realtime_snapshot["orderbook"] = {
+                                    "asks": copy.deepcopy(current_asks[:1]),
+                                    "bids": copy.deepcopy(current_bids[:1]),
+                                }
+                                current_depth_tick = target.get("last_depth_tick")
+                                if isinstance(current_depth_tick, dict) and str(
+                                    current_depth_tick.get("item") or ""
+                                ) == str(raw_item_code or ""):
+                                    route_depth_totals = current_depth_tick.get(
+                                        "route_depth_totals"
+                                    )
+                                    if isinstance(route_depth_totals, dict):
+                                        realtime_snapshot["route_depth_totals"] = (
+                                            copy.deepcopy(route_depth_totals)
+                                        )
+                                    realtime_snapshot["orderbook_time_raw"] = str(
+                                        current_depth_tick.get("orderbook_time_raw")
+                                        or ""
+                                    )
+                            route_snapshot[real_type] = realtime_snapshot
+                    target["time"] = datetime.now().strftime("%H:%M:%S")
 
-                            tick_event_snapshot = self._snapshot_target(target)
-                        # Snapshot is completed under the market-data lock; observer
-                        # normalization and enqueue stay outside that critical section.
-                        self._queue_tick_event(
-                            item_code,
-                            tick_event_snapshot,
-                            realtime_type=real_type,
+                    if not target.get("_first_tick_logged") and self._is_ws_ready(
+                        target, require_trade=False
+                    ):
+                        received = sorted(list(target.get("received_types") or []))
+                        print(
+                            f"✅ [WS] 첫 실시간 데이터 수신 확인: {item_code} / types={received}"
                         )
-                self._flush_deferred_scalp_condition_matches_if_allowed()
+                        target["_first_tick_logged"] = True
+                    self._mark_dashboard_snapshot_dirty(item_code)
+
+                    tick_event_snapshot = self._snapshot_target(target)
+                    if self._data_arrival_waiters:
+                        self._notify_data_arrival_locked(item_code, real_type)
+                # Repair bookkeeping lives under the subscription lock; it is
+                # only non-empty for codes that were being repaired.
+                if (
+                    item_code in self._persistent_repair_no_tick_attempts
+                    or item_code in self._persistent_repair_stuck_until_ts
+                ):
+                    with self.lock:
+                        self._persistent_repair_no_tick_attempts.pop(item_code, None)
+                        self._persistent_repair_stuck_until_ts.pop(item_code, None)
+                # Snapshot is completed under the symbol stripe; observer
+                # normalization and enqueue stay outside that critical section.
+                self._queue_tick_event(
+                    item_code,
+                    tick_event_snapshot,
+                    realtime_type=real_type,
+                )
+        if micro_quotes:
+            self._flush_micro_estimator_quotes(micro_quotes)
 
-        except websockets.ConnectionClosed:
-            pass
+    def _ws_frame_shard_key(self, item):
+        return self._normalize_code(item.get("item", ""))
+
+    def _handle_ws_control_frame(self, frame):
+        loop = self.loop
+        if not loop or not loop.is_running() or self._stop_event.is_set():
+            return
+        future = asyncio.run_coroutine_threadsafe(self._handle_message(frame), loop)
+        with self._pending_future_lock:
+            self._pending_loop_futures.add(future)
+
+        def on_complete(fut):
+            with self._pending_future_lock:
+                self._pending_loop_futures.discard(fut)
+
+        future.add_done_callback(on_complete)
+
+    def _after_ws_frame_shard_batch(self, shard_index):
+        # Condition pushes carry no item code, so they always land on shard 0.
+        if shard_index == 0:
+            self._flush_deferred_scalp_condition_matches_if_allowed()
+
+    def _start_ws_frame_pipeline(self):
+        if not ws_frame_pipeline_enabled():
+            self._ws_frame_pipeline = None
+            return
+        pipeline = KiwoomWSFramePipeline(
+            apply_items=self._apply_realtime_items,
+            handle_control=self._handle_ws_control_frame,
+            shard_key=self._ws_frame_shard_key,
+            config=WSFramePipelineConfig.from_env(),
+            after_shard_batch=self._after_ws_frame_shard_batch,
+        )
+        pipeline.start()
+        self._ws_frame_pipeline = pipeline
+        print(
+            "[WS_FRAME_PIPELINE] receive/apply split enabled "
+            f"shards={pipeline.shard_count} queue_maxsize={pipeline.config.queue_maxsize}"
+        )
+
+    def _stop_ws_frame_pipeline(self):
+        pipeline = self._ws_frame_pipeline
+        self._ws_frame_pipeline = None
+        if pipeline is not None:
+            pipeline.stop(timeout=2.0)
+
+    def _start_ws_frame_capture(self):
+        """Open a new capture file set for this WS session (default off)."""
+        self._stop_ws_frame_capture()
+        if not ws_frame_capture_enabled():
+            return
+        self._ws_frame_capture_sessions += 1
+        session_id = (
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            f"_{os.getpid()}_{self._ws_frame_capture_sessions:03d}"
+        )
+        try:
+            self._ws_frame_capture = WSFrameCaptureWriter(session_id=session_id).start()
+        except OSError as e:
+            log_error(f"[WS_CAPTURE] capture start failed: {e}")
+            self._ws_frame_capture = None
+
+    def _stop_ws_frame_capture(self):
+        capture = self._ws_frame_capture
+        self._ws_frame_capture = None
+        if capture is not None:
+            capture.close(timeout=2.0)
+
+    def _capture_ws_frame(self, message, received_perf):
+        capture = self._ws_frame_capture
+        if capture is None:
+            return
+        try:
+            capture.append(message, received_perf)
         except Exception as e:
-            log_error(f"🚨 [WS] 메시지 파싱 에러 발생: {e} | Payload: {message[:150]}")
+            log_error(f"[WS_CAPTURE] frame append failed: {e}")
+
+    def get_ws_frame_capture_snapshot(self):
+        capture = self._ws_frame_capture
+        if capture is None:
+            return {"enabled": False}
+        return {"enabled": True, **capture.snapshot()}
+
+    def get_ws_frame_pipeline_snapshot(self):
+        pipeline = self._ws_frame_pipeline
+        if pipeline is None:
+            return {"enabled": False}
+        return {"enabled": True, **pipeline.snapshot()}
 
     def start(self):
         if self._started:
@@ -3931,6 +4118,8 @@ class KiwoomWSManager:
         self._started = True
         self._stop_event.clear()
         self._start_micro_reversion_forward_collector()
+        self._start_dashboard_snapshot_publisher()
+        self._start_ws_frame_pipeline()
 
         def thread_target():
             self.loop = asyncio.new_event_loop()
@@ -3955,12 +4144,44 @@ class KiwoomWSManager:
         self._tick_dispatch_thread.start()
         self._ws_thread.start()
 
+    def _ws_send_ready(self):
+        if self.websocket and self._session_ready.is_set():
+            return True
+        return bool(getattr(self, "_ws_pool_sockets", None))
+
+    def _ws_for_slot(self, slot):
+        if slot is None or slot == WS_POOL_PRIMARY_SLOT:
+            return self.websocket
+        return self._ws_pool_sockets.get(slot)
+
+    def _ws_send_batches(self, items, batch_size):
+        """Split REG/REMOVE items into ``(slot, batch)`` per pool connection.
+
+        ``slot`` is ``None`` outside pool mode (primary socket only).
+        """
+        pool = getattr(self, "_ws_pool", None)
+        if pool is None:
+            return [(None, batch) for batch in self._chunked(list(items), batch_size)]
+        items_by_slot = OrderedDict()
+        with self.lock:
+            for item in items:
+                slot = pool.slot_for(self._normalize_code(item))
+                if slot is None:
+                    slot = WS_POOL_PRIMARY_SLOT
+                items_by_slot.setdefault(slot, []).append(item)
+        return [
+            (slot, batch)
+            for slot, slot_items in items_by_slot.items()
+            for batch in self._chunked(slot_items, batch_size)
+        ]
+
     async def _send_remove(
         self,
         codes,
         *,
         items_by_code_snapshot=None,
         update_local_state=True,
+        release_ws_pool_slots=True,
         source="",
         reason="",
     ):
@@ -4007,14 +4228,14 @@ class KiwoomWSManager:
             for _ in range(100):
                 if self._stop_event.is_set():
                     return False
-                if self.websocket and self._session_ready.is_set():
+                if self._ws_send_ready():
                     break
                 await asyncio.sleep(0.1)
 
             if self._stop_event.is_set():
                 return False
 
-            if not (self.websocket and self._session_ready.is_set()):
+            if not self._ws_send_ready():
                 print(
                     f"⚠️ [WS] 로그인 준비가 완료되지 않아 REMOVE 전송 실패: {normalized_codes}"
                 )
@@ -4023,12 +4244,17 @@ class KiwoomWSManager:
             batch_size = min(
                 int(getattr(TRADING_RULES, "WS_REG_BATCH_SIZE", 20) or 20), 50
             )
-            total_batches = (len(remove_items) + batch_size - 1) // batch_size
-            for batch_index, batch_items in enumerate(
-                self._chunked(remove_items, batch_size), start=1
-            ):
-                if self._stop_event.is_set() or not self.websocket:
+            batches = self._ws_send_batches(remove_items, batch_size)
+            total_batches = len(batches)
+            for batch_index, (slot, batch_items) in enumerate(batches, start=1):
+                if self._stop_event.is_set():
                     return False
+                send_ws = self._ws_for_slot(slot)
+                if not send_ws:
+                    if slot is None:
+                        return False
+                    # That pool connection dropped and released its codes.
+                    continue
                 remove_packet = {
                     "trnm": "REMOVE",
                     "grp_no": "1",
@@ -4039,7 +4265,7 @@ class KiwoomWSManager:
                         {"item": batch_items, "type": ["0F"]},
                     ],
                 }
-                await self.websocket.send(json.dumps(remove_packet))
+                await send_ws.send(json.dumps(remove_packet))
                 now_ts = time.time()
                 with self.lock:
                     for code in normalized_codes:
@@ -4054,15 +4280,23 @@ class KiwoomWSManager:
                             self._persistent_repair_stuck_until_ts.pop(code, None)
                             self._persistent_repair_overflow_codes.pop(code, None)
                             self.subscribed_codes.discard(code)
-                            self.realtime_data.pop(code, None)
+                            self._ws_pool_unsent_codes.discard(code)
+                            with self._symbol_lock(code):
+                                self.realtime_data.pop(code, None)
+                            self._mark_dashboard_snapshot_dirty(code)
                 print(
                     "🧹 [WS] 종목 REMOVE 패킷 전송 완료: "
                     f"grp_no=1 batch={batch_index}/{total_batches} "
+                    f"connection={slot if slot is not None else '-'} "
                     f"code_count={len(normalized_codes)} item_count={len(batch_items)} "
                     f"source={source or '-'} reason={reason or '-'} "
                     f"items={batch_items}"
                 )
                 await asyncio.sleep(0.05)
+            if release_ws_pool_slots and getattr(self, "_ws_pool", None) is not None:
+                with self.lock:
+                    for code in normalized_codes:
+                        self._ws_pool.release(code)
             return True
         except asyncio.CancelledError:
             return False
@@ -4143,18 +4377,19 @@ class KiwoomWSManager:
             for _ in range(100):
                 if self._stop_event.is_set():
                     return
-                if self.websocket and self._session_ready.is_set():
+                if self._ws_send_ready():
                     break
                 await asyncio.sleep(0.1)
 
             if self._stop_event.is_set():
                 return
 
-            if self.websocket and self._session_ready.is_set():
+            if self._ws_send_ready():
                 if remove_before_reg:
                     remove_sent = await self._send_remove(
                         normalized_codes,
                         update_local_state=False,
+                        release_ws_pool_slots=False,
                         source=source,
                         reason="remove_before_reg_recovery",
                     )
@@ -4168,7 +4403,8 @@ class KiwoomWSManager:
                 batch_size = min(
                     int(getattr(TRADING_RULES, "WS_REG_BATCH_SIZE", 20) or 20), 50
                 )
-                total_batches = (len(normalized_codes) + batch_size - 1) // batch_size
+                batches = self._ws_send_batches(normalized_codes, batch_size)
+                total_batches = len(batches)
                 print(
                     f"📝 [WS] 종목 등록(REG) 전송 시도: {normalized_codes} "
                     f"(grp_no=1, refresh=1, items={register_items}, "
@@ -4178,11 +4414,16 @@ class KiwoomWSManager:
                     f"realtime_types={requested_realtime_types}, "
                     f"remove_before_reg={remove_before_reg})"
                 )
-                for batch_index, batch_codes in enumerate(
-                    self._chunked(normalized_codes, batch_size), start=1
-                ):
-                    if self._stop_event.is_set() or not self.websocket:
+                for batch_index, (slot, batch_codes) in enumerate(batches, start=1):
+                    if self._stop_event.is_set():
                         return
+                    send_ws = self._ws_for_slot(slot)
+                    if not send_ws:
+                        if slot is None:
+                            return
+                        # Codes of a dropped pool connection (sent or not) are
+                        # re-REGed by its rebalance, not here.
+                        continue
                     batch_code_set = set(batch_codes)
                     batch_items = [
                         item
@@ -4198,10 +4439,23 @@ class KiwoomWSManager:
                             for realtime_type in requested_realtime_types
                         ],
                     }
-                    await self.websocket.send(json.dumps(reg_packet))
+                    try:
+                        await send_ws.send(json.dumps(reg_packet))
+                    except (websockets.ConnectionClosed, OSError) as exc:
+                        if slot in (None, WS_POOL_PRIMARY_SLOT):
+                            raise
+                        # A secondary died mid-REG: hand its codes to the
+                        # rebalance and keep sending the other batches.
+                        log_error(
+                            f"[WS_POOL] 연결 {slot} REG 전송 실패, 재배치: "
+                            f"codes={batch_codes} error={exc}"
+                        )
+                        self._mark_ws_pool_slot_down(slot)
+                        continue
                     reg_sent_at = time.time()
                     with self.lock:
                         self.subscribed_codes.update(batch_codes)
+                        self._ws_pool_unsent_codes.difference_update(batch_codes)
                         self._micro_reversion_observation_only_codes.difference_update(
                             batch_code_set.intersection(trading_promotion_code_set)
                         )
@@ -4209,18 +4463,22 @@ class KiwoomWSManager:
                             self._registered_items_by_code[code] = tuple(
                                 register_items_by_code.get(code) or ()
                             )
-                            target = self._ensure_target_defaults(code)
-                            if "0w" in requested_realtime_types:
-                                target["program_subscription_requested_at"] = (
-                                    reg_sent_at
-                                )
-                                if "0w" not in (target.get("received_types") or set()):
-                                    target["program_missing_reason"] = (
-                                        "program_0w_awaiting_first_observation"
+                            with self._symbol_lock(code):
+                                target = self._ensure_target_defaults(code)
+                                if "0w" in requested_realtime_types:
+                                    target["program_subscription_requested_at"] = (
+                                        reg_sent_at
                                     )
+                                    if "0w" not in (
+                                        target.get("received_types") or set()
+                                    ):
+                                        target["program_missing_reason"] = (
+                                            "program_0w_awaiting_first_observation"
+                                        )
                     print(
                         "📡 [WS] 종목 등록 패킷 전송 완료(실수신 대기): "
                         f"grp_no=1 refresh=1 batch={batch_index}/{total_batches} "
+                        f"connection={slot if slot is not None else '-'} "
                         f"code_count={len(batch_codes)} item_count={len(batch_items)} "
                         f"replace_existing={replace_existing} source={source or '-'} "
                         f"repair_cycle={repair_cycle or '-'} "
@@ -4485,10 +4743,13 @@ class KiwoomWSManager:
 
         self.subscribed_codes.difference_update(normalized_codes)
         with self.lock:
+            self._ws_pool_unsent_codes.difference_update(normalized_codes)
             for code in normalized_codes:
                 self._recent_reg_request_ts.pop(code, None)
                 self._registered_items_by_code.pop(code, None)
-                self.realtime_data.pop(code, None)
+                with self._symbol_lock(code):
+                    self.realtime_data.pop(code, None)
+                self._mark_dashboard_snapshot_dirty(code)
                 self._persistent_repair_request_ts.pop(code, None)
                 self._persistent_repair_no_tick_attempts.pop(code, None)
                 self._persistent_repair_stuck_until_ts.pop(code, None)
@@ -4658,24 +4919,42 @@ class KiwoomWSManager:
         codes = payload.get("codes", [])
         self.execute_unsubscribe(codes)
 
+    def _symbol_lock(self, code):
+        return self._symbol_locks.for_code(code)
+
     def get_latest_data(self, code):
         code = self._normalize_code(code)
-        with self.lock:
+        with self._symbol_lock(code):
             target = self.realtime_data.get(code, {})
             return self._snapshot_target(target) if target else {}
 
-    def get_all_data(self, codes):
-        """Return dict of latest data for multiple codes, acquiring lock once."""
+    def get_all_data(self, codes, *, lock_timeout=None):
+        """Return dict of latest data for multiple codes, one stripe at a time.
+
+        With ``lock_timeout`` (seconds) a busy stripe is skipped and its codes
+        come back as ``{}`` instead of blocking the caller.
+        """
         if isinstance(codes, str):
             codes = [codes]
-        with self.lock:
-            return {
-                self._normalize_code(code): (
-                    self._snapshot_target(
-                        self.realtime_data.get(self._normalize_code(code), {})
-                    )
-                    if self.realtime_data.get(self._normalize_code(code), {})
-                    else {}
-                )
-                for code in codes
-            }
+        normalized = [self._normalize_code(code) for code in codes]
+        result = dict.fromkeys(normalized, {})
+        timeout = -1 if lock_timeout is None else max(0.0, float(lock_timeout))
+        for stripe, stripe_codes in self._symbol_locks.group(dict.fromkeys(normalized)):
+            if not stripe.acquire(timeout=timeout):
+                continue
+            try:
+                for code in stripe_codes:
+                    target = self.realtime_data.get(code, {})
+                    result[code] = self._snapshot_target(target) if target else {}
+            finally:
+                stripe.release()
+        return result
+
+    def get_lock_contention_snapshot(self):
+        """Hold-time and contention counters for the subscription lock and the
+        symbol stripes."""
+        subscription = self.lock.snapshot() if hasattr(self.lock, "snapshot") else {}
+        return {
+            "subscription_lock": subscription,
+            "symbol_locks": self._symbol_locks.snapshot(),
+        }
@@ -0,0 +1,967 @@
+"""Array-backed micro estimator store with batched WS quote updates.
+
+``MicroEstimatorArrayStore`` keeps the same per-symbol state as
+``MicroEstimatorStore`` in a structure of arrays (symbol -> row index,
+float64/int64 columns).  The quotes that arrived in one dispatch cycle are
+submitted as a columnar ``WSQuoteBatch``; depth pressure, true OFI, decay and
+the EWMA updates are then computed with numpy over every row at once, and
+``snapshot_many`` returns all watch symbols in one call.
+
+The per-symbol math, TTL pruning and hot/warm limit ordering mirror
+``micro_estimator_state``.  A batch that could demote or evict a symbol falls
+back to quote-by-quote application so tie-breaking stays identical to
+consecutive ``update_from_ws_quote`` calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from src.engine.scalping.micro_estimator_state import (
+    POLICY_VERSION,
+    MicroEstimatorConfig,
+    MicroEstimatorStore,
+    SymbolMicroEstimatorState,
+    best_level_snapshot,
+    clamp,
+    estimate_orderbook_pressure,
+    read_first_number,
+    safe_float,
+)
+
+BENCHMARK_SCHEMA = "micro_estimator_array_store_benchmark_v1"
+FRESH_QUOTE_MAX_AGE_MS = 3000.0
+_HOT = 1
+_WARM = 0
+_FLOAT_COLUMNS = {
+    "last_update_ts": 0.0,
+    "last_rest_ts": 0.0,
+    "last_ws_ts": 0.0,
+    "last_probe_ts": 0.0,
+    "ofi_ewma": 0.0,
+    "true_ofi_ewma": 0.0,
+    "depth_imbalance_ewma": 0.0,
+    "last_ofi_event": 0.0,
+    "pressure_ewma": 50.0,
+    "top_depth_ratio": 0.0,
+    "confidence": 0.0,
+    "prev_best_bid_price": 0.0,
+    "prev_best_bid_size": 0.0,
+    "prev_best_ask_price": 0.0,
+    "prev_best_ask_size": 0.0,
+}
+_INT_COLUMNS = ("sample_count", "true_ofi_sample_count")
+_SNAPSHOT_FLOAT_FIELDS = (
+    "ofi_ewma",
+    "true_ofi_ewma",
+    "depth_imbalance_ewma",
+    "last_ofi_event",
+    "pressure_ewma",
+    "top_depth_ratio",
+)
+_SNAPSHOT_TIMESTAMP_FIELDS = (
+    "last_update_ts",
+    "last_rest_ts",
+    "last_ws_ts",
+    "last_probe_ts",
+    "prev_best_bid_price",
+    "prev_best_bid_size",
+    "prev_best_ask_price",
+    "prev_best_ask_size",
+)
+
+
+def _quote_is_stale(data: Mapping[str, Any]) -> bool:
+    stale = str(data.get("source_quality_state") or "").lower().find("stale") >= 0
+    return stale or str(data.get("quote_stale") or "").strip().lower() in {
+        "1",
+        "true",
+        "stale",
+    }
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class WSQuoteBatch:
+    """Columnar best-level/depth view of the WS quotes from one dispatch cycle."""
+
+    symbols: tuple[str, ...]
+    bid_price: np.ndarray
+    ask_price: np.ndarray
+    bid_size: np.ndarray
+    ask_size: np.ndarray
+    bid_total: np.ndarray
+    ask_total: np.ndarray
+    quote_age_ms: np.ndarray
+    stale: np.ndarray
+
+    def __post_init__(self) -> None:
+        size = len(self.symbols)
+        for name in (
+            "bid_price",
+            "ask_price",
+            "bid_size",
+            "ask_size",
+            "bid_total",
+            "ask_total",
+            "quote_age_ms",
+        ):
+            column = np.asarray(getattr(self, name), dtype=np.float64)
+            if column.shape != (size,):
+                raise ValueError(f"{name} must have one value per symbol")
+            object.__setattr__(self, name, column)
+        stale = np.asarray(self.stale, dtype=bool)
+        if stale.shape != (size,):
+            raise ValueError("stale must have one value per symbol")
+        object.__setattr__(self, "stale", stale)
+        object.__setattr__(self, "symbols", tuple(self.symbols))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_quotes(
+        cls, quotes: Iterable[tuple[str, Mapping[str, Any] | None]]
+    ) -> "WSQuoteBatch":
+        """Parse ``(symbol, ws_quote)`` pairs with the per-symbol store's rules."""
+        symbols: list[str] = []
+        columns: list[tuple[float, ...]] = []
+        stale: list[bool] = []
+        for symbol, ws_quote in quotes:
+            data = ws_quote if isinstance(ws_quote, Mapping) else {}
+            best = best_level_snapshot(data)
+            symbols.append(symbol)
+            columns.append(
+                (
+                    best["bid_price"],
+                    best["ask_price"],
+                    best["bid_size"],
+                    best["ask_size"],
+                    read_first_number(data, "bid_tot", "bid_total", "total_bid_qty"),
+                    read_first_number(data, "ask_tot", "ask_total", "total_ask_qty"),
+                    safe_float(data.get("quote_age_ms"), 0.0),
+                )
+            )
+            stale.append(_quote_is_stale(data))
+        values = np.asarray(columns, dtype=np.float64).reshape(len(symbols), 7)
+        return cls(
+            symbols=tuple(symbols),
+            bid_price=values[:, 0],
+            ask_price=values[:, 1],
+            bid_size=values[:, 2],
+            ask_size=values[:, 3],
+            bid_total=values[:, 4],
+            ask_total=values[:, 5],
+            quote_age_ms=values[:, 6],
+            stale=np.asarray(stale, dtype=bool),
+        )
+
+
+class MicroEstimatorArrayStore:
+    """Structure-of-arrays variant of ``MicroEstimatorStore``."""
+
+    def __init__(
+        self, config: MicroEstimatorConfig | None = None, *, capacity: int = 256
+    ):
+        self.config = config or MicroEstimatorConfig.from_env()
+        self._lock = threading.RLock()
+        self._rows: dict[str, int] = {}
+        self._symbols: list[str | None] = []
+        self._free: list[int] = []
+        self._labels: list[str] = []
+        self._label_codes: dict[str, int] = {}
+        self._float: dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=np.float64) for name in _FLOAT_COLUMNS
+        }
+        self._int: dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=np.int64) for name in _INT_COLUMNS
+        }
+        self._tier = np.empty(0, dtype=np.int8)
+        self._ofi_source = np.empty(0, dtype=np.int32)
+        self._source_state = np.empty(0, dtype=np.int32)
+        self._grow(max(1, int(capacity)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._free.extend(self._rows.values())
+            self._rows.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def state_count_by_tier(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._active_rows()
+            hot = int(np.count_nonzero(self._tier[rows] == _HOT))
+            return {"hot": hot, "warm": len(rows) - hot}
+
+    def state(self, symbol: str) -> SymbolMicroEstimatorState | None:
+        """Materialize one row as a ``SymbolMicroEstimatorState`` copy."""
+        with self._lock:
+            row = self._rows.get(str(symbol or "").strip())
+            return None if row is None else self._materialize(row)
+
+    def mark_candidate(
+        self,
+        symbol: str,
+        *,
+        tier: str = "warm",
+        now_ts: float,
+        reason: str = "candidate",
+    ) -> SymbolMicroEstimatorState:
+        with self._lock:
+            symbol_key = self._symbol_key(symbol)
+            self.prune(now_ts)
+            row = self._touch(symbol_key, tier, float(now_ts))
+            self._enforce_limits(now_ts)
+            return self._materialize(row)
+
+    def update_ws_quotes(
+        self,
+        batch: WSQuoteBatch,
+        *,
+        now_ts: float,
+        tier: str = "warm",
+    ) -> int:
+        """Apply one dispatch cycle of WS quotes; returns the applied quote count.
+
+        Repeated symbols are applied in arrival order, one batch round per
+        repetition.  When the batch could demote or evict a symbol it is
+        applied quote by quote instead, exactly like consecutive
+        ``update_from_ws_quote`` calls.
+        """
+        with self._lock:
+            keys = [self._symbol_key(symbol) for symbol in batch.symbols]
+            now = float(now_ts)
+            applied = 0
+            self.prune(now)
+            if self._round_fits_limits(list(dict.fromkeys(keys)), tier):
+                parts = _batch_rounds(keys)
+            else:
+                parts = [[position] for position in range(len(keys))]
+            for part in parts:
+                self.prune(now)
+                rows = np.fromiter(
+                    (self._touch(keys[index], tier, now) for index in part),
+                    dtype=np.int64,
+                    count=len(part),
+                )
+                self._enforce_limits(now)
+                applied += self._apply_ws_round(batch, part, rows, keys, now)
+            return applied
+
+    def update_from_ws_quote(
+        self,
+        symbol: str,
+        ws_quote: Mapping[str, Any] | None,
+        *,
+        now_ts: float,
+        tier: str = "warm",
+    ) -> SymbolMicroEstimatorState:
+        with self._lock:
+            symbol_key = self._symbol_key(symbol)
+            batch = WSQuoteBatch.from_quotes([(symbol_key, ws_quote)])
+            self.update_ws_quotes(batch, now_ts=now_ts, tier=tier)
+            return self._materialize_symbol(symbol_key)
+
+    def update_from_rest_orderbook(
+        self,
+        symbol: str,
+        orderbook: Mapping[str, Any] | None,
+        *,
+        now_ts: float,
+        tier: str = "hot",
+    ) -> SymbolMicroEstimatorState:
+        with self._lock:
+            symbol_key = self._symbol_key(symbol)
+            self.prune(now_ts)
+            row = self._touch(symbol_key, tier, float(now_ts))
+            self._enforce_limits(now_ts)
+            depth = estimate_orderbook_pressure(orderbook)
+            if depth["total_depth"] <= 0 or self._symbols[row] != symbol_key:
+                return self._materialize(row)
+            best = best_level_snapshot(orderbook)
+            current = np.array(
+                [
+                    [best["bid_price"]],
+                    [best["bid_size"]],
+                    [best["ask_price"]],
+                    [best["ask_size"]],
+                ],
+                dtype=np.float64,
+            )
+            rows = np.array([row], dtype=np.int64)
+            true_norm, raw_event = self._true_ofi(rows, current)
+            has_true = not np.isnan(true_norm[0])
+            self._apply(
+                rows,
+                now_ts=float(now_ts),
+                ofi_norm=np.where(np.isnan(true_norm), depth["ofi_norm"], true_norm),
+                depth_imbalance=np.array([depth["ofi_norm"]]),
+                true_ofi_norm=true_norm,
+                raw_ofi_event=raw_event,
+                pressure=np.array([depth["pressure"]]),
+                top_depth_ratio=np.array([depth["top_depth_ratio"]]),
+                confidence=np.array([0.72]),
+                source_state=np.array(
+                    [
+                        self._code(
+                            "rest_orderbook_delta_estimate"
+                            if has_true
+                            else "rest_anchored_estimate"
+                        )
+                    ]
+                ),
+                ofi_source=np.array(
+                    [
+                        self._code(
+                            "rest_orderbook_delta"
+                            if has_true
+                            else "depth_imbalance_proxy"
+                        )
+                    ]
+                ),
+                current_best=current,
+            )
+            self._float["last_rest_ts"][row] = float(now_ts)
+            self._enforce_limits(now_ts)
+            return self._materialize(row)
+
+    def update_from_feature_probe(
+        self,
+        symbol: str,
+        probe: Mapping[str, Any] | None,
+        source_quality: Mapping[str, Any] | None = None,
+        *,
+        now_ts: float,
+        observed_ts: float | None = None,
+        max_age_sec: float = 120.0,
+        tier: str = "hot",
+    ) -> SymbolMicroEstimatorState:
+        with self._lock:
+            symbol_key = self._symbol_key(symbol)
+            self.prune(now_ts)
+            row = self._touch(symbol_key, tier, float(now_ts))
+            self._enforce_limits(now_ts)
+            if self._symbols[row] != symbol_key:
+                return self._materialize(row)
+            probe_data = probe if isinstance(probe, Mapping) else {}
+            quality_data = source_quality if isinstance(source_quality, Mapping) else {}
+            pressure = safe_float(
+                probe_data.get("buy_pressure_10t")
+                or probe_data.get("late_entry_buy_pressure_10t")
+                or quality_data.get("buy_pressure_10t")
+                or quality_data.get("late_entry_buy_pressure_10t"),
+                50.0,
+            )
+            delta = safe_float(
+                probe_data.get("net_aggressive_delta_10t")
+                or quality_data.get("net_aggressive_delta_10t"),
+                0.0,
+            )
+            observed = safe_float(observed_ts, 0.0)
+            age_sec = (
+                max(0.0, float(now_ts) - observed) if observed > 0 else max_age_sec
+            )
+            age_confidence = clamp(1.0 - (age_sec / max(1.0, max_age_sec)), 0.0, 1.0)
+            decayed_pressure = 50.0 + (
+                (clamp(pressure, 0.0, 100.0) - 50.0) * age_confidence
+            )
+            ofi_hint = (
+                clamp(delta / max(abs(delta), 1000.0), -1.0, 1.0) if delta else 0.0
+            )
+            confidence = 0.40 * age_confidence if observed > 0 else 0.0
+            rows = np.array([row], dtype=np.int64)
+            self._apply(
+                rows,
+                now_ts=float(now_ts),
+                ofi_norm=np.array([ofi_hint]),
+                depth_imbalance=np.array([ofi_hint]),
+                true_ofi_norm=np.array([np.nan]),
+                raw_ofi_event=np.array([0.0]),
+                pressure=np.array([decayed_pressure]),
+                top_depth_ratio=self._float["top_depth_ratio"][rows],
+                confidence=np.array([confidence]),
+                source_state=np.array(
+                    [
+                        self._code(
+                            "smoothed_probe_estimate"
+                            if confidence > 0
+                            else "default_prior"
+                        )
+                    ]
+                ),
+                ofi_source=np.array([self._code("feature_probe_delta_hint")]),
+                current_best=None,
+            )
+            if confidence > 0:
+                self._float["last_probe_ts"][row] = observed
+            self._enforce_limits(now_ts)
+            return self._materialize(row)
+
+    def snapshot(self, symbol: str, *, now_ts: float) -> dict[str, Any]:
+        symbol_key = str(symbol or "").strip()
+        return self.snapshot_many([symbol_key], now_ts=now_ts)[symbol_key]
+
+    def snapshot_many(
+        self, symbols: Iterable[str], *, now_ts: float
+    ) -> dict[str, dict[str, Any]]:
+        """Return ``snapshot`` for every symbol, decayed in one vectorized pass."""
+        with self._lock:
+            keys = list(dict.fromkeys(str(symbol or "").strip() for symbol in symbols))
+            present = [key for key in keys if key in self._rows]
+            rows = np.fromiter(
+                (self._rows[key] for key in present),
+                dtype=np.int64,
+                count=len(present),
+            )
+            now = float(now_ts)
+            last_update = self._float["last_update_ts"][rows]
+            age_sec = np.maximum(
+                0.0, now - np.where(last_update != 0.0, last_update, now)
+            )
+            tiers = self._tier[rows]
+            ttl_sec = np.where(
+                tiers == _HOT, self.config.hot_ttl_sec, self.config.warm_ttl_sec
+            )
+            confidence = np.clip(
+                self._float["confidence"][rows]
+                * self._decay(age_sec, self.config.half_life_sec),
+                0.0,
+                1.0,
+            )
+            expired = age_sec > ttl_sec
+            confidence[expired] = 0.0
+            state_codes = self._source_state[rows].tolist()
+            columns = {
+                name: self._float[name][rows].tolist()
+                for name in _SNAPSHOT_FLOAT_FIELDS + _SNAPSHOT_TIMESTAMP_FIELDS
+            }
+            counts = {name: self._int[name][rows].tolist() for name in _INT_COLUMNS}
+            ofi_codes = self._ofi_source[rows].tolist()
+            expired_list = expired.tolist()
+            confidence_list = confidence.tolist()
+            age_list = age_sec.tolist()
+            tier_list = tiers.tolist()
+            result: dict[str, dict[str, Any]] = {}
+            for index, key in enumerate(present):
+                if expired_list[index]:
+                    source_state = "unusable"
+                elif confidence_list[index] <= 0.0:
+                    source_state = "default_prior"
+                elif age_list[index] > self.config.half_life_sec:
+                    source_state = "decayed_estimate"
+                else:
+                    source_state = self._labels[state_codes[index]]
+                snap: dict[str, Any] = {
+                    "policy_version": POLICY_VERSION,
+                    "symbol": key,
+                    "tier": "hot" if tier_list[index] == _HOT else "warm",
+                    "source_state": source_state,
+                    "ofi_source": self._labels[ofi_codes[index]],
+                }
+                for name in _SNAPSHOT_FLOAT_FIELDS:
+                    snap[name] = columns[name][index]
+                snap["confidence"] = confidence_list[index]
+                for name in _INT_COLUMNS:
+                    snap[name] = counts[name][index]
+                snap["age_sec"] = age_list[index]
+                for name in _SNAPSHOT_TIMESTAMP_FIELDS:
+                    snap[name] = columns[name][index]
+                snap["min_confidence"] = self.config.min_confidence
+                snap["min_ofi_norm"] = self.config.min_ofi_norm
+                snap["min_pressure"] = self.config.min_pressure
+                result[key] = snap
+            for key in keys:
+                if key not in result:
+                    result[key] = self._default_snapshot(key, now_ts=now)
+            return {key: result[key] for key in keys}
+
+    def prune(self, now_ts: float) -> int:
+        with self._lock:
+            rows = self._active_rows()
+            now = float(now_ts)
+            last_update = self._float["last_update_ts"][rows]
+            age_sec = np.maximum(
+                0.0, now - np.where(last_update != 0.0, last_update, now)
+            )
+            ttl_sec = np.where(
+                self._tier[rows] == _HOT,
+                self.config.hot_ttl_sec,
+                self.config.warm_ttl_sec,
+            )
+            expired = rows[age_sec > ttl_sec]
+            self._release(expired)
+            return len(expired)
+
+    def _apply_ws_round(
+        self,
+        batch: WSQuoteBatch,
+        positions: list[int],
+        rows: np.ndarray,
+        keys: list[str],
+        now: float,
+    ) -> int:
+        index = np.asarray(positions, dtype=np.int64)
+        bid_size = batch.bid_size[index]
+        ask_size = batch.ask_size[index]
+        bid_total = batch.bid_total[index]
+        ask_total = batch.ask_total[index]
+        bid_depth = np.where(bid_total > 0, bid_total, bid_size)
+        ask_depth = np.where(ask_total > 0, ask_total, ask_size)
+        total_depth = np.maximum(0.0, bid_depth + ask_depth)
+        resident = np.fromiter(
+            (self._symbols[row] == keys[pos] for row, pos in zip(rows, positions)),
+            dtype=bool,
+            count=len(positions),
+        )
+        keep = (total_depth > 0) & resident
+        if not keep.any():
+            return 0
+        rows = rows[keep]
+        index = index[keep]
+        bid_depth = bid_depth[keep]
+        ask_depth = ask_depth[keep]
+        total_depth = total_depth[keep]
+        depth_ofi = (bid_depth - ask_depth) / total_depth
+        pressure = np.clip(50.0 + (50.0 * depth_ofi), 0.0, 100.0)
+        top_depth_ratio = np.where(
+            (bid_depth > 0) & (ask_depth > 0),
+            bid_depth / np.maximum(ask_depth, 1.0),
+            0.0,
+        )
+        current = np.vstack(
+            (
+                batch.bid_price[index],
+                batch.bid_size[index],
+                batch.ask_price[index],
+                batch.ask_size[index],
+            )
+        )
+        true_norm, raw_event = self._true_ofi(rows, current)
+        has_true = ~np.isnan(true_norm)
+        fresh = (batch.quote_age_ms[index] <= FRESH_QUOTE_MAX_AGE_MS) & ~batch.stale[
+            index
+        ]
+        source_state = np.where(
+            fresh,
+            np.where(
+                has_true,
+                self._code("fresh_ws_order_flow_delta"),
+                self._code("fresh_ws_estimate"),
+            ),
+            np.where(
+                has_true,
+                self._code("decayed_ws_order_flow_delta"),
+                self._code("decayed_ws_estimate"),
+            ),
+        )
+        ofi_source = np.where(
+            has_true,
+            self._code("ws_order_flow_delta"),
+            self._code("depth_imbalance_proxy"),
+        )
+        self._apply(
+            rows,
+            now_ts=now,
+            ofi_norm=np.where(has_true, true_norm, depth_ofi),
+            depth_imbalance=depth_ofi,
+            true_ofi_norm=true_norm,
+            raw_ofi_event=raw_event,
+            pressure=pressure,
+            top_depth_ratio=top_depth_ratio,
+            confidence=np.where(fresh, 0.85, 0.15),
+            source_state=source_state,
+            ofi_source=ofi_source,
+            current_best=current,
+        )
+        self._float["last_ws_ts"][rows] = now
+        self._enforce_limits(now)
+        return len(rows)
+
+    def _round_fits_limits(self, keys: Sequence[str], tier: str) -> bool:
+        """True when touching ``keys`` cannot demote or evict any symbol.
+
+        Otherwise the batch is applied quote by quote so demotion/eviction
+        tie-breaking follows the per-symbol store exactly.
+        """
+        rows = self._active_rows()
+        hot = int(np.count_nonzero(self._tier[rows] == _HOT))
+        warm = len(rows) - hot
+        if str(tier).lower() == "hot":
+            added_hot = sum(
+                1
+                for key in keys
+                if key not in self._rows or self._tier[self._rows[key]] != _HOT
+            )
+            return (
+                hot + added_hot <= self.config.max_hot_symbols
+                and warm <= self.config.max_warm_symbols
+            )
+        added_warm = sum(1 for key in keys if key not in self._rows)
+        return (
+            hot <= self.config.max_hot_symbols
+            and warm + added_warm <= self.config.max_warm_symbols
+        )
+
+    def _true_ofi(
+        self, rows: np.ndarray, current: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized ``_true_ofi_event_norm``; NaN marks rows without a delta."""
+        prev_bid_price = self._float["prev_best_bid_price"][rows]
+        prev_bid_size = self._float["prev_best_bid_size"][rows]
+        prev_ask_price = self._float["prev_best_ask_price"][rows]
+        prev_ask_size = self._float["prev_best_ask_size"][rows]
+        bid_price, bid_size, ask_price, ask_size = current
+        has_delta = (
+            (prev_bid_price > 0)
+            & (prev_bid_size > 0)
+            & (prev_ask_price > 0)
+            & (prev_ask_size > 0)
+            & (current > 0).all(axis=0)
+        )
+        event = np.zeros(len(rows), dtype=np.float64)
+        event = event + np.where(bid_price >= prev_bid_price, bid_size, 0.0)
+        event = event - np.where(bid_price <= prev_bid_price, prev_bid_size, 0.0)
+        event = event - np.where(ask_price <= prev_ask_price, ask_size, 0.0)
+        event = event + np.where(ask_price >= prev_ask_price, prev_ask_size, 0.0)
+        denominator = np.maximum(
+            1.0, bid_size + ask_size + prev_bid_size + prev_ask_size
+        )
+        norm = np.clip(event / denominator, -1.0, 1.0)
+        return np.where(has_delta, norm, np.nan), np.where(has_delta, event, 0.0)
+
+    def _apply(
+        self,
+        rows: np.ndarray,
+        *,
+        now_ts: float,
+        ofi_norm: np.ndarray,
+        depth_imbalance: np.ndarray,
+        true_ofi_norm: np.ndarray,
+        raw_ofi_event: np.ndarray,
+        pressure: np.ndarray,
+        top_depth_ratio: np.ndarray,
+        confidence: np.ndarray,
+        source_state: np.ndarray,
+        ofi_source: np.ndarray,
+        current_best: np.ndarray | None,
+    ) -> None:
+        """Vectorized ``MicroEstimatorStore._apply_observation`` without limits."""
+        values = self._float
+        last_update = values["last_update_ts"][rows]
+        elapsed = np.maximum(
+            0.0, now_ts - np.where(last_update != 0.0, last_update, now_ts)
+        )
+        weight = self._decay(elapsed, self.config.half_life_sec)
+        samples = self._int["sample_count"][rows]
+        alpha = np.where(samples <= 0, 1.0, np.clip(1.0 - weight, 0.20, 0.80))
+        keep = 1.0 - alpha
+        values["depth_imbalance_ewma"][rows] = (
+            keep * values["depth_imbalance_ewma"][rows]
+        ) + (alpha * np.clip(depth_imbalance, -1.0, 1.0))
+        true_count = self._int["true_ofi_sample_count"][rows]
+        has_true = ~np.isnan(true_ofi_norm)
+        true_ofi = np.where(
+            has_true,
+            (keep * values["true_ofi_ewma"][rows])
+            + (alpha * np.clip(true_ofi_norm, -1.0, 1.0)),
+            values["true_ofi_ewma"][rows],
+        )
+        previous_true = ~has_true & (true_count > 0)
+        values["ofi_ewma"][rows] = np.where(
+            has_true | previous_true,
+            true_ofi,
+            (keep * values["ofi_ewma"][rows]) + (alpha * np.clip(ofi_norm, -1.0, 1.0)),
+        )
+        values["true_ofi_ewma"][rows] = true_ofi
+        values["last_ofi_event"][rows] = np.where(
+            has_true, raw_ofi_event, values["last_ofi_event"][rows]
+        )
+        self._int["true_ofi_sample_count"][rows] = true_count + has_true
+        values["pressure_ewma"][rows] = (keep * values["pressure_ewma"][rows]) + (
+            alpha * np.clip(pressure, 0.0, 100.0)
+        )
+        values["top_depth_ratio"][rows] = np.maximum(0.0, top_depth_ratio)
+        values["confidence"][rows] = np.maximum(
+            values["confidence"][rows] * weight, np.clip(confidence, 0.0, 1.0)
+        )
+        self._int["sample_count"][rows] = samples + 1
+        values["last_update_ts"][rows] = now_ts
+        self._ofi_source[rows] = np.where(
+            previous_true, self._code("previous_true_ofi"), ofi_source
+        )
+        self._source_state[rows] = source_state
+        if current_best is not None:
+            has_best = (current_best > 0).all(axis=0)
+            best_rows = rows[has_best]
+            for offset, name in enumerate(
+                (
+                    "prev_best_bid_price",
+                    "prev_best_bid_size",
+                    "prev_best_ask_price",
+                    "prev_best_ask_size",
+                )
+            ):
+                values[name][best_rows] = current_best[offset][has_best]
+
+    def _enforce_limits(self, now_ts: float) -> None:
+        self.prune(now_ts)
+        rows = self._active_rows()
+        last_update = self._float["last_update_ts"]
+        is_hot = self._tier[rows] == _HOT
+        hot = rows[is_hot]
+        warm = rows[~is_hot]
+        hot = hot[np.argsort(last_update[hot], kind="stable")]
+        warm = warm[np.argsort(last_update[warm], kind="stable")]
+        excess_hot = len(hot) - self.config.max_hot_symbols
+        if excess_hot > 0:
+            demoted = hot[:excess_hot]
+            self._tier[demoted] = _WARM
+            warm = np.concatenate((warm, demoted))
+            warm = warm[np.argsort(last_update[warm], kind="stable")]
+        excess_warm = len(warm) - self.config.max_warm_symbols
+        if excess_warm > 0:
+            self._release(warm[:excess_warm])
+
+    def _touch(self, symbol_key: str, tier: str, now_ts: float) -> int:
+        resolved = _HOT if str(tier).lower() == "hot" else _WARM
+        row = self._rows.get(symbol_key)
+        if row is None:
+            row = self._allocate(symbol_key)
+            self._tier[row] = resolved
+        elif self._tier[row] != _HOT or resolved == _HOT:
+            self._tier[row] = resolved
+        if self._float["last_update_ts"][row] <= 0:
+            self._float["last_update_ts"][row] = now_ts
+            self._source_state[row] = self._code("default_prior")
+        return row
+
+    def _allocate(self, symbol_key: str) -> int:
+        if not self._free:
+            self._grow(len(self._symbols) * 2)
+        row = self._free.pop()
+        for name, default in _FLOAT_COLUMNS.items():
+            self._float[name][row] = default
+        for name in _INT_COLUMNS:
+            self._int[name][row] = 0
+        self._ofi_source[row] = self._code("default_prior")
+        self._source_state[row] = self._code("default_prior")
+        self._symbols[row] = symbol_key
+        self._rows[symbol_key] = row
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        current = len(self._symbols)
+        if capacity <= current:
+            return
+        extra = capacity - current
+        for name, default in _FLOAT_COLUMNS.items():
+            self._float[name] = np.concatenate(
+                (self._float[name], np.full(extra, default, dtype=np.float64))
+            )
+        for name in _INT_COLUMNS:
+            self._int[name] = np.concatenate(
+                (self._int[name], np.zeros(extra, dtype=np.int64))
+            )
+        self._tier = np.concatenate((self._tier, np.zeros(extra, dtype=np.int8)))
+        self._ofi_source = np.concatenate(
+            (self._ofi_source, np.zeros(extra, dtype=np.int32))
+        )
+        self._source_state = np.concatenate(
+            (self._source_state, np.zeros(extra, dtype=np.int32))
+        )
+        self._symbols.extend([None] * extra)
+        self._free.extend(range(capacity - 1, current - 1, -1))
+
+    def _release(self, rows: np.ndarray) -> None:
+        for row in rows.tolist():
+            symbol_key = self._symbols[row]
+            if symbol_key is not None and self._rows.get(symbol_key) == row:
+                del self._rows[symbol_key]
+                self._free.append(row)
+
+    def _active_rows(self) -> np.ndarray:
+        return np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+
+    def _code(self, label: str) -> int:
+        code = self._label_codes.get(label)
+        if code is None:
+            code = len(self._labels)
+            self._labels.append(label)
+            self._label_codes[label] = code
+        return code
+
+    def _materialize_symbol(self, symbol_key: str) -> SymbolMicroEstimatorState:
+        row = self._rows.get(symbol_key)
+        if row is None:
+            return SymbolMicroEstimatorState(symbol=symbol_key)
+        return self._materialize(row)
+
+    def _materialize(self, row: int) -> SymbolMicroEstimatorState:
+        return SymbolMicroEstimatorState(
+            symbol=str(self._symbols[row]),
+            tier="hot" if self._tier[row] == _HOT else "warm",
+            **{name: float(self._float[name][row]) for name in _FLOAT_COLUMNS},
+            **{name: int(self._int[name][row]) for name in _INT_COLUMNS},
+            ofi_source=self._labels[int(self._ofi_source[row])],
+            source_state=self._labels[int(self._source_state[row])],
+        )
+
+    def _default_snapshot(self, symbol: str, *, now_ts: float) -> dict[str, Any]:
+        return MicroEstimatorStore._default_snapshot(self, symbol, now_ts=now_ts)
+
+    @staticmethod
+    def _symbol_key(symbol: str) -> str:
+        symbol_key = str(symbol or "").strip()
+        if not symbol_key:
+            raise ValueError("symbol is required")
+        return symbol_key
+
+    @staticmethod
+    def _decay(age_sec: np.ndarray, half_life_sec: float) -> np.ndarray:
+        if half_life_sec <= 0:
+            return np.zeros_like(age_sec)
+        return np.power(0.5, np.maximum(0.0, age_sec) / half_life_sec)
+
+
+def _batch_rounds(keys: Sequence[str]) -> list[list[int]]:
+    """Split batch positions so every symbol appears at most once per round."""
+    rounds: list[list[int]] = []
+    seen: dict[str, int] = {}
+    for position, key in enumerate(keys):
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        if occurrence == len(rounds):
+            rounds.append([])
+        rounds[occurrence].append(position)
+    return rounds
+
+
+def build_benchmark_cycles(
+    symbol_count: int, *, cycles: int, seed: int = 7
+) -> list[list[tuple[str, dict[str, Any]]]]:
+    """Deterministic random-walk WS quotes, one dispatch cycle per list entry."""
+    rng = random.Random(seed)
+    symbols = [f"{index:06d}" for index in range(1, symbol_count + 1)]
+    prices = {symbol: 10_000 + (rng.randrange(100) * 10) for symbol in symbols}
+    result = []
+    for _ in range(cycles):
+        quotes = []
+        for symbol in symbols:
+            prices[symbol] += rng.choice((-10, 0, 0, 10))
+            quotes.append(
+                (
+                    symbol,
+                    {
+                        "best_bid": prices[symbol],
+                        "best_ask": prices[symbol] + 10,
+                        "best_bid_qty": rng.randint(1, 2_000),
+                        "best_ask_qty": rng.randint(1, 2_000),
+                        "bid_tot": rng.randint(5_000, 50_000),
+                        "ask_tot": rng.randint(5_000, 50_000),
+                        "quote_age_ms": rng.choice((50.0, 400.0, 4_000.0)),
+                        "quote_stale": rng.random() < 0.05,
+                    },
+                )
+            )
+        result.append(quotes)
+    return result
+
+
+def benchmark_micro_estimator_stores(
+    symbol_counts: Sequence[int] = (50, 200, 1000),
+    *,
+    cycles: int = 20,
+    seed: int = 7,
+) -> dict[str, Any]:
+    """Time per-symbol updates/snapshots against the batched array store."""
+    rows = []
+    for symbol_count in symbol_counts:
+        config = MicroEstimatorConfig(
+            max_hot_symbols=symbol_count,
+            max_warm_symbols=symbol_count,
+        )
+        quote_cycles = build_benchmark_cycles(symbol_count, cycles=cycles, seed=seed)
+        symbols = [symbol for symbol, _ in quote_cycles[0]]
+        scalar = MicroEstimatorStore(config)
+        arrays = MicroEstimatorArrayStore(config, capacity=symbol_count)
+        scalar_update = scalar_snapshot = array_update = array_snapshot = 0.0
+        for cycle, quotes in enumerate(quote_cycles):
+            now_ts = 1_000.0 + cycle
+            started = time.perf_counter()
+            for symbol, quote in quotes:
+                scalar.update_from_ws_quote(symbol, quote, now_ts=now_ts)
+            scalar_update += time.perf_counter() - started
+            started = time.perf_counter()
+            scalar_snapshots = {
+                symbol: scalar.snapshot(symbol, now_ts=now_ts + 0.5)
+                for symbol in symbols
+            }
+            scalar_snapshot += time.perf_counter() - started
+            started = time.perf_counter()
+            arrays.update_ws_quotes(WSQuoteBatch.from_quotes(quotes), now_ts=now_ts)
+            array_update += time.perf_counter() - started
+            started = time.perf_counter()
+            array_snapshots = arrays.snapshot_many(symbols, now_ts=now_ts + 0.5)
+            array_snapshot += time.perf_counter() - started
+        max_abs_diff = max(
+            abs(float(scalar_snapshots[symbol][field]) - float(snap[field]))
+            for symbol, snap in array_snapshots.items()
+            for field in _SNAPSHOT_FLOAT_FIELDS + ("confidence",)
+        )
+        rows.append(
+            {
+                "symbols": symbol_count,
+                "cycles": cycles,
+                "per_symbol_update_ms_per_cycle": round(
+                    scalar_update * 1000.0 / cycles, 3
+                ),
+                "batch_update_ms_per_cycle": round(array_update * 1000.0 / cycles, 3),
+                "per_symbol_snapshot_ms_per_cycle": round(
+                    scalar_snapshot * 1000.0 / cycles, 3
+                ),
+                "snapshot_many_ms_per_cycle": round(
+                    array_snapshot * 1000.0 / cycles, 3
+                ),
+                "update_speedup": round(scalar_update / max(array_update, 1e-9), 2),
+                "snapshot_speedup": round(
+                    scalar_snapshot / max(array_snapshot, 1e-9), 2
+                ),
+                "max_abs_diff": max_abs_diff,
+            }
+        )
+    return {"schema": BENCHMARK_SCHEMA, "rows": rows}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the array-backed micro estimator store."
+    )
+    parser.add_argument(
+        "--symbols", type=int, nargs="+", default=[50, 200, 1000], dest="symbols"
+    )
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    print(
+        json.dumps(
+            benchmark_micro_estimator_stores(
+                args.symbols, cycles=args.cycles, seed=args.seed
+            ),
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
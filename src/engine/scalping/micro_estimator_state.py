@@ -6,7 +6,7 @@ import math
 import os
 import threading
 from dataclasses import dataclass
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping
 
 POLICY_VERSION = "micro_estimator_state_v1"
 DEFAULT_HOT_TTL_SEC = 600.0
@@ -24,7 +24,7 @@ FEATURE_ONLY_FORBIDDEN_USES = (
 )
 
 
-def _safe_float(value: Any, default: float = 0.0) -> float:
+def safe_float(value: Any, default: float = 0.0) -> float:
     try:
         if value in (None, "", "-"):
             return default
@@ -55,14 +55,14 @@ def _env_bool(name: str, default: bool) -> bool:
 
 
 def _env_float(name: str, default: float) -> float:
-    return _safe_float(os.environ.get(name), default)
+    return safe_float(os.environ.get(name), default)
 
 
 def _env_int(name: str, default: int) -> int:
     return _safe_int(os.environ.get(name), default)
 
 
-def _clamp(value: float, low: float, high: float) -> float:
+def clamp(value: float, low: float, high: float) -> float:
     return max(low, min(high, value))
 
 
@@ -72,10 +72,10 @@ def _decay_weight(age_sec: float, half_life_sec: float) -> float:
     return math.pow(0.5, max(0.0, age_sec) / half_life_sec)
 
 
-def _read_first_number(data: Mapping[str, Any], *keys: str) -> float:
+def read_first_number(data: Mapping[str, Any], *keys: str) -> float:
     for key in keys:
         if key in data:
-            value = _safe_float(data.get(key), 0.0)
+            value = safe_float(data.get(key), 0.0)
             if value > 0:
                 return value
     return 0.0
@@ -170,19 +170,19 @@ class SymbolMicroEstimatorState:
 
 def estimate_orderbook_pressure(orderbook: Mapping[str, Any] | None) -> dict[str, Any]:
     data = orderbook if isinstance(orderbook, Mapping) else {}
-    best_bid_qty = _read_first_number(
+    best_bid_qty = read_first_number(
         data, "best_bid_qty", "bid_qty_1", "bid1_qty", "bid_qty"
     )
-    best_ask_qty = _read_first_number(
+    best_ask_qty = read_first_number(
         data, "best_ask_qty", "ask_qty_1", "ask1_qty", "ask_qty"
     )
-    bid_total = _read_first_number(data, "bid_tot", "bid_total", "total_bid_qty")
-    ask_total = _read_first_number(data, "ask_tot", "ask_total", "total_ask_qty")
+    bid_total = read_first_number(data, "bid_tot", "bid_total", "total_bid_qty")
+    ask_total = read_first_number(data, "ask_tot", "ask_total", "total_ask_qty")
     bid_depth = bid_total if bid_total > 0 else best_bid_qty
     ask_depth = ask_total if ask_total > 0 else best_ask_qty
     total_depth = max(0.0, bid_depth + ask_depth)
     ofi_norm = ((bid_depth - ask_depth) / total_depth) if total_depth > 0 else 0.0
-    pressure = _clamp(50.0 + (50.0 * ofi_norm), 0.0, 100.0)
+    pressure = clamp(50.0 + (50.0 * ofi_norm), 0.0, 100.0)
     top_depth_ratio = (
         (bid_depth / max(ask_depth, 1.0)) if bid_depth > 0 and ask_depth > 0 else 0.0
     )
@@ -201,19 +201,19 @@ def estimate_orderbook_pressure(orderbook: Mapping[str, Any] | None) -> dict[str
     }
 
 
-def _best_level_snapshot(orderbook: Mapping[str, Any] | None) -> dict[str, float]:
+def best_level_snapshot(orderbook: Mapping[str, Any] | None) -> dict[str, float]:
     data = orderbook if isinstance(orderbook, Mapping) else {}
     return {
-        "bid_price": _read_first_number(
+        "bid_price": read_first_number(
             data, "best_bid", "bid_price_1", "bid1_price", "bid_price"
         ),
-        "bid_size": _read_first_number(
+        "bid_size": read_first_number(
             data, "best_bid_qty", "bid_qty_1", "bid1_qty", "bid_qty"
         ),
-        "ask_price": _read_first_number(
+        "ask_price": read_first_number(
             data, "best_ask", "ask_price_1", "ask1_price", "ask_price"
         ),
-        "ask_size": _read_first_number(
+        "ask_size": read_first_number(
             data, "best_ask_qty", "ask_qty_1", "ask1_qty", "ask_qty"
         ),
     }
@@ -252,7 +252,7 @@ def _true_ofi_event_norm(
     if ask_price >= prev_ask_price:
         event += prev_ask_size
     denominator = max(1.0, bid_size + ask_size + prev_bid_size + prev_ask_size)
-    return _clamp(event / denominator, -1.0, 1.0), event
+    return clamp(event / denominator, -1.0, 1.0), event
 
 
 def feature_only_fields_from_snapshot(
@@ -268,28 +268,26 @@ def feature_only_fields_from_snapshot(
         f"{prefix}_tier": snap.get("tier") or "cold",
         f"{prefix}_source_state": snap.get("source_state") or "default_prior",
         f"{prefix}_ofi_source": snap.get("ofi_source") or "default_prior",
-        f"{prefix}_ofi_ewma": round(_safe_float(snap.get("ofi_ewma"), 0.0), 4),
-        f"{prefix}_true_ofi_ewma": round(
-            _safe_float(snap.get("true_ofi_ewma"), 0.0), 4
-        ),
+        f"{prefix}_ofi_ewma": round(safe_float(snap.get("ofi_ewma"), 0.0), 4),
+        f"{prefix}_true_ofi_ewma": round(safe_float(snap.get("true_ofi_ewma"), 0.0), 4),
         f"{prefix}_depth_imbalance_ewma": round(
-            _safe_float(snap.get("depth_imbalance_ewma"), 0.0), 4
+            safe_float(snap.get("depth_imbalance_ewma"), 0.0), 4
         ),
         f"{prefix}_last_ofi_event": round(
-            _safe_float(snap.get("last_ofi_event"), 0.0), 4
+            safe_float(snap.get("last_ofi_event"), 0.0), 4
         ),
         f"{prefix}_pressure_ewma": round(
-            _safe_float(snap.get("pressure_ewma"), 50.0), 3
+            safe_float(snap.get("pressure_ewma"), 50.0), 3
         ),
         f"{prefix}_top_depth_ratio": round(
-            _safe_float(snap.get("top_depth_ratio"), 0.0), 4
+            safe_float(snap.get("top_depth_ratio"), 0.0), 4
         ),
-        f"{prefix}_confidence": round(_safe_float(snap.get("confidence"), 0.0), 4),
+        f"{prefix}_confidence": round(safe_float(snap.get("confidence"), 0.0), 4),
         f"{prefix}_sample_count": _safe_int(snap.get("sample_count"), 0),
         f"{prefix}_true_ofi_sample_count": _safe_int(
             snap.get("true_ofi_sample_count"), 0
         ),
-        f"{prefix}_age_sec": round(_safe_float(snap.get("age_sec"), 0.0), 3),
+        f"{prefix}_age_sec": round(safe_float(snap.get("age_sec"), 0.0), 3),
         f"{prefix}_consumer_stage": consumer_stage or "unspecified",
         f"{prefix}_metric_role": "diagnostic",
         f"{prefix}_decision_authority": FEATURE_ONLY_DECISION_AUTHORITY,
@@ -364,7 +362,7 @@ class MicroEstimatorStore:
             depth = estimate_orderbook_pressure(orderbook)
             if depth["total_depth"] <= 0:
                 return state
-            current_best = _best_level_snapshot(orderbook)
+            current_best = best_level_snapshot(orderbook)
             true_ofi_norm, raw_ofi_event = self._calculate_true_ofi(state, current_best)
             confidence = 0.72
             self._apply_observation(
@@ -413,9 +411,9 @@ class MicroEstimatorStore:
             depth = estimate_orderbook_pressure(data)
             if depth["total_depth"] <= 0:
                 return state
-            current_best = _best_level_snapshot(data)
+            current_best = best_level_snapshot(data)
             true_ofi_norm, raw_ofi_event = self._calculate_true_ofi(state, current_best)
-            quote_age_ms = _safe_float(data.get("quote_age_ms"), 0.0)
+            quote_age_ms = safe_float(data.get("quote_age_ms"), 0.0)
             stale = (
                 str(data.get("source_quality_state") or "").lower().find("stale") >= 0
             )
@@ -485,28 +483,28 @@ class MicroEstimatorStore:
             )
             probe_data = probe if isinstance(probe, Mapping) else {}
             quality_data = source_quality if isinstance(source_quality, Mapping) else {}
-            pressure = _safe_float(
+            pressure = safe_float(
                 probe_data.get("buy_pressure_10t")
                 or probe_data.get("late_entry_buy_pressure_10t")
                 or quality_data.get("buy_pressure_10t")
                 or quality_data.get("late_entry_buy_pressure_10t"),
                 50.0,
             )
-            delta = _safe_float(
+            delta = safe_float(
                 probe_data.get("net_aggressive_delta_10t")
                 or quality_data.get("net_aggressive_delta_10t"),
                 0.0,
             )
-            observed = _safe_float(observed_ts, 0.0)
+            observed = safe_float(observed_ts, 0.0)
             age_sec = (
                 max(0.0, float(now_ts) - observed) if observed > 0 else max_age_sec
             )
-            age_confidence = _clamp(1.0 - (age_sec / max(1.0, max_age_sec)), 0.0, 1.0)
+            age_confidence = clamp(1.0 - (age_sec / max(1.0, max_age_sec)), 0.0, 1.0)
             decayed_pressure = 50.0 + (
-                (_clamp(pressure, 0.0, 100.0) - 50.0) * age_confidence
+                (clamp(pressure, 0.0, 100.0) - 50.0) * age_confidence
             )
             ofi_hint = (
-                _clamp(delta / max(abs(delta), 1000.0), -1.0, 1.0) if delta else 0.0
+                clamp(delta / max(abs(delta), 1000.0), -1.0, 1.0) if delta else 0.0
             )
             confidence = 0.40 * age_confidence if observed > 0 else 0.0
             self._apply_observation(
@@ -542,7 +540,7 @@ class MicroEstimatorStore:
                 else self.config.warm_ttl_sec
             )
             decay = _decay_weight(age_sec, self.config.half_life_sec)
-            confidence = _clamp(state.confidence * decay, 0.0, 1.0)
+            confidence = clamp(state.confidence * decay, 0.0, 1.0)
             source_state = state.source_state
             if age_sec > ttl_sec:
                 source_state = "unusable"
@@ -580,6 +578,17 @@ class MicroEstimatorStore:
                 "min_pressure": self.config.min_pressure,
             }
 
+    def snapshot_many(
+        self, symbols: Iterable[str], *, now_ts: float
+    ) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                symbol_key: self.snapshot(symbol_key, now_ts=now_ts)
+                for symbol_key in dict.fromkeys(
+                    str(symbol or "").strip() for symbol in symbols
+                )
+            }
+
     def prune(self, now_ts: float) -> int:
         with self._lock:
             remove: list[str] = []
@@ -632,16 +641,16 @@ class MicroEstimatorStore:
         alpha = (
             1.0
             if state.sample_count <= 0
-            else _clamp(
+            else clamp(
                 1.0 - _decay_weight(elapsed, self.config.half_life_sec), 0.20, 0.80
             )
         )
         state.depth_imbalance_ewma = ((1.0 - alpha) * state.depth_imbalance_ewma) + (
-            alpha * _clamp(depth_imbalance, -1.0, 1.0)
+            alpha * clamp(depth_imbalance, -1.0, 1.0)
         )
         if true_ofi_norm is not None:
             state.true_ofi_ewma = ((1.0 - alpha) * state.true_ofi_ewma) + (
-                alpha * _clamp(true_ofi_norm, -1.0, 1.0)
+                alpha * clamp(true_ofi_norm, -1.0, 1.0)
             )
             state.true_ofi_sample_count += 1
             state.last_ofi_event = float(raw_ofi_event)
@@ -652,16 +661,16 @@ class MicroEstimatorStore:
             effective_ofi_source = "previous_true_ofi"
         elif state.true_ofi_sample_count <= 0:
             state.ofi_ewma = ((1.0 - alpha) * state.ofi_ewma) + (
-                alpha * _clamp(ofi_norm, -1.0, 1.0)
+                alpha * clamp(ofi_norm, -1.0, 1.0)
             )
             effective_ofi_source = ofi_source
         state.pressure_ewma = ((1.0 - alpha) * state.pressure_ewma) + (
-            alpha * _clamp(pressure, 0.0, 100.0)
+            alpha * clamp(pressure, 0.0, 100.0)
         )
         state.top_depth_ratio = max(0.0, top_depth_ratio)
         state.confidence = max(
             state.confidence * _decay_weight(elapsed, self.config.half_life_sec),
-            _clamp(confidence, 0.0, 1.0),
+            clamp(confidence, 0.0, 1.0),
         )
         state.sample_count += 1
         state.last_update_ts = float(now_ts)
@@ -720,7 +729,22 @@ class MicroEstimatorStore:
         }
 
 
-DEFAULT_STORE = MicroEstimatorStore()
+def _build_default_store():
+    """Process-wide store shared by WS dispatch and the sniper handlers.
+
+    ``KORSTOCKSCAN_MICRO_ESTIMATOR_ARRAY_STORE_ENABLED`` (default off) swaps in
+    the array-backed store, whose WS updates are batched per dispatch cycle.
+    """
+    if _env_bool("KORSTOCKSCAN_MICRO_ESTIMATOR_ARRAY_STORE_ENABLED", False):
+        from src.engine.scalping.micro_estimator_arrays import (
+            MicroEstimatorArrayStore,
+        )
+
+        return MicroEstimatorArrayStore()
+    return MicroEstimatorStore()
+
+
+DEFAULT_STORE = _build_default_store()
 
 
 def mark_candidate(
@@ -778,6 +802,12 @@ def snapshot(symbol: str, *, now_ts: float) -> dict[str, Any]:
     return DEFAULT_STORE.snapshot(symbol, now_ts=now_ts)
 
 
+def snapshot_many(
+    symbols: Iterable[str], *, now_ts: float
+) -> dict[str, dict[str, Any]]:
+    return DEFAULT_STORE.snapshot_many(symbols, now_ts=now_ts)
+
+
 def feature_only_fields(
     symbol: str,
     *,
@@ -0,0 +1,769 @@
+"""Columnar, memory-mappable encoding for closed path-journal partitions.
+
+The live writers keep appending JSONL (``NonBlockingPathJournalWriter``); once a
+partition is closed, ``convert_partition_to_columnar`` re-encodes every shard
+as fixed-schema column blocks so offline readers can slice one symbol and time
+range without json-parsing the whole session.
+
+File layout (``.mrcol``, little endian)::
+
+    magic   b"MRCOL01\\n"
+    block*  <4sIQ b"BLK1", header_len, payload_len | header JSON | pad8 | payload
+
+Each block header records its row schema, ordered keys, per-column encoding,
+row count, ``local_receive_timestamp`` min/max in microseconds, symbol set and
+a SHA-256 over the canonical JSON of its rows.  Column buffers sit at 8-byte
+aligned payload offsets:
+
+* ``bool``  int8 (-1 null)        * ``int``/``float``  int64/float64 + null mask
+* ``str``   int32 dictionary code (-1 null), dictionary in the header
+* ``json``  like ``str`` for nested values (levels, route totals)
+
+Two derived int64 columns, ``_receive_us`` and ``_exchange_us``, back the time
+range filters.  ``iter_rows`` rebuilds the original row dicts exactly, so
+consumers run the same provenance validation on columnar rows as on JSONL.
+A truncated trailing block is skipped, as with the JSONL tail.
+
+Closed partitions are converted from the command line with
+``python -m src.engine.scalping.micro_reversion.columnar_shard <partition>...``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from .path_journal import (
+    MARKET_DEPTH_CONTRACT_ID,
+    MARKET_DEPTH_METRIC_CONTRACT,
+    MARKET_DEPTH_SCHEMA,
+    MARKET_PATH_METRIC_CONTRACT,
+    MARKET_PATH_SCHEMA,
+    MARKET_STREAM_CONTRACT_ID,
+    MARKET_STREAM_METRIC_CONTRACT,
+    MARKET_STREAM_SCHEMA,
+    PathStoragePolicy,
+    _parse_aware_timestamp,
+    _shard_index,
+    partition_maintenance_lock,
+    readable_partition_path_files,
+    validate_market_stream_path_provenance,
+)
+
+COLUMNAR_SHARD_SCHEMA = "scalp_micro_reversion_columnar_shard_v1"
+COLUMNAR_MANIFEST_SCHEMA = "scalp_micro_reversion_columnar_manifest_v1"
+COLUMNAR_SUFFIX = ".mrcol"
+DEFAULT_BLOCK_ROWS = 8_192
+
+_MAGIC = b"MRCOL01\n"
+_BLOCK_HEAD = struct.Struct("<4sIQ")
+_BLOCK_TAG = b"BLK1"
+_NULL_CODE = -1
+_DERIVED_TIME_COLUMNS = {
+    "_receive_us": "local_receive_timestamp",
+    "_exchange_us": "exchange_timestamp",
+}
+
+
+def _canonical_row(row: dict[str, Any]) -> bytes:
+    return (json.dumps(row, ensure_ascii=False, sort_keys=True) + "\n").encode("utf-8")
+
+
+def _timestamp_us(value: object) -> int | None:
+    try:
+        parsed = _parse_aware_timestamp(str(value or ""), field_name="timestamp")
+    except ValueError:
+        return None
+    return int(parsed.timestamp() * 1_000_000)
+
+
+def _pad8(size: int) -> int:
+    return (-size) % 8
+
+
+def _column_kind(values: Sequence[Any]) -> str:
+    present = [value for value in values if value is not None]
+    if not present:
+        return "null"
+    if all(isinstance(value, bool) for value in present):
+        return "bool"
+    if all(
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and -(2**63) <= value < 2**63
+        for value in present
+    ):
+        return "int"
+    if all(isinstance(value, float) for value in present):
+        return "float"
+    if all(isinstance(value, str) for value in present):
+        return "str"
+    return "json"
+
+
+def _dictionary_encode(
+    values: Sequence[Any], encode: Callable[[Any], str]
+) -> tuple[np.ndarray, list[str]]:
+    dictionary: dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for index, value in enumerate(values):
+        if value is None:
+            codes[index] = _NULL_CODE
+            continue
+        text = encode(value)
+        code = dictionary.get(text)
+        if code is None:
+            code = dictionary[text] = len(dictionary)
+        codes[index] = code
+    return codes, list(dictionary)
+
+
+def _encode_block(rows: Sequence[dict[str, Any]]) -> bytes:
+    keys = list(rows[0])
+    payload = bytearray()
+    columns: list[dict[str, Any]] = []
+
+    def put(array: np.ndarray) -> tuple[int, int]:
+        payload.extend(b"\0" * _pad8(len(payload)))
+        offset = len(payload)
+        payload.extend(array.tobytes())
+        return offset, array.nbytes
+
+    for key in keys:
+        values = [row[key] for row in rows]
+        kind = _column_kind(values)
+        column: dict[str, Any] = {"name": key, "kind": kind}
+        nulls = np.fromiter((value is None for value in values), bool, len(values))
+        if kind == "bool":
+            data = np.array(
+                [_NULL_CODE if value is None else int(value) for value in values],
+                dtype=np.int8,
+            )
+            column["offset"], column["nbytes"] = put(data)
+        elif kind in {"int", "float"}:
+            dtype = np.int64 if kind == "int" else np.float64
+            fill = 0 if kind == "int" else np.nan
+            data = np.array(
+                [fill if value is None else value for value in values], dtype=dtype
+            )
+            column["offset"], column["nbytes"] = put(data)
+            if nulls.any():
+                column["null_offset"], _ = put(nulls.astype(np.uint8))
+        elif kind in {"str", "json"}:
+            encode = (
+                str
+                if kind == "str"
+                else lambda value: json.dumps(value, ensure_ascii=False, sort_keys=True)
+            )
+            codes, dictionary = _dictionary_encode(values, encode)
+            column["offset"], column["nbytes"] = put(codes)
+            column["dictionary"] = dictionary
+        columns.append(column)
+
+    receive_us: list[int] = []
+    for name, source in _DERIVED_TIME_COLUMNS.items():
+        if source not in rows[0]:
+            continue
+        micros = [_timestamp_us(row[source]) for row in rows]
+        if name == "_receive_us":
+            receive_us = [value for value in micros if value is not None]
+        data = np.array([0 if value is None else value for value in micros], np.int64)
+        column = {"name": name, "kind": "int", "derived": True}
+        column["offset"], column["nbytes"] = put(data)
+        if any(value is None for value in micros):
+            column["null_offset"], _ = put(
+                np.array([value is None for value in micros], dtype=np.uint8)
+            )
+        columns.append(column)
+
+    payload.extend(b"\0" * _pad8(len(payload)))
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(_canonical_row(row))
+    header = {
+        "format": COLUMNAR_SHARD_SCHEMA,
+        "row_schema": rows[0].get("schema"),
+        "rows": len(rows),
+        "keys": keys,
+        "columns": columns,
+        "ts_min_us": min(receive_us) if receive_us else None,
+        "ts_max_us": max(receive_us) if receive_us else None,
+        "symbols": sorted({str(row.get("symbol") or "") for row in rows}),
+        "rows_sha256": digest.hexdigest(),
+    }
+    encoded_header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    encoded_header += b" " * _pad8(_BLOCK_HEAD.size + len(encoded_header))
+    return (
+        _BLOCK_HEAD.pack(_BLOCK_TAG, len(encoded_header), len(payload))
+        + encoded_header
+        + bytes(payload)
+    )
+
+
+def _row_blocks(
+    rows: Iterable[dict[str, Any]], block_rows: int
+) -> Iterator[list[dict[str, Any]]]:
+    block: list[dict[str, Any]] = []
+    block_keys: tuple[str, ...] | None = None
+    for row in rows:
+        if not isinstance(row, dict):
+            raise ValueError("columnar shard rows must be objects")
+        keys = tuple(row)
+        if block and (keys != block_keys or len(block) >= block_rows):
+            yield block
+            block = []
+        block_keys = keys
+        block.append(row)
+    if block:
+        yield block
+
+
+def write_columnar_shard(
+    path: Path,
+    rows: Iterable[dict[str, Any]],
+    *,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+) -> dict[str, Any]:
+    """Atomically write ``rows`` as one ``.mrcol`` shard and summarize it."""
+
+    if block_rows <= 0:
+        raise ValueError("block_rows must be positive")
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    temporary = Path(temporary_name)
+    digest = hashlib.sha256()
+    blocks: list[dict[str, Any]] = []
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(_MAGIC)
+            for block in _row_blocks(rows, block_rows):
+                for row in block:
+                    digest.update(_canonical_row(row))
+                encoded = _encode_block(block)
+                handle.write(encoded)
+                header = _decode_header(encoded, 0)[0]
+                blocks.append(
+                    {
+                        "rows": header["rows"],
+                        "ts_min_us": header["ts_min_us"],
+                        "ts_max_us": header["ts_max_us"],
+                        "symbols": header["symbols"],
+                    }
+                )
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(temporary, 0o640)
+        os.replace(temporary, target)
+    finally:
+        if temporary.exists():
+            temporary.unlink()
+    return {
+        "file": target.name,
+        "bytes": target.stat().st_size,
+        "rows": sum(block["rows"] for block in blocks),
+        "rows_sha256": digest.hexdigest(),
+        "blocks": blocks,
+    }
+
+
+def _decode_header(buffer, offset: int) -> tuple[dict[str, Any], int, int] | None:
+    head_end = offset + _BLOCK_HEAD.size
+    if head_end > len(buffer):
+        return None
+    tag, header_len, payload_len = _BLOCK_HEAD.unpack_from(buffer, offset)
+    if tag != _BLOCK_TAG:
+        raise ValueError("corrupt columnar shard block tag")
+    payload_start = head_end + header_len
+    if payload_start + payload_len > len(buffer):
+        return None
+    header = json.loads(bytes(buffer[head_end:payload_start]).decode("utf-8"))
+    return header, payload_start, payload_len
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnarBlockInfo:
+    index: int
+    rows: int
+    row_schema: str | None
+    ts_min_us: int | None
+    ts_max_us: int | None
+    symbols: tuple[str, ...]
+    rows_sha256: str
+
+    def overlaps(
+        self,
+        *,
+        symbol: str | None = None,
+        start_us: int | None = None,
+        end_us: int | None = None,
+    ) -> bool:
+        if symbol is not None and symbol not in self.symbols:
+            return False
+        if start_us is not None and (
+            self.ts_max_us is None or self.ts_max_us < start_us
+        ):
+            return False
+        if end_us is not None and (self.ts_min_us is None or self.ts_min_us > end_us):
+            return False
+        return True
+
+
+class ColumnarShardReader:
+    """Memory-mapped reader for one ``.mrcol`` shard.
+
+    Numeric columns are zero-copy views into the map; keep the reader open
+    while using arrays returned by ``column`` (``read_arrays`` copies).
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._handle = open(self.path, "rb")
+        size = os.fstat(self._handle.fileno()).st_size
+        self._map = (
+            mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+            if size
+            else b""
+        )
+        if bytes(self._map[: len(_MAGIC)]) != _MAGIC:
+            self.close()
+            raise ValueError(f"not a columnar shard: {self.path}")
+        self._headers: list[tuple[dict[str, Any], int]] = []
+        offset = len(_MAGIC)
+        while True:
+            decoded = _decode_header(self._map, offset)
+            if decoded is None:
+                break
+            header, payload_start, payload_len = decoded
+            self._headers.append((header, payload_start))
+            offset = payload_start + payload_len
+        self.blocks = tuple(
+            ColumnarBlockInfo(
+                index=index,
+                rows=header["rows"],
+                row_schema=header.get("row_schema"),
+                ts_min_us=header.get("ts_min_us"),
+                ts_max_us=header.get("ts_max_us"),
+                symbols=tuple(header.get("symbols") or ()),
+                rows_sha256=header["rows_sha256"],
+            )
+            for index, (header, _start) in enumerate(self._headers)
+        )
+
+    def __enter__(self) -> "ColumnarShardReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._handle.close()
+
+    @property
+    def rows(self) -> int:
+        return sum(block.rows for block in self.blocks)
+
+    def _column_spec(self, block_index: int, name: str) -> dict[str, Any]:
+        header, _ = self._headers[block_index]
+        for spec in header["columns"]:
+            if spec["name"] == name:
+                return spec
+        raise KeyError(name)
+
+    def _buffer(self, block_index: int, offset: int, dtype, count: int) -> np.ndarray:
+        _, payload_start = self._headers[block_index]
+        return np.frombuffer(
+            self._map, dtype=dtype, count=count, offset=payload_start + offset
+        )
+
+    def _nulls(self, block_index: int, spec: dict[str, Any]) -> np.ndarray | None:
+        if "null_offset" not in spec:
+            return None
+        rows = self.blocks[block_index].rows
+        return self._buffer(block_index, spec["null_offset"], np.uint8, rows).view(bool)
+
+    def column(self, block_index: int, name: str) -> np.ndarray:
+        """One block column: numeric views, or object arrays for text/nested."""
+
+        spec = self._column_spec(block_index, name)
+        rows = self.blocks[block_index].rows
+        kind = spec["kind"]
+        if kind == "null":
+            return np.full(rows, None, dtype=object)
+        if kind == "bool":
+            data = self._buffer(block_index, spec["offset"], np.int8, rows)
+            if (data == _NULL_CODE).any():
+                values = np.full(rows, None, dtype=object)
+                present = data != _NULL_CODE
+                values[present] = data[present].astype(bool)
+                return values
+            return data.astype(bool)
+        if kind in {"int", "float"}:
+            dtype = np.int64 if kind == "int" else np.float64
+            data = self._buffer(block_index, spec["offset"], dtype, rows)
+            nulls = self._nulls(block_index, spec)
+            if nulls is None:
+                return data
+            values = data.astype(np.float64)
+            values[nulls] = np.nan
+            return values
+        codes = self._buffer(block_index, spec["offset"], np.int32, rows)
+        dictionary = spec["dictionary"]
+        if kind == "json":
+            dictionary = [json.loads(text) for text in dictionary]
+        lookup = np.empty(len(dictionary) + 1, dtype=object)
+        lookup[: len(dictionary)] = dictionary
+        lookup[-1] = None
+        return lookup[codes]
+
+    def _row_mask(
+        self,
+        block_index: int,
+        *,
+        symbol: str | None,
+        start_us: int | None,
+        end_us: int | None,
+    ) -> np.ndarray | None:
+        mask = None
+        if symbol is not None and len(self.blocks[block_index].symbols) > 1:
+            spec = self._column_spec(block_index, "symbol")
+            codes = self._buffer(
+                block_index, spec["offset"], np.int32, self.blocks[block_index].rows
+            )
+            mask = codes == spec["dictionary"].index(symbol)
+        if start_us is not None or end_us is not None:
+            receive_us = self.column(block_index, "_receive_us")
+            time_mask = np.ones(len(receive_us), dtype=bool)
+            if start_us is not None:
+                time_mask &= receive_us >= start_us
+            if end_us is not None:
+                time_mask &= receive_us <= end_us
+            mask = time_mask if mask is None else mask & time_mask
+        return mask
+
+    def _selected_blocks(self, symbol, start_us, end_us):
+        for block in self.blocks:
+            if block.overlaps(symbol=symbol, start_us=start_us, end_us=end_us):
+                yield block.index, self._row_mask(
+                    block.index, symbol=symbol, start_us=start_us, end_us=end_us
+                )
+
+    def read_arrays(
+        self,
+        *,
+        symbol: str | None = None,
+        start_us: int | None = None,
+        end_us: int | None = None,
+        columns: Iterable[str] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Concatenate columns for one symbol and receive-time range.
+
+        ``start_us``/``end_us`` are inclusive ``local_receive_timestamp``
+        bounds.  Nullable integer columns come back as float64 with NaN.
+        """
+
+        wanted = list(columns) if columns is not None else None
+        parts: dict[str, list[np.ndarray]] = {}
+        for block_index, mask in self._selected_blocks(symbol, start_us, end_us):
+            header, _ = self._headers[block_index]
+            names = wanted or [spec["name"] for spec in header["columns"]]
+            for name in names:
+                values = self.column(block_index, name)
+                parts.setdefault(name, []).append(
+                    values if mask is None else values[mask]
+                )
+        return {
+            name: np.concatenate(chunks) if len(chunks) > 1 else chunks[0].copy()
+            for name, chunks in parts.items()
+        }
+
+    def iter_rows(
+        self,
+        *,
+        symbol: str | None = None,
+        start_us: int | None = None,
+        end_us: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Rebuild the original row dicts, in write order."""
+
+        for block_index, mask in self._selected_blocks(symbol, start_us, end_us):
+            indices = None if mask is None else np.flatnonzero(mask).tolist()
+            yield from self._block_rows(block_index, indices)
+
+    def verify(self) -> bool:
+        """Recompute each block's canonical row digest."""
+
+        for block in self.blocks:
+            digest = hashlib.sha256()
+            for row in self._block_rows(block.index):
+                digest.update(_canonical_row(row))
+            if digest.hexdigest() != block.rows_sha256:
+                return False
+        return True
+
+    def _python_values(self, block_index: int, spec: dict[str, Any]) -> list[Any]:
+        if spec["kind"] in {"int", "float"} and "null_offset" in spec:
+            rows = self.blocks[block_index].rows
+            dtype = np.int64 if spec["kind"] == "int" else np.float64
+            values = self._buffer(block_index, spec["offset"], dtype, rows).tolist()
+            for index in np.flatnonzero(self._nulls(block_index, spec)).tolist():
+                values[index] = None
+            return values
+        return self.column(block_index, spec["name"]).tolist()
+
+    def _block_rows(
+        self, block_index: int, indices: list[int] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        header, _ = self._headers[block_index]
+        keys = header["keys"]
+        decoded = [
+            self._python_values(block_index, spec)
+            for spec in header["columns"][: len(keys)]
+        ]
+        for index in range(header["rows"]) if indices is None else indices:
+            yield {key: decoded[position][index] for position, key in enumerate(keys)}
+
+
+def _read_jsonl_rows(path: Path) -> Iterator[dict[str, Any]]:
+    handle = (
+        gzip.open(path, "rt", encoding="utf-8")
+        if path.suffix == ".gz"
+        else path.open("r", encoding="utf-8")
+    )
+    with handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            payload = json.loads(line)
+            if not isinstance(payload, dict):
+                raise ValueError("JSONL row must be an object")
+            yield payload
+
+
+def default_row_validator(row_schema: str) -> Callable[[dict[str, Any]], None] | None:
+    """The read-side provenance check each partition kind already applies."""
+
+    if row_schema == MARKET_DEPTH_SCHEMA:
+        from .depth_join import validate_depth_row
+
+        return validate_depth_row
+    if row_schema == MARKET_STREAM_SCHEMA:
+
+        def validate_stream_row(row: dict[str, Any]) -> None:
+            validate_market_stream_path_provenance(
+                path_order_status=row.get("path_order_status"),
+                path_consumer_eligible=row.get("path_consumer_eligible"),
+                exchange_timestamp_regression_ms=row.get(
+                    "exchange_timestamp_regression_ms"
+                ),
+            )
+
+        return validate_stream_row
+    return None
+
+
+def partition_contract_fields(
+    partition_path: Path,
+) -> tuple[str, str, dict[str, Any]]:
+    """Row schema, contract id and metric contract, as ``write_market_path_manifest``."""
+
+    name = Path(partition_path).name
+    if name.startswith("market_depth_stream"):
+        return (
+            MARKET_DEPTH_SCHEMA,
+            MARKET_DEPTH_CONTRACT_ID,
+            MARKET_DEPTH_METRIC_CONTRACT,
+        )
+    if name.startswith("market_stream"):
+        return (
+            MARKET_STREAM_SCHEMA,
+            MARKET_STREAM_CONTRACT_ID,
+            MARKET_STREAM_METRIC_CONTRACT,
+        )
+    return (
+        MARKET_PATH_SCHEMA,
+        "scalp_micro_reversion_market_path_contract_v6",
+        MARKET_PATH_METRIC_CONTRACT,
+    )
+
+
+def columnar_shard_path(partition_path: Path, shard_index: int) -> Path:
+    base = Path(partition_path)
+    if shard_index == 0:
+        return base.with_suffix(COLUMNAR_SUFFIX)
+    return base.with_name(f"{base.stem}.part-{shard_index:06d}{COLUMNAR_SUFFIX}")
+
+
+def columnar_manifest_path(partition_path: Path) -> Path:
+    base = Path(partition_path)
+    return base.with_name(f"{base.stem}.columnar_manifest.json")
+
+
+def convert_partition_to_columnar(
+    partition_path: Path,
+    *,
+    storage_policy: PathStoragePolicy | None = None,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    validate_row: Callable[[dict[str, Any]], None] | None = None,
+) -> Path:
+    """Encode every JSONL shard of a closed partition and publish a manifest.
+
+    Rows are validated with ``validate_row`` (default: the partition kind's
+    read-side check) before encoding; JSONL shards are left untouched.
+    """
+
+    base = Path(partition_path)
+    policy = storage_policy or PathStoragePolicy()
+    row_schema, contract_id, metric_contract = partition_contract_fields(base)
+    validator = validate_row or default_row_validator(row_schema)
+
+    def checked_rows(path: Path) -> Iterator[dict[str, Any]]:
+        for row in _read_jsonl_rows(path):
+            if validator is not None:
+                validator(row)
+            yield row
+
+    with partition_maintenance_lock(base):
+        sources = readable_partition_path_files(base)
+        if not sources:
+            raise ValueError("cannot convert a partition without path shards")
+        shards = []
+        for source in sources:
+            logical = source.with_suffix("") if source.suffix == ".gz" else source
+            index = _shard_index(base, logical)
+            summary = write_columnar_shard(
+                columnar_shard_path(base, index),
+                checked_rows(source),
+                block_rows=block_rows,
+            )
+            shards.append(
+                {
+                    "index": index,
+                    "source_file": source.name,
+                    "source_bytes": source.stat().st_size,
+                    **summary,
+                }
+            )
+        source_manifest = policy.manifest_path(base)
+        payload = {
+            "schema": COLUMNAR_MANIFEST_SCHEMA,
+            "shard_format": COLUMNAR_SHARD_SCHEMA,
+            "generated_at": datetime.now()
+            .astimezone()
+            .isoformat(timespec="milliseconds"),
+            "logical_path": base.name,
+            "source_manifest": (
+                source_manifest.name if source_manifest.exists() else None
+            ),
+            "rows": sum(shard["rows"] for shard in shards),
+            "shards": shards,
+            "actual_order_submitted": False,
+            "broker_order_forbidden": True,
+            "trading_runtime_effect": False,
+            "row_schema": row_schema,
+            "metric_contract_id": contract_id,
+            **metric_contract,
+        }
+        target = columnar_manifest_path(base)
+        descriptor, temporary_name = tempfile.mkstemp(
+            prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+        )
+        temporary = Path(temporary_name)
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(
+                    (
+                        json.dumps(payload, ensure_ascii=False, sort_keys=True) + "\n"
+                    ).encode("utf-8")
+                )
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(temporary, 0o640)
+            os.replace(temporary, target)
+        finally:
+            if temporary.exists():
+                temporary.unlink()
+    return target
+
+
+def columnar_partition_files(partition_path: Path) -> tuple[Path, ...]:
+    """Columnar shards listed by a partition's manifest, in shard order."""
+
+    base = Path(partition_path)
+    manifest = json.loads(columnar_manifest_path(base).read_text(encoding="utf-8"))
+    if manifest.get("schema") != COLUMNAR_MANIFEST_SCHEMA:
+        raise ValueError("unexpected columnar manifest schema")
+    shards = sorted(manifest.get("shards") or [], key=lambda shard: shard["index"])
+    paths = []
+    for expected, shard in enumerate(shards):
+        if shard["index"] != expected:
+            raise ValueError("columnar shard sequence is not contiguous")
+        path = base.with_name(shard["file"])
+        if path.stat().st_size != shard["bytes"]:
+            raise ValueError("columnar shard size conflicts with manifest")
+        paths.append(path)
+    return tuple(paths)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Convert closed path-journal partitions to columnar shards."
+    )
+    parser.add_argument(
+        "partitions",
+        nargs="+",
+        type=Path,
+        help="logical partition path, e.g. .../market_depth_stream.jsonl",
+    )
+    parser.add_argument("--block-rows", type=int, default=DEFAULT_BLOCK_ROWS)
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="leave partitions that already have a columnar manifest",
+    )
+    args = parser.parse_args(argv)
+    results = []
+    for partition in args.partitions:
+        result: dict[str, Any] = {"partition": str(partition)}
+        if args.skip_existing and columnar_manifest_path(partition).exists():
+            results.append({**result, "status": "skipped_existing"})
+            continue
+        try:
+            manifest_path = convert_partition_to_columnar(
+                partition, block_rows=args.block_rows
+            )
+        except (OSError, ValueError) as exc:
+            results.append({**result, "status": "failed", "error": str(exc)})
+            continue
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        results.append(
+            {
+                **result,
+                "status": "converted",
+                "manifest": str(manifest_path),
+                "rows": manifest["rows"],
+                "shards": len(manifest["shards"]),
+            }
+        )
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 1 if any(result["status"] == "failed" for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,25 +3,36 @@
 The join deliberately uses local receive time, never a future snapshot, and
 never crosses symbol, venue, or session boundaries.  It has no runtime policy
 or order authority.
+
+``join_latest_past_depth`` materializes the depth side in memory;
+``stream_join_latest_past_depth`` produces the same rows lazily from
+receive-time-ordered inputs and keeps only one snapshot per series.
 """
 
 from __future__ import annotations
 
+import argparse
 import gzip
+import heapq
 import json
 import math
+import time
+import tracemalloc
 from bisect import bisect_right
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
+from .columnar_shard import COLUMNAR_SUFFIX, ColumnarShardReader
 from .contracts import normalize_symbol, normalize_venue, registration_item_identity
 from .path_journal import (
     MARKET_DEPTH_CONTRACT_ID,
     MARKET_DEPTH_SCHEMA,
     MARKET_STREAM_CONTRACT_ID,
     MARKET_STREAM_SCHEMA,
+    MarketDepthPoint,
+    MarketStreamPoint,
     validate_market_stream_path_provenance,
 )
 
@@ -49,11 +60,22 @@ DEPTH_JOIN_METRIC_CONTRACT = {
 
 
 def read_depth_rows(paths: Iterable[Path | str]) -> tuple[dict[str, Any], ...]:
-    """Read and validate plain or gzip depth JSONL shards."""
+    """Read and validate plain or gzip depth JSONL shards, or columnar shards."""
+
+    return tuple(iter_depth_rows(paths))
+
+
+def iter_depth_rows(paths: Iterable[Path | str]) -> Iterator[dict[str, Any]]:
+    """Lazily yield validated depth rows from shards in the given order."""
 
-    rows: list[dict[str, Any]] = []
     for raw_path in paths:
         path = Path(raw_path)
+        if path.suffix == COLUMNAR_SUFFIX:
+            with ColumnarShardReader(path) as reader:
+                for payload in reader.iter_rows():
+                    validate_depth_row(payload)
+                    yield payload
+            continue
         handle = (
             gzip.open(path, "rt", encoding="utf-8")
             if path.suffix == ".gz"
@@ -65,8 +87,21 @@ def read_depth_rows(paths: Iterable[Path | str]) -> tuple[dict[str, Any], ...]:
                     continue
                 payload = json.loads(line)
                 validate_depth_row(payload)
-                rows.append(payload)
-    return tuple(rows)
+                yield payload
+
+
+def merge_by_receive_time(
+    *streams: Iterable[dict[str, Any]],
+) -> Iterator[dict[str, Any]]:
+    """K-way merge receive-time-ordered row iterators (per series or shard).
+
+    Rows with equal receive times keep their input stream order, so a series'
+    own sequence order survives the merge.
+    """
+
+    return heapq.merge(
+        *streams, key=lambda row: _timestamp_us(row.get("local_receive_timestamp"))
+    )
 
 
 def join_latest_past_depth(
@@ -110,55 +145,131 @@ def join_latest_past_depth(
     joined: list[dict[str, Any]] = []
     for market in market_rows:
         _validate_market_row(market)
-        payload = dict(market)
-        if payload.get("bid_depth") is not None or payload.get("ask_depth") is not None:
-            raise ValueError("canonical 0B row must not contain prejoined depth")
-        key = _series_key(payload)
-        market_received_us = _timestamp_us(payload.get("local_receive_timestamp"))
+        key = _series_key(market)
+        market_received_us = _timestamp_us(market.get("local_receive_timestamp"))
         candidates = by_series.get(key, ())
         index = bisect_right(receive_times.get(key, ()), market_received_us) - 1
-        status = "missing_same_series_depth"
-        age_ms: float | None = None
-        selected: dict[str, Any] | None = None
-        if index >= 0 and candidates:
-            selected_receive_us, candidate = candidates[index]
-            age_ms = (market_received_us - selected_receive_us) / 1_000.0
-            if age_ms <= max_age_ms:
-                selected = candidate
-                status = "joined_fresh_past_depth"
-            else:
-                status = "stale_past_depth"
-        if selected is not None:
-            if payload.get("bid_depth") is None:
-                payload["bid_depth"] = selected["bid_depth"]
-            if payload.get("ask_depth") is None:
-                payload["ask_depth"] = selected["ask_depth"]
-            payload["depth_context"] = {
-                "best_bid": selected["best_bid"],
-                "best_ask": selected["best_ask"],
-                "best_bid_qty": selected["best_bid_qty"],
-                "best_ask_qty": selected["best_ask_qty"],
-                "bid_levels": selected["bid_levels"],
-                "ask_levels": selected["ask_levels"],
-                "route_depth_totals": selected["route_depth_totals"],
-                "source_sequence": selected["source_sequence"],
-                "sequence_epoch": selected["sequence_epoch"],
-                "local_receive_timestamp": selected["local_receive_timestamp"],
-                "exchange_timestamp": selected["exchange_timestamp"],
-                "item": selected["item"],
-            }
-        payload.update(
-            {
-                "depth_join_schema": DEPTH_JOIN_SCHEMA,
-                "depth_join_status": status,
-                "depth_age_ms": age_ms,
-                "depth_join_metric_contract": dict(DEPTH_JOIN_METRIC_CONTRACT),
-            }
-        )
-        joined.append(payload)
+        latest = candidates[index] if index >= 0 and candidates else None
+        joined.append(_join_market_row(market, market_received_us, latest, max_age_ms))
     return tuple(joined)
 
 
+def stream_join_latest_past_depth(
+    market_rows: Iterable[dict[str, Any]],
+    depth_rows: Iterable[dict[str, Any]],
+    *,
+    max_age_ms: int = 1_000,
+) -> Iterator[dict[str, Any]]:
+    """Lazily enrich 0B rows with the latest nonfuture fresh 0D snapshot.
+
+    Both inputs must be ordered by local receive time; use
+    ``merge_by_receive_time`` to combine per-series or per-shard iterators.
+    Only the latest depth snapshot and last series sequence are kept per
+    series.  Yields the same rows as ``join_latest_past_depth``; depth rows
+    after the last 0B row are still drained so sequence gaps are reported.
+    """
+
+    if max_age_ms < 0:
+        raise ValueError("max_age_ms must not be negative")
+    return _stream_join(iter(market_rows), iter(depth_rows), max_age_ms)
+
+
+def _stream_join(
+    market_rows: Iterator[dict[str, Any]],
+    depth_rows: Iterator[dict[str, Any]],
+    max_age_ms: int,
+) -> Iterator[dict[str, Any]]:
+    latest: dict[tuple[str, str, str, int], tuple[int, dict[str, Any]]] = {}
+    last_sequence: dict[tuple[str, str, str, int], int] = {}
+    last_depth_us: int | None = None
+
+    def next_depth() -> tuple[int, tuple[str, str, str, int], dict[str, Any]] | None:
+        nonlocal last_depth_us
+        depth = next(depth_rows, None)
+        if depth is None:
+            return None
+        validate_depth_row(depth)
+        key = _series_key(depth)
+        received_us = _timestamp_us(depth.get("local_receive_timestamp"))
+        if last_depth_us is not None and received_us < last_depth_us:
+            raise ValueError("depth rows must be ordered by local receive time")
+        sequence = int(depth.get("series_sequence") or 0)
+        previous = last_sequence.get(key)
+        if previous is not None and sequence == previous:
+            raise ValueError("duplicate depth series sequence")
+        if previous is not None and sequence != previous + 1:
+            raise ValueError("depth series sequence gap or regression")
+        last_sequence[key] = sequence
+        last_depth_us = received_us
+        return received_us, key, depth
+
+    pending = next_depth()
+    last_market_us: int | None = None
+    for market in market_rows:
+        _validate_market_row(market)
+        key = _series_key(market)
+        market_received_us = _timestamp_us(market.get("local_receive_timestamp"))
+        if last_market_us is not None and market_received_us < last_market_us:
+            raise ValueError("market rows must be ordered by local receive time")
+        last_market_us = market_received_us
+        while pending is not None and pending[0] <= market_received_us:
+            latest[pending[1]] = (pending[0], pending[2])
+            pending = next_depth()
+        yield _join_market_row(market, market_received_us, latest.get(key), max_age_ms)
+    while pending is not None:
+        pending = next_depth()
+
+
+def _join_market_row(
+    market: dict[str, Any],
+    market_received_us: int,
+    latest: tuple[int, dict[str, Any]] | None,
+    max_age_ms: int,
+) -> dict[str, Any]:
+    payload = dict(market)
+    if payload.get("bid_depth") is not None or payload.get("ask_depth") is not None:
+        raise ValueError("canonical 0B row must not contain prejoined depth")
+    status = "missing_same_series_depth"
+    age_ms: float | None = None
+    selected: dict[str, Any] | None = None
+    if latest is not None:
+        selected_receive_us, candidate = latest
+        age_ms = (market_received_us - selected_receive_us) / 1_000.0
+        if age_ms <= max_age_ms:
+            selected = candidate
+            status = "joined_fresh_past_depth"
+        else:
+            status = "stale_past_depth"
+    if selected is not None:
+        if payload.get("bid_depth") is None:
+            payload["bid_depth"] = selected["bid_depth"]
+        if payload.get("ask_depth") is None:
+            payload["ask_depth"] = selected["ask_depth"]
+        payload["depth_context"] = {
+            "best_bid": selected["best_bid"],
+            "best_ask": selected["best_ask"],
+            "best_bid_qty": selected["best_bid_qty"],
+            "best_ask_qty": selected["best_ask_qty"],
+            "bid_levels": selected["bid_levels"],
+            "ask_levels": selected["ask_levels"],
+            "route_depth_totals": selected["route_depth_totals"],
+            "source_sequence": selected["source_sequence"],
+            "sequence_epoch": selected["sequence_epoch"],
+            "local_receive_timestamp": selected["local_receive_timestamp"],
+            "exchange_timestamp": selected["exchange_timestamp"],
+            "item": selected["item"],
+        }
+    payload.update(
+        {
+            "depth_join_schema": DEPTH_JOIN_SCHEMA,
+            "depth_join_status": status,
+            "depth_age_ms": age_ms,
+            "depth_join_metric_contract": dict(DEPTH_JOIN_METRIC_CONTRACT),
+        }
+    )
+    return payload
+
+
 def validate_depth_row(payload: object) -> None:
     if not isinstance(payload, dict):
         raise ValueError("depth JSONL row must be an object")
@@ -383,3 +494,189 @@ def _timestamp_us(value: object) -> int:
     if parsed.tzinfo is None:
         raise ValueError("depth join timestamp must include timezone")
     return int(parsed.timestamp() * 1_000_000)
+
+
+_BENCHMARK_KST = timezone(timedelta(hours=9))
+_BENCHMARK_SESSION_OPEN_US = 1_786_147_200_000_000  # 2026-08-08T09:00:00+09:00
+_BENCHMARK_SESSION_US = 23_400_000_000  # 09:00-15:30
+
+
+def _benchmark_timestamp(value_us: int) -> str:
+    return (
+        datetime.fromtimestamp(value_us // 1_000_000, _BENCHMARK_KST)
+        .replace(microsecond=value_us % 1_000_000)
+        .isoformat(timespec="microseconds")
+    )
+
+
+def _benchmark_depth_series(symbol: str, rows: int) -> Iterator[dict[str, Any]]:
+    opened = _benchmark_timestamp(_BENCHMARK_SESSION_OPEN_US)
+    template = MarketDepthPoint(
+        symbol=symbol,
+        exchange_timestamp=opened,
+        local_receive_timestamp=opened,
+        source_sequence=1,
+        sequence_epoch=1,
+        series_sequence=1,
+        venue="KRX",
+        session_bucket="KRX_REGULAR",
+        item=symbol,
+        orderbook_time_raw="090000000",
+        best_bid=10_000,
+        best_ask=10_010,
+        best_bid_qty=200,
+        best_ask_qty=100,
+        bid_depth=4_000,
+        ask_depth=3_000,
+        bid_levels=tuple((level, 10_010 - level * 10, 200) for level in range(1, 11)),
+        ask_levels=tuple((level, 10_000 + level * 10, 100) for level in range(1, 11)),
+        route_depth_totals={
+            "combined": {"ask": 3_000, "bid": 4_000},
+            "KRX": {"ask": 3_000, "bid": 4_000},
+            "NXT": {"ask": None, "bid": None},
+        },
+    ).as_dict()
+    step_us = _BENCHMARK_SESSION_US // max(1, rows)
+    for index in range(rows):
+        stamp = _benchmark_timestamp(_BENCHMARK_SESSION_OPEN_US + index * step_us)
+        row = dict(template)
+        row.update(
+            exchange_timestamp=stamp,
+            local_receive_timestamp=stamp,
+            source_sequence=index + 1,
+            series_sequence=index + 1,
+            bid_levels=[list(level) for level in template["bid_levels"]],
+            ask_levels=[list(level) for level in template["ask_levels"]],
+            route_depth_totals={
+                route: dict(totals)
+                for route, totals in template["route_depth_totals"].items()
+            },
+        )
+        yield row
+
+
+def _benchmark_market_series(symbol: str, rows: int) -> Iterator[dict[str, Any]]:
+    step_us = _BENCHMARK_SESSION_US // max(1, rows)
+    for index in range(rows):
+        stamp = _benchmark_timestamp(
+            _BENCHMARK_SESSION_OPEN_US + index * step_us + step_us // 3
+        )
+        row = MarketStreamPoint(
+            symbol=symbol,
+            exchange_timestamp=stamp,
+            local_receive_timestamp=stamp,
+            source_sequence=index + 1,
+            sequence_epoch=1,
+            series_sequence=index + 1,
+            venue="KRX",
+            session_bucket="KRX_REGULAR",
+            realtime_type="0B",
+            trade_price=10_000,
+            trade_qty=10,
+        ).as_dict()
+        row["item"] = symbol
+        yield row
+
+
+def build_benchmark_day(
+    *, symbols: int = 200, depth_rows: int = 2_000, market_rows: int = 2_000
+) -> tuple[Iterator[dict[str, Any]], Iterator[dict[str, Any]]]:
+    """Synthetic session as receive-time-merged 0B and 0D row iterators."""
+
+    codes = [f"{900_000 + index:06d}" for index in range(symbols)]
+    return (
+        merge_by_receive_time(
+            *(_benchmark_market_series(code, market_rows) for code in codes)
+        ),
+        merge_by_receive_time(
+            *(_benchmark_depth_series(code, depth_rows) for code in codes)
+        ),
+    )
+
+
+def benchmark_depth_join(
+    *,
+    symbols: int = 200,
+    depth_rows: int = 2_000,
+    market_rows: int = 2_000,
+    max_age_ms: int = 30_000,
+) -> dict[str, Any]:
+    """Time and trace peak memory of the materialized and streaming joins.
+
+    Both paths consume the same lazily generated synthetic day; the
+    materialized path keeps its output tuple, the streaming path discards each
+    joined row as a file sink would.  Generation cost is included in both.
+    """
+
+    def materialized() -> int:
+        market, depth = build_benchmark_day(
+            symbols=symbols, depth_rows=depth_rows, market_rows=market_rows
+        )
+        return len(join_latest_past_depth(market, depth, max_age_ms=max_age_ms))
+
+    def streaming() -> int:
+        market, depth = build_benchmark_day(
+            symbols=symbols, depth_rows=depth_rows, market_rows=market_rows
+        )
+        return sum(
+            1
+            for _ in stream_join_latest_past_depth(market, depth, max_age_ms=max_age_ms)
+        )
+
+    result: dict[str, Any] = {
+        "schema": DEPTH_JOIN_SCHEMA,
+        "symbols": symbols,
+        "depth_rows": symbols * depth_rows,
+        "market_rows": symbols * market_rows,
+    }
+    for name, run in (("materialized", materialized), ("streaming", streaming)):
+        started = time.perf_counter()
+        joined = run()
+        elapsed = time.perf_counter() - started
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result[name] = {
+            "joined_rows": joined,
+            "seconds": round(elapsed, 3),
+            "market_rows_per_sec": round(joined / elapsed) if elapsed else None,
+            "peak_mib": round(peak / 1_048_576, 2),
+        }
+    streaming_peak = result["streaming"]["peak_mib"]
+    result["peak_memory_ratio"] = (
+        round(result["materialized"]["peak_mib"] / streaming_peak, 2)
+        if streaming_peak
+        else None
+    )
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark materialized and streaming past-only depth joins."
+    )
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--depth-rows", type=int, default=2_000)
+    parser.add_argument("--market-rows", type=int, default=2_000)
+    parser.add_argument("--max-age-ms", type=int, default=30_000)
+    args = parser.parse_args(argv)
+    print(
+        json.dumps(
+            benchmark_depth_join(
+                symbols=args.symbols,
+                depth_rows=args.depth_rows,
+                market_rows=args.market_rows,
+                max_age_ms=args.max_age_ms,
+            ),
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,285 @@
+"""Content-addressed cache of parsed micro-reversion replay observations.
+
+Parsing pipeline-event JSONL into ``PriceObservation`` rows does not depend on
+detector, dedupe, cost or path-gap settings, so a replay config sweep only has
+to parse each input file once.  Entries are keyed by the input file's SHA-256,
+``PARSER_SCHEMA_VERSION`` and a fingerprint of the parser-relevant replay
+config.  Each entry stores the accepted observations in file order (before
+dedupe) as compressed numpy columns together with the parse counters, so a
+cached replay reproduces ``ReplayInputStats`` exactly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+from src.utils.constants import DATA_DIR
+
+from .contracts import OBSERVATION_SCHEMA, PriceObservation
+
+PARSER_SCHEMA_VERSION = "scalp_micro_reversion_parsed_observations_v1"
+DEFAULT_CACHE_ROOT = DATA_DIR / "cache" / "scalp_micro_reversion_parsed_observations"
+_HASH_CHUNK_BYTES = 1 << 20
+_STRING_COLUMNS = (
+    "symbol",
+    "trade_date",
+    "venue",
+    "session_bucket",
+    "source_event_id",
+    "price_source_field",
+    "source_quality_status",
+    "listing_market",
+    "instrument_type",
+    "instrument_metadata_source",
+)
+_OPTIONAL_FLOAT_COLUMNS = (
+    "best_bid",
+    "best_ask",
+    "quote_age_ms",
+    "micro_vwap",
+    "aggressive_sell_ratio",
+    "ofi",
+    "qi",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedInput:
+    """Accepted observations of one input file, in file order, plus counters."""
+
+    observations: tuple[PriceObservation, ...]
+    counters: dict[str, int]
+
+
+@dataclass(slots=True)
+class ParsedObservationCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    unreadable_entries: int = 0
+    cached_row_count: int = 0
+    parsed_row_count: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hits": self.memory_hits + self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "unreadable_entries": self.unreadable_entries,
+            "cached_row_count": self.cached_row_count,
+            "parsed_row_count": self.parsed_row_count,
+        }
+
+
+@dataclass
+class ParsedObservationCache:
+    """Disk cache (plus a small in-process LRU) of ``ParsedInput`` entries."""
+
+    root: Path = DEFAULT_CACHE_ROOT
+    memory_entries: int = 8
+    stats: ParsedObservationCacheStats = field(
+        default_factory=ParsedObservationCacheStats
+    )
+    _memory: OrderedDict[str, ParsedInput] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+        if self.memory_entries < 0:
+            raise ValueError("memory_entries must be non-negative")
+
+    def key_for(self, path: Path, parser_fingerprint: str) -> str:
+        digest = hashlib.sha256()
+        with Path(path).open("rb") as handle:
+            while chunk := handle.read(_HASH_CHUNK_BYTES):
+                digest.update(chunk)
+        return hashlib.sha256(
+            "\n".join(
+                (PARSER_SCHEMA_VERSION, parser_fingerprint, digest.hexdigest())
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.root / f"{key}.npz"
+
+    def get_or_parse(
+        self,
+        path: Path,
+        *,
+        parser_fingerprint: str,
+        parse: Callable[[Path], ParsedInput],
+        run_stats: ParsedObservationCacheStats | None = None,
+    ) -> ParsedInput:
+        """Return the cached parse of ``path`` or parse and store it.
+
+        ``run_stats`` receives the same hit/miss accounting as ``self.stats``
+        so a single replay can report its own cache behaviour.
+        """
+        targets = [self.stats] if run_stats is None else [self.stats, run_stats]
+        key = self.key_for(path, parser_fingerprint)
+        parsed = self._memory.get(key)
+        if parsed is not None:
+            self._memory.move_to_end(key)
+            for stats in targets:
+                stats.memory_hits += 1
+                stats.cached_row_count += len(parsed.observations)
+            return parsed
+        parsed = self._read(key, targets)
+        if parsed is not None:
+            for stats in targets:
+                stats.disk_hits += 1
+                stats.cached_row_count += len(parsed.observations)
+        else:
+            parsed = parse(Path(path))
+            self._write(key, parsed)
+            for stats in targets:
+                stats.misses += 1
+                stats.writes += 1
+                stats.parsed_row_count += len(parsed.observations)
+        self._remember(key, parsed)
+        return parsed
+
+    def _remember(self, key: str, parsed: ParsedInput) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = parsed
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read(
+        self, key: str, targets: list[ParsedObservationCacheStats]
+    ) -> ParsedInput | None:
+        path = self.entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                columns = {name: archive[name] for name in archive.files}
+            meta = json.loads(bytes(columns.pop("meta")).decode("utf-8"))
+            if meta.get("schema") != PARSER_SCHEMA_VERSION or meta.get("key") != key:
+                raise ValueError("parsed observation cache entry does not match key")
+            return ParsedInput(
+                observations=decode_observations(columns, meta["vocabularies"]),
+                counters={str(name): int(value) for name, value in meta["counters"]},
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            for stats in targets:
+                stats.unreadable_entries += 1
+            return None
+
+    def _write(self, key: str, parsed: ParsedInput) -> Path:
+        columns, vocabularies = encode_observations(parsed.observations)
+        meta = {
+            "schema": PARSER_SCHEMA_VERSION,
+            "key": key,
+            "row_count": len(parsed.observations),
+            "counters": sorted(parsed.counters.items()),
+            "vocabularies": vocabularies,
+        }
+        columns["meta"] = np.frombuffer(
+            json.dumps(meta, ensure_ascii=False, sort_keys=True).encode("utf-8"),
+            dtype=np.uint8,
+        )
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **columns)
+        path = self.entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(buffer.getvalue())
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+        return path
+
+
+def encode_observations(
+    observations: tuple[PriceObservation, ...],
+) -> tuple[dict[str, np.ndarray], dict[str, list[str]]]:
+    """Column-encode observations; strings are dictionary encoded."""
+    if any(item.schema != OBSERVATION_SCHEMA for item in observations):
+        raise ValueError("only current-schema observations can be cached")
+    columns: dict[str, np.ndarray] = {
+        "observed_at_ms": np.fromiter(
+            (item.observed_at_ms for item in observations),
+            dtype=np.int64,
+            count=len(observations),
+        ),
+        "price": np.fromiter(
+            (item.price for item in observations),
+            dtype=np.float64,
+            count=len(observations),
+        ),
+        "instrument_metadata_verified": np.fromiter(
+            (item.instrument_metadata_verified for item in observations),
+            dtype=bool,
+            count=len(observations),
+        ),
+    }
+    for name in _OPTIONAL_FLOAT_COLUMNS:
+        columns[name] = np.fromiter(
+            (
+                np.nan if getattr(item, name) is None else getattr(item, name)
+                for item in observations
+            ),
+            dtype=np.float64,
+            count=len(observations),
+        )
+    vocabularies: dict[str, list[str]] = {}
+    for name in _STRING_COLUMNS:
+        codes: dict[str, int] = {}
+        values = [_string_value(getattr(item, name)) for item in observations]
+        columns[name] = np.fromiter(
+            (codes.setdefault(value, len(codes)) for value in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+        vocabularies[name] = list(codes)
+    return columns, vocabularies
+
+
+def decode_observations(
+    columns: Mapping[str, np.ndarray], vocabularies: Mapping[str, list[str]]
+) -> tuple[PriceObservation, ...]:
+    decoded: dict[str, list[Any]] = {
+        "observed_at_ms": columns["observed_at_ms"].tolist(),
+        "price": columns["price"].tolist(),
+        "instrument_metadata_verified": columns[
+            "instrument_metadata_verified"
+        ].tolist(),
+    }
+    for name in _OPTIONAL_FLOAT_COLUMNS:
+        decoded[name] = [
+            None if value != value else value for value in columns[name].tolist()
+        ]
+    for name in _STRING_COLUMNS:
+        vocabulary = vocabularies[name]
+        decoded[name] = [vocabulary[code] for code in columns[name].tolist()]
+    names = tuple(decoded)
+    return tuple(
+        PriceObservation(**dict(zip(names, values)))
+        for values in zip(*(decoded[name] for name in names))
+    )
+
+
+def _string_value(value: object) -> str:
+    return str(getattr(value, "value", value))
@@ -1,13 +1,27 @@
-"""Future-path labels for source-only micro-reversion shock events."""
+"""Future-path labels for source-only micro-reversion shock events.
+
+``OutcomeLabeler.label`` scans one event's series directly.  ``label_many``
+indexes each series once (``SeriesPathIndex``) and answers every event's
+horizon windows with ``searchsorted`` and sparse-table range max/min, so
+labeling a volatile day costs O(series_length log n + events log n) instead of
+O(events x series_length).  Both paths produce equal labels.
+"""
 
 from __future__ import annotations
 
+import argparse
 import bisect
+import json
+import time
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Sequence
+
+import numpy as np
 
 from .contracts import (
     DEFAULT_HORIZONS_SEC,
+    CoverageTier,
     HorizonOutcome,
     OutcomeLabel,
     PriceObservation,
@@ -43,6 +57,106 @@ class OutcomeLabelerConfig:
             raise ValueError("continuation_fraction must be in (0, 1]")
 
 
+class _SparseTable:
+    """Static range max or min over a NumPy array with O(1) queries."""
+
+    __slots__ = ("_levels", "_reduce")
+
+    def __init__(self, values: np.ndarray, *, reduce: np.ufunc) -> None:
+        self._reduce = reduce
+        self._levels = [values]
+        width = 1
+        while width * 2 <= len(values):
+            previous = self._levels[-1]
+            self._levels.append(reduce(previous[:-width], previous[width:]))
+            width *= 2
+
+    def query(self, left: int, right: int):
+        """Reduce ``values[left:right + 1]``; the range must not be empty."""
+
+        level = (right - left + 1).bit_length() - 1
+        values = self._levels[level]
+        return self._reduce(values[left], values[right - (1 << level) + 1])
+
+
+class SeriesPathIndex:
+    """One series' observations sorted once, with range max/min lookups."""
+
+    __slots__ = (
+        "observations",
+        "times",
+        "prices",
+        "_price_max",
+        "_price_min",
+        "_gap_max",
+    )
+
+    def __init__(self, observations: Iterable[PriceObservation]) -> None:
+        self.observations = sorted(
+            observations, key=lambda observation: observation.observed_at_ms
+        )
+        self.times = np.fromiter(
+            (observation.observed_at_ms for observation in self.observations),
+            dtype=np.int64,
+            count=len(self.observations),
+        )
+        self.prices = np.fromiter(
+            (observation.price for observation in self.observations),
+            dtype=np.float64,
+            count=len(self.observations),
+        )
+        self._price_max = _SparseTable(self.prices, reduce=np.maximum)
+        self._price_min = _SparseTable(self.prices, reduce=np.minimum)
+        self._gap_max = _SparseTable(np.diff(self.times), reduce=np.maximum)
+
+    def __len__(self) -> int:
+        return len(self.observations)
+
+    def bisect_left(self, value_ms: int) -> int:
+        return int(np.searchsorted(self.times, value_ms, side="left"))
+
+    def bisect_right(self, value_ms: int) -> int:
+        return int(np.searchsorted(self.times, value_ms, side="right"))
+
+    def price_max(self, left: int, right: int) -> float:
+        return float(self._price_max.query(left, right))
+
+    def price_min(self, left: int, right: int) -> float:
+        return float(self._price_min.query(left, right))
+
+    def gap_max(self, left: int, right: int) -> int:
+        """Largest ``times[i + 1] - times[i]`` for ``left <= i <= right``."""
+
+        return int(self._gap_max.query(left, right))
+
+    def first_at_or_above(self, left: int, stop: int, threshold: float) -> int | None:
+        return self._first_crossing(left, stop, threshold, direction="up")
+
+    def first_at_or_below(self, left: int, stop: int, threshold: float) -> int | None:
+        return self._first_crossing(left, stop, threshold, direction="down")
+
+    def _first_crossing(
+        self, left: int, stop: int, threshold: float, *, direction: str
+    ) -> int | None:
+        # Prefix max/min over [left, right] is monotone in ``right``, so the
+        # first crossing is found by binary search over range queries.
+        def crossed(right: int) -> bool:
+            if direction == "up":
+                return self.price_max(left, right) >= threshold
+            return self.price_min(left, right) <= threshold
+
+        if left >= stop or not crossed(stop - 1):
+            return None
+        low, high = left, stop - 1
+        while low < high:
+            middle = (low + high) // 2
+            if crossed(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+
 class OutcomeLabeler:
     def __init__(self, config: OutcomeLabelerConfig | None = None) -> None:
         self.config = config or OutcomeLabelerConfig()
@@ -66,6 +180,96 @@ class OutcomeLabeler:
             self._horizon_outcome(event, series, times, horizon_sec)
             for horizon_sec in self.config.horizons_sec
         )
+        path_limit_ms = self._path_limit_ms(event, outcomes)
+        bounded_series = [
+            observation
+            for observation in series
+            if observation.observed_at_ms <= path_limit_ms
+        ]
+        return self._label(
+            event,
+            outcomes,
+            first_full_reclaim_ms=self._first_crossing_ms(
+                bounded_series,
+                event.reference_price,
+                direction="up",
+            ),
+            first_half_reclaim_ms=self._first_crossing_ms(
+                bounded_series,
+                self._half_reclaim_price(event),
+                direction="up",
+            ),
+            first_continuation_ms=self._first_crossing_ms(
+                bounded_series,
+                self._continuation_price(event),
+                direction="down",
+            ),
+        )
+
+    def label_many(
+        self,
+        events: Iterable[ShockEvent],
+        observations: Iterable[PriceObservation],
+    ) -> tuple[OutcomeLabel, ...]:
+        """Label events in order, indexing each series path only once."""
+
+        grouped: dict[tuple[str, str, str, str], list[PriceObservation]] = defaultdict(
+            list
+        )
+        for observation in observations:
+            grouped[observation.series_key].append(observation)
+        indexes: dict[tuple[str, str, str, str], SeriesPathIndex] = {}
+        labels = []
+        for event in events:
+            index = indexes.get(event.series_key)
+            if index is None:
+                index = SeriesPathIndex(grouped.get(event.series_key, ()))
+                indexes[event.series_key] = index
+            labels.append(self.label_indexed(event, index))
+        return tuple(labels)
+
+    def label_indexed(self, event: ShockEvent, index: SeriesPathIndex) -> OutcomeLabel:
+        """Label ``event`` against a prebuilt index of its own series."""
+
+        start = index.bisect_left(event.detected_at_ms)
+        outcomes = tuple(
+            self._indexed_horizon_outcome(event, index, start, horizon_sec)
+            for horizon_sec in self.config.horizons_sec
+        )
+        stop = index.bisect_right(self._path_limit_ms(event, outcomes))
+        crossings = []
+        for threshold, direction in (
+            (event.reference_price, "up"),
+            (self._half_reclaim_price(event), "up"),
+            (self._continuation_price(event), "down"),
+        ):
+            position = (
+                index.first_at_or_above(start, stop, threshold)
+                if direction == "up"
+                else index.first_at_or_below(start, stop, threshold)
+            )
+            crossings.append(
+                None
+                if position is None
+                else index.observations[position].observed_at_ms
+            )
+        return self._label(
+            event,
+            outcomes,
+            first_full_reclaim_ms=crossings[0],
+            first_half_reclaim_ms=crossings[1],
+            first_continuation_ms=crossings[2],
+        )
+
+    def _label(
+        self,
+        event: ShockEvent,
+        outcomes: tuple[HorizonOutcome, ...],
+        *,
+        first_full_reclaim_ms: int | None,
+        first_half_reclaim_ms: int | None,
+        first_continuation_ms: int | None,
+    ) -> OutcomeLabel:
         mature_count = sum(outcome.complete for outcome in outcomes)
         if mature_count == len(outcomes):
             quality_status = "pass"
@@ -77,43 +281,6 @@ class OutcomeLabeler:
             quality_status = "blocked_missing_horizon"
             exclusion_reasons = ("all_horizons_missing",)
 
-        complete_outcomes = [outcome for outcome in outcomes if outcome.complete]
-        if complete_outcomes:
-            last_complete = complete_outcomes[-1]
-            path_limit_ms = (
-                event.detected_at_ms
-                + last_complete.horizon_sec * 1_000
-                + int(last_complete.observation_lag_ms or 0)
-            )
-        else:
-            path_limit_ms = event.detected_at_ms
-        bounded_series = [
-            observation
-            for observation in series
-            if observation.observed_at_ms <= path_limit_ms
-        ]
-        first_full_reclaim_ms = self._first_crossing_ms(
-            bounded_series,
-            event.reference_price,
-            direction="up",
-        )
-        half_reclaim_price = event.shock_price + (
-            event.shock_size * self.config.half_reclaim_fraction
-        )
-        first_half_reclaim_ms = self._first_crossing_ms(
-            bounded_series,
-            half_reclaim_price,
-            direction="up",
-        )
-        continuation_price = event.shock_price - (
-            event.shock_size * self.config.continuation_fraction
-        )
-        first_continuation_ms = self._first_crossing_ms(
-            bounded_series,
-            continuation_price,
-            direction="down",
-        )
-
         return OutcomeLabel(
             event_id=event.event_id,
             symbol=event.symbol,
@@ -133,6 +300,28 @@ class OutcomeLabeler:
             exclusion_reasons=exclusion_reasons,
         )
 
+    @staticmethod
+    def _path_limit_ms(event: ShockEvent, outcomes: tuple[HorizonOutcome, ...]) -> int:
+        complete_outcomes = [outcome for outcome in outcomes if outcome.complete]
+        if not complete_outcomes:
+            return event.detected_at_ms
+        last_complete = complete_outcomes[-1]
+        return (
+            event.detected_at_ms
+            + last_complete.horizon_sec * 1_000
+            + int(last_complete.observation_lag_ms or 0)
+        )
+
+    def _half_reclaim_price(self, event: ShockEvent) -> float:
+        return event.shock_price + (
+            event.shock_size * self.config.half_reclaim_fraction
+        )
+
+    def _continuation_price(self, event: ShockEvent) -> float:
+        return event.shock_price - (
+            event.shock_size * self.config.continuation_fraction
+        )
+
     def _horizon_outcome(
         self,
         event: ShockEvent,
@@ -181,21 +370,91 @@ class OutcomeLabeler:
 
         path_prices = [event.shock_price]
         path_prices.extend(observation.price for observation in path_observations)
-        terminal_return_bps = (endpoint.price / event.shock_price - 1.0) * 10_000.0
-        mfe_bps = (max(path_prices) / event.shock_price - 1.0) * 10_000.0
-        mae_bps = (min(path_prices) / event.shock_price - 1.0) * 10_000.0
-        half_reclaim_price = event.shock_price + (
-            event.shock_size * self.config.half_reclaim_fraction
+        return self._complete_outcome(
+            event,
+            horizon_sec,
+            endpoint_price=endpoint.price,
+            lag_ms=lag_ms,
+            path_observation_count=len(path_observations),
+            max_path_gap_ms=max_path_gap_ms,
+            path_max=max(path_prices),
+            path_min=min(path_prices),
         )
-        continuation_price = event.shock_price - (
-            event.shock_size * self.config.continuation_fraction
+
+    def _indexed_horizon_outcome(
+        self,
+        event: ShockEvent,
+        index: SeriesPathIndex,
+        start: int,
+        horizon_sec: int,
+    ) -> HorizonOutcome:
+        target_ms = event.detected_at_ms + horizon_sec * 1_000
+        endpoint_index = index.bisect_left(target_ms)
+        if endpoint_index >= len(index):
+            return HorizonOutcome(horizon_sec=horizon_sec, complete=False)
+        endpoint = index.observations[endpoint_index]
+        lag_ms = endpoint.observed_at_ms - target_ms
+        if lag_ms > self.config.max_horizon_lag_ms:
+            return HorizonOutcome(
+                horizon_sec=horizon_sec,
+                complete=False,
+                observation_lag_ms=lag_ms,
+                path_continuity_status="endpoint_lag_exceeded",
+            )
+
+        # The endpoint lies strictly after detection, so the path always has
+        # a first post-detection observation at ``after``.
+        after = index.bisect_right(event.detected_at_ms)
+        max_path_gap_ms = index.observations[after].observed_at_ms - (
+            event.detected_at_ms
         )
+        if endpoint_index > after:
+            max_path_gap_ms = max(
+                max_path_gap_ms, index.gap_max(after, endpoint_index - 1)
+            )
+        path_observation_count = endpoint_index + 1 - start
+        if max_path_gap_ms > self.config.max_internal_gap_ms:
+            return HorizonOutcome(
+                horizon_sec=horizon_sec,
+                complete=False,
+                observation_lag_ms=lag_ms,
+                path_observation_count=path_observation_count,
+                max_path_gap_ms=max_path_gap_ms,
+                path_continuity_status="internal_gap_exceeded",
+            )
+
+        return self._complete_outcome(
+            event,
+            horizon_sec,
+            endpoint_price=endpoint.price,
+            lag_ms=lag_ms,
+            path_observation_count=path_observation_count,
+            max_path_gap_ms=max_path_gap_ms,
+            path_max=max(event.shock_price, index.price_max(start, endpoint_index)),
+            path_min=min(event.shock_price, index.price_min(start, endpoint_index)),
+        )
+
+    def _complete_outcome(
+        self,
+        event: ShockEvent,
+        horizon_sec: int,
+        *,
+        endpoint_price: float,
+        lag_ms: int,
+        path_observation_count: int,
+        max_path_gap_ms: int,
+        path_max: float,
+        path_min: float,
+    ) -> HorizonOutcome:
+        terminal_return_bps = (endpoint_price / event.shock_price - 1.0) * 10_000.0
+        mfe_bps = (path_max / event.shock_price - 1.0) * 10_000.0
+        mae_bps = (path_min / event.shock_price - 1.0) * 10_000.0
 
         return HorizonOutcome(
             horizon_sec=horizon_sec,
             complete=True,
             observation_lag_ms=lag_ms,
-            path_observation_count=len(path_observations),
+            path_observation_count=path_observation_count,
             max_path_gap_ms=max_path_gap_ms,
             path_continuity_status="pass",
             terminal_return_bps=round(terminal_return_bps, 6),
@@ -205,13 +464,11 @@ class OutcomeLabeler:
             ),
             mfe_bps=round(mfe_bps, 6),
             mae_bps=round(mae_bps, 6),
-            full_reclaim=max(path_prices) >= event.reference_price,
-            half_reclaim=max(path_prices) >= half_reclaim_price,
-            continuation_half_shock=min(path_prices) <= continuation_price,
+            full_reclaim=path_max >= event.reference_price,
+            half_reclaim=path_max >= self._half_reclaim_price(event),
+            continuation_half_shock=path_min <= self._continuation_price(event),
             micro_vwap_reclaimed=(
-                None
-                if event.micro_vwap is None
-                else max(path_prices) >= event.micro_vwap
+                None if event.micro_vwap is None else path_max >= event.micro_vwap
             ),
         )
 
@@ -231,3 +488,114 @@ class OutcomeLabeler:
             if crossed:
                 return observation.observed_at_ms
         return None
+
+
+_BENCHMARK_BASE_MS = 1_786_147_200_000  # 2026-08-08T09:00:00+09:00
+
+
+def build_benchmark_series(
+    *, series_length: int = 6_000, step_ms: int = 1_000, seed: int = 7
+) -> tuple[PriceObservation, ...]:
+    """Synthetic one-series random-walk path with occasional feed gaps."""
+
+    rng = np.random.default_rng(seed)
+    prices = 10_000.0 * np.exp(np.cumsum(rng.normal(0.0, 4e-4, series_length)))
+    offsets = np.cumsum(
+        np.where(rng.random(series_length) < 0.002, 12 * step_ms, step_ms)
+    )
+    return tuple(
+        PriceObservation(
+            symbol="900001",
+            observed_at_ms=_BENCHMARK_BASE_MS + int(offset),
+            price=round(float(price), 1),
+            trade_date="2026-08-08",
+            venue="KRX",
+            session_bucket="KRX_REGULAR",
+        )
+        for offset, price in zip(offsets, prices, strict=True)
+    )
+
+
+def build_benchmark_events(
+    series: Sequence[PriceObservation], *, count: int
+) -> tuple[ShockEvent, ...]:
+    """Evenly spaced synthetic shocks detected on ``series`` observations."""
+
+    stride = max(1, len(series) // max(1, count))
+    events = []
+    for number, observation in enumerate(series[::stride][:count]):
+        events.append(
+            ShockEvent(
+                event_id=f"SMR-BENCH-{number:06d}",
+                symbol=observation.symbol,
+                venue=observation.venue,
+                session_bucket=observation.session_bucket,
+                trade_date=observation.trade_date,
+                detected_at_ms=observation.observed_at_ms,
+                reference_at_ms=observation.observed_at_ms - 5_000,
+                reference_price=observation.price * 1.004,
+                shock_price=observation.price,
+                shock_return_bps=-40.0,
+                return_robust_z=-3.0,
+                acceleration_robust_z=-2.5,
+                micro_vwap=None,
+                coverage_tier=CoverageTier.PRICE_PATH,
+                source_quality_status="price_path_only",
+            )
+        )
+    return tuple(events)
+
+
+def benchmark_outcome_labeling(
+    *,
+    series_length: int = 6_000,
+    events_per_series: Sequence[int] = (10, 100, 1_000),
+) -> dict:
+    """Time per-event scanning against indexed labeling as events grow."""
+
+    labeler = OutcomeLabeler()
+    series = build_benchmark_series(series_length=series_length)
+    rows = []
+    for count in events_per_series:
+        events = build_benchmark_events(series, count=count)
+        started = time.perf_counter()
+        scanned = tuple(labeler.label(event, series) for event in events)
+        scan_sec = time.perf_counter() - started
+        started = time.perf_counter()
+        indexed = labeler.label_many(events, series)
+        indexed_sec = time.perf_counter() - started
+        rows.append(
+            {
+                "events": len(events),
+                "scan_sec": round(scan_sec, 4),
+                "indexed_sec": round(indexed_sec, 4),
+                "speedup": round(scan_sec / indexed_sec, 2) if indexed_sec else None,
+                "labels_equal": scanned == indexed,
+            }
+        )
+    return {"series_length": series_length, "rows": rows}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark scanned and indexed micro-reversion outcome labels."
+    )
+    parser.add_argument("--series-length", type=int, default=6_000)
+    parser.add_argument(
+        "--events", type=int, nargs="+", default=[10, 100, 1_000], dest="events"
+    )
+    args = parser.parse_args(argv)
+    print(
+        json.dumps(
+            benchmark_outcome_labeling(
+                series_length=args.series_length, events_per_series=args.events
+            ),
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
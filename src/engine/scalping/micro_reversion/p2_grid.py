@@ -0,0 +1,468 @@
+"""Batch replay of many frozen P2 policies over one event path.
+
+``replay_policy_grid`` validates and columnarizes a path once, resolves every
+distinct entry rule with array scans, and finds the first stop/take-profit
+touch of all policies sharing that entry with one policy x point mask.  The
+vectorized subset is marketable or passive entry with a single take-profit
+exit whose fills cannot be partial; reclaim/hybrid entries, runner exits and
+multi-quantity trade-through fills fall back to ``replay_path``.  Results are
+equal to ``replay_path`` policy for policy.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from .p2_replay import (
+    EntryExecutionMode,
+    EntryPolicy,
+    ExitPolicy,
+    FillBound,
+    P2PolicySnapshot,
+    P2ReplayPoint,
+    P2ReplayPolicy,
+    P2ReplayResult,
+    ReplayTerminalReason,
+    SameTimestampPolicy,
+    _empty_result,
+    _EntryResolution,
+    _fresh_quote,
+    _stop_execution_price,
+    _validate_path,
+    _validated_event_bid,
+    replay_path,
+)
+
+_VECTOR_ENTRY_POLICIES = frozenset(
+    {EntryPolicy.MARKETABLE_NEXT_ASK, EntryPolicy.PASSIVE_EVENT_BID}
+)
+
+
+def _float_column(points: Sequence[P2ReplayPoint], name: str) -> np.ndarray:
+    return np.array(
+        [
+            np.nan if getattr(point, name) is None else float(getattr(point, name))
+            for point in points
+        ],
+        dtype=np.float64,
+    )
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class P2PathColumns:
+    """One validated path and its post-watermark points as NumPy columns."""
+
+    path: tuple[P2ReplayPoint, ...]
+    points: tuple[P2ReplayPoint, ...]
+    decision_watermark_timestamp_ms: int
+    decision_watermark_local_receive_timestamp_ms: int
+    decision_watermark_source_sequence: int
+    exchange_ms: np.ndarray = field(repr=False)
+    trade_price: np.ndarray = field(repr=False)
+    trade_qty: np.ndarray = field(repr=False)
+    best_bid: np.ndarray = field(repr=False)
+    best_ask: np.ndarray = field(repr=False)
+    low_price: np.ndarray = field(repr=False)
+    high_price: np.ndarray = field(repr=False)
+    low: np.ndarray = field(repr=False)
+    quote_age_ms: np.ndarray = field(repr=False)
+
+    @classmethod
+    def from_path(
+        cls,
+        points: Iterable[P2ReplayPoint],
+        *,
+        decision_watermark_timestamp_ms: int,
+        decision_watermark_local_receive_timestamp_ms: int,
+        decision_watermark_source_sequence: int,
+    ) -> "P2PathColumns":
+        if (
+            decision_watermark_timestamp_ms <= 0
+            or decision_watermark_local_receive_timestamp_ms
+            < decision_watermark_timestamp_ms
+            or decision_watermark_source_sequence < 0
+        ):
+            raise ValueError("decision exchange/local/sequence watermark is invalid")
+        path = tuple(points)
+        _validate_path(path)
+        eligible = tuple(
+            point
+            for point in path
+            if (point.exchange_timestamp_ms, point.source_sequence)
+            > (decision_watermark_timestamp_ms, decision_watermark_source_sequence)
+            and (point.local_receive_timestamp_ms, point.source_sequence)
+            > (
+                decision_watermark_local_receive_timestamp_ms,
+                decision_watermark_source_sequence,
+            )
+        )
+        low_price = _float_column(eligible, "low_price")
+        trade_price = _float_column(eligible, "trade_price")
+        return cls(
+            path=path,
+            points=eligible,
+            decision_watermark_timestamp_ms=decision_watermark_timestamp_ms,
+            decision_watermark_local_receive_timestamp_ms=(
+                decision_watermark_local_receive_timestamp_ms
+            ),
+            decision_watermark_source_sequence=decision_watermark_source_sequence,
+            exchange_ms=np.array(
+                [point.exchange_timestamp_ms for point in eligible], dtype=np.int64
+            ),
+            trade_price=trade_price,
+            trade_qty=np.array(
+                [int(point.trade_qty or 0) for point in eligible], dtype=np.int64
+            ),
+            best_bid=_float_column(eligible, "best_bid"),
+            best_ask=_float_column(eligible, "best_ask"),
+            low_price=low_price,
+            high_price=_float_column(eligible, "high_price"),
+            low=np.fmin(low_price, trade_price),
+            quote_age_ms=_float_column(eligible, "quote_age_ms"),
+        )
+
+    def fresh_quote(self, max_quote_age_ms: float) -> np.ndarray:
+        return (self.quote_age_ms >= 0) & (self.quote_age_ms <= max_quote_age_ms)
+
+
+def is_grid_vectorizable(policy: P2ReplayPolicy) -> bool:
+    """Whether ``replay_policy_grid`` evaluates ``policy`` with array scans."""
+
+    return (
+        policy.entry_policy in _VECTOR_ENTRY_POLICIES
+        and policy.exit_policy is ExitPolicy.SINGLE_TP
+        and (policy.fill_bound is FillBound.UPPER_TOUCH or policy.target_quantity == 1)
+    )
+
+
+def replay_policy_grid(
+    points: Iterable[P2ReplayPoint],
+    *,
+    policies: Sequence[P2ReplayPolicy],
+    decision_watermark_timestamp_ms: int,
+    decision_watermark_local_receive_timestamp_ms: int,
+    decision_watermark_source_sequence: int,
+    event_trade_price: float | None = None,
+    event_bid_price: float | None = None,
+    event_bid_quote_age_ms: float | None = None,
+) -> tuple[P2ReplayResult, ...]:
+    """Replay every policy over one path; results follow ``policies`` order."""
+
+    columns = P2PathColumns.from_path(
+        points,
+        decision_watermark_timestamp_ms=decision_watermark_timestamp_ms,
+        decision_watermark_local_receive_timestamp_ms=(
+            decision_watermark_local_receive_timestamp_ms
+        ),
+        decision_watermark_source_sequence=decision_watermark_source_sequence,
+    )
+    results: list[P2ReplayResult | None] = [None] * len(policies)
+    groups: dict[tuple, list[int]] = defaultdict(list)
+    for position, policy in enumerate(policies):
+        if is_grid_vectorizable(policy):
+            groups[
+                (
+                    policy.entry_policy,
+                    policy.entry_ttl_ms,
+                    policy.fill_bound,
+                    policy.max_quote_age_ms,
+                    policy.target_quantity,
+                )
+            ].append(position)
+            continue
+        results[position] = replay_path(
+            columns.path,
+            policy=policy,
+            decision_watermark_timestamp_ms=decision_watermark_timestamp_ms,
+            decision_watermark_local_receive_timestamp_ms=(
+                decision_watermark_local_receive_timestamp_ms
+            ),
+            decision_watermark_source_sequence=decision_watermark_source_sequence,
+            event_trade_price=event_trade_price,
+            event_bid_price=event_bid_price,
+            event_bid_quote_age_ms=event_bid_quote_age_ms,
+        )
+    for positions in groups.values():
+        group = [policies[position] for position in positions]
+        entry = _grid_entry(
+            columns,
+            group[0],
+            event_bid_price=event_bid_price,
+            event_bid_quote_age_ms=event_bid_quote_age_ms,
+        )
+        if entry is None:
+            group_results = [
+                _empty_result(
+                    policy,
+                    decision_watermark_timestamp_ms,
+                    decision_watermark_local_receive_timestamp_ms,
+                    decision_watermark_source_sequence,
+                    len(columns.path),
+                )
+                for policy in group
+            ]
+        else:
+            group_results = _grid_single_tp_exits(columns, group, entry)
+        for position, result in zip(positions, group_results, strict=True):
+            results[position] = result
+    return tuple(result for result in results if result is not None)
+
+
+def _first_index(mask: np.ndarray) -> int | None:
+    if not mask.size:
+        return None
+    index = int(np.argmax(mask))
+    return index if mask[index] else None
+
+
+def _grid_entry(
+    columns: P2PathColumns,
+    policy: P2ReplayPolicy,
+    *,
+    event_bid_price: float | None,
+    event_bid_quote_age_ms: float | None,
+) -> tuple[int, _EntryResolution] | None:
+    in_window = columns.exchange_ms <= (
+        columns.decision_watermark_timestamp_ms + policy.entry_ttl_ms
+    )
+    if policy.entry_policy is EntryPolicy.MARKETABLE_NEXT_ASK:
+        index = _first_index(
+            in_window
+            & ~np.isnan(columns.best_ask)
+            & columns.fresh_quote(policy.max_quote_age_ms)
+        )
+        if index is None:
+            return None
+        price = columns.points[index].best_ask
+        filled_quantity = policy.target_quantity
+        execution_mode = EntryExecutionMode.MARKETABLE_NEXT_ASK
+    else:
+        price = _validated_event_bid(
+            event_bid_price,
+            event_bid_quote_age_ms,
+            policy=policy,
+            entry_policy=policy.entry_policy,
+        )
+        if policy.fill_bound is FillBound.UPPER_TOUCH:
+            touched = (
+                (columns.low_price <= price)
+                | (columns.trade_price <= price)
+                | (columns.best_ask <= price)
+            )
+        else:
+            touched = (columns.trade_price < price) & (columns.trade_qty > 0)
+        index = _first_index(in_window & touched)
+        if index is None:
+            return None
+        filled_quantity = policy.target_quantity
+        if policy.fill_bound is FillBound.LOWER_TRADE_THROUGH:
+            filled_quantity = min(policy.target_quantity, int(columns.trade_qty[index]))
+        execution_mode = EntryExecutionMode.PASSIVE_EVENT_BID
+    point = columns.points[index]
+    return index, _EntryResolution(
+        price=price,
+        exchange_timestamp_ms=point.exchange_timestamp_ms,
+        local_receive_timestamp_ms=point.local_receive_timestamp_ms,
+        source_sequence=point.source_sequence,
+        filled_quantity=filled_quantity,
+        execution_mode=execution_mode,
+        confirmation_exchange_timestamp_ms=columns.decision_watermark_timestamp_ms,
+        confirmation_local_receive_timestamp_ms=(
+            columns.decision_watermark_local_receive_timestamp_ms
+        ),
+        confirmation_source_sequence=columns.decision_watermark_source_sequence,
+    )
+
+
+def _grid_single_tp_exits(
+    columns: P2PathColumns,
+    group: list[P2ReplayPolicy],
+    resolved: tuple[int, _EntryResolution],
+) -> list[P2ReplayResult]:
+    entry_index, entry = resolved
+    entry_price = entry.price
+    head = group[0]
+    stop_prices = [
+        entry_price * (1 - policy.stop_loss_bps / 10_000.0) for policy in group
+    ]
+    take_profit_prices = [
+        entry_price * (1 + policy.take_profit_bps / 10_000.0) for policy in group
+    ]
+    deadlines = [
+        entry.exchange_timestamp_ms + policy.holding_ttl_ms for policy in group
+    ]
+    holding = slice(entry_index + 1, None)
+    exchange_ms = columns.exchange_ms[holding]
+    trade_price = columns.trade_price[holding]
+    best_bid = columns.best_bid[holding]
+    fresh = columns.fresh_quote(head.max_quote_age_ms)[holding]
+
+    stop = np.array(stop_prices, dtype=np.float64)[:, None]
+    take_profit = np.array(take_profit_prices, dtype=np.float64)[:, None]
+    stop_hit = (columns.low[holding] <= stop) | (fresh & (best_bid <= stop))
+    if head.fill_bound is FillBound.UPPER_TOUCH:
+        bid_usable = columns.quote_age_ms[holding] <= head.max_quote_age_ms
+        take_profit_hit = (
+            (columns.high_price[holding] >= take_profit)
+            | (trade_price >= take_profit)
+            | (bid_usable & (best_bid >= take_profit))
+        )
+    else:
+        take_profit_hit = (trade_price > take_profit) & (columns.trade_qty[holding] > 0)
+    in_window = exchange_ms <= np.array(deadlines, dtype=np.int64)[:, None]
+    hit = (stop_hit | take_profit_hit) & in_window
+    first_hit = hit.argmax(axis=1) if hit.shape[1] else np.zeros(len(group), int)
+
+    holding_points = columns.points[entry_index + 1 :]
+    results = []
+    for row, policy in enumerate(group):
+        filled_quantity = entry.filled_quantity
+        remaining = filled_quantity
+        proceeds = 0.0
+        exited_quantity = 0
+        exit_time: int | None = None
+        terminal = ReplayTerminalReason.PATH_ENDED
+        ambiguity = False
+        column = int(first_hit[row])
+        if hit.shape[1] and hit[row, column]:
+            point = holding_points[column]
+            point_stop = bool(stop_hit[row, column])
+            point_take_profit = bool(take_profit_hit[row, column])
+            same_point_range_crossed = (
+                point.low_price is not None
+                and point.high_price is not None
+                and point.low_price <= stop_prices[row]
+                and point.high_price >= take_profit_prices[row]
+            )
+            if point_stop and (point_take_profit or same_point_range_crossed):
+                ambiguity = True
+                if policy.same_timestamp_policy is SameTimestampPolicy.MARK_AMBIGUOUS:
+                    results.append(
+                        _grid_result(
+                            policy,
+                            columns,
+                            entry,
+                            remaining=remaining,
+                            realized_exit=None,
+                            exit_time=point.exchange_timestamp_ms,
+                            terminal=ReplayTerminalReason.AMBIGUOUS_SAME_TIMESTAMP,
+                            ambiguity=True,
+                        )
+                    )
+                    continue
+            if point_stop:
+                proceeds += remaining * _stop_execution_price(
+                    point, stop_price=stop_prices[row], policy=policy
+                )
+                terminal = ReplayTerminalReason.STOP_LOSS
+            else:
+                proceeds += remaining * take_profit_prices[row]
+                terminal = ReplayTerminalReason.TAKE_PROFIT
+            exited_quantity += remaining
+            remaining = 0
+            exit_time = point.exchange_timestamp_ms
+        else:
+            deadline = deadlines[row]
+            terminal_index = (
+                int(np.searchsorted(exchange_ms, deadline, side="right")) - 1
+            )
+            deadline_matured = bool(exchange_ms.size) and (
+                int(exchange_ms[-1]) >= deadline
+            )
+            if deadline_matured and terminal_index >= 0:
+                terminal_point = holding_points[terminal_index]
+                terminal_price = (
+                    (
+                        terminal_point.best_bid
+                        if _fresh_quote(terminal_point, policy)
+                        else None
+                    )
+                    or terminal_point.trade_price
+                    or terminal_point.low
+                    or entry_price
+                )
+                proceeds += remaining * terminal_price
+                exited_quantity += remaining
+                remaining = 0
+                exit_time = terminal_point.exchange_timestamp_ms
+                terminal = ReplayTerminalReason.HOLDING_TTL
+        results.append(
+            _grid_result(
+                policy,
+                columns,
+                entry,
+                remaining=remaining,
+                realized_exit=(
+                    proceeds / exited_quantity if exited_quantity > 0 else None
+                ),
+                exit_time=exit_time,
+                terminal=terminal,
+                ambiguity=ambiguity,
+            )
+        )
+    return results
+
+
+def _grid_result(
+    policy: P2ReplayPolicy,
+    columns: P2PathColumns,
+    entry: _EntryResolution,
+    *,
+    remaining: int,
+    realized_exit: float | None,
+    exit_time: int | None,
+    terminal: ReplayTerminalReason,
+    ambiguity: bool,
+) -> P2ReplayResult:
+    filled_quantity = entry.filled_quantity
+    gross_bps = (
+        None
+        if remaining > 0 or realized_exit is None
+        else (realized_exit / entry.price - 1.0) * 10_000.0
+    )
+    return P2ReplayResult(
+        policy_id=policy.policy_id,
+        policy_version=policy.policy_version,
+        policy_contract=P2PolicySnapshot.from_policy(policy),
+        fill_bound=policy.fill_bound,
+        filled_quantity=filled_quantity,
+        unresolved_quantity=remaining,
+        fill_fraction=round(filled_quantity / policy.target_quantity, 6),
+        average_entry_price=round(entry.price, 6),
+        average_exit_price=(None if realized_exit is None else round(realized_exit, 6)),
+        entry_filled_at_ms=entry.exchange_timestamp_ms,
+        entry_execution_mode=entry.execution_mode,
+        entry_confirmation_at_ms=entry.confirmation_exchange_timestamp_ms,
+        entry_confirmation_local_receive_at_ms=(
+            entry.confirmation_local_receive_timestamp_ms
+        ),
+        entry_confirmation_source_sequence=entry.confirmation_source_sequence,
+        exited_at_ms=exit_time,
+        gross_return_bps=None if gross_bps is None else round(gross_bps, 6),
+        net_return_bps=(
+            None if gross_bps is None else round(gross_bps - policy.all_in_cost_bps, 6)
+        ),
+        net_return_per_detected_signal_bps=(
+            None
+            if gross_bps is None
+            else round(
+                (gross_bps - policy.all_in_cost_bps)
+                * (filled_quantity / policy.target_quantity),
+                6,
+            )
+        ),
+        terminal_reason=terminal,
+        partial_fill_observed=filled_quantity < policy.target_quantity,
+        partial_take_profit_observed=False,
+        ambiguity_observed=ambiguity,
+        decision_watermark_timestamp_ms=columns.decision_watermark_timestamp_ms,
+        decision_watermark_local_receive_timestamp_ms=(
+            columns.decision_watermark_local_receive_timestamp_ms
+        ),
+        decision_watermark_source_sequence=columns.decision_watermark_source_sequence,
+        source_point_count=len(columns.path),
+    )
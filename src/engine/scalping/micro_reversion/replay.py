@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import gzip
+import hashlib
 import json
 from collections import Counter, defaultdict
 from dataclasses import asdict, dataclass, field
@@ -23,6 +24,11 @@ from .contracts import (
     normalize_venue,
 )
 from .detector import DetectorConfig, ShockDetector
+from .observation_cache import (
+    ParsedInput,
+    ParsedObservationCache,
+    ParsedObservationCacheStats,
+)
 from .outcome_labeler import OutcomeLabeler, OutcomeLabelerConfig
 from .symbol_master import SymbolLookupStatus, VerifiedSymbolMaster
 from .tax import InstrumentMetadata, metadata_from_mapping
@@ -102,6 +108,7 @@ class ReplayResult:
     observations: tuple[PriceObservation, ...]
     events: tuple[ShockEvent, ...]
     labels: tuple[OutcomeLabel, ...]
+    parse_cache_stats: dict[str, int] | None = None
 
     def as_dict(self, *, include_observations: bool = False) -> dict[str, Any]:
         payload = {
@@ -109,6 +116,8 @@ class ReplayResult:
             "events": [event.as_dict() for event in self.events],
             "labels": [label.as_dict() for label in self.labels],
         }
+        if self.parse_cache_stats is not None:
+            payload["parse_cache_stats"] = dict(self.parse_cache_stats)
         if include_observations:
             payload["observations"] = [
                 observation.as_dict() for observation in self.observations
@@ -120,6 +129,7 @@ def replay_paths(
     paths: Iterable[Path],
     *,
     config: ReplayConfig | None = None,
+    observation_cache: ParsedObservationCache | None = None,
 ) -> ReplayResult:
     replay_config = config or ReplayConfig()
     normalized_paths = tuple(sorted(Path(path) for path in paths))
@@ -128,53 +138,32 @@ def replay_paths(
 
     observations_by_bucket: dict[tuple[str, str, str, str, int], PriceObservation] = {}
     counters: Counter[str] = Counter()
+    cache_stats = None if observation_cache is None else ParsedObservationCacheStats()
+    fingerprint = (
+        None if observation_cache is None else parser_fingerprint(replay_config)
+    )
 
     for path in normalized_paths:
-        with _open_text(path) as handle:
-            for line in handle:
-                counters["raw_row_count"] += 1
-                try:
-                    row = json.loads(line)
-                except (json.JSONDecodeError, TypeError):
-                    counters["invalid_json_count"] += 1
-                    continue
-                if not isinstance(row, dict):
-                    counters["invalid_json_count"] += 1
-                    continue
-                parsed = _parse_observation(
-                    row,
-                    config=replay_config,
-                    counters=counters,
-                )
-                if parsed is None:
-                    continue
-                counters["accepted_row_count"] += 1
-                if (
-                    parsed.best_bid is not None
-                    and parsed.best_ask is not None
-                    and parsed.best_ask >= parsed.best_bid
-                ):
-                    counters["raw_bbo_candidate_rows"] += 1
-                if any(
-                    value is not None
-                    for value in (
-                        parsed.aggressive_sell_ratio,
-                        parsed.ofi,
-                        parsed.qi,
-                    )
-                ):
-                    counters["raw_micro_capture_rows"] += 1
-                if parsed.coverage_tier.value == "micro_context":
-                    counters["raw_micro_context_candidate_rows"] += 1
-                bucket_ms = (
-                    parsed.observed_at_ms // replay_config.dedupe_interval_ms
-                ) * replay_config.dedupe_interval_ms
-                bucket_key = (*parsed.series_key, bucket_ms)
-                existing = observations_by_bucket.get(bucket_key)
-                if existing is None or _observation_rank(parsed) > _observation_rank(
-                    existing
-                ):
-                    observations_by_bucket[bucket_key] = parsed
+        if observation_cache is None:
+            parsed_input = _parse_input(path, config=replay_config)
+        else:
+            parsed_input = observation_cache.get_or_parse(
+                path,
+                parser_fingerprint=fingerprint,
+                parse=lambda item: _parse_input(item, config=replay_config),
+                run_stats=cache_stats,
+            )
+        counters.update(parsed_input.counters)
+        for parsed in parsed_input.observations:
+            bucket_ms = (
+                parsed.observed_at_ms // replay_config.dedupe_interval_ms
+            ) * replay_config.dedupe_interval_ms
+            bucket_key = (*parsed.series_key, bucket_ms)
+            existing = observations_by_bucket.get(bucket_key)
+            if existing is None or _observation_rank(parsed) > _observation_rank(
+                existing
+            ):
+                observations_by_bucket[bucket_key] = parsed
 
     observations = tuple(
         sorted(
@@ -237,17 +226,74 @@ def replay_paths(
             max_internal_gap_ms=replay_config.max_path_gap_ms,
         )
     )
-    labels = tuple(
-        labeler.label(event, grouped[event.series_key]) for event in events_tuple
-    )
+    labels = labeler.label_many(events_tuple, observations)
     return ReplayResult(
         input_stats=stats,
         observations=observations,
         events=events_tuple,
         labels=labels,
+        parse_cache_stats=None if cache_stats is None else cache_stats.as_dict(),
     )
 
 
+def parser_fingerprint(config: ReplayConfig) -> str:
+    """Hash of the ``ReplayConfig`` fields that change parsed observations."""
+    master = config.verified_symbol_master
+    payload = {
+        "clean_baseline_date": CLEAN_BASELINE_DATE.isoformat(),
+        "session_start": config.session_start.isoformat(),
+        "session_end": config.session_end.isoformat(),
+        "current_price_fields": list(config.current_price_fields),
+        "instrument_metadata_by_symbol": config.instrument_metadata_by_symbol,
+        "verified_symbol_master": None if master is None else master.as_dict(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _parse_input(path: Path, *, config: ReplayConfig) -> ParsedInput:
+    observations: list[PriceObservation] = []
+    counters: Counter[str] = Counter()
+    with _open_text(path) as handle:
+        for line in handle:
+            counters["raw_row_count"] += 1
+            try:
+                row = json.loads(line)
+            except (json.JSONDecodeError, TypeError):
+                counters["invalid_json_count"] += 1
+                continue
+            if not isinstance(row, dict):
+                counters["invalid_json_count"] += 1
+                continue
+            parsed = _parse_observation(
+                row,
+                config=config,
+                counters=counters,
+            )
+            if parsed is None:
+                continue
+            counters["accepted_row_count"] += 1
+            if (
+                parsed.best_bid is not None
+                and parsed.best_ask is not None
+                and parsed.best_ask >= parsed.best_bid
+            ):
+                counters["raw_bbo_candidate_rows"] += 1
+            if any(
+                value is not None
+                for value in (
+                    parsed.aggressive_sell_ratio,
+                    parsed.ofi,
+                    parsed.qi,
+                )
+            ):
+                counters["raw_micro_capture_rows"] += 1
+            if parsed.coverage_tier.value == "micro_context":
+                counters["raw_micro_context_candidate_rows"] += 1
+            observations.append(parsed)
+    return ParsedInput(observations=tuple(observations), counters=dict(counters))
+
+
 def _parse_observation(
     row: dict[str, Any],
     *,
@@ -522,6 +568,11 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--write", action="store_true")
     parser.add_argument("--test-result", default="not_run_for_this_manifest")
     parser.add_argument("--output-root", type=Path, default=DEFAULT_REPORT_ROOT)
+    parser.add_argument(
+        "--parse-cache-dir",
+        type=Path,
+        help="reuse parsed observations across config sweeps",
+    )
     return parser.parse_args()
 
 
@@ -545,6 +596,11 @@ def main() -> int:
             instrument_metadata_by_symbol=instrument_metadata,
             verified_symbol_master=symbol_master,
         ),
+        observation_cache=(
+            None
+            if args.parse_cache_dir is None
+            else ParsedObservationCache(root=args.parse_cache_dir)
+        ),
     )
     from .report import build_report, write_report
 
@@ -568,6 +624,7 @@ def main() -> int:
                 "written": (
                     None if written is None else [str(path) for path in written]
                 ),
+                "parse_cache_stats": result.parse_cache_stats,
             },
             ensure_ascii=False,
         )
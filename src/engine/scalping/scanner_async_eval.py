@@ -4,18 +4,22 @@ from __future__ import annotations
 
 from collections.abc import Callable, Mapping
 from concurrent.futures import Future, ThreadPoolExecutor
-from copy import deepcopy
 from dataclasses import dataclass, field
 from queue import Empty, SimpleQueue
 import threading
 import time
-from types import MappingProxyType
 from typing import Any
 
 from src.engine.ai.hot_path_ai_dispatcher import (
     HotPathAIDispatcher,
     HotPathAIRequest,
 )
+from src.engine.infrastructure.frozen_values import (
+    EMPTY_FROZEN_MAP,
+    FrozenSnapshotInterner,
+    frozen_mapping,
+    thaw,
+)
 from src.engine.scalping.scanner_runtime_scheduler import ScannerGeneration
 
 SCANNER_ASYNC_EVAL_VERSION = "scanner_async_eval_commit_v1"
@@ -23,32 +27,27 @@ _MAX_READY_RESULTS = 128
 _MAX_CANCELLED_GENERATIONS = 256
 
 
-def _deep_freeze(value: Any) -> Any:
-    if isinstance(value, Mapping):
-        return MappingProxyType(
-            {str(key): _deep_freeze(item) for key, item in value.items()}
-        )
-    if isinstance(value, (list, tuple)):
-        return tuple(_deep_freeze(item) for item in value)
-    if isinstance(value, (set, frozenset)):
-        return frozenset(_deep_freeze(item) for item in value)
-    return deepcopy(value)
+# Per-code interners: an unchanged snapshot is frozen once and the same object
+# is shared by the coordinator, the hot-path dispatcher and commit validation.
+_STOCK_SNAPSHOT_INTERNER = FrozenSnapshotInterner(max_entries=512)
+_WS_SNAPSHOT_INTERNER = FrozenSnapshotInterner(max_entries=512)
 
 
 def thaw_scanner_async_value(value: Any) -> Any:
     """Return a private mutable copy for a worker/provider call."""
 
-    if isinstance(value, Mapping):
-        return {str(key): thaw_scanner_async_value(item) for key, item in value.items()}
-    if isinstance(value, tuple):
-        return [thaw_scanner_async_value(item) for item in value]
-    if isinstance(value, frozenset):
-        return {thaw_scanner_async_value(item) for item in value}
-    return deepcopy(value)
+    return thaw(value)
 
 
 def _immutable_mapping(value: Mapping[str, Any] | None) -> Mapping[str, Any]:
-    return _deep_freeze(dict(value or {}))
+    return frozen_mapping(value)
+
+
+def get_scanner_async_snapshot_interner_stats() -> dict[str, dict[str, int]]:
+    return {
+        "stock_snapshot": _STOCK_SNAPSHOT_INTERNER.stats(),
+        "ws_snapshot": _WS_SNAPSHOT_INTERNER.stats(),
+    }
 
 
 @dataclass(frozen=True, slots=True)
@@ -84,8 +83,10 @@ class ScannerAsyncEvalContext:
             cache_key=str(cache_key or "").strip() or generation.generation_id,
             submitted_epoch=submitted,
             deadline_epoch=deadline,
-            stock_snapshot=_immutable_mapping(stock_snapshot),
-            ws_snapshot=_immutable_mapping(ws_snapshot),
+            stock_snapshot=_STOCK_SNAPSHOT_INTERNER.freeze(
+                generation.code, stock_snapshot
+            ),
+            ws_snapshot=_WS_SNAPSHOT_INTERNER.freeze(generation.code, ws_snapshot),
             state_version=str(state_version or "-"),
         )
 
@@ -222,7 +223,7 @@ class ScannerAsyncEvalCoordinator:
     ) -> tuple[float, float, Mapping[str, Any]]:
         started = time.time()
         if started > request.context.deadline_epoch:
-            return started, started, MappingProxyType({})
+            return started, started, EMPTY_FROZEN_MAP
         prepared = request.prepare(request.context)
         completed = time.time()
         return started, completed, _immutable_mapping(prepared)
@@ -324,7 +325,7 @@ class ScannerAsyncEvalCoordinator:
             request_id = ai_result.request_id
             with self._lock:
                 request = self._requests.get(request_id)
-                prepared = self._prepared.pop(request_id, MappingProxyType({}))
+                prepared = self._prepared.pop(request_id, EMPTY_FROZEN_MAP)
                 timings = self._preparation_timings.pop(
                     request_id,
                     (ai_result.submitted_epoch, ai_result.submitted_epoch),
@@ -14,10 +14,16 @@
    이 모듈만 가볍게 import하면 즉시 AI의 판독 결과를 얻을 수 있습니다.
 """
 
+import argparse
+import json
 import os
+import time
+
 import joblib
 import pandas as pd
 import numpy as np
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
 
 # 💡 Level 1 공통 모듈 (경로, 로거, 피처 엔지니어링)
 from src.utils.constants import DATA_DIR
@@ -130,99 +136,285 @@ def load_models():
         return None
 
 
+STACKING_COLUMNS = ["XGB_Prob", "LGBM_Prob", "Bull_XGB_Prob", "Bull_LGBM_Prob"]
+MODEL_FEATURES = list(dict.fromkeys(FEATURES_XGB + FEATURES_LGBM))
+
+# 💡 calculate_all_features 출력(구/신 명명)을 모델 학습 피처명으로 맞추는 방탄 매핑
+FEATURE_RENAME_MAP = {
+    "Return": "daily_return",
+    "MA_Ratio": "ma_ratio",
+    "MACD": "macd",
+    "MACD_Sig": "macd_sig",
+    "VWAP": "vwap",
+    "OBV": "obv",
+    "Up_Trend_2D": "up_trend_2d",
+    "Dist_MA5": "dist_ma5",
+    "Dual_Net_Buy": "dual_net_buy",
+    "Foreign_Net_Roll5": "foreign_net_roll5",
+    "Inst_Net_Roll5": "inst_net_roll5",
+    "BB_Width": "bbb",
+    "BBB": "bbb",
+    "BB_Pos": "bbp",
+    "BBP": "bbp",
+    "ATR_Ratio": "atr_ratio",
+    "RSI": "rsi",
+    "RSI_Slope": "rsi_slope",
+    "Range_Ratio": "range_ratio",
+    "Vol_Momentum": "vol_momentum",
+    "Vol_Change": "vol_change",
+    "ATR": "atr",
+    "Foreign_Vol_Ratio": "foreign_vol_ratio",
+    "Inst_Vol_Ratio": "inst_vol_ratio",
+    "Margin_Rate_Change": "margin_rate_change",
+    "Margin_Rate_Roll5": "margin_rate_roll5",
+}
+
+
+def build_model_feature_row(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    일봉 DataFrame 한 종목분을 받아 피처를 계산하고,
+    최신 일자 한 줄을 모델 입력 규격(MODEL_FEATURES 포함)으로 반환합니다.
+    실패 시 예외를 그대로 올리므로 호출부에서 0점 처리합니다.
+    """
+    df = normalize_model_input_frame(df)
+
+    # [절대 방어막] 대문자/소문자 상관없이 수급/신용 데이터 누락 시 강제 0 주입
+    for col in [
+        "Retail_Net",
+        "retail_net",
+        "Foreign_Net",
+        "foreign_net",
+        "Inst_Net",
+        "inst_net",
+        "Margin_Rate",
+        "margin_rate",
+    ]:
+        if col not in df.columns:
+            df[col] = 0.0
+
+    # 1. 기술적 지표(피처) 일괄 계산
+    df = calculate_all_features(df)
+
+    # 2. DataFrame에 존재하는 컬럼만 안전하게 이름 변경
+    df = df.rename(
+        columns={k: v for k, v in FEATURE_RENAME_MAP.items() if k in df.columns}
+    )
+    if "daily_return" not in df.columns and "return_1d" in df.columns:
+        df["daily_return"] = df["return_1d"]
+    if "vwap" not in df.columns and "vwap20" in df.columns:
+        df["vwap"] = df["vwap20"]
+
+    # 3. 가장 최신 일자(오늘)의 데이터 한 줄만 추출
+    latest_row = df.iloc[[-1]].replace([np.inf, -np.inf], np.nan).fillna(0)
+    for feature in set(FEATURES_XGB + FEATURES_LGBM):
+        if feature not in latest_row.columns:
+            latest_row[feature] = 0.0
+    return latest_row
+
+
+def predict_probs_for_features(features: pd.DataFrame, models: tuple) -> np.ndarray:
+    """
+    build_model_feature_row 결과를 여러 줄 쌓은 피처 프레임을 받아
+    4개 베이스 모델과 메타 모델을 각각 한 번씩만 호출합니다.
+    트리/로지스틱 모델은 행 단위 독립 연산이라 한 줄씩 호출한 값과 같습니다.
+    """
+    m_xgb, m_lgbm, b_xgb, b_lgbm, meta_model = models
+    if features.empty:
+        return np.empty(0, dtype=np.float64)
+
+    # 4. 4개의 개별 베이스 모델 예측 (양성 클래스 확률 열)
+    base_probs = [
+        m_xgb.predict_proba(features[FEATURES_XGB])[:, 1],
+        m_lgbm.predict_proba(features[FEATURES_LGBM])[:, 1],
+        b_xgb.predict_proba(features[FEATURES_XGB])[:, 1],
+        b_lgbm.predict_proba(features[FEATURES_LGBM])[:, 1],
+    ]
+
+    # 5. 메타 모델(Stacking) 최종 예측
+    stacking = pd.DataFrame(dict(zip(STACKING_COLUMNS, base_probs)))
+    return _meta_positive_probs(meta_model, stacking)
+
+
+def _meta_positive_probs(meta_model, stacking: pd.DataFrame) -> np.ndarray:
+    """
+    메타 모델 양성 확률. (N,4)@(4,1) 한 번의 행렬곱은 BLAS 누산 순서가 1행 호출과 달라
+    1ulp 차이가 날 수 있으므로, 이진 LogisticRegression 은 행마다 (1,4)@(4,1) 을
+    쌓은(stacked) matmul 로 단건 predict_proba 와 같은 값을 한 번에 계산합니다.
+    그 외 메타 모델은 한 줄씩 predict_proba 를 호출합니다.
+    """
+    names = getattr(meta_model, "feature_names_in_", None)
+    if (
+        type(meta_model) is LogisticRegression
+        and len(getattr(meta_model, "classes_", ())) == 2
+        and (names is None or list(names) == STACKING_COLUMNS)
+    ):
+        x = np.ascontiguousarray(stacking.to_numpy(dtype=np.float64))
+        decision = np.matmul(x[:, None, :], meta_model.coef_.T[None])[:, 0, 0]
+        return expit(decision + meta_model.intercept_[0])
+    return np.array(
+        [
+            meta_model.predict_proba(stacking.iloc[[index]])[0][1]
+            for index in range(len(stacking))
+        ],
+        dtype=np.float64,
+    )
+
+
+def predict_probs_for_dfs(frames, models: tuple) -> dict:
+    """
+    {키: 일봉 DataFrame} 후보 전체를 한 번에 추론하여 {키: Prob} 로 반환합니다.
+    종목별 피처 계산은 각자 수행하고, 모델 호출은 후보 전체에 대해 한 번만 합니다.
+    피처 계산에 실패한 종목은 predict_prob_for_df 와 동일하게 0.0 입니다.
+    """
+    probs = {key: 0.0 for key in frames}
+    if not models:
+        return probs
+
+    rows = {}
+    for key, df in frames.items():
+        if df is None or df.empty:
+            continue
+        try:
+            rows[key] = build_model_feature_row(df)[MODEL_FEATURES]
+        except Exception:
+            continue
+    if not rows:
+        return probs
+
+    try:
+        features = pd.concat(rows.values(), ignore_index=True)
+        batch = predict_probs_for_features(features, models)
+        probs.update(zip(rows, (float(p) for p in batch)))
+    except Exception:
+        # 한 종목의 dtype 이상 등으로 배치가 깨지면 한 줄씩 재시도해 단건 경로와 결과를 맞춥니다.
+        for key, row in rows.items():
+            try:
+                probs[key] = float(predict_probs_for_features(row, models)[0])
+            except Exception:
+                probs[key] = 0.0
+    return probs
+
+
 def predict_prob_for_df(df: pd.DataFrame, models: tuple) -> float:
     """
     일봉 DataFrame을 입력받아 피처를 계산하고,
     최종 AI Stacking 확신지수(Prob)를 반환하는 순수 함수(Pure Function)입니다.
+    여러 종목을 평가할 때는 predict_probs_for_dfs 로 모델 호출을 묶으세요.
     """
     if not models or df is None or df.empty:
         return 0.0
 
-    # 🛡️ [핵심 교정] try-except 블록을 함수 최상단으로 끌어올렸습니다!
-    # 이제 피처 계산, 이름 변경, 모델 추론 등 어디서 에러가 나든 무조건 0점을 반환합니다.
+    # 🛡️ 피처 계산, 이름 변경, 모델 추론 등 어디서 에러가 나든 무조건 0점을 반환합니다.
     try:
-        m_xgb, m_lgbm, b_xgb, b_lgbm, meta_model = models
-        df = normalize_model_input_frame(df)
-
-        # [절대 방어막] 대문자/소문자 상관없이 수급/신용 데이터 누락 시 강제 0 주입
-        for col in [
-            "Retail_Net",
-            "retail_net",
-            "Foreign_Net",
-            "foreign_net",
-            "Inst_Net",
-            "inst_net",
-            "Margin_Rate",
-            "margin_rate",
-        ]:
-            if col not in df.columns:
-                df[col] = 0.0
-
-        # 1. 기술적 지표(피처) 일괄 계산 (🚨 이제 여기서 에러가 나도 안전합니다)
-        df = calculate_all_features(df)
-
-        # 2. 방탄 매핑 (Bulletproof Mapping)
-        rename_map = {
-            "Return": "daily_return",
-            "MA_Ratio": "ma_ratio",
-            "MACD": "macd",
-            "MACD_Sig": "macd_sig",
-            "VWAP": "vwap",
-            "OBV": "obv",
-            "Up_Trend_2D": "up_trend_2d",
-            "Dist_MA5": "dist_ma5",
-            "Dual_Net_Buy": "dual_net_buy",
-            "Foreign_Net_Roll5": "foreign_net_roll5",
-            "Inst_Net_Roll5": "inst_net_roll5",
-            "BB_Width": "bbb",
-            "BBB": "bbb",
-            "BB_Pos": "bbp",
-            "BBP": "bbp",
-            "ATR_Ratio": "atr_ratio",
-            "RSI": "rsi",
-            "RSI_Slope": "rsi_slope",
-            "Range_Ratio": "range_ratio",
-            "Vol_Momentum": "vol_momentum",
-            "Vol_Change": "vol_change",
-            "ATR": "atr",
-            "Foreign_Vol_Ratio": "foreign_vol_ratio",
-            "Inst_Vol_Ratio": "inst_vol_ratio",
-            "Margin_Rate_Change": "margin_rate_change",
-            "Margin_Rate_Roll5": "margin_rate_roll5",
-        }
-
-        # DataFrame에 존재하는 컬럼만 안전하게 이름 변경
-        df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
-        if "daily_return" not in df.columns and "return_1d" in df.columns:
-            df["daily_return"] = df["return_1d"]
-        if "vwap" not in df.columns and "vwap20" in df.columns:
-            df["vwap"] = df["vwap20"]
-
-        # 3. 가장 최신 일자(오늘)의 데이터 한 줄만 추출
-        latest_row = df.iloc[[-1]].replace([np.inf, -np.inf], np.nan).fillna(0)
-        for feature in set(FEATURES_XGB + FEATURES_LGBM):
-            if feature not in latest_row.columns:
-                latest_row[feature] = 0.0
-
-        # 4. 4개의 개별 베이스 모델 예측
-        preds = [
-            m_xgb.predict_proba(latest_row[FEATURES_XGB])[0][1],
-            m_lgbm.predict_proba(latest_row[FEATURES_LGBM])[0][1],
-            b_xgb.predict_proba(latest_row[FEATURES_XGB])[0][1],
-            b_lgbm.predict_proba(latest_row[FEATURES_LGBM])[0][1],
-        ]
-
-        # 5. 메타 모델(Stacking) 최종 예측
-        p_final = meta_model.predict_proba(
-            pd.DataFrame(
-                [preds],
-                columns=["XGB_Prob", "LGBM_Prob", "Bull_XGB_Prob", "Bull_LGBM_Prob"],
-            )
-        )[0][1]
-
-        return float(p_final)
-
+        return float(predict_probs_for_features(build_model_feature_row(df), models)[0])
     except Exception as e:
         # 에러 발생 시 0.0을 반환하여, 스캐너가 이 종목을 'AI 확신도 부족(0점)' 통계로 정상 분류하게 만듭니다.
         # log_info(f"⚠️ AI 추론 연산 중 에러 발생: {e}") # 로그가 너무 많이 찍히는 것을 방지하려면 주석 처리
         return 0.0
+
+
+# ==========================================
+# ⏱️ 배치 추론 벤치마크
+# ==========================================
+def build_benchmark_frames(count: int, rows: int = 120, seed: int = 7) -> dict:
+    """스캐너 ka10081 일봉과 같은 대문자 규격의 합성 후보 일봉."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2026-01-02", periods=rows)
+    frames = {}
+    for index in range(count):
+        close = 10_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, rows)))
+        open_ = close * np.exp(rng.normal(0.0, 0.01, rows))
+        code = f"{index + 1:06d}"
+        frames[code] = pd.DataFrame(
+            {
+                "Date": dates,
+                "Code": code,
+                "Name": f"bench{index}",
+                "Open": open_,
+                "High": np.maximum(open_, close) * 1.01,
+                "Low": np.minimum(open_, close) * 0.99,
+                "Close": close,
+                "Volume": rng.integers(10_000, 500_000, rows).astype(float),
+                "Foreign_Net": rng.normal(0.0, 1_000.0, rows),
+                "Inst_Net": rng.normal(0.0, 1_000.0, rows),
+                "Margin_Rate": rng.random(rows),
+            }
+        )
+    return frames
+
+
+def benchmark_batch_inference(
+    models: tuple, sizes=(10, 100, 1000), single_cap: int = 100, seed: int = 7
+) -> dict:
+    """
+    후보 수별 종목당 지연(ms)을 단건 경로(predict_prob_for_df 반복)와
+    배치 경로(predict_probs_for_dfs)로 비교합니다. 단건 경로는 single_cap
+    종목까지만 측정해 종목당 지연을 구합니다. 모델 구간은 피처 계산 후 측정합니다.
+    """
+    report = {}
+    for size in sizes:
+        frames = build_benchmark_frames(size, seed=seed)
+        sample = dict(list(frames.items())[: max(1, min(size, single_cap))])
+
+        started = time.perf_counter()
+        single = {key: predict_prob_for_df(df, models) for key, df in sample.items()}
+        single_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batch = predict_probs_for_dfs(frames, models)
+        batch_sec = time.perf_counter() - started
+
+        features = pd.concat(
+            [build_model_feature_row(df)[MODEL_FEATURES] for df in frames.values()],
+            ignore_index=True,
+        )
+        started = time.perf_counter()
+        for index in range(min(size, single_cap)):
+            predict_probs_for_features(features.iloc[[index]], models)
+        single_model_sec = time.perf_counter() - started
+        started = time.perf_counter()
+        predict_probs_for_features(features, models)
+        batch_model_sec = time.perf_counter() - started
+
+        single_ms = single_sec * 1000 / len(sample)
+        batch_ms = batch_sec * 1000 / size
+        report[str(size)] = {
+            "single_ms_per_candidate": round(single_ms, 3),
+            "batch_ms_per_candidate": round(batch_ms, 3),
+            "speedup": round(single_ms / max(batch_ms, 1e-9), 2),
+            "single_model_ms_per_candidate": round(
+                single_model_sec * 1000 / len(sample), 3
+            ),
+            "batch_model_ms_per_candidate": round(batch_model_sec * 1000 / size, 3),
+            "single_measured_candidates": len(sample),
+            "parity": all(batch[key] == prob for key, prob in single.items()),
+        }
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="ml_predictor 단건/배치 추론 지연 벤치마크 (data/*.pkl 모델 사용)"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--single-cap", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    models = load_models()
+    if not models:
+        print("❌ 모델 로드 실패: data/*.pkl 을 확인하세요.")
+        return 1
+    print(
+        json.dumps(
+            benchmark_batch_inference(
+                models, sizes=args.sizes, single_cap=args.single_cap, seed=args.seed
+            ),
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,8 @@
+import argparse
+import json
+import time
+
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 
@@ -7,6 +12,25 @@ except ImportError:
     from common_v2 import engine, AI_PRED_PATH, select_daily_candidates
 
 
+TRADE_COLUMNS = [
+    "date",
+    "code",
+    "name",
+    "score",
+    "hybrid_mean",
+    "bull_regime",
+    "hold_days",
+    "buy_price",
+    "exit_price",
+    "gross_ret",
+    "net_ret",
+    "exit_reason",
+]
+GRID_PARAM_COLUMNS = ["tp", "sl_bull", "sl_bear", "max_hold_days"]
+# resolve_exit_price 판정 우선순위와 같은 순서
+EXIT_REASONS = np.array(["TP_GAP", "SL_GAP", "AMBIG_SL_FIRST", "TP", "SL", "TIME"])
+
+
 def resolve_exit_price(
     open_p, high_p, low_p, close_p, tp_price, sl_price, hold_day, max_hold=3
 ):
@@ -31,77 +55,19 @@ def resolve_exit_price(
     return None, None
 
 
-def run_backtest_v2(
-    top_k_bull=3,  # (유지) 상승장 하루 최대 3종목
-    top_k_bear=1,  # (유지) 하락장 보수적 접근
-    floor_bull=0.35,  # 💡 (수정) 0.42 -> 0.35: Base 모델 컷오프 대폭 완화 (랭커에게 권한 위임)
-    floor_bear=0.40,  # 💡 (수정) 0.48 -> 0.40: 하락장 컷오프 완화
+def _simulate_trades_loop(
+    picks,
+    px,
+    tp=0.055,
+    sl_bull=0.040,
+    sl_bear=0.035,
+    max_hold_days=4,
     roundtrip_fee_rate=0.0023,
-    tp=0.055,  # 4.5% -> 5.5% (익절 폭 확대)
-    sl_bull=0.040,  # 4.5% -> 4.0% (손절 폭 소폭 축소)
-    sl_bear=0.035,  # 💡 (수정) 0.025 -> 0.035: 하락장 손절폭 완화
-    max_hold_days=4,  # TIME 아웃 17건을 구제하기 위해 보유 기간 하루 연장
-    output_path=None,
-    save=True,
 ):
-    print("🚀 실전 정밀 Backtest 시작 (파라미터 튜닝 V2)")
-
-    df_pred = pd.read_csv(AI_PRED_PATH)
-    df_pred["date"] = pd.to_datetime(df_pred["date"]).dt.normalize()
-    df_pred["code"] = (
-        df_pred["code"]
-        .astype(str)
-        .str.replace(r"\.0$", "", regex=True)
-        .str.strip()
-        .str.zfill(6)
-    )
-
-    # 💡 투트랙 필터링 적용 (score: 랭커 상대점수 / prob_col: Base 절대확률)
-    picks = select_daily_candidates(
-        df_pred,
-        score_col="score",
-        prob_col="hybrid_mean",
-        date_col="date",
-        top_k_bull=top_k_bull,
-        top_k_bear=top_k_bear,
-        floor_bull=floor_bull,
-        floor_bear=floor_bear,
-    )
-
-    if picks.empty:
-        print("❌ 선택된 시그널이 없습니다.")
-        return pd.DataFrame()
-
-    print(f"✅ 필터링된 최종 시그널 수: {len(picks)}")
-
-    # 시그널 이후의 주가 추이를 DB에서 Fetch
-    min_date = picks["date"].min().strftime("%Y-%m-%d")
-    codes = tuple(sorted(picks["code"].unique()))
-    code_str = f"('{codes[0]}')" if len(codes) == 1 else str(codes)
-
-    query = f"""
-        SELECT quote_date, stock_code, open_price, high_price, low_price, close_price
-        FROM daily_stock_quotes
-        WHERE quote_date >= '{min_date}'
-          AND stock_code IN {code_str}
-        ORDER BY stock_code ASC, quote_date ASC
     """
-    with engine.connect() as conn:
-        px = pd.read_sql(text(query), conn)
-
-    if px.empty:
-        print("❌ DB에서 미래 가격 데이터를 불러오지 못했습니다.")
-        return pd.DataFrame()
-
-    px["quote_date"] = pd.to_datetime(px["quote_date"]).dt.normalize()
-    px["stock_code"] = (
-        px["stock_code"]
-        .astype(str)
-        .str.replace(r"\.0$", "", regex=True)
-        .str.strip()
-        .str.zfill(6)
-    )
-
+    시그널 1건씩 px 를 필터링해 청산을 판정하는 기존 구현.
+    simulate_trades 의 정합성 기준(reference)으로만 남겨둔다.
+    """
     results = []
     for _, row in picks.iterrows():
         sig_date = row["date"]
@@ -166,7 +132,346 @@ def run_backtest_v2(
             }
         )
 
-    res = pd.DataFrame(results)
+    return pd.DataFrame(results)
+
+
+def build_forward_windows(picks, px, max_hold_days):
+    """
+    px 를 (stock_code, quote_date) 로 정렬한 뒤 시그널마다 '시그널일 다음 거래일'
+    행 오프셋을 searchsorted 한 번으로 찾고, 최대 max_hold_days 개의 미래 봉을
+    (시그널 수, max_hold_days) 행렬로 모은다. 봉이 모자란 칸은 valid=False.
+    """
+    if max_hold_days < 0:
+        raise ValueError("max_hold_days must be non-negative")
+
+    px = px.dropna(subset=["quote_date"]).sort_values(
+        ["stock_code", "quote_date"], kind="mergesort"
+    )
+    code_ids, code_values = pd.factorize(px["stock_code"].to_numpy(), sort=True)
+    px_dates = pd.to_datetime(px["quote_date"]).to_numpy("datetime64[ns]")
+    unique_dates = np.unique(px_dates)
+
+    # 날짜를 px 고유일 순위로 바꿔 (종목, 날짜) 를 하나의 정렬 키로 합친다.
+    span = len(unique_dates) + 1
+    px_key = code_ids.astype(np.int64) * span + np.searchsorted(
+        unique_dates, px_dates, side="left"
+    )
+    code_end = np.searchsorted(code_ids, np.arange(len(code_values)), side="right")
+
+    sig_dates = pd.to_datetime(picks["date"]).to_numpy("datetime64[ns]")
+    pick_ids = pd.Index(code_values).get_indexer(picks["code"].to_numpy())
+    matched = (pick_ids >= 0) & ~np.isnat(sig_dates)
+    safe_ids = np.where(matched, pick_ids, 0)
+    # date > sig_date 인 첫 행 = 해당 종목에서 순위가 (sig_date 이하 고유일 수) 이상인 첫 행
+    pick_key = safe_ids.astype(np.int64) * span + np.searchsorted(
+        unique_dates, sig_dates, side="right"
+    )
+    first = np.searchsorted(px_key, pick_key, side="left")
+    end = code_end[safe_ids] if len(code_values) else np.zeros_like(first)
+    available = np.where(matched, np.clip(end - first, 0, max_hold_days), 0)
+
+    steps = np.arange(max_hold_days)
+    valid = steps[None, :] < available[:, None]
+    rows = np.minimum(first[:, None] + steps[None, :], max(len(px) - 1, 0))
+
+    def gather(column):
+        values = px[column].to_numpy()
+        if not len(values):
+            return np.full(valid.shape, np.nan)
+        return np.where(valid, values[rows].astype(np.float64), np.nan)
+
+    buy_source = px["open_price"].to_numpy()
+    buy_price = (
+        buy_source[np.minimum(first, len(px) - 1)]
+        if len(px)
+        else np.full(len(first), np.nan)
+    )
+    return {
+        "valid": valid,
+        "open": gather("open_price"),
+        "high": gather("high_price"),
+        "low": gather("low_price"),
+        "close": gather("close_price"),
+        "buy_price": buy_price,
+        "available": available,
+    }
+
+
+def _normalize_grid(grid):
+    combos = []
+    for item in grid:
+        if not isinstance(item, dict):
+            item = dict(zip(GRID_PARAM_COLUMNS, item))
+        missing = [name for name in GRID_PARAM_COLUMNS if name not in item]
+        if missing:
+            raise ValueError(f"grid entry missing {missing}: {item}")
+        hold = int(item["max_hold_days"])
+        if hold < 0:
+            raise ValueError("max_hold_days must be non-negative")
+        combos.append(
+            {
+                "tp": float(item["tp"]),
+                "sl_bull": float(item["sl_bull"]),
+                "sl_bear": float(item["sl_bear"]),
+                "max_hold_days": hold,
+            }
+        )
+    return combos
+
+
+def _evaluate_grid(picks, windows, combos, roundtrip_fee_rate):
+    """
+    (조합, 시그널, 보유일) 3차원 배열에서 resolve_exit_price 우선순위대로
+    첫 청산 이벤트를 찾는다. 반환값은 조합별 체결 DataFrame 목록.
+    """
+    grid_tp = np.array([c["tp"] for c in combos])[:, None]
+    grid_sl_bull = np.array([c["sl_bull"] for c in combos])[:, None]
+    grid_sl_bear = np.array([c["sl_bear"] for c in combos])[:, None]
+    grid_hold = np.array([c["max_hold_days"] for c in combos])[:, None, None]
+
+    if "bull_regime" in picks.columns:
+        regime = picks["bull_regime"].to_numpy()
+    else:
+        regime = np.zeros(len(picks), dtype=np.int64)
+    is_bull = np.asarray(regime == 1, dtype=bool)
+
+    buy_source = windows["buy_price"]
+    buy = buy_source.astype(np.float64)
+    tradable = (windows["available"] >= 1) & ~np.isnan(buy) & (buy > 0)
+
+    tp_price = buy[None, :] * (1.0 + grid_tp)
+    sl_price = buy[None, :] * (
+        1.0 - np.where(is_bull[None, :], grid_sl_bull, grid_sl_bear)
+    )
+    tp3 = tp_price[:, :, None]
+    sl3 = sl_price[:, :, None]
+
+    open_, high, low, close = (
+        windows[name][None, :, :] for name in ("open", "high", "low", "close")
+    )
+    steps = np.arange(windows["valid"].shape[1])[None, None, :]
+    in_window = windows["valid"][None, :, :] & (steps < grid_hold)
+
+    tp_gap = open_ >= tp3
+    sl_gap = open_ <= sl3
+    hit_tp = high >= tp3
+    hit_sl = low <= sl3
+    reason_code = np.select(
+        [tp_gap, sl_gap, hit_tp & hit_sl, hit_tp, hit_sl, steps + 1 >= grid_hold],
+        np.arange(len(EXIT_REASONS)),
+        default=-1,
+    )
+    event = in_window & (reason_code >= 0)
+    first_day = event.argmax(axis=2)
+    filled = event.any(axis=2) & tradable[None, :] & (grid_hold[:, :, 0] >= 1)
+
+    def at_exit(values):
+        return np.take_along_axis(values, first_day[:, :, None], axis=2)[:, :, 0]
+
+    code = at_exit(reason_code)
+    exit_price = np.choose(
+        np.clip(code, 0, len(EXIT_REASONS) - 1),
+        [
+            at_exit(np.broadcast_to(open_, event.shape)),
+            at_exit(np.broadcast_to(open_, event.shape)),
+            sl_price,
+            tp_price,
+            sl_price,
+            at_exit(np.broadcast_to(close, event.shape)),
+        ],
+    )
+
+    columns = {
+        "date": picks["date"].to_numpy(),
+        "code": picks["code"].to_numpy(),
+        "name": (
+            picks["name"].to_numpy()
+            if "name" in picks.columns
+            else np.full(len(picks), "", dtype=object)
+        ),
+        "score": picks["score"].to_numpy(),
+        "hybrid_mean": (
+            picks["hybrid_mean"].to_numpy()
+            if "hybrid_mean" in picks.columns
+            else np.zeros(len(picks), dtype=np.int64)
+        ),
+        "bull_regime": regime,
+    }
+
+    frames = []
+    for g in range(len(combos)):
+        selected = np.flatnonzero(filled[g])
+        gross_ret = exit_price[g, selected] / buy[selected] - 1.0
+        frame = {name: values[selected] for name, values in columns.items()}
+        frame.update(
+            {
+                "hold_days": first_day[g, selected].astype(np.int64) + 1,
+                "buy_price": buy_source[selected],
+                "exit_price": exit_price[g, selected],
+                "gross_ret": gross_ret,
+                "net_ret": gross_ret - roundtrip_fee_rate,
+                "exit_reason": EXIT_REASONS[code[g, selected]].astype(object),
+            }
+        )
+        frames.append(pd.DataFrame(frame, columns=TRADE_COLUMNS))
+    return frames
+
+
+def simulate_trades(
+    picks,
+    px,
+    tp=0.055,
+    sl_bull=0.040,
+    sl_bear=0.035,
+    max_hold_days=4,
+    roundtrip_fee_rate=0.0023,
+):
+    """
+    picks(시그널) 와 px(일봉) 를 병합 방식으로 한 번에 평가한다.
+    _simulate_trades_loop 와 같은 체결 목록(행 순서 포함)을 반환한다.
+    """
+    res = simulate_trade_grid(
+        picks,
+        px,
+        [(tp, sl_bull, sl_bear, max_hold_days)],
+        roundtrip_fee_rate=roundtrip_fee_rate,
+    )
+    if res.empty:
+        return pd.DataFrame()
+    return res[TRADE_COLUMNS]
+
+
+def simulate_trade_grid(picks, px, grid, roundtrip_fee_rate=0.0023):
+    """
+    (tp, sl_bull, sl_bear, max_hold_days) 조합 목록을 한 번의 병합/윈도우 수집으로
+    평가한다. 조합 순서 → 시그널 순서로 쌓고 grid_id/파라미터 컬럼을 붙인다.
+    """
+    combos = _normalize_grid(grid)
+    if not combos or picks.empty:
+        return pd.DataFrame()
+
+    picks = picks.reset_index(drop=True)
+    # 보유일 0 조합만 있어도 argmax 축이 비지 않도록 최소 1칸
+    windows = build_forward_windows(
+        picks, px, max(1, *(c["max_hold_days"] for c in combos))
+    )
+    frames = []
+    for grid_id, (combo, frame) in enumerate(
+        zip(combos, _evaluate_grid(picks, windows, combos, roundtrip_fee_rate))
+    ):
+        if frame.empty:
+            continue
+        params = pd.DataFrame({"grid_id": grid_id, **combo}, index=frame.index)
+        frames.append(pd.concat([params, frame], axis=1))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize_trade_grid(res):
+    """simulate_trade_grid 결과를 조합별 성과 요약으로 집계한다."""
+    if res.empty:
+        return pd.DataFrame()
+    grouped = res.groupby(["grid_id", *GRID_PARAM_COLUMNS], sort=True)["net_ret"]
+    return grouped.agg(
+        trades="size",
+        win_rate=lambda s: (s > 0).mean(),
+        avg_ret="mean",
+        med_ret="median",
+        total_ret="sum",
+    ).reset_index()
+
+
+def _load_picks(top_k_bull, top_k_bear, floor_bull, floor_bear):
+    df_pred = pd.read_csv(AI_PRED_PATH)
+    df_pred["date"] = pd.to_datetime(df_pred["date"]).dt.normalize()
+    df_pred["code"] = (
+        df_pred["code"]
+        .astype(str)
+        .str.replace(r"\.0$", "", regex=True)
+        .str.strip()
+        .str.zfill(6)
+    )
+
+    # 💡 투트랙 필터링 적용 (score: 랭커 상대점수 / prob_col: Base 절대확률)
+    return select_daily_candidates(
+        df_pred,
+        score_col="score",
+        prob_col="hybrid_mean",
+        date_col="date",
+        top_k_bull=top_k_bull,
+        top_k_bear=top_k_bear,
+        floor_bull=floor_bull,
+        floor_bear=floor_bear,
+    )
+
+
+def _load_forward_prices(picks):
+    # 시그널 이후의 주가 추이를 DB에서 Fetch
+    min_date = picks["date"].min().strftime("%Y-%m-%d")
+    codes = tuple(sorted(picks["code"].unique()))
+    code_str = f"('{codes[0]}')" if len(codes) == 1 else str(codes)
+
+    query = f"""
+        SELECT quote_date, stock_code, open_price, high_price, low_price, close_price
+        FROM daily_stock_quotes
+        WHERE quote_date >= '{min_date}'
+          AND stock_code IN {code_str}
+        ORDER BY stock_code ASC, quote_date ASC
+    """
+    with engine.connect() as conn:
+        px = pd.read_sql(text(query), conn)
+
+    if px.empty:
+        return px
+
+    px["quote_date"] = pd.to_datetime(px["quote_date"]).dt.normalize()
+    px["stock_code"] = (
+        px["stock_code"]
+        .astype(str)
+        .str.replace(r"\.0$", "", regex=True)
+        .str.strip()
+        .str.zfill(6)
+    )
+    return px
+
+
+def run_backtest_v2(
+    top_k_bull=3,  # (유지) 상승장 하루 최대 3종목
+    top_k_bear=1,  # (유지) 하락장 보수적 접근
+    floor_bull=0.35,  # 💡 (수정) 0.42 -> 0.35: Base 모델 컷오프 대폭 완화 (랭커에게 권한 위임)
+    floor_bear=0.40,  # 💡 (수정) 0.48 -> 0.40: 하락장 컷오프 완화
+    roundtrip_fee_rate=0.0023,
+    tp=0.055,  # 4.5% -> 5.5% (익절 폭 확대)
+    sl_bull=0.040,  # 4.5% -> 4.0% (손절 폭 소폭 축소)
+    sl_bear=0.035,  # 💡 (수정) 0.025 -> 0.035: 하락장 손절폭 완화
+    max_hold_days=4,  # TIME 아웃 17건을 구제하기 위해 보유 기간 하루 연장
+    output_path=None,
+    save=True,
+):
+    print("🚀 실전 정밀 Backtest 시작 (파라미터 튜닝 V2)")
+
+    picks = _load_picks(top_k_bull, top_k_bear, floor_bull, floor_bear)
+    if picks.empty:
+        print("❌ 선택된 시그널이 없습니다.")
+        return pd.DataFrame()
+
+    print(f"✅ 필터링된 최종 시그널 수: {len(picks)}")
+
+    px = _load_forward_prices(picks)
+    if px.empty:
+        print("❌ DB에서 미래 가격 데이터를 불러오지 못했습니다.")
+        return pd.DataFrame()
+
+    res = simulate_trades(
+        picks,
+        px,
+        tp=tp,
+        sl_bull=sl_bull,
+        sl_bear=sl_bear,
+        max_hold_days=max_hold_days,
+        roundtrip_fee_rate=roundtrip_fee_rate,
+    )
     if res.empty:
         print("❌ 체결 결과가 없습니다.")
         return res
@@ -198,5 +503,150 @@ def run_backtest_v2(
     return res
 
 
+def run_backtest_grid(
+    grid,
+    top_k_bull=3,
+    top_k_bear=1,
+    floor_bull=0.35,
+    floor_bear=0.40,
+    roundtrip_fee_rate=0.0023,
+):
+    """
+    시그널/가격을 한 번만 불러와 (tp, sl_bull, sl_bear, max_hold_days) 조합 전체를
+    평가한다. 반환값은 (조합별 체결 내역, 조합별 요약).
+    """
+    picks = _load_picks(top_k_bull, top_k_bear, floor_bull, floor_bear)
+    if picks.empty:
+        print("❌ 선택된 시그널이 없습니다.")
+        return pd.DataFrame(), pd.DataFrame()
+
+    px = _load_forward_prices(picks)
+    if px.empty:
+        print("❌ DB에서 미래 가격 데이터를 불러오지 못했습니다.")
+        return pd.DataFrame(), pd.DataFrame()
+
+    res = simulate_trade_grid(picks, px, grid, roundtrip_fee_rate=roundtrip_fee_rate)
+    summary = summarize_trade_grid(res)
+    if not summary.empty:
+        print(summary.sort_values("total_ret", ascending=False).to_string(index=False))
+    return res, summary
+
+
+def build_benchmark_inputs(codes=2000, days=500, picks=5000, seed=7):
+    """벤치마크/테스트용 합성 시그널과 (종목, 날짜) 정렬 일봉."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-02", periods=days)
+    code_values = np.array([f"{i:06d}" for i in range(1, codes + 1)], dtype=object)
+
+    close = 10_000.0 * np.exp(
+        np.cumsum(rng.normal(0.0, 0.025, size=(codes, days)), axis=1)
+    )
+    open_ = close * np.exp(rng.normal(0.0, 0.012, size=(codes, days)))
+    high = np.maximum(open_, close) * np.exp(
+        np.abs(rng.normal(0.0, 0.02, (codes, days)))
+    )
+    low = np.minimum(open_, close) * np.exp(
+        -np.abs(rng.normal(0.0, 0.02, (codes, days)))
+    )
+    px = pd.DataFrame(
+        {
+            "quote_date": np.tile(dates, codes),
+            "stock_code": np.repeat(code_values, days),
+            "open_price": open_.ravel(),
+            "high_price": high.ravel(),
+            "low_price": low.ravel(),
+            "close_price": close.ravel(),
+        }
+    )
+
+    signal = pd.DataFrame(
+        {
+            "date": dates[rng.integers(0, days, picks)],
+            "code": code_values[rng.integers(0, codes, picks)],
+            "name": "bench",
+            "score": rng.random(picks),
+            "hybrid_mean": rng.random(picks),
+            "bull_regime": rng.integers(0, 2, picks),
+        }
+    )
+    return signal.sort_values("date", kind="mergesort").reset_index(drop=True), px
+
+
+def benchmark_backtest(codes=2000, days=500, picks=5000, loop_picks=200, seed=7):
+    """
+    병합 방식 simulate_trades / simulate_trade_grid 와 기존 시그널 루프를 비교한다.
+    루프는 loop_picks 건만 측정해 전체 시그널 수로 환산한다.
+    """
+    signals, px = build_benchmark_inputs(codes=codes, days=days, picks=picks, seed=seed)
+
+    started = time.perf_counter()
+    merged = simulate_trades(signals, px)
+    merged_sec = time.perf_counter() - started
+
+    sample = signals.iloc[: max(1, min(loop_picks, picks))]
+    started = time.perf_counter()
+    loop = _simulate_trades_loop(sample, px)
+    loop_sec = time.perf_counter() - started
+
+    grid = [
+        (tp, sl, sl, hold)
+        for tp in (0.03, 0.045, 0.055, 0.07)
+        for sl in (0.025, 0.035, 0.045)
+        for hold in (2, 3, 4, 5)
+    ]
+    started = time.perf_counter()
+    swept = simulate_trade_grid(signals, px, grid)
+    grid_sec = time.perf_counter() - started
+
+    loop_full_sec = loop_sec * picks / len(sample)
+    return {
+        "codes": codes,
+        "days": days,
+        "price_rows": len(px),
+        "picks": picks,
+        "trades": len(merged),
+        "merged_sec": round(merged_sec, 3),
+        "loop_measured_picks": len(sample),
+        "loop_measured_sec": round(loop_sec, 3),
+        "loop_full_estimate_sec": round(loop_full_sec, 1),
+        "speedup": round(loop_full_sec / max(merged_sec, 1e-9), 1),
+        "grid_combos": len(grid),
+        "grid_trades": len(swept),
+        "grid_sec": round(grid_sec, 3),
+        "grid_loop_estimate_sec": round(loop_full_sec * len(grid), 1),
+        "parity": simulate_trades(sample, px).equals(loop),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest V2 (병합 방식 청산 판정)")
+    parser.add_argument(
+        "--benchmark", action="store_true", help="합성 데이터로 루프 대비 속도 측정"
+    )
+    parser.add_argument("--codes", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=500)
+    parser.add_argument("--picks", type=int, default=5000)
+    parser.add_argument("--loop-picks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if not args.benchmark:
+        run_backtest_v2()
+        return 0
+    print(
+        json.dumps(
+            benchmark_backtest(
+                codes=args.codes,
+                days=args.days,
+                picks=args.picks,
+                loop_picks=args.loop_picks,
+                seed=args.seed,
+            ),
+            indent=2,
+        )
+    )
+    return 0
+
+
 if __name__ == "__main__":
-    run_backtest_v2()
+    raise SystemExit(main())
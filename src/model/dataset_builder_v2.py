@@ -1,3 +1,10 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 import numpy as np
 import pandas as pd
 import FinanceDataReader as fdr
@@ -10,6 +17,7 @@ try:
         normalize_codes,
         sql_code_tuple,
     )
+    from .feature_store_v2 import FeatureStore
 except ImportError:
     from common_v2 import (
         calculate_all_features,
@@ -17,6 +25,7 @@ except ImportError:
         normalize_codes,
         sql_code_tuple,
     )
+    from feature_store_v2 import FeatureStore
 
 
 RAW_COLS = """
@@ -55,8 +64,99 @@ def fetch_raw_quotes(codes, start_date, end_date):
     return raw
 
 
+PATH_TARGET_COLUMNS = [
+    "target_strict",
+    "target_loose",
+    "realized_ret_3d",
+    "exit_reason_3d",
+]
+DATASET_WORKERS_ENV = "KORSTOCKSCAN_SWING_DATASET_WORKERS"
+
+
 def build_path_targets(df, tp=0.045, sl=0.03, hold_days=3):
     """
+    signal day = row i
+    entry day  = row i+1 open
+    path-based label:
+      - 갭 TP / 갭 SL 우선
+      - 같은 날 TP/SL 둘 다 닿으면 보수적으로 SL 우선
+      - strict: 3일 내 +4.5% TP 먼저
+      - loose : 최종 realized_ret_3d >= +2.0%
+
+    보유 구간을 (signal, hold_days) forward-window 뷰로 만들고 첫 이벤트 일자를
+    argmax 로 찾는다. 결과는 _build_path_targets_scalar 와 동일하다.
+    """
+    df = df.copy().reset_index(drop=True)
+
+    strict = np.full(len(df), np.nan)
+    loose = np.full(len(df), np.nan)
+    realized_ret = np.full(len(df), np.nan)
+    exit_reason = np.array([""] * len(df), dtype=object)
+
+    signal_count = len(df) - hold_days - 1
+    if signal_count > 0 and hold_days > 0:
+        op, hi, lo, cl = (
+            np.lib.stride_tricks.sliding_window_view(
+                df[col].to_numpy(dtype=float)[1:], hold_days
+            )[:signal_count]
+            for col in ("open", "high", "low", "close")
+        )
+        buy_price = op[:, 0]
+        tp_price = (buy_price * (1.0 + tp))[:, None]
+        sl_price = (buy_price * (1.0 - sl))[:, None]
+
+        tp_gap = op >= tp_price
+        sl_gap = op <= sl_price
+        hit_tp = hi >= tp_price
+        hit_sl = lo <= sl_price
+        time_exit = np.zeros(hold_days, dtype=bool)
+        time_exit[-1] = True
+
+        first = (tp_gap | sl_gap | hit_tp | hit_sl | time_exit).argmax(axis=1)
+        rows = np.arange(signal_count)
+        day_op = op[rows, first]
+        day_hit_tp = hit_tp[rows, first]
+        day_hit_sl = hit_sl[rows, first]
+        # 갭 -> 동시 터치(SL 우선) -> TP -> SL -> TIME 순서
+        conditions = [
+            tp_gap[rows, first],
+            sl_gap[rows, first],
+            day_hit_tp & day_hit_sl,
+            day_hit_tp,
+            day_hit_sl,
+        ]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gap_ret = (day_op / buy_price) - 1.0
+            time_ret = (cl[rows, first] / buy_price) - 1.0
+        final_ret = np.select(
+            conditions, [gap_ret, gap_ret, -sl, tp, -sl], default=time_ret
+        )
+        reason = np.select(
+            conditions,
+            ["TP_GAP", "SL_GAP", "AMBIG_SL_FIRST", "TP", "SL"],
+            default="TIME",
+        ).astype(object)
+
+        keep = (buy_price > 0) & ~np.isnan(final_ret)
+        strict[:signal_count][keep] = np.where(
+            (reason == "TP_GAP") | (reason == "TP"), 1, 0
+        )[keep]
+        loose[:signal_count][keep] = np.where(final_ret >= 0.02, 1, 0)[keep]
+        realized_ret[:signal_count][keep] = final_ret[keep]
+        exit_reason[:signal_count][keep] = reason[keep]
+
+    df["target_strict"] = strict
+    df["target_loose"] = loose
+    df["realized_ret_3d"] = realized_ret
+    df["exit_reason_3d"] = exit_reason
+
+    return df
+
+
+def _build_path_targets_scalar(df, tp=0.045, sl=0.03, hold_days=3):
+    """
+    build_path_targets 의 행 단위 기준 구현 (parity 테스트/벤치마크용).
+
     signal day = row i
     entry day  = row i+1 open
     path-based label:
@@ -196,26 +296,80 @@ def add_market_features(panel, start_date, end_date):
     return panel
 
 
-def build_panel_dataset(codes, start_date, end_date, min_rows=150, include_labels=True):
+def _build_code_frame(g, min_rows=150, include_labels=True, feature_store=None):
+    """(features, 새로 계산한 피처 행 수) 반환. min_rows 미달이면 (None, 0)."""
+    g = g.sort_values("quote_date").reset_index(drop=True)
+    if len(g) < min_rows:
+        return None, 0
+
+    if feature_store is None:
+        feat, computed_rows = calculate_all_features(g), len(g)
+    else:
+        feat, computed_rows = feature_store.load_or_compute(g, calculate_all_features)
+
+    if include_labels:
+        feat = build_path_targets(feat, tp=0.045, sl=0.03, hold_days=3)
+        feat = feat.dropna(subset=["target_strict", "target_loose", "realized_ret_3d"])
+
+    return feat, computed_rows
+
+
+def _resolve_workers(workers, group_count):
+    if workers is None:
+        try:
+            workers = int(os.getenv(DATASET_WORKERS_ENV, "1"))
+        except ValueError:
+            workers = 1
+    return max(1, min(int(workers), os.cpu_count() or 1, group_count))
+
+
+def build_panel_dataset(
+    codes,
+    start_date,
+    end_date,
+    min_rows=150,
+    include_labels=True,
+    workers=None,
+    feature_store=None,
+):
+    """
+    workers > 1 이면 종목 그룹별 피처/라벨 계산을 프로세스 풀로 나눈다.
+    기본값은 KORSTOCKSCAN_SWING_DATASET_WORKERS (없으면 1, 순차 처리)이며
+    CPU 수와 종목 수로 상한을 둔다.
+
+    feature_store(FeatureStore)가 있으면 시작일이 같은 캐시의 (종목, 일자) 피처를 재사용하고
+    추가/정정된 일자만 계산한다.
+    기본값은 KORSTOCKSCAN_SWING_FEATURE_STORE_DIR 가 설정된 경우에만 켜진다.
+    """
     raw = fetch_raw_quotes(codes, start_date, end_date)
     if raw.empty:
         return pd.DataFrame()
 
-    frames = []
-    for code, g in raw.groupby("stock_code", sort=False):
-        g = g.sort_values("quote_date").reset_index(drop=True)
-        if len(g) < min_rows:
-            continue
-
-        feat = calculate_all_features(g)
-
-        if include_labels:
-            feat = build_path_targets(feat, tp=0.045, sl=0.03, hold_days=3)
-            feat = feat.dropna(
-                subset=["target_strict", "target_loose", "realized_ret_3d"]
+    if feature_store is None:
+        feature_store = FeatureStore.from_env()
+    groups = [g for _, g in raw.groupby("stock_code", sort=False)]
+    workers = _resolve_workers(workers, len(groups))
+    build = partial(
+        _build_code_frame,
+        min_rows=min_rows,
+        include_labels=include_labels,
+        feature_store=feature_store,
+    )
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(
+                pool.map(build, groups, chunksize=max(1, len(groups) // (workers * 4)))
             )
-
-        frames.append(feat)
+    else:
+        built = [build(g) for g in groups]
+    if feature_store is not None:
+        computed = [rows for feat, rows in built if feat is not None]
+        print(
+            f"[feature store] {feature_store.version}: "
+            f"hit={computed.count(0)} miss={len(computed) - computed.count(0)} "
+            f"computed_rows={sum(computed)}"
+        )
+    frames = [feat for feat, _ in built if feat is not None]
 
     if not frames:
         return pd.DataFrame()
@@ -228,3 +382,82 @@ def build_panel_dataset(codes, start_date, end_date, min_rows=150, include_label
     panel = panel.fillna(0.0)
 
     return panel
+
+
+def build_benchmark_code_frames(codes=2500, rows=500, seed=7):
+    """전 종목 패널 크기의 합성 일봉 (갭/결측/0 시가 포함)."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(codes):
+        close = 10_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.025, rows)))
+        open_ = close * np.exp(rng.normal(0.0, 0.02, rows))
+        high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0.0, 0.015, rows)))
+        low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0.0, 0.015, rows)))
+        open_[rng.random(rows) < 0.002] = np.nan
+        open_[rng.random(rows) < 0.001] = 0.0
+        close[rng.random(rows) < 0.002] = np.nan
+        frames.append(
+            pd.DataFrame({"open": open_, "high": high, "low": low, "close": close})
+        )
+    return frames
+
+
+def benchmark_path_targets(codes=2500, rows=500, scalar_codes=50, seed=7):
+    """
+    벡터화 build_path_targets 와 행 단위 구현을 비교한다.
+    행 단위 구현은 scalar_codes 종목만 측정해 전 종목 시간으로 환산한다.
+    """
+    frames = build_benchmark_code_frames(codes=codes, rows=rows, seed=seed)
+
+    started = time.perf_counter()
+    vectorized = [build_path_targets(frame) for frame in frames]
+    vectorized_sec = time.perf_counter() - started
+
+    scalar_frames = frames[: max(1, min(scalar_codes, codes))]
+    started = time.perf_counter()
+    scalar = [_build_path_targets_scalar(frame) for frame in scalar_frames]
+    scalar_sec = time.perf_counter() - started
+
+    parity = all(
+        expected[PATH_TARGET_COLUMNS].equals(actual[PATH_TARGET_COLUMNS])
+        for expected, actual in zip(scalar, vectorized)
+    )
+    scalar_full_sec = scalar_sec * codes / len(scalar_frames)
+    return {
+        "codes": codes,
+        "rows_per_code": rows,
+        "panel_rows": codes * rows,
+        "vectorized_sec": round(vectorized_sec, 3),
+        "scalar_measured_codes": len(scalar_frames),
+        "scalar_measured_sec": round(scalar_sec, 3),
+        "scalar_full_universe_estimate_sec": round(scalar_full_sec, 1),
+        "speedup": round(scalar_full_sec / max(vectorized_sec, 1e-9), 1),
+        "parity": parity,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="build_path_targets 벡터화 벤치마크 (합성 전 종목 패널)"
+    )
+    parser.add_argument("--codes", type=int, default=2500)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--scalar-codes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    print(
+        json.dumps(
+            benchmark_path_targets(
+                codes=args.codes,
+                rows=args.rows,
+                scalar_codes=args.scalar_codes,
+                seed=args.seed,
+            ),
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
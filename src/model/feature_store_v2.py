@@ -0,0 +1,163 @@
+import hashlib
+import inspect
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+try:
+    from . import feature_engineering_v2
+    from .common_v2 import DATA_DIR
+except ImportError:
+    import feature_engineering_v2
+    from common_v2 import DATA_DIR
+
+
+FEATURE_SET_NAME = "swing_features_v2"
+FEATURE_STORE_DIR_ENV = "KORSTOCKSCAN_SWING_FEATURE_STORE_DIR"
+DEFAULT_FEATURE_STORE_DIR = Path(DATA_DIR) / "cache" / "swing_feature_store"
+
+
+def feature_set_version():
+    """
+    calculate_all_features 결과를 결정하는 코드/라이브러리 버전 지문.
+    feature_engineering_v2 소스나 pandas/pandas_ta 버전이 바뀌면 캐시가 자동 무효화된다.
+    """
+    payload = "\n".join(
+        [
+            inspect.getsource(feature_engineering_v2),
+            pd.__version__,
+            str(getattr(ta, "version", "")),
+        ]
+    )
+    return f"{FEATURE_SET_NAME}-{hashlib.sha256(payload.encode()).hexdigest()[:12]}"
+
+
+def raw_row_hashes(raw):
+    """원천 일봉 행별 내용 해시. 특정 일자 데이터 정정을 감지하는 데 쓴다."""
+    return pd.util.hash_pandas_object(
+        raw.reset_index(drop=True), index=False
+    ).to_numpy()
+
+
+@dataclass
+class FeatureStore:
+    """
+    종목별 calculate_all_features 결과를 (종목, 시작일, 일자) 단위로 parquet 에 보관한다.
+    경로: <root>/<feature-set version>/<code>/<raw 시작일>.parquet, 행마다 원천 행 해시를 둔다.
+
+    RSI/ATR(RMA), MACD/EWM, OBV(누적합), ma120 등은 첫 행부터의 이력에 따라 값이 달라지므로
+    시작일이 다른 조회는 캐시를 공유하지 않는다(콜드 빌드와 같은 결과를 보장).
+    같은 시작일에서는 앞에서부터 일자/원천 해시가 캐시와 일치하는 구간을 그대로 재사용하고,
+    그 이후(추가/정정된 일자부터)만 warmup_rows 만큼의 과거 구간을 붙여 재계산한다.
+    warmup_rows 이상 이력이 쌓인 뒤의 증분 계산에서 이동평균(ma*)과 OBV(직전 캐시 값에 이어 붙임)는
+    콜드 빌드와 같다. pandas rolling 합/분산은 계산 시작점부터 누적되고 RMA/EWM 계열은
+    초기값 영향이 warmup_rows 동안 지수적으로 사라지므로 상대 1e-12 이하의 반올림 차이가 남는다.
+    """
+
+    root: Path = DEFAULT_FEATURE_STORE_DIR
+    version: str = ""
+    warmup_rows: int = 500
+    keep_per_code: int = 4
+
+    CUMULATIVE_COLUMNS = ("obv",)
+    ROW_HASH_COLUMN = "_raw_row_hash"
+
+    def __post_init__(self):
+        self.root = Path(self.root)
+        if not self.version:
+            self.version = feature_set_version()
+
+    @classmethod
+    def from_env(cls):
+        root = os.getenv(FEATURE_STORE_DIR_ENV, "").strip()
+        return cls(root=Path(root)) if root else None
+
+    def partition_path(self, code, start_date):
+        day = pd.Timestamp(start_date).strftime("%Y-%m-%d")
+        return self.root / self.version / str(code) / f"{day}.parquet"
+
+    def load_or_compute(self, raw, compute):
+        """
+        (features, 새로 계산한 행 수) 반환. raw 는 한 종목의 quote_date 정렬 원천 일봉.
+        같은 시작일의 캐시에 모든 일자가 있으면 compute 를 호출하지 않는다.
+        """
+        raw = raw.reset_index(drop=True)
+        code = str(raw["stock_code"].iloc[0])
+        path = self.partition_path(code, raw["quote_date"].iloc[0])
+        hashes = raw_row_hashes(raw)
+        cached = self._read(path)
+        reused = self._reusable_prefix(cached, raw["quote_date"], hashes)
+        if reused == len(raw):
+            rows = cached.iloc[:reused]
+            return rows.drop(columns=self.ROW_HASH_COLUMN).reset_index(drop=True), 0
+
+        context_start = max(0, reused - self.warmup_rows)
+        context = compute(raw.iloc[context_start:].reset_index(drop=True))
+        fresh = context.iloc[reused - context_start :].reset_index(drop=True)
+        if reused:
+            previous = cached.iloc[:reused]
+            if context_start:
+                anchor = reused - context_start - 1
+                for column in self.CUMULATIVE_COLUMNS:
+                    if column in fresh.columns:
+                        fresh[column] += (
+                            previous[column].iloc[-1] - context[column].iloc[anchor]
+                        )
+            feat = pd.concat(
+                [previous.drop(columns=self.ROW_HASH_COLUMN), fresh],
+                ignore_index=True,
+            )
+        else:
+            feat = fresh
+
+        stored = feat.copy()
+        stored[self.ROW_HASH_COLUMN] = hashes
+        self._write(path, stored)
+        return feat, len(raw) - reused
+
+    def _reusable_prefix(self, cached, quote_dates, hashes):
+        """같은 시작일 캐시에서 앞에서부터 일자/해시가 연속 일치하는 행 수."""
+        if cached is None or cached.empty:
+            return 0
+        dates = pd.to_datetime(quote_dates).dt.normalize().to_numpy()
+        cached_dates = pd.to_datetime(cached["date"]).to_numpy()
+        span = min(len(dates), len(cached))
+        matches = (cached_dates[:span] == dates[:span]) & (
+            cached[self.ROW_HASH_COLUMN].to_numpy()[:span] == hashes[:span]
+        )
+        mismatch = np.flatnonzero(~matches)
+        return int(mismatch[0]) if len(mismatch) else span
+
+    def _read(self, path):
+        if not path.exists():
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"⚠️ [feature store] 캐시 읽기 실패, 재계산: {path.name} ({e})")
+            return None
+
+    def _write(self, path, feat):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(
+            prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+        )
+        os.close(fd)
+        try:
+            feat.to_parquet(temporary, index=False)
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+
+        entries = sorted(
+            path.parent.glob("*.parquet"), key=lambda item: item.stat().st_mtime
+        )
+        for stale in entries[: max(0, len(entries) - self.keep_per_code)]:
+            if stale != path:
+                stale.unlink(missing_ok=True)
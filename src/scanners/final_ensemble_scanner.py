@@ -260,6 +260,8 @@ def run_integrated_scanner():
             "margin_rate": "Margin_Rate",
         }
 
+        # 💡 품질 필터 통과 종목의 일봉을 먼저 모은 뒤, AI 추론은 후보 전체에 대해 한 번만 수행
+        ai_candidates = []
         for stock in target_list:
             code = str(stock["Code"]).strip().zfill(6)
             name = stock["Name"]
@@ -308,9 +310,16 @@ def run_integrated_scanner():
                 drop_stats["quality"] += 1
                 continue
 
+            ai_candidates.append((code, name, df_raw, current_price))
+
+        # 추론을 ml_predictor에게 위임! (배치 1회 호출)
+        ai_probs = ml_predictor.predict_probs_for_dfs(
+            {index: cand[2] for index, cand in enumerate(ai_candidates)}, models
+        )
+
+        for index, (code, name, df_raw, current_price) in enumerate(ai_candidates):
             try:
-                # 추론을 ml_predictor에게 위임!
-                p_final = ml_predictor.predict_prob_for_df(df_raw, models)
+                p_final = ai_probs[index]
 
                 if p_final < getattr(TRADING_RULES, "PROB_RUNNER_PICK", 0.70):
                     drop_stats["ai_prob"] += 1
@@ -33,6 +33,11 @@ from datetime import datetime
 
 # 💡 Level 1 & 2 공통 모듈 임포트
 from src.utils import kiwoom_utils
+from src.utils.daily_bar_store import (
+    DailyBarStore,
+    DailyBarStoreStats,
+    fetch_daily_bars,
+)
 from src.utils.logger import log_error, log_info
 from src.database.db_manager import (
     DBManager,
@@ -85,6 +90,36 @@ def build_kosdaq_candidate_map(raw_targets, supernova_targets):
     return all_candidate_codes
 
 
+def select_kosdaq_picks(analyzed, probs, is_test_mode=False):
+    """배치 추론 확률(probs: code -> Prob)로 분석 후보(analyzed)에서 최종 픽을 고른다."""
+    # 💡 [테스트용 교정] 평소에는 0.80 이상이어야 하지만,
+    # test_threshold = 0.60 if is_test_mode else 0.80
+    test_threshold = 0.60 if is_test_mode else 0.58
+
+    picks = []
+    for cand in analyzed:
+        item = cand["item"]
+        prm_data = cand["prm_data"]
+        prob = probs.get(cand["code"], 0.0)
+
+        # 💡 [조건 강화] AI 확률 + 프로그램 수급이 '순매수(+)' 상태일 때만 픽
+        if prob >= test_threshold and prm_data["net_amt"] > 0:
+            picks.append(
+                {
+                    "Code": cand["code"],
+                    "Name": cand["name"],
+                    "Price": cand["curr_price"],
+                    "Prob": prob,
+                    "Position": "MIDDLE",
+                    "ProgramStatus": cand["p_status"],
+                    "SpikeRate": item.get("spike_rate", 0.0),
+                    "IsSupernova": item.get("source") == "SUPERNOVA",
+                    "PrmData": prm_data,  # 🚀 나중에 텔레그램이나 DB에서 쓰기 위해 전체 저장
+                }
+            )
+    return picks
+
+
 def filter_kosdaq_watchlist_picks(kosdaq_picks):
     """KOSDAQ RUNNER candidates are report-only and must not enter WATCHING."""
     return []
@@ -105,6 +140,9 @@ def run_kosdaq_scanner(is_test_mode=False):
         log_error("❌ AI 모델 로드 실패. KOSDAQ 스캐너를 종료합니다.")
         return
 
+    # 💡 ka10081 일봉 로컬 저장소 (KORSTOCKSCAN_DAILY_BAR_STORE_DIR 설정 시에만 사용)
+    bar_store = DailyBarStore.from_env()
+
     # 환경 설정 및 토큰
     while True:
         now = datetime.now()
@@ -136,10 +174,7 @@ def run_kosdaq_scanner(is_test_mode=False):
 
         all_candidate_codes = build_kosdaq_candidate_map(raw_targets, supernova)
 
-        kosdaq_picks = []
-        new_codes_found = []  # 웹소켓 등록용
-
-        # 🚀 2. 개별 종목 정밀 분석 루프
+        # 🚀 2. 개별 종목 정밀 분석 루프 (일봉/수급 수집만, AI 추론은 루프 뒤 일괄 수행)
         # 💡 [핵심 교정 2] 수급 강도가 높은(spike_rate) 순서로 먼저 분석하여 API 할당량 아끼기
         sorted_candidates = sorted(
             all_candidate_codes.values(),
@@ -147,6 +182,9 @@ def run_kosdaq_scanner(is_test_mode=False):
             reverse=True,
         )
 
+        analyzed = []
+        candidate_frames = {}
+        bar_stats = DailyBarStoreStats()
         for item in sorted_candidates:
             code = item["Code"]
             name = item.get("Name", "Unknown")
@@ -176,7 +214,7 @@ def run_kosdaq_scanner(is_test_mode=False):
                 else f"⚪ 관망 ({prm_data['net_amt']}M)"
             )
             # 일봉 차트 기반 필터링
-            df = kiwoom_utils.get_daily_ohlcv_ka10081_df(token, code)
+            df = fetch_daily_bars(token, code, bar_store, run_stats=bar_stats)
             if df is None or len(df) < 60:
                 continue
 
@@ -215,36 +253,32 @@ def run_kosdaq_scanner(is_test_mode=False):
             df["Prm_Net_Amt"] = prm_data["net_amt"]  # 실시간 순매수 금액
             df["Prm_Net_Irds"] = prm_data["net_irds_amt"]  # 실시간 수급 가속도
 
-            # 🚀 3. AI 앙상블 분석 (ml_predictor 사용)
-            try:
-                # 💡 [수정] ml_predictor에게 순수하게 예측만 요청
-                prob = ml_predictor.predict_prob_for_df(df, models)
-
-                # 💡 [테스트용 교정] 평소에는 0.80 이상이어야 하지만,
-                # test_threshold = 0.60 if is_test_mode else 0.80
-                test_threshold = 0.60 if is_test_mode else 0.58
-
-                # 💡 [조건 강화] AI 확률 + 프로그램 수급이 '순매수(+)' 상태일 때만 픽
-                if prob >= test_threshold and prm_data["net_amt"] > 0:
-                    kosdaq_picks.append(
-                        {
-                            "Code": code,
-                            "Name": name,
-                            "Price": curr_price,
-                            "Prob": prob,
-                            "Position": "MIDDLE",
-                            "ProgramStatus": p_status,
-                            "SpikeRate": item.get("spike_rate", 0.0),
-                            "IsSupernova": item.get("source") == "SUPERNOVA",
-                            "PrmData": prm_data,  # 🚀 나중에 텔레그램이나 DB에서 쓰기 위해 전체 저장
-                        }
-                    )
-                    new_codes_found.append(code)
-            except Exception as e:
-                log_info(f"⚠️ {name} AI 분석 실패: {e}")
+            analyzed.append(
+                {
+                    "item": item,
+                    "code": code,
+                    "name": name,
+                    "curr_price": curr_price,
+                    "prm_data": prm_data,
+                    "p_status": p_status,
+                }
+            )
+            candidate_frames[code] = df
 
             time.sleep(0.3)  # API 제한 방어
 
+        if bar_store is not None:
+            log_info(f"[DAILY_BAR_STORE] kosdaq_scanner {bar_stats.as_dict()}")
+
+        # 🚀 3. AI 앙상블 분석 (ml_predictor 배치 추론: 후보 전체를 모아 모델 1회 호출)
+        try:
+            probs = ml_predictor.predict_probs_for_dfs(candidate_frames, models)
+        except Exception as e:
+            log_info(f"⚠️ KOSDAQ AI 배치 분석 실패: {e}")
+            probs = {}
+
+        kosdaq_picks = select_kosdaq_picks(analyzed, probs, is_test_mode=is_test_mode)
+
         # 🚀 4. 리포트 브로드캐스트. RUNNER는 감시 DB/WS 대상에서 제외한다.
         if kosdaq_picks:
             report_picks = list(kosdaq_picks)
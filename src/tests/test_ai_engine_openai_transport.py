@@ -1,6 +1,7 @@
 import hashlib
 import json
 import threading
+import time
 from dataclasses import replace
 from types import SimpleNamespace
 
@@ -7135,3 +7136,618 @@ def test_transport_trace_copy_preserves_generic_provider_response_id():
     assert target["provider"] == "bedrock"
     assert target["provider_response_id"] == "aws-request-1"
     assert target["bedrock_response_id"] == "aws-request-1"
+
+
+def _record_then_replay_engine(monkeypatch, tmp_path, http_results):
+    engine = _build_engine()
+    monkeypatch.setattr(engine, "_try_bedrock_primary_provider", lambda **kwargs: None)
+    pending = list(http_results)
+
+    def _fake_http(request):
+        outcome = pending.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return OpenAITransportResult(
+            payload=outcome, transport_mode="http", roundtrip_ms=5
+        )
+
+    monkeypatch.setattr(engine, "_call_openai_responses_http", _fake_http)
+    archive = tmp_path / "calls.jsonl.gz"
+    engine.start_ai_provider_recording(archive)
+    return engine, archive
+
+
+def _call_entry(engine, user_input="payload", timeout_ms=5000):
+    return GPTSniperEngine._call_openai_safe(
+        engine,
+        "PROMPT",
+        user_input,
+        require_json=True,
+        context_name="replay_test",
+        schema_name="entry_v1",
+        endpoint_name="analyze_target",
+        symbol="005930",
+        transport_mode_override="http",
+        timeout_ms_override=timeout_ms,
+    )
+
+
+def test_prompt_payload_sizing_runs_only_behind_metrics_flag(monkeypatch):
+    engine = _build_engine()
+    monkeypatch.setattr(engine, "_try_bedrock_primary_provider", lambda **kw: None)
+    monkeypatch.setattr(
+        engine,
+        "_call_openai_responses_http",
+        lambda request: OpenAITransportResult(
+            payload={"action": "WAIT", "score": 61},
+            transport_mode="http",
+            roundtrip_ms=10,
+        ),
+    )
+    sized = []
+    record = engine._record_prompt_payload_size
+    monkeypatch.setattr(
+        engine,
+        "_record_prompt_payload_size",
+        lambda request: sized.append(request.endpoint_name) or record(request),
+    )
+
+    _call_entry(engine, '{"input_schema":"entry_v1","price":1}')
+    assert sized == []
+    assert "openai_input_payload_bytes" not in engine._consume_last_transport_meta()
+
+    monkeypatch.setattr(
+        openai_module,
+        "TRADING_RULES",
+        replace(
+            openai_module.TRADING_RULES, OPENAI_PROMPT_PAYLOAD_METRICS_ENABLED=True
+        ),
+    )
+    _call_entry(engine, '{"input_schema":"entry_v1","price":1}')
+    meta = engine._consume_last_transport_meta()
+    assert sized == ["analyze_target"]
+    assert meta["openai_input_payload_bytes"] > 0
+    assert meta["openai_input_payload_contract"] == "entry_v1"
+    assert engine.get_prompt_payload_metrics_snapshot()
+
+
+def test_provider_recording_replays_ok_timeout_and_invalid_json_offline(
+    monkeypatch, tmp_path
+):
+    from src.engine.ai.provider_call_replay import (
+        AIProviderReplay,
+        AIProviderReplayTimeout,
+        load_provider_call_archive,
+    )
+
+    invalid = ValueError("JSON 형식을 찾을 수 없음")
+    invalid.raw_response_text = "not json"
+    engine, archive = _record_then_replay_engine(
+        monkeypatch,
+        tmp_path,
+        [
+            {"action": "WAIT", "score": 61},
+            OpenAIResponsesHTTPError(
+                "budget exhausted",
+                timing_meta={"openai_http_timeout_budget_exhausted": True},
+            ),
+        ],
+    )
+    assert _call_entry(engine)["score"] == 61
+    with pytest.raises(OpenAIResponsesHTTPError):
+        _call_entry(engine, "payload-2")
+    error = RuntimeError("OpenAI Responses HTTP 응답/파싱 실패")
+    error.__cause__ = invalid
+    monkeypatch.setattr(
+        engine,
+        "_call_openai_responses_http",
+        lambda request: (_ for _ in ()).throw(error),
+    )
+    with pytest.raises(RuntimeError):
+        _call_entry(engine, "payload-3")
+    engine.stop_ai_provider_recording()
+
+    records = load_provider_call_archive(archive)
+    assert [record.outcome for record in records] == ["ok", "timeout", "invalid_json"]
+    assert records[2].response_text == "not json"
+    assert "openai_request_id" not in records[0].transport_meta
+
+    sleeps = []
+    engine.install_ai_provider_replay(
+        AIProviderReplay(records, latency_mode="none", sleep=sleeps.append)
+    )
+    monkeypatch.setattr(
+        engine,
+        "_call_openai_responses_http",
+        lambda request: (_ for _ in ()).throw(AssertionError("network used")),
+    )
+
+    assert _call_entry(engine)["action"] == "WAIT"
+    meta = engine._consume_last_transport_meta()
+    assert meta["openai_transport_mode"] == "replay"
+    assert meta["ai_provider_replay_match"] == "contract"
+    with pytest.raises(AIProviderReplayTimeout):
+        _call_entry(engine, "payload-2")
+    with pytest.raises(RuntimeError, match="파싱 실패"):
+        _call_entry(engine, "payload-3")
+    snapshot = engine.get_ai_provider_replay_snapshot()
+    assert snapshot["served"] == 3
+    assert snapshot["counts"]["match_contract"] == 3
+    assert sleeps == []
+
+
+def test_entry_screen_batch_fans_out_per_symbol_and_falls_back_on_malformed_slice(
+    monkeypatch,
+):
+    engine = _build_engine()
+    monkeypatch.setattr(
+        openai_module,
+        "TRADING_RULES",
+        replace(
+            openai_module.TRADING_RULES,
+            OPENAI_ENTRY_SCREEN_BATCH_ENABLED=True,
+            OPENAI_ENTRY_SCREEN_BATCH_WINDOW_MS=2000,
+            OPENAI_ENTRY_SCREEN_BATCH_MAX_SIZE=3,
+        ),
+    )
+    setup_evidence = build_entry_setup_evidence(
+        exact_payload={"current": {"price": 10100}},
+        exact_analysis={
+            "schema": "exact_payload_analysis_v1",
+            "source_quality": {"status": "pass", "completed_bar_count": 20},
+            "executable_liquidity": {"execution_cost_state": "low"},
+            "contradictions": [],
+            "deterministic_contract_facts": {
+                "structural_edge_floor": True,
+                "trusted_supportive_trigger": True,
+            },
+        },
+        recovery_analysis={
+            "schema": "anticipatory_reversal_analysis_v1",
+            "source_mode": "fresh_dual",
+            "hard_blockers": [],
+            "clean_continuation_probe": {"eligible": True},
+            "recovery_confirmation_probe": {"eligible": False},
+        },
+    )
+    risk = {
+        "schema": ENTRY_RISK_ADJUDICATION_SCHEMA,
+        "risk_verdict": "PASS",
+        "risk_codes": ["NO_BLOCKING_RISK"],
+        "supporting_fact_ids": ["structural_edge_floor"],
+        "contradicting_fact_ids": [],
+        "confidence": 70,
+    }
+    calls = []
+    captured = []
+
+    def _fake_capture(**kwargs):
+        captured.append(kwargs)
+        return {"ai_trace_request_id": kwargs["request_id"]}
+
+    def _fake_call(prompt, user_input, **kwargs):
+        calls.append((kwargs["endpoint_name"], kwargs["symbol"], user_input))
+        engine._set_last_transport_meta({"openai_transport_mode": "http"})
+        if kwargs["endpoint_name"] == "analyze_target_batch":
+            assert kwargs["timeout_ms_override"] == 5000 + 2 * 500
+            batch = json.loads(user_input)
+            assert batch["shared_context"] == {"market": {"regime": "open"}}
+            assert len(batch["candidates"]) == 3
+            return {
+                "results": [
+                    {"symbol": "000001", **risk},
+                    {"symbol": "000002", **risk, "risk_verdict": "MAYBE"},
+                ]
+            }
+        return dict(risk, confidence=55)
+
+    monkeypatch.setattr(engine, "_call_openai_safe", _fake_call)
+    monkeypatch.setattr(openai_module, "capture_ai_request", _fake_capture)
+    results = {}
+
+    def _screen(symbol):
+        results[symbol] = engine._call_analyze_target_provider(
+            "PROMPT",
+            json.dumps({"market": {"regime": "open"}, "price": int(symbol)}),
+            batch_setup_evidence=setup_evidence,
+            require_json=True,
+            schema_name=ENTRY_RISK_ADJUDICATION_SCHEMA,
+            endpoint_name="analyze_target",
+            symbol=symbol,
+            transport_mode_override="http",
+            timeout_ms_override=5000,
+            cache_key=f"entry:{symbol}",
+            metadata_extra={"ai_trace_strategy": "SCALPING"},
+            replay_context={"symbol": symbol},
+        )
+        results[f"{symbol}_meta"] = engine._consume_last_transport_meta()
+
+    threads = [
+        threading.Thread(target=_screen, args=(symbol,))
+        for symbol in ("000001", "000002", "000003")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    endpoints = [call[0] for call in calls]
+    assert endpoints.count("analyze_target_batch") == 1
+    assert sorted(call[1] for call in calls if call[0] == "analyze_target") == [
+        "000002",
+        "000003",
+    ]
+    assert results["000001"]["confidence"] == 70
+    assert results["000001_meta"]["openai_entry_screen_batch_size"] == 3
+    assert results["000002"]["confidence"] == 55
+    assert results["000002_meta"]["openai_entry_screen_batch_fallback"] == (
+        "entry_risk_verdict_invalid"
+    )
+    assert results["000003_meta"]["openai_entry_screen_batch_fallback"] == (
+        "entry_screen_batch_result_missing"
+    )
+    snapshot = engine.get_entry_screen_batch_snapshot()
+    assert snapshot["batches"] == 1
+    assert snapshot["fallback_items"] == 2
+    # Only the slice served from the batch is captured here; the two serial
+    # fallbacks capture through their own single call.
+    assert [row["symbol"] for row in captured] == ["000001"]
+    assert captured[0]["endpoint_name"] == "analyze_target"
+    assert captured[0]["user_input"] == json.dumps(
+        {"market": {"regime": "open"}, "price": 1}
+    )
+    assert captured[0]["replay_context"] == {"symbol": "000001"}
+    assert captured[0]["metadata"]["ai_trace_strategy"] == "SCALPING"
+    assert captured[0]["metadata"]["entry_screen_batch_id"] == (
+        results["000001_meta"]["openai_entry_screen_batch_id"]
+    )
+    assert results["000001_meta"]["ai_trace_request_id"] == (captured[0]["request_id"])
+
+
+def test_entry_screen_batch_timeout_fails_closed_without_serial_retry(monkeypatch):
+    engine = _build_engine()
+    monkeypatch.setattr(
+        openai_module,
+        "TRADING_RULES",
+        replace(
+            openai_module.TRADING_RULES,
+            OPENAI_ENTRY_SCREEN_BATCH_ENABLED=True,
+            OPENAI_ENTRY_SCREEN_BATCH_WINDOW_MS=2000,
+            OPENAI_ENTRY_SCREEN_BATCH_MAX_SIZE=3,
+            OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_PER_ITEM_MS=400,
+            OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_MAX_MS=3500,
+        ),
+    )
+    calls = []
+    captured = []
+
+    def _fake_call(prompt, user_input, **kwargs):
+        calls.append((kwargs["endpoint_name"], kwargs["timeout_ms_override"]))
+        engine._set_last_transport_meta({"openai_transport_mode": "http"})
+        raise TimeoutError("OpenAI Responses HTTP timed out")
+
+    monkeypatch.setattr(engine, "_call_openai_safe", _fake_call)
+    monkeypatch.setattr(
+        openai_module,
+        "capture_ai_request",
+        lambda **kwargs: captured.append(kwargs["symbol"]) or {},
+    )
+    results = {}
+
+    def _screen(symbol):
+        try:
+            engine._call_analyze_target_provider(
+                "PROMPT",
+                json.dumps({"market": {"regime": "open"}, "price": int(symbol)}),
+                batch_setup_evidence={},
+                require_json=True,
+                schema_name=ENTRY_RISK_ADJUDICATION_SCHEMA,
+                endpoint_name="analyze_target",
+                symbol=symbol,
+                transport_mode_override="http",
+                timeout_ms_override=3000,
+            )
+        except TimeoutError as exc:
+            results[symbol] = exc
+        results[f"{symbol}_meta"] = engine._consume_last_transport_meta()
+
+    threads = [
+        threading.Thread(target=_screen, args=(symbol,))
+        for symbol in ("000001", "000002", "000003")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == [("analyze_target_batch", 3500)]
+    assert sorted(captured) == ["000001", "000002", "000003"]
+    for symbol in ("000001", "000002", "000003"):
+        assert isinstance(results[symbol], TimeoutError)
+        meta = results[f"{symbol}_meta"]
+        assert meta["openai_entry_screen_batch_fallback"] == (
+            "entry_screen_batch_timeout"
+        )
+        assert meta["openai_entry_screen_batch_timeout_ms"] == 3500
+
+
+class _ScalingStubWorker:
+    def __init__(self, *, worker_id, api_key, metrics_callback):
+        self.worker_id = worker_id
+        self.api_key = api_key
+        self.depth = 0
+        self.prewarmed = 0
+        self.retired = False
+        self.health_checks = 0
+        self.idle = 0.0
+
+    def queue_depth(self):
+        return self.depth
+
+    def idle_sec(self):
+        return self.idle
+
+    def prewarm(self):
+        self.prewarmed += 1
+
+    def health_check(self, *, timeout_sec=2.0):
+        self.health_checks += 1
+
+    def retire(self):
+        self.retired = True
+
+    def stats(self):
+        return {"worker_id": self.worker_id, "queue_depth": self.depth}
+
+    def submit(self, job):
+        return OpenAITransportResult(
+            payload={}, transport_mode="responses_ws", queue_wait_ms=400
+        )
+
+    def close(self):
+        return None
+
+
+def _ws_request(idx=0):
+    return OpenAIResponseRequest(
+        prompt="PROMPT",
+        user_input="payload",
+        require_json=True,
+        context_name="ctx",
+        model_name="gpt-fast",
+        temperature=0.0,
+        schema_name="entry_v1",
+        endpoint_name="analyze_target",
+        request_id=f"req-{idx}",
+        symbol="005930",
+        cache_key="-",
+        submitted_at_perf=0.0,
+        timeout_ms=700,
+    )
+
+
+def test_openai_responses_ws_pool_autoscales_within_key_budget(monkeypatch):
+    monkeypatch.setattr(openai_module, "OpenAIResponsesWSWorker", _ScalingStubWorker)
+    metrics = []
+    pool = OpenAIResponsesWSPool(
+        api_keys=["key-a", "key-b"],
+        pool_size=1,
+        metrics_callback=lambda name, value: metrics.append(name),
+        min_size=1,
+        max_size=3,
+        scale_up_queue_wait_ms=150,
+        scale_cooldown_sec=0.0,
+    )
+
+    for idx in range(6):
+        pool.submit(_ws_request(idx), use_schema_registry=False)
+    scaled = pool.snapshot()
+
+    assert scaled["size"] == 3
+    assert [w["worker_id"] for w in scaled["workers"]] == [0, 1, 2]
+    assert all(worker.prewarmed for worker in pool._workers[1:])
+    assert metrics.count("openai_ws_pool_scale_up") == 2
+
+    pool._queue_wait_ewma_ms = 0.0
+    pool._last_busy_perf = 0.0
+    last_worker = pool._workers[-1]
+    pool.maintain(idle_sec=60.0)
+
+    assert pool.snapshot()["size"] == 2
+    assert last_worker.retired is True
+    assert "openai_ws_pool_scale_down" in metrics
+
+
+def test_openai_responses_ws_pool_balances_keys_across_scale_cycles(monkeypatch):
+    monkeypatch.setattr(openai_module, "OpenAIResponsesWSWorker", _ScalingStubWorker)
+    metrics = []
+    pool = OpenAIResponsesWSPool(
+        api_keys=["A", "B"],
+        pool_size=1,
+        metrics_callback=lambda name, value: metrics.append(name),
+        min_size=1,
+        max_size=4,
+        scale_up_queue_wait_ms=150,
+        scale_cooldown_sec=0.0,
+        max_workers_per_key=2,
+    )
+
+    def _scale_up(times):
+        for _ in range(times):
+            pool._queue_wait_ewma_ms = 400.0
+            with pool._rr_lock:
+                pool._maybe_scale_locked()
+
+    def _scale_down(times):
+        for _ in range(times):
+            pool._queue_wait_ewma_ms = 0.0
+            pool._last_busy_perf = 0.0
+            with pool._rr_lock:
+                pool._maybe_scale_locked()
+
+    _scale_up(3)
+    assert pool.key_load() == {"A": 2, "B": 2}
+    for _ in range(3):
+        _scale_down(2)
+        assert pool.key_load() == {"A": 1, "B": 1}
+        _scale_down(1)
+        assert sum(pool.key_load().values()) == 1
+        _scale_up(3)
+        assert pool.key_load() == {"A": 2, "B": 2}
+    assert [w.api_key for w in pool._workers].count("A") == 2
+
+    pool_limited = OpenAIResponsesWSPool(
+        api_keys=["A"],
+        pool_size=1,
+        metrics_callback=lambda name, value: metrics.append(name),
+        min_size=1,
+        max_size=4,
+        scale_up_queue_wait_ms=150,
+        scale_cooldown_sec=0.0,
+        max_workers_per_key=2,
+    )
+    for _ in range(3):
+        pool_limited._queue_wait_ewma_ms = 400.0
+        with pool_limited._rr_lock:
+            pool_limited._maybe_scale_locked()
+    assert pool_limited.prewarm(target_size=4) == 2
+    assert pool_limited.key_load() == {"A": 2}
+    assert metrics.count("openai_ws_pool_scale_up_key_limited") == 2
+
+
+def test_engine_ws_metrics_keep_sample_windows_only_for_latency_metrics():
+    engine = _build_engine()
+
+    engine._record_ws_metric("openai_ws_roundtrip_ms", 120)
+    engine._record_ws_metric("openai_ws_connect_ms", 40)
+    engine._record_ws_metric("openai_ws_worker3_queue_wait_ms", 9)
+
+    assert engine._ws_metrics["openai_ws_roundtrip_ms_values"] == [120]
+    assert engine._ws_metrics["openai_ws_connect_ms_values"] == [40]
+    assert "openai_ws_worker3_queue_wait_ms_values" not in engine._ws_metrics
+
+
+def test_openai_responses_ws_pool_prewarm_and_idle_health_check(monkeypatch):
+    monkeypatch.setattr(openai_module, "OpenAIResponsesWSWorker", _ScalingStubWorker)
+    pool = OpenAIResponsesWSPool(api_keys=["key-a"], pool_size=1, metrics_callback=None)
+
+    assert pool.prewarm(target_size=3) == 1
+    pool._workers[0].idle = 45.0
+    snapshot = pool.maintain(prewarm=True, idle_sec=30.0)
+
+    assert pool._workers[0].prewarmed == 2
+    assert pool._workers[0].health_checks == 1
+    assert snapshot["health_checked"] == 1
+    assert snapshot["autoscale"] is False
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_openai_ws_worker_prewarm_reconnect_and_health_check_publish_metrics(
+    monkeypatch,
+):
+    metrics = {}
+    connects = []
+    connections = []
+
+    class _Connection:
+        def __init__(self):
+            self.closed = False
+            self.alive = True
+            self.probes = 0
+            self._connection = SimpleNamespace(recv=self._recv)
+
+        def _recv(self, *, timeout, decode):
+            assert timeout == 0 and decode is False
+            self.probes += 1
+            if not self.alive:
+                raise ConnectionError("keepalive ping timeout")
+            raise TimeoutError
+
+        def close(self):
+            self.closed = True
+
+    class _FakeOpenAI:
+        def __init__(self, **kwargs):
+            def _connect(**connect_kwargs):
+                connects.append(connect_kwargs)
+
+                def _enter():
+                    if len(connects) == 2:
+                        raise ConnectionError("handshake failed")
+                    connections.append(_Connection())
+                    return connections[-1]
+
+                return SimpleNamespace(enter=_enter)
+
+            self.responses = SimpleNamespace(connect=_connect)
+
+    def _metric(name, value):
+        metrics[name] = metrics.get(name, 0) + value
+
+    monkeypatch.setattr(openai_module, "OpenAI", _FakeOpenAI)
+    worker = OpenAIResponsesWSWorker(worker_id=7, api_key="k", metrics_callback=_metric)
+    worker.prewarm()
+    worker.health_check(timeout_sec=0.1)
+    assert _wait_for(lambda: metrics.get("openai_ws_health_check_ok") == 1)
+    assert len(connects) == 1 and not connections[0].closed
+    connections[0].alive = False
+    worker.health_check(timeout_sec=0.1)
+    worker.prewarm()
+    worker.retire()
+    worker._thread.join(timeout=2)
+
+    assert not worker._thread.is_alive()
+    assert connections[0].probes == 2
+    assert len(connects) == 3
+    assert connects[0]["websocket_connection_options"] == {
+        "ping_interval": 20.0,
+        "ping_timeout": 20.0,
+    }
+    assert connects[1]["websocket_connection_options"]["open_timeout"] == 0.1
+    assert "open_timeout" not in connects[2]["websocket_connection_options"]
+    assert [connection.closed for connection in connections] == [True, True]
+    assert metrics["openai_ws_prewarm_connected"] == 2
+    assert metrics["openai_ws_health_check_fail"] == 1
+    assert metrics["openai_ws_worker_reconnects"] == 1
+    assert not any(name.startswith("openai_ws_worker7") for name in metrics)
+    assert worker.stats()["reconnect_count"] == 1
+
+
+def test_maintain_responses_ws_pool_prewarms_only_in_prewarm_window(monkeypatch):
+    engine = _build_engine()
+    monkeypatch.setattr(openai_module, "OpenAIResponsesWSWorker", _ScalingStubWorker)
+    monkeypatch.setattr(
+        openai_module,
+        "TRADING_RULES",
+        replace(
+            openai_module.TRADING_RULES,
+            OPENAI_TRANSPORT_MODE="responses_ws",
+            OPENAI_RESPONSES_WS_ENABLED=True,
+            OPENAI_RESPONSES_WS_PREWARM_ENABLED=True,
+            OPENAI_RESPONSES_WS_POOL_SIZE=2,
+        ),
+    )
+    allowed = {"value": False}
+    monkeypatch.setattr(
+        openai_module,
+        "is_scalping_prewarm_time_allowed",
+        lambda now_value=None: allowed["value"],
+    )
+
+    assert engine.maintain_responses_ws_pool() == {}
+    assert engine._responses_ws_pool is None
+
+    allowed["value"] = True
+    snapshot = engine.maintain_responses_ws_pool()
+
+    assert snapshot["size"] == 2
+    assert all(worker.prewarmed == 1 for worker in engine._responses_ws_pool._workers)
+    assert engine._ws_metrics["openai_ws_pool_size"] == 2
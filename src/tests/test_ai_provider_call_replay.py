@@ -0,0 +1,206 @@
+import pytest
+
+from src.engine.ai import provider_call_replay
+from src.engine.ai.provider_call_replay import (
+    AIProviderReplay,
+    AIProviderReplayMiss,
+    AIProviderReplayTimeout,
+    DecisionStep,
+    ProviderCallRecord,
+    ProviderCallRecorder,
+    classify_provider_error,
+    load_decision_steps,
+    load_provider_call_archive,
+    run_decision_replay,
+    summarize_archive,
+)
+
+
+def _record(contract, *, symbol="005930", outcome="ok", latency_ms=400, text="{}"):
+    return ProviderCallRecord(
+        contract_sha256=contract,
+        endpoint_name="analyze_target",
+        schema_name="entry_v1",
+        model="gpt-fast",
+        require_json=True,
+        symbol=symbol,
+        timeout_ms=3000,
+        outcome=outcome,
+        latency_ms=latency_ms,
+        response_text=text,
+    )
+
+
+def _serve(replay, contract, *, symbol="005930", timeout_ms=3000):
+    return replay.serve(
+        contract_sha256=contract,
+        endpoint_name="analyze_target",
+        schema_name="entry_v1",
+        symbol=symbol,
+        timeout_ms=timeout_ms,
+    )
+
+
+def test_recorder_appends_gzip_members_and_round_trips(tmp_path):
+    path = tmp_path / "calls.jsonl.gz"
+    recorder = ProviderCallRecorder(path, flush_every=1)
+    recorder.record(_record("a"))
+    recorder.record(_record("b", outcome="invalid_json", text="oops"))
+    recorder.flush()
+
+    records = load_provider_call_archive(path)
+
+    assert [record.contract_sha256 for record in records] == ["a", "b"]
+    assert records[1].response_text == "oops"
+    assert summarize_archive(records)["endpoints"]["analyze_target"]["calls"] == 2
+
+
+def test_replay_matches_contract_then_route_then_schema_with_scaled_latency():
+    sleeps = []
+    replay = AIProviderReplay(
+        [_record("a", latency_ms=400), _record("b", symbol="000660", latency_ms=800)],
+        latency_mode="scaled",
+        latency_scale=0.5,
+        sleep=sleeps.append,
+    )
+
+    assert _serve(replay, "a").match == "contract"
+    assert _serve(replay, "drifted", symbol="000660").match == "route"
+    assert _serve(replay, "drifted", symbol="035420").match == "schema"
+    assert sleeps[:2] == [0.2, 0.4]
+    assert replay.snapshot()["served"] == 3
+
+
+def test_replay_raises_timeout_when_scaled_latency_exceeds_budget():
+    sleeps = []
+    replay = AIProviderReplay(
+        [_record("a", latency_ms=2000), _record("t", outcome="timeout")],
+        latency_mode="original",
+        sleep=sleeps.append,
+    )
+
+    with pytest.raises(AIProviderReplayTimeout):
+        _serve(replay, "a", timeout_ms=500)
+    with pytest.raises(AIProviderReplayTimeout):
+        _serve(replay, "t")
+    with pytest.raises(AIProviderReplayMiss):
+        AIProviderReplay([]).serve(
+            contract_sha256="x",
+            endpoint_name="holding",
+            schema_name=None,
+            symbol="-",
+            timeout_ms=100,
+        )
+    assert sleeps == [0.5, 0.4]
+    assert replay.snapshot()["counts"]["timeout"] == 2
+
+
+def test_classify_provider_error_walks_exception_chain():
+    parse_error = ValueError("bad")
+    parse_error.raw_response_text = "not json"
+    wrapped = RuntimeError("parse failed")
+    wrapped.__cause__ = parse_error
+
+    assert classify_provider_error(wrapped) == ("invalid_json", "not json")
+    assert classify_provider_error(TimeoutError("slow")) == ("timeout", "")
+    assert classify_provider_error(RuntimeError("boom")) == ("error", "")
+
+
+def test_buffered_recorder_rows_are_flushed_at_process_exit(tmp_path):
+    path = tmp_path / "calls.jsonl.gz"
+    recorder = ProviderCallRecorder(path)
+    recorder.record(_record("a"))
+    recorder.record(_record("b"))
+    assert not path.exists()
+
+    provider_call_replay._flush_recorders_at_exit()
+
+    assert [r.contract_sha256 for r in load_provider_call_archive(path)] == ["a", "b"]
+
+
+def test_sniper_handler_wrappers_record_decision_steps(tmp_path, monkeypatch):
+    from src.engine import kiwoom_sniper_v2
+
+    monkeypatch.setenv("KORSTOCKSCAN_AI_DECISION_RECORDING_ENABLED", "true")
+    monkeypatch.setenv("KORSTOCKSCAN_AI_PROVIDER_RECORDING_DIR", str(tmp_path))
+    monkeypatch.setattr(provider_call_replay, "_DECISION_RECORDER", None)
+    calls = []
+    monkeypatch.setattr(
+        kiwoom_sniper_v2.sniper_state_handlers,
+        "handle_watching_state",
+        lambda stock, *args, **kwargs: calls.append(stock["status"]),
+    )
+    monkeypatch.setattr(
+        kiwoom_sniper_v2.sniper_state_handlers,
+        "handle_holding_state",
+        lambda stock, *args, **kwargs: calls.append(stock["status"]),
+    )
+
+    kiwoom_sniper_v2.handle_watching_state(
+        {"status": "WATCHING", "tags": {"x"}},
+        "005930",
+        {"curr": 70_000},
+        None,
+        now_ts=1.5,
+    )
+    kiwoom_sniper_v2.handle_holding_state(
+        {"status": "HOLDING"}, "000660", {"curr": 200_000}, None, "BULL", now_ts=2.5
+    )
+    recorder = provider_call_replay._DECISION_RECORDER
+    recorder.flush()
+
+    steps = load_decision_steps(recorder.path)
+    assert calls == ["WATCHING", "HOLDING"]
+    assert [(s.state, s.code, s.now_ts) for s in steps] == [
+        ("WATCHING", "005930", 1.5),
+        ("HOLDING", "000660", 2.5),
+    ]
+    assert steps[0].stock["tags"] == "{'x'}"
+    assert steps[1].market_regime == "BULL"
+
+
+def test_decision_replay_runs_recorded_steps_through_handlers_offline():
+    class _ReplayEngine:
+        def __init__(self, replay):
+            self.replay = replay
+
+        def decide(self, code):
+            return _serve(self.replay, "entry", symbol=code).record.response_text
+
+        def get_ai_provider_replay_snapshot(self):
+            return self.replay.snapshot()
+
+    decisions = []
+
+    def watching(stock, code, ws_data, admin_id, **kwargs):
+        stock["status"] = "BUY_ORDERED"
+        decisions.append((code, kwargs["ai_engine"].decide(code), kwargs["now_ts"]))
+
+    def holding(stock, code, ws_data, admin_id, market_regime, **kwargs):
+        raise RuntimeError("replayed holding failure")
+
+    stock = {"status": "WATCHING"}
+    steps = [
+        DecisionStep("WATCHING", "005930", 10.0, stock, {"curr": 1}),
+        DecisionStep("WATCHING", "005930", 11.0, stock, {"curr": 2}),
+        DecisionStep("HOLDING", "000660", 12.0, {"status": "HOLDING"}, {}, "BEAR"),
+    ]
+    replay = AIProviderReplay(
+        [_record("entry", text='{"action": "WAIT"}')], latency_mode="none"
+    )
+
+    report = run_decision_replay(
+        steps,
+        _ReplayEngine(replay),
+        handlers={"WATCHING": watching, "HOLDING": holding},
+    )
+
+    assert decisions == [
+        ("005930", '{"action": "WAIT"}', 10.0),
+        ("005930", '{"action": "WAIT"}', 11.0),
+    ]
+    assert stock == {"status": "WATCHING"}
+    assert report["steps"] == 3
+    assert report["states"]["WATCHING"]["steps"] == 2
+    assert report["states"]["HOLDING"]["errors"] == 1
+    assert report["provider"]["served"] == 2
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model import backtest_v2
+
+
+def _fixture(seed):
+    picks, px = backtest_v2.build_benchmark_inputs(
+        codes=12, days=60, picks=240, seed=seed
+    )
+    rng = np.random.default_rng(seed + 100)
+    # 결측, 0원 시가, 정확히 TP 가격에 닿는 고가, 거래정지(행 누락), 미상장 코드를 섞는다.
+    for column in ("open_price", "high_price", "low_price", "close_price"):
+        px.loc[rng.random(len(px)) < 0.03, column] = np.nan
+    px.loc[rng.random(len(px)) < 0.01, "open_price"] = 0.0
+    touch = rng.random(len(px)) < 0.05
+    px.loc[touch, "high_price"] = px["open_price"].shift(1)[touch] * 1.055
+    px = px[rng.random(len(px)) > 0.05].reset_index(drop=True)
+    picks.loc[rng.random(len(picks)) < 0.05, "code"] = "999999"
+    return picks, px
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("max_hold_days", [0, 1, 4, 7])
+@pytest.mark.parametrize(
+    "tp, sl_bull, sl_bear", [(0.055, 0.040, 0.035), (0.02, 0.01, 0.05)]
+)
+def test_merged_backtest_matches_per_trade_loop(
+    seed, max_hold_days, tp, sl_bull, sl_bear
+):
+    picks, px = _fixture(seed)
+    params = dict(tp=tp, sl_bull=sl_bull, sl_bear=sl_bear, max_hold_days=max_hold_days)
+
+    expected = backtest_v2._simulate_trades_loop(picks, px, **params)
+    actual = backtest_v2.simulate_trades(picks, px, **params)
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_trade_grid_matches_individual_runs():
+    picks, px = _fixture(5)
+    grid = [
+        (0.055, 0.040, 0.035, 4),
+        {"tp": 0.03, "sl_bull": 0.02, "sl_bear": 0.02, "max_hold_days": 2},
+        (0.08, 0.05, 0.03, 0),
+    ]
+
+    swept = backtest_v2.simulate_trade_grid(picks, px, grid, roundtrip_fee_rate=0.001)
+
+    assert sorted(swept["grid_id"].unique()) == [0, 1]
+    for grid_id, params in enumerate(backtest_v2._normalize_grid(grid[:2])):
+        expected = backtest_v2._simulate_trades_loop(
+            picks, px, roundtrip_fee_rate=0.001, **params
+        )
+        actual = swept[swept["grid_id"] == grid_id][backtest_v2.TRADE_COLUMNS]
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected)
+
+    summary = backtest_v2.summarize_trade_grid(swept)
+    assert summary["trades"].tolist() == swept.groupby("grid_id").size().tolist()
+
+
+def test_merged_backtest_keeps_integer_price_dtype():
+    picks, px = backtest_v2.build_benchmark_inputs(codes=3, days=20, picks=30, seed=1)
+    for column in ("open_price", "high_price", "low_price", "close_price"):
+        px[column] = px[column].round().astype("int64")
+
+    pd.testing.assert_frame_equal(
+        backtest_v2.simulate_trades(picks, px),
+        backtest_v2._simulate_trades_loop(picks, px),
+    )
+
+
+def test_backtest_benchmark_reports_parity():
+    report = backtest_v2.benchmark_backtest(codes=5, days=40, picks=50, loop_picks=20)
+
+    assert report["parity"] is True
+    assert report["loop_measured_picks"] == 20
+    assert report["grid_combos"] == 48
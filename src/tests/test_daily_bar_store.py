@@ -0,0 +1,191 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import daily_bar_store, kiwoom_utils
+from src.utils.daily_bar_store import DailyBarStore, DailyBarStoreStats
+
+
+class _FakeKa10081:
+    """ka10081 처럼 최근 일자부터 page_rows 행씩, 최대 max_pages 페이지를 돌려준다."""
+
+    def __init__(self, days=40, page_rows=10, default_pages=3, seed=1):
+        rng = np.random.default_rng(seed)
+        dates = pd.bdate_range("2026-01-02", periods=days, name="Date")
+        close = np.round(10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, days))))
+        self.market = pd.DataFrame(
+            {
+                "Open": close - 10,
+                "High": close + 50,
+                "Low": close - 60,
+                "Close": close,
+                "Volume": rng.integers(1_000, 9_000, days).astype(float),
+                "trde_prica": [str(v) for v in range(days)],
+            },
+            index=dates,
+        )
+        self.page_rows = page_rows
+        self.default_pages = default_pages
+        self.calls = []
+
+    def __call__(self, token, code, max_pages=None):
+        pages = self.default_pages if max_pages is None else max_pages
+        self.calls.append(pages)
+        rows = self.market.tail(pages * self.page_rows)
+        used = -(-len(rows) // self.page_rows)
+        frame = rows.copy()
+        frame.attrs["kiwoom_source_meta"] = {"page_count": used}
+        return frame
+
+    def append_day(self, close):
+        day = self.market.index[-1] + pd.offsets.BDay(1)
+        self.market.loc[day] = [close - 10, close + 50, close - 60, close, 5_000.0, "x"]
+
+
+def _assert_same_bars(actual, expected):
+    actual = actual.copy()
+    expected = expected.copy()
+    actual.attrs = {}
+    expected.attrs = {}
+    pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+
+
+def test_store_fetches_only_trailing_page_and_matches_direct_fetch(tmp_path):
+    source = _FakeKa10081()
+    store = DailyBarStore(root=tmp_path)
+
+    first = store.get_daily_bars("token", "5930", fetch=source)
+    source.append_day(12_345.0)
+    run_stats = DailyBarStoreStats()
+    second = store.get_daily_bars("token", "005930", fetch=source, run_stats=run_stats)
+
+    assert source.calls == [3, 1]
+    _assert_same_bars(first, source.market.iloc[-31:-1])
+    _assert_same_bars(second, source(None, None))
+    assert run_stats.as_dict() == {
+        "requests": 1,
+        "store_only": 0,
+        "incremental_fetches": 1,
+        "full_fetches": 0,
+        "revision_refetches": 0,
+        "gap_refetches": 0,
+        "rest_pages": 1,
+        "rest_pages_avoided": 2,
+    }
+    assert store.stats.full_fetches == 1
+    assert len(store.read_many(["005930"])) == 31
+
+
+def test_store_overwrites_partial_last_bar_and_refetches_revised_history(tmp_path):
+    source = _FakeKa10081()
+    store = DailyBarStore(root=tmp_path)
+    store.get_daily_bars("token", "000660", fetch=source)
+
+    # 장중 미완성 봉: 마지막 봉이 바뀌어도 수정주가 변경으로 보지 않는다.
+    source.market.iloc[-1, source.market.columns.get_loc("Close")] += 100
+    partial = store.get_daily_bars("token", "000660", fetch=source)
+    assert store.stats.incremental_fetches == 1
+    _assert_same_bars(partial, source(None, None))
+
+    # 액면분할: 과거 수정주가가 모두 바뀌면 해당 종목만 전체 재조회한다.
+    source.market[["Open", "High", "Low", "Close"]] /= 2
+    source.calls.clear()
+    revised = store.get_daily_bars("token", "000660", fetch=source)
+
+    assert source.calls == [1, 3]
+    assert store.stats.revision_refetches == 1
+    assert store.stats.full_fetches == 2
+    _assert_same_bars(revised, source(None, None))
+    _assert_same_bars(
+        store.read_many(["000660"]).set_index("Date").drop(columns="Code"),
+        source.market.tail(30),
+    )
+
+
+def test_store_serves_final_bars_without_rest(tmp_path):
+    source = _FakeKa10081()
+    store = DailyBarStore(root=tmp_path)
+    store.get_daily_bars("token", "035720", fetch=source, final_through="2026-02-26")
+    source.calls.clear()
+
+    cached = store.get_daily_bars(
+        "token", "035720", fetch=source, final_through="2026-02-26"
+    )
+    store.get_daily_bars("token", "035720", fetch=source, final_through="2026-02-27")
+
+    assert source.calls == [1]
+    assert store.stats.store_only == 1
+    assert store.stats.rest_pages_avoided == 3 + 2
+    _assert_same_bars(cached, source.market.tail(30))
+
+
+def test_store_recovers_from_gap_and_missing_meta(tmp_path):
+    source = _FakeKa10081(days=80)
+    store = DailyBarStore(root=tmp_path)
+    store.get_daily_bars("token", "000001", fetch=source)
+    for offset in range(15):
+        source.append_day(10_000.0 + offset)
+
+    gap = store.get_daily_bars("token", "000001", fetch=source)
+    store.meta_path("000001").unlink()
+    source.calls.clear()
+    store.get_daily_bars("token", "000001", fetch=source)
+
+    assert store.stats.gap_refetches == 1
+    assert source.calls == [3]
+    _assert_same_bars(gap, source(None, None))
+
+
+def test_read_many_returns_one_sorted_frame_with_db_columns(tmp_path):
+    store = DailyBarStore(root=tmp_path)
+    for code, seed in (("000002", 2), ("000001", 1)):
+        store.get_daily_bars("token", code, fetch=_FakeKa10081(seed=seed))
+
+    frame = store.read_many(
+        ["000002", "000001", "999999"], start="2026-02-02", db_schema=True
+    )
+
+    assert list(frame.columns[:7]) == [
+        "quote_date",
+        "stock_code",
+        "open_price",
+        "high_price",
+        "low_price",
+        "close_price",
+        "volume",
+    ]
+    assert frame["quote_date"].min() == pd.Timestamp("2026-02-02")
+    assert frame["stock_code"].iloc[:2].tolist() == ["000001", "000002"]
+    assert frame.groupby("stock_code").size().tolist() == [19, 19]
+    assert store.read_many([]).empty
+
+
+def test_fetch_daily_bars_without_store_uses_rest(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        kiwoom_utils,
+        "get_daily_ohlcv_ka10081_df",
+        lambda token, code, max_pages=None: calls.append((code, max_pages))
+        or pd.DataFrame(),
+    )
+    monkeypatch.delenv(daily_bar_store.DAILY_BAR_STORE_DIR_ENV, raising=False)
+
+    assert daily_bar_store.fetch_daily_bars("token", "005930").empty
+    assert calls == [("005930", None)]
+    assert DailyBarStore.from_env() is None
+
+
+@pytest.mark.parametrize(
+    "now, cutoff, expected",
+    [
+        (datetime(2026, 3, 3, 20, 5), "", "2026-03-03"),
+        (datetime(2026, 3, 3, 14, 0), "", None),
+        (datetime(2026, 3, 3, 15, 45), "15:40", "2026-03-03"),
+    ],
+)
+def test_final_through_uses_close_cutoff(monkeypatch, now, cutoff, expected):
+    monkeypatch.setenv(daily_bar_store.DAILY_BAR_FINAL_AFTER_ENV, cutoff)
+
+    assert daily_bar_store.final_through_for(now) == expected
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from src.model import dataset_builder_v2 as builder
+from src.model.feature_store_v2 import FeatureStore, feature_set_version
+
+
+def _raw_quotes(codes=3, rows=180, seed=5):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for code_index in range(codes):
+        close = 10_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, rows)))
+        open_ = close * np.exp(rng.normal(0.0, 0.01, rows))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "quote_date": pd.bdate_range("2025-01-02", periods=rows),
+                    "stock_code": f"{code_index + 1:06d}",
+                    "stock_name": f"종목{code_index}",
+                    "open_price": open_,
+                    "high_price": np.maximum(open_, close) * 1.01,
+                    "low_price": np.minimum(open_, close) * 0.99,
+                    "close_price": close,
+                    "volume": rng.integers(10_000, 500_000, rows).astype(float),
+                    "foreign_net": rng.normal(0.0, 1_000.0, rows),
+                    "inst_net": rng.normal(0.0, 1_000.0, rows),
+                    "margin_rate": rng.random(rows),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _patch_sources(monkeypatch, raw):
+    index = pd.DataFrame(
+        {
+            "date": pd.bdate_range("2025-01-02", periods=400),
+            "bull_regime": 1,
+            "idx_ret20": 0.01,
+            "idx_atr_ratio": 0.02,
+        }
+    )
+    monkeypatch.setattr(builder, "fetch_raw_quotes", lambda *args: raw.copy())
+    monkeypatch.setattr(builder, "fetch_kospi_index", lambda *args: index.copy())
+
+
+def test_feature_store_hits_match_cold_rebuild(tmp_path, monkeypatch):
+    raw = _raw_quotes()
+    _patch_sources(monkeypatch, raw)
+    store = FeatureStore(root=tmp_path)
+    cold = builder.build_panel_dataset(["000001"], "2025-01-01", "2025-12-31")
+
+    miss = builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2025-12-31", feature_store=store
+    )
+    calls = []
+    original = builder.calculate_all_features
+    monkeypatch.setattr(
+        builder,
+        "calculate_all_features",
+        lambda g: calls.append(g["stock_code"].iloc[0]) or original(g),
+    )
+    hit = builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2025-12-31", feature_store=store
+    )
+
+    pd.testing.assert_frame_equal(miss, cold)
+    pd.testing.assert_frame_equal(hit, cold)
+    assert calls == []
+    assert len(list((tmp_path / store.version).glob("*/*.parquet"))) == 3
+
+
+def test_feature_store_recomputes_appended_and_restated_codes(tmp_path, monkeypatch):
+    raw = _raw_quotes(rows=181)
+    store = FeatureStore(root=tmp_path)
+    _patch_sources(monkeypatch, raw[raw["quote_date"] < raw["quote_date"].max()])
+    builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2025-12-31", feature_store=store
+    )
+
+    restated = raw.copy()
+    first_row = restated.index[restated["stock_code"] == "000002"][0]
+    restated.loc[first_row, "close_price"] *= 1.001
+    _patch_sources(monkeypatch, restated)
+    calls = []
+    original = builder.calculate_all_features
+    monkeypatch.setattr(
+        builder,
+        "calculate_all_features",
+        lambda g: calls.append(g["stock_code"].iloc[0]) or original(g),
+    )
+    incremental = builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2025-12-31", feature_store=store
+    )
+    monkeypatch.setattr(builder, "calculate_all_features", original)
+    cold = builder.build_panel_dataset(["000001"], "2025-01-01", "2025-12-31")
+
+    assert sorted(calls) == ["000001", "000002", "000003"]
+    pd.testing.assert_frame_equal(incremental, cold)
+    assert all(
+        len(pd.read_parquet(store.partition_path(code, raw["quote_date"].min()))) == 181
+        for code in ("000001", "000002", "000003")
+    )
+
+
+def test_feature_store_appended_day_computes_only_new_rows(tmp_path, monkeypatch):
+    raw = _raw_quotes(rows=700)
+    store = FeatureStore(root=tmp_path, warmup_rows=400)
+    _patch_sources(monkeypatch, raw[raw["quote_date"] < raw["quote_date"].max()])
+    builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2027-12-31", feature_store=store
+    )
+
+    _patch_sources(monkeypatch, raw)
+    calls = []
+    original = builder.calculate_all_features
+    monkeypatch.setattr(
+        builder,
+        "calculate_all_features",
+        lambda g: calls.append(len(g)) or original(g),
+    )
+    appended = builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2027-12-31", feature_store=store
+    )
+    monkeypatch.setattr(builder, "calculate_all_features", original)
+    cold = builder.build_panel_dataset(["000001"], "2025-01-01", "2027-12-31")
+
+    assert calls == [401, 401, 401]
+    # pandas rolling 누적합과 RMA/EWM 은 계산 시작점에 따라 반올림이 달라진다.
+    exact_columns = ["ma5", "ma20", "ma60", "ma120", "obv", "obv_change_5"]
+    pd.testing.assert_frame_equal(appended[exact_columns], cold[exact_columns])
+    pd.testing.assert_frame_equal(appended, cold, check_exact=False, rtol=1e-12)
+
+    later_start = raw[raw["quote_date"] >= raw["quote_date"].iloc[200]]
+    _patch_sources(monkeypatch, later_start)
+    calls.clear()
+    monkeypatch.setattr(
+        builder,
+        "calculate_all_features",
+        lambda g: calls.append(len(g)) or original(g),
+    )
+    later = builder.build_panel_dataset(
+        ["000001"], "2025-10-09", "2027-12-31", feature_store=store
+    )
+    monkeypatch.setattr(builder, "calculate_all_features", original)
+    later_cold = builder.build_panel_dataset(["000001"], "2025-10-09", "2027-12-31")
+
+    assert calls == [500, 500, 500]
+    pd.testing.assert_frame_equal(later, later_cold)
+
+
+def test_feature_store_version_tracks_feature_code_and_env(tmp_path, monkeypatch):
+    assert feature_set_version() == FeatureStore(root=tmp_path).version
+    assert FeatureStore(root=tmp_path, version="other").partition_path(
+        "000001", "2025-03-04"
+    ) == (tmp_path / "other" / "000001" / "2025-03-04.parquet")
+
+    monkeypatch.delenv("KORSTOCKSCAN_SWING_FEATURE_STORE_DIR", raising=False)
+    assert FeatureStore.from_env() is None
+    monkeypatch.setenv("KORSTOCKSCAN_SWING_FEATURE_STORE_DIR", str(tmp_path))
+    assert FeatureStore.from_env().root == tmp_path
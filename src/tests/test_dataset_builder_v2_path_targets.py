@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model import dataset_builder_v2 as builder
+
+
+def _ohlc(rows: int, seed: int) -> pd.DataFrame:
+    frame = builder.build_benchmark_code_frames(codes=1, rows=rows, seed=seed)[0]
+    rng = np.random.default_rng(seed + 100)
+    # 정확히 TP/SL 가격에 닿는 경계 케이스와 결측을 섞는다.
+    touch = rng.random(rows) < 0.05
+    frame.loc[touch, "high"] = frame["open"].shift(-1)[touch] * 1.045
+    frame.loc[rng.random(rows) < 0.01, "high"] = np.nan
+    frame.loc[rng.random(rows) < 0.01, "low"] = np.nan
+    frame.index = frame.index + 1000
+    return frame
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize(
+    "tp, sl, hold_days",
+    [(0.045, 0.03, 3), (0.02, 0.02, 1), (0.08, 0.05, 5), (0.045, 0.03, 0)],
+)
+def test_vectorized_path_targets_match_row_loop(seed, tp, sl, hold_days):
+    frame = _ohlc(240, seed)
+
+    expected = builder._build_path_targets_scalar(
+        frame, tp=tp, sl=sl, hold_days=hold_days
+    )
+    actual = builder.build_path_targets(frame, tp=tp, sl=sl, hold_days=hold_days)
+
+    pd.testing.assert_frame_equal(actual, expected)
+    assert set(actual["exit_reason_3d"]) <= {
+        "",
+        "TP_GAP",
+        "SL_GAP",
+        "AMBIG_SL_FIRST",
+        "TP",
+        "SL",
+        "TIME",
+    }
+
+
+@pytest.mark.parametrize("rows", [0, 1, 4, 5])
+def test_vectorized_path_targets_handle_short_frames(rows):
+    frame = _ohlc(max(rows, 1), 3).iloc[:rows]
+
+    pd.testing.assert_frame_equal(
+        builder.build_path_targets(frame),
+        builder._build_path_targets_scalar(frame),
+    )
+
+
+def test_panel_dataset_process_pool_matches_sequential(monkeypatch):
+    rows = []
+    for code_index, frame in enumerate(
+        builder.build_benchmark_code_frames(codes=4, rows=200, seed=11)
+    ):
+        frame = frame.fillna(10_000.0).replace(0.0, 10_000.0)
+        rows.append(
+            pd.DataFrame(
+                {
+                    "quote_date": pd.bdate_range("2025-01-02", periods=len(frame)),
+                    "stock_code": f"{code_index + 1:06d}",
+                    "stock_name": f"종목{code_index}",
+                    "open_price": frame["open"],
+                    "high_price": frame[["open", "high", "close"]].max(axis=1),
+                    "low_price": frame[["open", "low", "close"]].min(axis=1),
+                    "close_price": frame["close"],
+                    "volume": 100_000 + code_index,
+                    "foreign_net": 0,
+                    "inst_net": 0,
+                    "margin_rate": 0.0,
+                }
+            )
+        )
+    raw = pd.concat(rows, ignore_index=True)
+    index = pd.DataFrame(
+        {
+            "date": pd.bdate_range("2025-01-02", periods=200),
+            "bull_regime": 1,
+            "idx_ret20": 0.01,
+            "idx_atr_ratio": 0.02,
+        }
+    )
+    monkeypatch.setattr(builder, "fetch_raw_quotes", lambda *args: raw.copy())
+    monkeypatch.setattr(builder, "fetch_kospi_index", lambda *args: index.copy())
+
+    sequential = builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2025-12-31", min_rows=150, workers=1
+    )
+    pooled = builder.build_panel_dataset(
+        ["000001"], "2025-01-01", "2025-12-31", min_rows=150, workers=2
+    )
+
+    assert not sequential.empty
+    pd.testing.assert_frame_equal(pooled, sequential)
+
+
+def test_path_target_benchmark_reports_parity():
+    report = builder.benchmark_path_targets(codes=4, rows=120, scalar_codes=2)
+
+    assert report["parity"] is True
+    assert report["panel_rows"] == 480
+    assert report["scalar_measured_codes"] == 2
@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+
+from src.engine.ai.entry_screen_batching import (
+    EntryScreenBatchCoalescer,
+    EntryScreenBatchItem,
+    EntryScreenBatchOutcome,
+    build_entry_screen_batch_input,
+    entry_screen_batch_timeout_ms,
+    parse_entry_screen_batch_response,
+    split_shared_context,
+)
+
+
+def test_split_shared_context_keeps_only_identical_top_level_fields():
+    shared, candidates = split_shared_context(
+        [
+            {"market": {"kospi": 1.2}, "session": "open", "price": 100},
+            {"market": {"kospi": 1.2}, "session": "open", "price": 200},
+            {"market": {"kospi": 1.2}, "session": "late", "price": 300},
+        ]
+    )
+
+    assert shared == {"market": {"kospi": 1.2}}
+    assert candidates[2] == {"session": "late", "price": 300}
+
+
+def test_batch_input_and_response_round_trip_by_symbol():
+    items = [
+        EntryScreenBatchItem(symbol="A", payload={"ctx": 1, "p": 1}),
+        EntryScreenBatchItem(symbol="B", payload={"ctx": 1, "p": 2}),
+    ]
+    body = json.loads(build_entry_screen_batch_input(items))
+
+    assert body["shared_context"] == {"ctx": 1}
+    assert body["candidates"] == [{"symbol": "A", "p": 1}, {"symbol": "B", "p": 2}]
+    parsed = parse_entry_screen_batch_response(
+        {"results": [{"symbol": "A", "v": 1}, {"symbol": "B"}, {"symbol": "B"}]},
+        ["A", "B", "C"],
+    )
+    assert parsed == {"A": {"v": 1}, "B": None, "C": None}
+    assert parse_entry_screen_batch_response("bad", ["A"]) == {"A": None}
+
+
+def test_batch_timeout_scales_with_item_count_and_is_capped():
+    assert entry_screen_batch_timeout_ms(3000, 1, per_item_ms=500, max_ms=8000) == 3000
+    assert entry_screen_batch_timeout_ms(3000, 4, per_item_ms=500, max_ms=8000) == 4500
+    assert entry_screen_batch_timeout_ms(3000, 20, per_item_ms=500, max_ms=8000) == (
+        8000
+    )
+    # A cap below the single-call budget never shortens that budget.
+    assert entry_screen_batch_timeout_ms(3000, 4, per_item_ms=500, max_ms=1000) == 3000
+
+
+def test_coalescer_singleton_window_and_batch_error_fall_back_per_caller():
+    def _boom(group_key, items):
+        raise RuntimeError("provider down")
+
+    coalescer = EntryScreenBatchCoalescer(
+        window_ms=0, max_batch_size=4, execute_batch=_boom
+    )
+    outcome = coalescer.submit("route", EntryScreenBatchItem(symbol="A", payload={}))
+    assert outcome.result is None
+    assert outcome.fallback_reason == "singleton"
+
+    coalescer = EntryScreenBatchCoalescer(
+        window_ms=2000, max_batch_size=2, execute_batch=_boom
+    )
+    outcomes = {}
+
+    def _submit(symbol):
+        outcomes[symbol] = coalescer.submit(
+            "route", EntryScreenBatchItem(symbol=symbol, payload={})
+        )
+
+    threads = [threading.Thread(target=_submit, args=(s,)) for s in ("A", "B")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert {o.fallback_reason for o in outcomes.values()} == {
+        "batch_error:RuntimeError"
+    }
+    assert coalescer.snapshot()["fallback_items"] == 2
+
+
+def test_coalescer_full_batch_closes_before_window_and_saves_calls():
+    def _execute(group_key, items):
+        return [EntryScreenBatchOutcome({"symbol": item.symbol}) for item in items]
+
+    coalescer = EntryScreenBatchCoalescer(
+        window_ms=10_000, max_batch_size=3, execute_batch=_execute
+    )
+    outcomes = {}
+
+    def _submit(symbol):
+        outcomes[symbol] = coalescer.submit(
+            "route", EntryScreenBatchItem(symbol=symbol, payload={})
+        )
+
+    threads = [threading.Thread(target=_submit, args=(s,)) for s in "ABC"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert {symbol: o.result["symbol"] for symbol, o in outcomes.items()} == {
+        "A": "A",
+        "B": "B",
+        "C": "C",
+    }
+    assert coalescer.snapshot()["provider_calls_saved"] == 2
+
+
+def test_coalescer_releases_lone_request_without_waiting_the_window():
+    def _execute(group_key, items):
+        return [EntryScreenBatchOutcome({"symbol": item.symbol}) for item in items]
+
+    coalescer = EntryScreenBatchCoalescer(
+        window_ms=1000, max_batch_size=4, execute_batch=_execute, solo_wait_ms=5
+    )
+
+    started = time.perf_counter()
+    outcome = coalescer.submit("route", EntryScreenBatchItem(symbol="A", payload={}))
+    lone_elapsed = time.perf_counter() - started
+
+    assert outcome.fallback_reason == "singleton"
+    assert lone_elapsed < 0.5
+    assert outcome.transport_meta["openai_entry_screen_batch_wait_ms"] < 500
+    assert coalescer.snapshot()["solo_releases"] == 1
+
+    # A call right behind it is part of a burst: it opens a normal window that
+    # the next caller joins.
+    outcomes = {}
+
+    def _submit(symbol):
+        outcomes[symbol] = coalescer.submit(
+            "route", EntryScreenBatchItem(symbol=symbol, payload={})
+        )
+
+    leader = threading.Thread(target=_submit, args=("B",))
+    leader.start()
+    time.sleep(0.05)
+    _submit("C")
+    leader.join(timeout=5)
+
+    assert {symbol: o.result for symbol, o in outcomes.items()} == {
+        "B": {"symbol": "B"},
+        "C": {"symbol": "C"},
+    }
+    assert coalescer.snapshot()["solo_releases"] == 1
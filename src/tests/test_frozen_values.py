@@ -0,0 +1,138 @@
+from datetime import datetime
+
+import pytest
+
+from src.engine.infrastructure.frozen_values import (
+    EMPTY_FROZEN_MAP,
+    FrozenList,
+    FrozenMap,
+    FrozenSnapshotInterner,
+    benchmark_snapshot_handoff,
+    build_benchmark_ws_snapshot,
+    freeze,
+    frozen_mapping,
+    thaw,
+)
+from src.engine.scalping.scanner_async_eval import (
+    ScannerAsyncEvalContext,
+    thaw_scanner_async_value,
+)
+from src.engine.scalping.scanner_runtime_scheduler import ScannerGeneration
+
+
+def test_freeze_rejects_mutation_and_thaw_returns_private_copy():
+    source = {"orderbook": {"asks": [{"price": 100}]}, "tags": {"a"}}
+
+    frozen = freeze(source)
+    source["orderbook"]["asks"][0]["price"] = 999
+
+    assert isinstance(frozen, FrozenMap)
+    assert isinstance(frozen["orderbook"]["asks"], FrozenList)
+    assert frozen["orderbook"]["asks"][0]["price"] == 100
+    assert frozen["tags"] == frozenset({"a"})
+    with pytest.raises(TypeError):
+        frozen["orderbook"]["asks"][0]["price"] = 1
+
+    thawed = thaw(frozen)
+    thawed["orderbook"]["asks"][0]["price"] = 1
+    assert thawed == {"orderbook": {"asks": [{"price": 1}]}, "tags": {"a"}}
+    assert frozen["orderbook"]["asks"][0]["price"] == 100
+
+
+def test_freeze_is_identity_for_frozen_values_and_shares_unchanged_subtrees():
+    stamp = datetime(2026, 5, 1, 9, 0, 1)
+    first = freeze({"book": {"asks": [1, 2]}, "ticks": [{"p": 1}], "ts": stamp})
+
+    assert freeze(first) is first
+    assert frozen_mapping(first) is first
+    assert first["ts"] is stamp
+
+    same = freeze(
+        {"book": {"asks": [1, 2]}, "ticks": [{"p": 1}], "ts": stamp}, previous=first
+    )
+    changed = freeze(
+        {"book": {"asks": [1, 2]}, "ticks": [{"p": 2}], "ts": stamp}, previous=first
+    )
+
+    assert same is first
+    assert changed is not first
+    assert changed["book"] is first["book"]
+    assert changed["ticks"] is not first["ticks"]
+    assert changed["ticks"][0]["p"] == 2
+
+
+def test_frozen_map_set_and_discard_return_new_maps_sharing_children():
+    base = freeze({"a": {"x": 1}, "b": [1, 2]})
+
+    updated = base.set("c", 3)
+    removed = updated.discard("a")
+
+    assert base.set("a", {"x": 1}) is base
+    assert "c" not in base
+    assert updated["a"] is base["a"]
+    assert removed["b"] is base["b"]
+    assert dict(removed) == {"b": (1, 2), "c": 3}
+    assert frozen_mapping(None) is EMPTY_FROZEN_MAP
+
+
+def test_snapshot_interner_reuses_unchanged_snapshot_by_reference():
+    interner = FrozenSnapshotInterner(max_entries=2)
+    snapshot = build_benchmark_ws_snapshot(levels=2, ticks=3, extra_fields=2)
+
+    first = interner.freeze("005930", snapshot)
+    second = interner.freeze("005930", dict(snapshot))
+    snapshot["curr"] = 10200
+    third = interner.freeze("005930", snapshot)
+    interner.freeze("000660", {})
+    interner.freeze("035420", {})
+
+    assert second is first
+    assert third is not first
+    assert third["orderbook"] is first["orderbook"]
+    assert interner.stats() == {
+        "reused": 1,
+        "shared_rebuild": 1,
+        "cold": 3,
+        "entries": 2,
+    }
+
+
+def test_scanner_async_context_shares_interned_ws_snapshot_between_generations():
+    ws = {"curr": 100, "orderbook": {"asks": [{"price": 101}]}}
+    contexts = [
+        ScannerAsyncEvalContext.create(
+            generation=ScannerGeneration(
+                code="123456",
+                promotion_id="PROMO-1",
+                revision=index + 1,
+                record_id=1,
+                venue="KRX",
+                promotion_epoch=100.0,
+                attach_epoch=101.0,
+                observed_price=100,
+                source_signature="VALUE_TOP",
+            ),
+            cache_key="k",
+            submitted_epoch=100.0,
+            deadline_epoch=101.0,
+            stock_snapshot={"code": "123456"},
+            ws_snapshot=ws,
+            state_version="s",
+        )
+        for index in range(2)
+    ]
+
+    assert contexts[1].ws_snapshot is contexts[0].ws_snapshot
+    assert thaw_scanner_async_value(contexts[1].ws_snapshot) == ws
+
+
+def test_benchmark_snapshot_handoff_reports_both_paths():
+    result = benchmark_snapshot_handoff(
+        build_benchmark_ws_snapshot(levels=2, ticks=2, extra_fields=2),
+        iterations=3,
+    )
+
+    assert result["iterations"] == 3
+    assert result["legacy_us_per_handoff"] > 0
+    assert result["structural_us_per_handoff"] > 0
+    assert result["interner"]["reused"] == 2
@@ -0,0 +1,229 @@
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+import src.engine.kiwoom_websocket as kiwoom_websocket
+from src.engine.infrastructure.kiwoom_realtime_fid_plan import (
+    MISSING,
+    apply_quote_fields,
+    benchmark_fid_parse,
+    parse_realtime_fields,
+    value_or,
+)
+from src.engine.kiwoom_websocket import KiwoomWSManager
+
+GOLDEN_PATH = Path(__file__).parent / "fixtures" / "kiwoom_realtime_fid_golden.json"
+GOLDEN_CODES = ("991001", "991002", "991003")
+_DIGESTED_HISTORY_KEYS = (
+    "recent_trade_ticks",
+    "recent_trade_ticks_by_route",
+    "strength_momentum_history",
+)
+
+
+def _golden_0b(code, idx, **overrides):
+    sign = "+" if idx % 3 else "-"
+    values = {
+        "10": f"{sign}{10100 + (idx % 5) * 10}",
+        "11": f"{sign}{100 + idx}",
+        "12": f"{sign}{1.05 + idx / 100:.2f}",
+        "13": str(1_200_000 + idx * 137),
+        "14": str(12_345 + idx),
+        "15": f"{sign}{40 + idx * 7}",
+        "16": "10000",
+        "17": "+10250",
+        "18": "-9950",
+        "20": f"0900{idx % 60:02d}",
+        "27": f"+{10110 + (idx % 3) * 10}",
+        "28": f"+{10100 + (idx % 3) * 10}",
+        "228": f"{95 + idx * 1.5:.2f}",
+        "1030": str(500_000 + idx * 11),
+        "1031": str(700_000 + idx * 13),
+        "1032": f"{55 + idx / 10:.2f}",
+        "1313": str(400 + idx),
+        "1314": f"{sign}{2000 + idx}",
+        "1315": str(30 + idx),
+        "1316": str(31 + idx),
+        "9081": "1",
+    }
+    values.update(overrides)
+    return {"type": "0B", "item": code, "values": values}
+
+
+def _golden_0d(code, idx, **overrides):
+    values = {"21": f"0900{idx % 60:02d}"}
+    for level in range(1, 6):
+        values[str(40 + level)] = f"+{10110 + level * 10 + idx}"
+        values[str(60 + level)] = str(1_000 + level * 17 + idx)
+        values[str(50 + level)] = f"-{10100 - level * 10 + idx}"
+        values[str(70 + level)] = str(900 + level * 13 + idx)
+    values.update(
+        {
+            "121": str(30_000 + idx),
+            "125": str(28_000 + idx),
+            "128": f"-{120 + idx}",
+            "129": f"{93.5 + idx / 10:.2f}",
+            "138": f"+{150 + idx}",
+            "139": f"{107.1 - idx / 10:.2f}",
+        }
+    )
+    values.update(overrides)
+    return {"type": "0D", "item": code, "values": values}
+
+
+def _golden_0w(code, idx, **overrides):
+    values = {
+        "202": str(1_000 + idx),
+        "204": f"-{30_000 + idx}",
+        "206": str(1_500 + idx),
+        "208": f"+{45_000 + idx}",
+        "210": f"{'-' if idx % 2 else '+'}{500 + idx}",
+        "211": f"+{idx}",
+        "212": f"{15_000 + idx}",
+        "213": f"-{idx * 3}",
+    }
+    values.update(overrides)
+    return {"type": "0w", "item": code, "values": values}
+
+
+def golden_frames():
+    """Recorded-shape REAL frames, including the awkward values seen live."""
+
+    a, b, c = GOLDEN_CODES
+    frames = [
+        [_golden_0d(a, 0), _golden_0b(a, 0)],
+        [_golden_0b(a, 1), _golden_0b(b, 1, **{"1313": ""})],
+        [_golden_0b(a, 2, **{"15": "0", "1313": "0"})],
+        [_golden_0b(b, 3, **{"27": "", "28": "", "15": "+1,200"})],
+        [_golden_0d(b, 3, **{"45": "", "75": "0", "292": "1,200"})],
+        [_golden_0b(b, 4, **{"10": "garbage", "13": "1,300,000"})],
+        [_golden_0w(a, 1), _golden_0w(b, 2, **{"211": "", "212": "n/a"})],
+        [
+            _golden_0d(
+                c,
+                5,
+                **{
+                    "291": "+10150",
+                    "292": "12,345",
+                    "293": "2",
+                    "294": "+50",
+                    "295": "+0.49",
+                    "299": "12.5",
+                },
+            )
+        ],
+        [_golden_0d(c, 6, **{"23": "10160", "24": "900", "200": "-5", "201": "x"})],
+        [
+            _golden_0b(
+                c,
+                7,
+                **{"1030": "", "1031": "", "228": "bad", "12": "bad", "1032": "-"},
+            )
+        ],
+        [_golden_0b(c, 8, **{"15": "", "13": "1300500"})],
+        [_golden_0b(c, 9, **{"15": "", "13": "1300450", "1313": "-"})],
+        [_golden_0b(a, 10, **{"15": "-0", "27": "-10120", "28": "bad"})],
+        [_golden_0d(a, 11, **{"121": "x", "125": "", "129": "", "139": "1,5"})],
+        [_golden_0b(f"{a}_NX", 12), _golden_0b(f"{a}_AL", 13)],
+        [_golden_0b(a, 14, **{"20": ""})],
+        [_golden_0d(a, 15, **{"41": "", "61": "", "51": "0", "71": ""})],
+        [_golden_0b(b, 16, **{"14": "1,234", "1314": "+1,234", "1315": "-3"})],
+    ]
+    return [json.dumps({"trnm": "REAL", "data": frame}) for frame in frames]
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 7, 3, 9, 0, 10)
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) or type(value).__name__ == "deque":
+        return [_jsonable(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_jsonable(item) for item in value)
+    return value
+
+
+def _digest(value):
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _golden_target(target):
+    state = _jsonable(target)
+    for key in _DIGESTED_HISTORY_KEYS:
+        if key in state:
+            state[key] = {"len": len(state[key]), "sha256": _digest(state[key])}
+    return state
+
+
+def run_golden_corpus(monkeypatch):
+    # The clock advances once per frame, never per read, so the golden output
+    # does not depend on how many times production code samples time.time().
+    clock = {"now": 1_783_036_810.0}
+    monkeypatch.setattr(kiwoom_websocket.time, "time", lambda: clock["now"])
+    monkeypatch.setattr(kiwoom_websocket, "datetime", _FixedDatetime)
+    monkeypatch.setenv("KORSTOCKSCAN_MICRO_ESTIMATOR_WS_OBSERVATION_ENABLED", "false")
+    manager = KiwoomWSManager("test-token")
+    manager.subscribed_codes = set(GOLDEN_CODES)
+    ticks = []
+    monkeypatch.setattr(
+        manager,
+        "_queue_tick_event",
+        lambda code, data, realtime_type="0B": ticks.append(
+            [code, realtime_type, _digest(_jsonable(data))]
+        ),
+    )
+    for frame in golden_frames():
+        clock["now"] = round(clock["now"] + 0.001, 6)
+        manager._apply_realtime_items(json.loads(frame)["data"])
+    return {
+        "realtime_data": {
+            code: _golden_target(manager.realtime_data.get(code))
+            for code in GOLDEN_CODES
+        },
+        "tick_events": ticks,
+    }
+
+
+def test_fid_plan_parser_matches_recorded_golden_output(monkeypatch):
+    expected = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+
+    actual = json.loads(json.dumps(run_golden_corpus(monkeypatch), sort_keys=True))
+
+    for code in GOLDEN_CODES:
+        assert actual["realtime_data"][code] == expected["realtime_data"][code], code
+    assert actual["tick_events"] == expected["tick_events"]
+
+
+def test_fid_plan_distinguishes_absent_from_unparseable_fields():
+    fields = parse_realtime_fields("0B", {"10": "-10100", "16": "bad", "15": "+7"})
+
+    assert fields.curr == 10100
+    assert fields.open is None
+    assert fields.high is MISSING
+    assert fields.signed_qty == 7
+    assert fields.signed_side == ("BUY", "signed_trade_volume_positive_auxiliary")
+
+    target = {"curr": 1, "open": 55, "high": 66}
+    apply_quote_fields(target, fields)
+    assert target == {"curr": 10100, "open": 55, "high": 66}
+    assert value_or(fields.high, -1) == -1
+
+    depth = parse_realtime_fields("0D", {"41": "+10120", "61": "", "51": "-1,0"})
+    assert depth.ask_prices[0] == 10120
+    assert depth.ask_volumes[0] is None
+    assert depth.bid_prices[0] == 0
+
+
+def test_fid_parse_benchmark_reports_per_tick_costs():
+    for realtime_type in ("0B", "0D"):
+        result = benchmark_fid_parse(realtime_type, iterations=20)
+        assert result["iterations"] == 20
+        assert result["parse_us_per_tick"] > 0
+        assert result["apply_us_per_tick"] > 0
@@ -0,0 +1,79 @@
+import threading
+
+import requests
+
+from src.engine.infrastructure.kiwoom_standin_server import (
+    KiwoomStandinServer,
+    StandinConfig,
+)
+from src.engine.kiwoom_websocket import KiwoomWSManager
+from src.utils import kiwoom_utils
+
+
+def _post(server, api_id, payload, **headers):
+    return requests.post(
+        f"{server.base_url}/api/dostk/mrkcond",
+        headers={"api-id": api_id, "authorization": "Bearer t", **headers},
+        json=payload,
+        timeout=5,
+    )
+
+
+def test_standin_rest_serves_paged_ranking_orderbook_and_rate_limits():
+    config = StandinConfig(symbol_count=45, rate_limits={"ka10004": 1.0})
+    with KiwoomStandinServer(config) as server:
+        pages = kiwoom_utils.fetch_kiwoom_api_continuous(
+            url=f"{server.base_url}/api/dostk/rkinfo",
+            token="t",
+            api_id="ka10027",
+            payload={"mrkt_tp": "000"},
+            use_continuous=True,
+            max_pages=10,
+        )
+        first = _post(server, "ka10004", {"stk_cd": "900001"})
+        limited = _post(server, "ka10004", {"stk_cd": "900001"})
+        minutes = _post(server, "ka10080", {"stk_cd": "900002"}).json()
+
+    assert [len(page["pred_pre_flu_rt_upper"]) for page in pages] == [20, 20, 5]
+    book = first.json()
+    assert first.status_code == 200 and book["return_code"] == 0
+    assert int(book["sel_fpr_bid"]) > int(book["buy_fpr_bid"])
+    assert limited.status_code == 429
+    assert len(minutes["stk_min_pole_chart_qry"]) >= 120
+
+
+def test_standin_ws_feeds_manager_and_pushes_order_notices(monkeypatch):
+    config = StandinConfig(symbol_count=5, tick_hz=50.0, fill_latency_ms=10.0)
+    with KiwoomStandinServer(config) as server:
+        monkeypatch.setenv("KORSTOCKSCAN_KIWOOM_WS_URI", server.ws_uri)
+        manager = KiwoomWSManager("test-token", publish_dashboard_snapshot=False)
+        manager.subscribed_codes = {"900001", "900002"}
+        notices = []
+        filled = threading.Event()
+
+        def on_notice(payload):
+            notices.append(payload)
+            if payload.get("status") == "체결":
+                filled.set()
+
+        manager.event_bus.subscribe("ORDER_NOTICE", on_notice)
+        manager.start()
+        try:
+            snapshot = manager.wait_for_data("900001", timeout=5.0, require_trade=True)
+            order = _post(
+                server,
+                "kt10000",
+                {"stk_cd": "900001", "ord_qty": "3", "ord_uv": "", "trde_tp": "3"},
+            ).json()
+            assert filled.wait(timeout=5.0)
+        finally:
+            manager.stop()
+            manager.event_bus.unsubscribe("ORDER_NOTICE", on_notice)
+        counters = server.snapshot()["counters"]
+
+    assert snapshot and snapshot.get("curr", 0) > 0
+    assert order["return_code"] == 0 and order["ord_no"]
+    assert {notice["order_no"] for notice in notices} == {order["ord_no"]}
+    assert [notice["status"] for notice in notices] == ["접수", "체결"]
+    assert counters["ws:LOGIN"] == 1
+    assert counters["ws:REG"] >= 3
@@ -0,0 +1,95 @@
+import threading
+
+from src.engine.infrastructure.kiwoom_tick_priority import (
+    ENTRY_ARMED,
+    HOLDING,
+    PENDING_ORDER,
+    WATCH,
+    TickPriorityLanes,
+    build_tick_priority_map,
+    classify_target,
+)
+from src.engine.kiwoom_websocket import KiwoomWSManager
+
+
+def test_classify_target_maps_active_target_state_to_priority_class():
+    assert classify_target({"status": "HOLDING"}) == HOLDING
+    assert classify_target({"status": "HOLDING", "scalp_live_simulator": True}) == WATCH
+    assert classify_target({"status": "SELL_ORDERED"}) == PENDING_ORDER
+    assert classify_target({"status": "WATCHING", "entry_armed_at_epoch": 1.0}) == (
+        ENTRY_ARMED
+    )
+    assert classify_target({"status": "WATCHING"}) == WATCH
+
+    priorities = build_tick_priority_map(
+        [
+            {"code": "000001", "status": "WATCHING"},
+            {"code": "000002", "status": "WATCHING", "entry_armed_at_epoch": 1.0},
+            {"code": "000002", "status": "HOLDING"},
+            {"code": "000003_NX", "status": "BUY_ORDERED"},
+        ]
+    )
+    assert priorities == {"000002": HOLDING, "000003": PENDING_ORDER}
+
+
+def test_lanes_serve_higher_classes_first_with_starvation_guard():
+    lanes = TickPriorityLanes(max_consecutive=2, max_wait_ms=1_000)
+    lanes.set_priorities({"H1": HOLDING, "H2": HOLDING, "H3": HOLDING})
+    for now_ns, key in enumerate(["W1", "H1", "W2", "H2", "H3"]):
+        lanes.push(key, now_ns=now_ns)
+    lanes.push("W1", now_ns=10)  # coalesced: keeps its original age
+
+    order = [lanes.pop(now_ns=100)[0] for _ in range(5)]
+
+    assert order == ["H1", "H2", "W1", "H3", "W2"]
+    assert lanes.pop() is None
+    snapshot = lanes.snapshot()["classes"]
+    assert snapshot["holding"]["dispatched"] == 3
+    assert snapshot["watch"]["starvation_picks"] == 1
+    assert sum(snapshot["watch"]["latency_histogram"].values()) == 2
+
+    aged = TickPriorityLanes(max_consecutive=100, max_wait_ms=0.001)
+    aged.push("W1", now_ns=0)
+    aged.set_priorities({"H1": HOLDING})
+    aged.push("H1", now_ns=5_000)
+    assert aged.pop(now_ns=5_000)[0] == "W1"
+
+
+def test_set_priorities_moves_queued_codes_between_lanes():
+    lanes = TickPriorityLanes(max_consecutive=100, max_wait_ms=1_000)
+    lanes.push("000001", now_ns=1)
+    lanes.push("000002", now_ns=2)
+
+    assert lanes.set_priorities({"000002": HOLDING}) is True
+    assert lanes.set_priorities({"000002": HOLDING}) is False
+    assert lanes.pop(now_ns=3) == ("000002", HOLDING)
+    assert lanes.pop(now_ns=3) == ("000001", WATCH)
+
+
+def test_manager_dispatches_holding_ticks_before_watch_burst(monkeypatch):
+    manager = KiwoomWSManager("test-token")
+    manager.set_tick_priorities({"000009": HOLDING})
+    published = []
+    done = threading.Event()
+
+    def publish(event_type, payload):
+        published.append(payload["code"])
+        if len(published) == 4:
+            done.set()
+
+    monkeypatch.setattr(manager.event_bus, "publish", publish)
+    for code in ("000001", "000002", "000003", "000009"):
+        manager._queue_tick_event(code, {"curr": 1000}, realtime_type="0w")
+    thread = threading.Thread(target=manager._dispatch_tick_events, daemon=True)
+    thread.start()
+    try:
+        assert done.wait(timeout=2.0)
+    finally:
+        manager._stop_event.set()
+        manager._tick_dispatch_event.set()
+        thread.join(timeout=2.0)
+
+    assert published == ["000009", "000001", "000002", "000003"]
+    snapshot = manager.get_tick_dispatch_snapshot()
+    assert snapshot["classes"]["holding"]["dispatched"] == 1
+    assert snapshot["classes"]["holding"]["members"] == 1
@@ -1,6 +1,8 @@
 import asyncio
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from types import SimpleNamespace
 
@@ -8,6 +10,8 @@ import pytest
 
 import src.engine.kiwoom_websocket as kiwoom_websocket
 from src.engine.kiwoom_websocket import KiwoomWSManager
+from src.engine.scalping.micro_estimator_arrays import MicroEstimatorArrayStore
+from src.engine.scalping.micro_estimator_state import MicroEstimatorStore
 
 
 class _FakeWS:
@@ -519,10 +523,11 @@ def test_realtime_0b_uses_fresh_synced_top_of_book_cache(monkeypatch):
     assert tick["best_bid"] == 10100
 
 
-def test_realtime_0d_updates_micro_estimator_store(monkeypatch):
+@pytest.mark.parametrize("store_class", [MicroEstimatorStore, MicroEstimatorArrayStore])
+def test_realtime_0d_updates_micro_estimator_store(monkeypatch, store_class):
     now = _epoch_at_090010()
     monkeypatch.setattr(kiwoom_websocket.time, "time", lambda: now)
-    store = kiwoom_websocket.MICRO_ESTIMATOR_STORE.__class__()
+    store = store_class()
     monkeypatch.setattr(kiwoom_websocket, "MICRO_ESTIMATOR_STORE", store)
     manager = KiwoomWSManager("test-token")
     manager.subscribed_codes = {"005930"}
@@ -1306,7 +1311,7 @@ def test_program_first_observation_closes_missing_provenance(monkeypatch):
     target["program_subscription_requested_at"] = 1000.0
     target["program_missing_reason"] = "program_0w_awaiting_first_observation"
     monkeypatch.setattr(kiwoom_websocket.time, "time", lambda: 1001.25)
-    monkeypatch.setattr(manager, "_maybe_write_dashboard_snapshot", lambda: None)
+    monkeypatch.setattr(manager, "_mark_dashboard_snapshot_dirty", lambda code: None)
 
     asyncio.run(
         manager._handle_message(
@@ -1393,9 +1398,7 @@ def test_send_reg_source_only_types_are_limited_to_0b_and_0d(monkeypatch):
     assert payload["refresh"] == "1"
     assert [row["type"] for row in payload["data"]] == [["0B"], ["0D"]]
     assert all(row["item"] == ["039490_NX"] for row in payload["data"])
-    assert not manager.realtime_data["039490"].get(
-        "program_subscription_requested_at"
-    )
+    assert not manager.realtime_data["039490"].get("program_subscription_requested_at")
 
 
 def test_send_reg_uses_single_effective_route_by_default(monkeypatch):
@@ -1559,9 +1562,7 @@ def test_execute_unsubscribe_retains_micro_collection_as_source_only(monkeypatch
     manager = KiwoomWSManager("test-token")
     manager.subscribed_codes = {"111111"}
     manager._registered_items_by_code = {"111111": ("111111_AL",)}
-    manager._micro_reversion_observation_items_by_code = {
-        "111111": "111111_AL"
-    }
+    manager._micro_reversion_observation_items_by_code = {"111111": "111111_AL"}
     manager.realtime_data = {"111111": {"curr": 1000}}
 
     manager.execute_unsubscribe(["111111"])
@@ -1578,9 +1579,7 @@ def test_widget_observation_registration_is_not_reclassified_as_micro_only(
     manager = KiwoomWSManager("test-token")
     manager.subscribed_codes = {"005930"}
     manager._registered_items_by_code = {"005930": ("005930_AL",)}
-    manager._micro_reversion_observation_items_by_code = {
-        "005930": "005930_AL"
-    }
+    manager._micro_reversion_observation_items_by_code = {"005930": "005930_AL"}
 
     manager.execute_unsubscribe(["005930"])
 
@@ -1594,9 +1593,7 @@ def test_micro_collection_demotion_replaces_route_with_source_only_types(monkeyp
     manager.loop = SimpleNamespace(is_running=lambda: True)
     manager.subscribed_codes = {"111111"}
     manager._registered_items_by_code = {"111111": ("111111",)}
-    manager._micro_reversion_observation_items_by_code = {
-        "111111": "111111_AL"
-    }
+    manager._micro_reversion_observation_items_by_code = {"111111": "111111_AL"}
     captured = []
 
     def fake_send_reg(codes, **kwargs):
@@ -1631,9 +1628,7 @@ def test_micro_collection_demotion_replaces_route_with_source_only_types(monkeyp
 
 def test_micro_collection_set_rotation_removes_old_source_only_code(monkeypatch):
     manager = KiwoomWSManager("test-token")
-    manager._micro_reversion_observation_items_by_code = {
-        "111111": "111111_AL"
-    }
+    manager._micro_reversion_observation_items_by_code = {"111111": "111111_AL"}
     manager._micro_reversion_observation_only_codes = {"111111"}
     manager.subscribed_codes = {"111111"}
     manager._registered_items_by_code = {"111111": ("111111_AL",)}
@@ -1658,9 +1653,7 @@ def test_micro_collection_set_rotation_removes_old_source_only_code(monkeypatch)
     assert subscribed[0][0] == ["222222_NX"]
     assert subscribed[0][1]["realtime_types"] == ("0B", "0D")
     assert subscribed[0][1]["observation_only"] is True
-    assert manager._micro_reversion_observation_items_by_code == {
-        "222222": "222222_NX"
-    }
+    assert manager._micro_reversion_observation_items_by_code == {"222222": "222222_NX"}
 
 
 def test_micro_collection_set_does_not_race_boot_runtime_registration(monkeypatch):
@@ -1690,9 +1683,7 @@ def test_real_subscription_stays_source_only_until_replacement_reg_is_sent():
     manager = KiwoomWSManager("test-token")
     manager._started = True
     manager.subscribed_codes = {"111111"}
-    manager._micro_reversion_observation_items_by_code = {
-        "111111": "111111_AL"
-    }
+    manager._micro_reversion_observation_items_by_code = {"111111": "111111_AL"}
     manager._micro_reversion_observation_only_codes = {"111111"}
 
     manager.execute_subscribe(["111111"], source="scanner_runtime_target_attach")
@@ -1745,9 +1736,7 @@ def test_real_subscription_requests_source_only_route_replacement(monkeypatch):
     manager.loop = SimpleNamespace(is_running=lambda: True)
     manager.subscribed_codes = {"111111"}
     manager._registered_items_by_code = {"111111": ("111111_NX",)}
-    manager._micro_reversion_observation_items_by_code = {
-        "111111": "111111_NX"
-    }
+    manager._micro_reversion_observation_items_by_code = {"111111": "111111_NX"}
     manager._micro_reversion_observation_only_codes = {"111111"}
     captured = []
 
@@ -2858,3 +2847,72 @@ def test_remove_before_reg_string_false_does_not_send_remove(monkeypatch):
 
     payloads = [json.loads(payload) for payload in fake_ws.sent]
     assert [payload["trnm"] for payload in payloads] == ["REG"]
+
+
+def _realtime_item(code, realtime_type, values):
+    return {"type": realtime_type, "item": code, "values": values}
+
+
+def test_wait_for_data_wakes_on_matching_frame_without_polling(monkeypatch):
+    manager = KiwoomWSManager("test-token")
+    manager.subscribed_codes = {"005930", "000660"}
+    snapshot_calls = []
+    original_snapshot = manager._snapshot_target
+    monkeypatch.setattr(
+        manager,
+        "_snapshot_target",
+        lambda target: snapshot_calls.append(1) or original_snapshot(target),
+    )
+    result = {}
+
+    def wait():
+        result["data"] = manager.wait_for_data("005930", timeout=5.0)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    deadline = time.monotonic() + 2.0
+    while "005930" not in manager._data_arrival_waiters:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    assert snapshot_calls == []
+
+    manager._apply_realtime_items([_realtime_item("000660", "0B", {"10": "180500"})])
+    assert waiter.is_alive()
+    manager._apply_realtime_items([_realtime_item("005930", "0B", {"10": "70100"})])
+    waiter.join(timeout=1.0)
+
+    assert not waiter.is_alive()
+    assert result["data"]["curr"] == 70100
+    assert manager._data_arrival_waiters == {}
+
+
+def test_wait_for_any_returns_first_ready_codes_for_requested_types(monkeypatch):
+    manager = KiwoomWSManager("test-token")
+    manager.subscribed_codes = {"005930", "000660", "035420"}
+    manager._apply_realtime_items([_realtime_item("035420", "0D", {"41": "+200"})])
+    result = {}
+
+    def wait():
+        result["ready"] = manager.wait_for_any(
+            ["005930", "000660", "035420"], types=("0B",), timeout=5.0
+        )
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    deadline = time.monotonic() + 2.0
+    while len(manager._data_arrival_waiters) < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    manager._apply_realtime_items([_realtime_item("005930", "0D", {"41": "+70200"})])
+    assert waiter.is_alive()
+    manager._apply_realtime_items([_realtime_item("000660", "0B", {"10": "180500"})])
+    waiter.join(timeout=1.0)
+
+    assert not waiter.is_alive()
+    assert list(result["ready"]) == ["000660"]
+    assert result["ready"]["000660"]["curr"] == 180500
+    assert manager.wait_for_any(["005930"], types=("0B",), timeout=0.01) == {}
+    assert manager.wait_for_any(["035420", "005930"], timeout=0.0).keys() == {
+        "035420",
+        "005930",
+    }
@@ -0,0 +1,118 @@
+import json
+import threading
+
+from src.engine.kiwoom_websocket import KiwoomWSManager
+from src.engine.infrastructure.kiwoom_ws_frame_pipeline import (
+    KiwoomWSFramePipeline,
+    WSFramePipelineConfig,
+)
+
+
+def _real_frame(*items):
+    return json.dumps(
+        {
+            "trnm": "REAL",
+            "data": [
+                {"type": realtime_type, "item": code, "values": {"10": str(price)}}
+                for code, realtime_type, price in items
+            ],
+        }
+    )
+
+
+def test_pipeline_keeps_per_symbol_order_and_hands_control_frames_back():
+    applied = []
+    applied_lock = threading.Lock()
+    controls = []
+
+    def apply_items(items):
+        with applied_lock:
+            applied.extend((item["item"], item["values"]["10"]) for item in items)
+
+    pipeline = KiwoomWSFramePipeline(
+        apply_items=apply_items,
+        handle_control=controls.append,
+        shard_key=lambda item: item.get("item", ""),
+        config=WSFramePipelineConfig(shard_count=3, queue_maxsize=64),
+    )
+    pipeline.start()
+    try:
+        for price in range(20):
+            assert pipeline.submit_nowait(
+                _real_frame(("005930", "0B", price), ("000660", "0D", price))
+            )
+        ping = json.dumps({"trnm": "PING"})
+        assert pipeline.submit_nowait(ping)
+        assert pipeline.drain(timeout=2.0)
+    finally:
+        pipeline.stop()
+
+    for code in ("005930", "000660"):
+        prices = [int(price) for item, price in applied if item == code]
+        assert prices == list(range(20))
+    assert controls == [ping]
+    snapshot = pipeline.snapshot()
+    assert snapshot["received"] == 21
+    assert snapshot["routed_real_frames"] == 20
+    assert snapshot["control_frames"] == 1
+    assert snapshot["applied_items"] == 40
+    assert snapshot["receive_to_apply_lag_ms"]["count"] == snapshot["applied_batches"]
+    assert snapshot["backlog"] == 0
+
+
+def test_pipeline_reports_backpressure_and_rate_limited_backlog_alarm():
+    release = threading.Event()
+    alarms = []
+    pipeline = KiwoomWSFramePipeline(
+        apply_items=lambda items: release.wait(2.0),
+        handle_control=lambda frame: None,
+        shard_key=lambda item: item.get("item", ""),
+        config=WSFramePipelineConfig(
+            shard_count=1,
+            queue_maxsize=2,
+            backlog_alarm_depth=2,
+            backlog_alarm_lag_ms=10_000,
+        ),
+        alarm_callback=alarms.append,
+    )
+
+    accepted = [
+        pipeline.submit_nowait(_real_frame(("005930", "0B", price)))
+        for price in range(3)
+    ]
+    assert accepted == [True, True, False]
+    pipeline.start()
+    try:
+        for price in range(3, 6):
+            pipeline.put(_real_frame(("005930", "0B", price)), 0.0)
+        release.set()
+        assert pipeline.drain(timeout=3.0)
+    finally:
+        pipeline.stop()
+
+    snapshot = pipeline.snapshot()
+    assert snapshot["receive_backpressure"] == 1
+    assert snapshot["applied_items"] == 5
+    assert snapshot["backlog_alarms"] == 1
+    assert len(alarms) == 1
+    assert alarms[0].startswith("[WS_FRAME_BACKLOG_ALARM]")
+
+
+def test_manager_applies_realtime_frames_through_pipeline(monkeypatch):
+    monkeypatch.setenv("KORSTOCKSCAN_WS_FRAME_PIPELINE_ENABLED", "true")
+    monkeypatch.setenv("KORSTOCKSCAN_WS_FRAME_PIPELINE_SHARDS", "2")
+    manager = KiwoomWSManager("test-token")
+    manager.subscribed_codes = {"005930", "000660"}
+    manager._start_ws_frame_pipeline()
+    pipeline = manager._ws_frame_pipeline
+    try:
+        pipeline.submit_nowait(_real_frame(("005930", "0B", 70100)))
+        pipeline.submit_nowait(_real_frame(("000660", "0B", 180500)))
+        pipeline.submit_nowait(_real_frame(("005930", "0B", 70200)))
+        assert pipeline.drain(timeout=2.0)
+    finally:
+        manager._stop_ws_frame_pipeline()
+
+    assert manager.get_latest_data("005930")["curr"] == 70200
+    assert manager.get_latest_data("000660")["curr"] == 180500
+    assert manager.get_ws_frame_pipeline_snapshot() == {"enabled": False}
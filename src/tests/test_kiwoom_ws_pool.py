@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+from src.engine.infrastructure.kiwoom_standin_server import (
+    KiwoomStandinServer,
+    StandinConfig,
+)
+from src.engine.infrastructure.kiwoom_tick_priority import HOLDING, WATCH
+from src.engine.infrastructure.kiwoom_ws_pool import WSPoolShardPlanner
+from src.engine.kiwoom_websocket import KiwoomWSManager
+
+
+def test_planner_spreads_classes_enforces_budget_and_releases_on_down():
+    planner = WSPoolShardPlanner(3)
+    for slot in range(3):
+        planner.mark_up(slot)
+
+    holding_slots = {
+        planner.assign(code, 1, HOLDING, max_items=2)
+        for code in ("000001", "000002", "000003")
+    }
+    watch_slots = [
+        planner.assign(code, 1, WATCH, max_items=2)
+        for code in ("000004", "000005", "000006", "000007")
+    ]
+
+    assert holding_slots == {0, 1, 2}
+    assert watch_slots[:3].count(None) == 0 and watch_slots[3] is None
+    assert planner.assign("000001", 1, HOLDING, max_items=2) == planner.slot_for(
+        "000001"
+    )
+    assert planner.assign("000007", 1, WATCH, max_items=2, enforce=False) is not None
+
+    dropped_slot = planner.slot_for("000002")
+    orphans = planner.mark_down(dropped_slot)
+    assert "000002" in orphans
+    assert all(planner.slot_for(code) is None for code in orphans)
+    assert planner.assign("000002", 1, HOLDING, max_items=0) != dropped_slot
+    snapshot = planner.snapshot(max_items=2)
+    assert snapshot["healthy"] == 2
+    assert snapshot["connections"][dropped_slot]["disconnects"] == 1
+
+
+def _wait_until(predicate, timeout=8.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_pool_shards_registrations_across_connections_and_rebalances(monkeypatch):
+    codes = ["900001", "900002", "900003", "900004"]
+    config = StandinConfig(symbol_count=6, tick_hz=50.0, max_registered_items=2)
+    with KiwoomStandinServer(config) as server:
+        monkeypatch.setenv("KORSTOCKSCAN_KIWOOM_WS_URI", server.ws_uri)
+        monkeypatch.setenv("KORSTOCKSCAN_WS_POOL_SIZE", "3")
+        monkeypatch.setenv("KORSTOCKSCAN_WS_MAX_REG_ITEMS", "2")
+        monkeypatch.setenv("KORSTOCKSCAN_WS_REG_RECENT_TTL_SEC", "0")
+        manager = KiwoomWSManager("test-token", publish_dashboard_snapshot=False)
+        manager.start()
+        try:
+            assert _wait_until(lambda: manager.get_ws_pool_snapshot()["healthy"] == 3)
+            manager.execute_subscribe(codes, source="pool_test")
+            assert _wait_until(
+                lambda: len(manager.wait_for_any(codes, timeout=0.1)) == 4
+            )
+            before = manager.get_ws_pool_snapshot()
+
+            dropped = next(
+                slot for slot in (1, 2) if before["connections"][slot]["codes"] > 0
+            )
+            moved = manager._ws_pool.codes_for(dropped)
+            asyncio.run_coroutine_threadsafe(
+                manager._ws_pool_sockets[dropped].close(), manager.loop
+            ).result(timeout=2.0)
+            assert _wait_until(
+                lambda: all(
+                    manager._ws_pool.slot_for(code) not in (None, dropped)
+                    for code in moved
+                )
+            )
+            moved_at = time.time()
+            assert _wait_until(
+                lambda: all(
+                    (manager.get_latest_data(code) or {}).get("last_ws_update_ts", 0)
+                    > moved_at
+                    for code in moved
+                )
+            )
+            after = manager.get_ws_pool_snapshot()
+        finally:
+            manager.stop()
+        counters = server.snapshot()["counters"]
+
+    assert sorted(row["items"] for row in before["connections"]) == [1, 1, 2]
+    assert all(row["items"] <= 2 for row in after["connections"])
+    assert after["connections"][dropped]["disconnects"] == 1
+    assert after["connections"][dropped]["rebalanced_codes"] == len(moved)
+    assert counters.get("ws_reg_items_rejected", 0) == 0
+
+
+class _DropOnSend:
+    """Pool socket stand-in that closes the real socket on its first send."""
+
+    def __init__(self, ws):
+        self.ws = ws
+
+    async def send(self, payload):
+        await self.ws.close()
+        await self.ws.send(payload)
+
+
+def test_pool_resends_codes_of_connection_dropped_mid_reg(monkeypatch):
+    codes = ["900001", "900002", "900003", "900004"]
+    config = StandinConfig(symbol_count=6, tick_hz=50.0, max_registered_items=2)
+    with KiwoomStandinServer(config) as server:
+        monkeypatch.setenv("KORSTOCKSCAN_KIWOOM_WS_URI", server.ws_uri)
+        monkeypatch.setenv("KORSTOCKSCAN_WS_POOL_SIZE", "3")
+        monkeypatch.setenv("KORSTOCKSCAN_WS_MAX_REG_ITEMS", "2")
+        monkeypatch.setenv("KORSTOCKSCAN_WS_REG_RECENT_TTL_SEC", "0")
+        manager = KiwoomWSManager("test-token", publish_dashboard_snapshot=False)
+        dropped = []
+        ws_for_slot = manager._ws_for_slot
+
+        def drop_first_secondary(slot):
+            ws = ws_for_slot(slot)
+            if ws and slot not in (None, 0) and not dropped:
+                dropped.append(slot)
+                return _DropOnSend(ws)
+            return ws
+
+        monkeypatch.setattr(manager, "_ws_for_slot", drop_first_secondary)
+        manager.start()
+        try:
+            assert _wait_until(lambda: manager.get_ws_pool_snapshot()["healthy"] == 3)
+            manager.execute_subscribe(codes, source="pool_test")
+            assert _wait_until(
+                lambda: len(manager.wait_for_any(codes, timeout=0.1)) == 4
+            )
+            snapshot = manager.get_ws_pool_snapshot()
+        finally:
+            manager.stop()
+
+    assert dropped
+    assert set(codes) <= manager.subscribed_codes
+    assert not manager._ws_pool_unsent_codes
+    assert snapshot["connections"][dropped[0]]["disconnects"] == 1
+    assert snapshot["connections"][dropped[0]]["rebalanced_codes"] >= 1
@@ -0,0 +1,93 @@
+import json
+
+import src.engine.bd_fbuy_accum_pre_scanner as pre_scanner
+from src.engine.infrastructure.kiwoom_ws_snapshot_store import (
+    WSSnapshotPublisher,
+    WSSnapshotSlotFile,
+    read_ws_snapshot_row,
+)
+
+
+def _target(curr, ts):
+    return {
+        "curr": curr,
+        "last_ws_update_ts": ts,
+        "received_types": {"0B"},
+        "last_realtime_type_ts": {"0B": ts},
+        "last_realtime_type_item": {"0B": "005930"},
+        "last_trade_tick": {"ts": ts, "price": curr, "volume": 1},
+    }
+
+
+def test_publisher_rewrites_only_dirty_slots_and_throttles_json(monkeypatch, tmp_path):
+    monkeypatch.setattr(pre_scanner, "WS_SNAPSHOT_PATH", tmp_path / "latest.json")
+    live = {"005930": _target(70100, 1000.0), "000660": _target(180500, 1000.0)}
+    built = []
+
+    def build_row(code):
+        built.append(code)
+        target = live.get(code)
+        return pre_scanner.build_ws_snapshot_row(target) if target else None
+
+    publisher = WSSnapshotPublisher(
+        build_row=build_row,
+        write_json=pre_scanner.write_ws_snapshot_rows,
+        interval_sec=0.5,
+        json_interval_sec=5.0,
+        slot_file=WSSnapshotSlotFile(tmp_path, slot_size=1024, capacity=1),
+    )
+    publisher.slot_file.open()
+    try:
+        publisher.mark_dirty("005930")
+        publisher.mark_dirty("000660")
+        assert publisher.publish(now_ts=1001.0) == 2
+
+        live["005930"] = _target(70200, 1001.5)
+        publisher.mark_dirty("005930")
+        built.clear()
+        assert publisher.publish(now_ts=1002.0) == 1
+        assert built == ["005930"]
+
+        row, published_at = read_ws_snapshot_row("005930", directory=tmp_path)
+        assert row["curr"] == 70200
+        assert row["last_trade_tick"]["ts"] == 1001.5
+        assert published_at == 1002.0
+        assert read_ws_snapshot_row("000660", directory=tmp_path)[0]["curr"] == 180500
+        assert publisher.slot_file.capacity == 2
+
+        payload = json.loads((tmp_path / "latest.json").read_text(encoding="utf-8"))
+        assert payload["generated_at_epoch"] == 1001.0
+        assert payload["stocks"]["005930"]["curr"] == 70100
+        assert payload["stocks"]["005930"]["last_0b_age_ms"] == 1000.0
+
+        del live["000660"]
+        publisher.mark_dirty("000660")
+        publisher.publish(now_ts=1006.5)
+        assert read_ws_snapshot_row("000660", directory=tmp_path) is None
+        payload = json.loads((tmp_path / "latest.json").read_text(encoding="utf-8"))
+        assert set(payload["stocks"]) == {"005930"}
+        assert payload["stocks"]["005930"]["curr"] == 70200
+        assert publisher.snapshot()["json_writes"] == 2
+    finally:
+        publisher.slot_file.close()
+
+
+def test_slot_file_trims_oversized_rows_and_reader_ignores_unknown_codes(tmp_path):
+    slot_file = WSSnapshotSlotFile(tmp_path, slot_size=256, capacity=4)
+    slot_file.open()
+    try:
+        slot_file.write_row(
+            "005930",
+            {
+                "curr": 70100,
+                "last_realtime_type_item": {str(i): "x" * 20 for i in range(20)},
+            },
+        )
+    finally:
+        slot_file.close()
+
+    row, _published_at = read_ws_snapshot_row("005930", directory=tmp_path)
+    assert row == {"curr": 70100, "slot_overflow": True}
+    assert slot_file.overflow_rows == 1
+    assert read_ws_snapshot_row("000660", directory=tmp_path) is None
+    assert read_ws_snapshot_row("005930", directory=tmp_path / "missing") is None
@@ -0,0 +1,81 @@
+import threading
+
+from src.engine.kiwoom_websocket import KiwoomWSManager
+from src.engine.infrastructure.kiwoom_ws_symbol_locks import (
+    InstrumentedLock,
+    SymbolLockStripes,
+)
+
+
+def test_instrumented_lock_counts_contention_hold_time_and_timeouts():
+    lock = InstrumentedLock("probe")
+    holder_ready = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with lock:
+            holder_ready.set()
+            release.wait(2.0)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert holder_ready.wait(2.0)
+    assert lock.acquire(timeout=0.001) is False
+    threading.Timer(0.02, release.set).start()
+    with lock:
+        pass
+    holder.join(2.0)
+
+    snapshot = lock.snapshot()
+    assert snapshot["acquisitions"] == 2
+    assert snapshot["contended"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms_max"] > 0
+    assert snapshot["hold_ms_max"] >= snapshot["wait_ms_max"] * 0.5
+
+
+def test_symbol_stripes_group_codes_once_per_stripe():
+    stripes = SymbolLockStripes(4)
+    codes = [f"{index:06d}" for index in range(40)]
+
+    grouped = stripes.group(codes)
+
+    assert len(grouped) <= 4
+    assert sorted(code for _lock, group in grouped for code in group) == codes
+    for lock, group in grouped:
+        assert all(stripes.for_code(code) is lock for code in group)
+
+
+def test_busy_symbol_stripe_does_not_block_other_symbols(monkeypatch):
+    monkeypatch.setenv("KORSTOCKSCAN_WS_SYMBOL_LOCK_STRIPES", "8")
+    manager = KiwoomWSManager("test-token")
+    stripes = manager._symbol_locks
+    busy_code = "005930"
+    free_code = next(
+        f"{index:06d}"
+        for index in range(1, 1000)
+        if stripes.stripe_index(f"{index:06d}") != stripes.stripe_index(busy_code)
+    )
+    manager.subscribed_codes = {busy_code, free_code}
+    manager._apply_realtime_items(
+        [{"type": "0B", "item": busy_code, "values": {"10": "70100"}}]
+    )
+
+    with manager._symbol_lock(busy_code):
+        applier = threading.Thread(
+            target=manager._apply_realtime_items,
+            args=([{"type": "0B", "item": free_code, "values": {"10": "9100"}}],),
+        )
+        applier.start()
+        applier.join(2.0)
+        assert not applier.is_alive()
+        with manager.lock:
+            snapshots = manager.get_all_data([busy_code, free_code], lock_timeout=0.005)
+
+    assert snapshots[busy_code] == {}
+    assert snapshots[free_code]["curr"] == 9100
+    assert manager.get_latest_data(busy_code)["curr"] == 70100
+    contention = manager.get_lock_contention_snapshot()
+    assert contention["symbol_locks"]["stripe_count"] == 8
+    assert contention["symbol_locks"]["timeouts"] == 1
+    assert contention["subscription_lock"]["name"] == "subscription"
@@ -698,6 +698,7 @@ def test_ws_raw_sink_receives_every_tick_before_latest_tick_coalescing(monkeypat
     manager.lock = threading.Lock()
     manager._tick_lock = threading.Lock()
     manager._pending_tick_events = {}
+    manager._tick_lanes = kiwoom_websocket.TickPriorityLanes()
     manager._tick_dispatch_event = threading.Event()
     manager._micro_reversion_forward_collector = None
     manager._micro_reversion_observation_only_codes = set()
@@ -0,0 +1,175 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.engine.scalping.micro_estimator_arrays import (
+    MicroEstimatorArrayStore,
+    WSQuoteBatch,
+    benchmark_micro_estimator_stores,
+)
+from src.engine.scalping.micro_estimator_state import (
+    MicroEstimatorConfig,
+    MicroEstimatorStore,
+    _build_default_store,
+)
+
+
+def _random_quote(rng: random.Random, price: int):
+    if rng.random() < 0.05:
+        return ["bad-payload"]
+    quote = {
+        "best_bid": price if rng.random() < 0.9 else None,
+        "best_ask": price + 10,
+        "best_bid_qty": rng.choice((0, 1, 50, 900)),
+        "best_ask_qty": rng.choice((0, 1, 50, 900)),
+        "quote_age_ms": rng.choice((None, 20.0, 2_999.0, 3_000.0, 3_500.0, "-")),
+    }
+    if rng.random() < 0.5:
+        quote["bid_tot"] = rng.choice((0, 5_000, 12_000))
+        quote["ask_tot"] = rng.choice((0, 4_000, 20_000))
+    if rng.random() < 0.1:
+        quote["source_quality_state"] = "ws_stale_quote"
+    if rng.random() < 0.1:
+        quote["quote_stale"] = rng.choice(("true", "0", 1, "STALE "))
+    return quote
+
+
+def _assert_snapshots_match(expected: dict, actual: dict) -> None:
+    assert list(actual) == list(expected)
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert actual[key] == pytest.approx(value, rel=1e-12, abs=1e-15), key
+        else:
+            assert actual[key] == value, key
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("capacity", [(80, 200), (2, 3)])
+def test_array_store_matches_per_symbol_store(seed, capacity):
+    rng = random.Random(seed)
+    config = MicroEstimatorConfig(
+        max_hot_symbols=capacity[0],
+        max_warm_symbols=capacity[1],
+        hot_ttl_sec=90.0,
+        warm_ttl_sec=30.0,
+        half_life_sec=20.0,
+    )
+    scalar = MicroEstimatorStore(config)
+    arrays = MicroEstimatorArrayStore(config, capacity=2)
+    symbols = [f"{index:06d}" for index in range(1, 9)]
+    prices = {symbol: 10_000 for symbol in symbols}
+    now_ts = 1_000.0
+    for _ in range(40):
+        now_ts += rng.choice((0.0, 0.5, 3.0, 25.0, 60.0))
+        tier = rng.choice(("hot", "warm"))
+        action = rng.random()
+        if action < 0.6:
+            quotes = []
+            for symbol in rng.sample(symbols, rng.randint(1, 5)):
+                for _ in range(rng.choice((1, 1, 2))):
+                    prices[symbol] += rng.choice((-10, 0, 10))
+                    quotes.append((symbol, _random_quote(rng, prices[symbol])))
+            for symbol, quote in quotes:
+                scalar.update_from_ws_quote(symbol, quote, now_ts=now_ts, tier=tier)
+            arrays.update_ws_quotes(
+                WSQuoteBatch.from_quotes(quotes), now_ts=now_ts, tier=tier
+            )
+        elif action < 0.75:
+            symbol = rng.choice(symbols)
+            orderbook = {
+                "best_bid": prices[symbol],
+                "best_ask": prices[symbol] + 10,
+                "best_bid_qty": rng.choice((0, 100, 700)),
+                "best_ask_qty": rng.choice((0, 100, 300)),
+            }
+            expected = scalar.update_from_rest_orderbook(
+                symbol, orderbook, now_ts=now_ts, tier=tier
+            )
+            actual = arrays.update_from_rest_orderbook(
+                symbol, orderbook, now_ts=now_ts, tier=tier
+            )
+            if symbol in scalar._states:
+                assert actual.sample_count == expected.sample_count
+        elif action < 0.9:
+            symbol = rng.choice(symbols)
+            probe = {
+                "buy_pressure_10t": rng.choice((None, 40.0, 70.0)),
+                "net_aggressive_delta_10t": rng.choice((0, -900, 2_500)),
+            }
+            observed = rng.choice((None, now_ts - 5.0))
+            for store in (scalar, arrays):
+                store.update_from_feature_probe(
+                    symbol, probe, {}, now_ts=now_ts, observed_ts=observed, tier=tier
+                )
+        else:
+            symbol = rng.choice(symbols)
+            scalar.mark_candidate(symbol, tier=tier, now_ts=now_ts)
+            arrays.mark_candidate(symbol, tier=tier, now_ts=now_ts)
+
+        assert set(arrays._rows) == set(scalar._states)
+        assert arrays.state_count_by_tier() == scalar.state_count_by_tier()
+        snapshot_ts = now_ts + rng.choice((0.0, 10.0, 45.0))
+        batch = arrays.snapshot_many(symbols + ["", "999999"], now_ts=snapshot_ts)
+        assert list(batch) == symbols + ["", "999999"]
+        for symbol in symbols + ["999999"]:
+            _assert_snapshots_match(
+                scalar.snapshot(symbol, now_ts=snapshot_ts), batch[symbol]
+            )
+    for symbol, state in scalar._states.items():
+        materialized = arrays.state(symbol)
+        assert materialized.tier == state.tier
+        assert materialized.source_state == state.source_state
+        assert materialized.true_ofi_sample_count == state.true_ofi_sample_count
+
+
+def test_ws_batch_parses_mapping_rules_and_checks_column_shapes():
+    batch = WSQuoteBatch.from_quotes(
+        [
+            ("000001", {"bid1_qty": "120", "ask_qty": 0, "ask_total": "3,000"}),
+            ("000002", None),
+            ("000003", {"quote_stale": "True", "quote_age_ms": "250"}),
+        ]
+    )
+
+    assert len(batch) == 3
+    assert batch.bid_size.tolist() == [120.0, 0.0, 0.0]
+    assert batch.ask_total.tolist() == [0.0, 0.0, 0.0]
+    assert batch.quote_age_ms.tolist() == [0.0, 0.0, 250.0]
+    assert batch.stale.tolist() == [False, False, True]
+    with pytest.raises(ValueError, match="one value per symbol"):
+        WSQuoteBatch(
+            symbols=("000001",),
+            bid_price=np.zeros(2),
+            ask_price=np.zeros(1),
+            bid_size=np.zeros(1),
+            ask_size=np.zeros(1),
+            bid_total=np.zeros(1),
+            ask_total=np.zeros(1),
+            quote_age_ms=np.zeros(1),
+            stale=np.zeros(1, dtype=bool),
+        )
+    with pytest.raises(ValueError, match="symbol is required"):
+        MicroEstimatorArrayStore().update_ws_quotes(
+            WSQuoteBatch.from_quotes([(" ", {"best_bid_qty": 1})]), now_ts=1.0
+        )
+
+
+def test_array_store_benchmark_reports_parity_and_speedup():
+    report = benchmark_micro_estimator_stores((50, 200), cycles=3)
+
+    assert [row["symbols"] for row in report["rows"]] == [50, 200]
+    for row in report["rows"]:
+        assert row["max_abs_diff"] <= 1e-12
+        assert row["batch_update_ms_per_cycle"] > 0
+        assert row["snapshot_many_ms_per_cycle"] > 0
+
+
+def test_default_store_is_array_backed_only_when_opted_in(monkeypatch):
+    monkeypatch.delenv(
+        "KORSTOCKSCAN_MICRO_ESTIMATOR_ARRAY_STORE_ENABLED", raising=False
+    )
+    assert type(_build_default_store()) is MicroEstimatorStore
+
+    monkeypatch.setenv("KORSTOCKSCAN_MICRO_ESTIMATOR_ARRAY_STORE_ENABLED", "1")
+    assert isinstance(_build_default_store(), MicroEstimatorArrayStore)
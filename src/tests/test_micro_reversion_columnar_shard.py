@@ -0,0 +1,144 @@
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from src.engine.scalping.micro_reversion.columnar_shard import (
+    COLUMNAR_MANIFEST_SCHEMA,
+    ColumnarShardReader,
+    columnar_partition_files,
+    convert_partition_to_columnar,
+    main,
+    write_columnar_shard,
+)
+from src.engine.scalping.micro_reversion.depth_join import read_depth_rows
+from src.engine.scalping.micro_reversion.path_journal import MarketDepthPoint
+
+
+def _depth_row(symbol: str, second: int, sequence: int) -> dict:
+    received = f"2026-08-08T09:00:{second:02d}.250+09:00"
+    return MarketDepthPoint(
+        symbol=symbol,
+        exchange_timestamp=received,
+        local_receive_timestamp=received,
+        source_sequence=sequence,
+        sequence_epoch=123,
+        series_sequence=sequence,
+        venue="KRX",
+        session_bucket="KRX_REGULAR",
+        item=symbol,
+        orderbook_time_raw=f"0900{second:02d}000",
+        best_bid=10_000 + sequence,
+        best_ask=10_010 + sequence,
+        best_bid_qty=200,
+        best_ask_qty=100,
+        bid_depth=400,
+        ask_depth=300,
+        bid_levels=((1, 10_000 + sequence, 200), (2, 9_990, 200)),
+        ask_levels=((1, 10_010 + sequence, 100), (2, 10_100, 200)),
+        route_depth_totals={
+            "combined": {"ask": 300, "bid": 400},
+            "KRX": {"ask": 300, "bid": 400},
+            "NXT": {"ask": None, "bid": None},
+        },
+    ).as_dict()
+
+
+def _write_partition(tmp_path):
+    partition = (
+        tmp_path
+        / "trade_date=2026-08-08"
+        / "venue=KRX"
+        / "session=KRX_REGULAR"
+        / "market_depth_stream.jsonl"
+    )
+    partition.parent.mkdir(parents=True)
+    rows = [
+        _depth_row(symbol, second, sequence)
+        for sequence, second in enumerate(range(0, 20), start=1)
+        for symbol in ("000001", "000002")
+    ]
+    encoded = [json.dumps(row, ensure_ascii=False, sort_keys=True) for row in rows]
+    with gzip.open(partition.with_suffix(".jsonl.gz"), "wt", encoding="utf-8") as fh:
+        fh.write("\n".join(encoded[:24]) + "\n")
+    partition.with_name("market_depth_stream.part-000001.jsonl").write_text(
+        "\n".join(encoded[24:]) + "\n", encoding="utf-8"
+    )
+    return partition, [json.loads(line) for line in encoded]
+
+
+def test_converted_partition_round_trips_rows_and_slices_arrays(tmp_path):
+    partition, rows = _write_partition(tmp_path)
+
+    manifest_path = convert_partition_to_columnar(partition, block_rows=10)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    shards = columnar_partition_files(partition)
+
+    assert manifest["schema"] == COLUMNAR_MANIFEST_SCHEMA
+    assert manifest["row_schema"] == rows[0]["schema"]
+    assert manifest["broker_order_forbidden"] is True
+    assert [shard["rows"] for shard in manifest["shards"]] == [24, 16]
+    assert [path.name for path in shards] == [
+        "market_depth_stream.mrcol",
+        "market_depth_stream.part-000001.mrcol",
+    ]
+    assert list(read_depth_rows(shards)) == rows
+
+    start_us = 1_786_147_205_000_000  # 2026-08-08T09:00:05+09:00
+    end_us = 1_786_147_209_000_000
+    with ColumnarShardReader(shards[0]) as reader:
+        assert reader.verify()
+        assert len(reader.blocks) == 3
+        arrays = reader.read_arrays(
+            symbol="000002",
+            start_us=start_us,
+            end_us=end_us,
+            columns=["source_sequence", "best_bid", "_receive_us", "bid_levels"],
+        )
+        assert arrays["source_sequence"].dtype == np.int64
+        assert arrays["source_sequence"].tolist() == [6, 7, 8, 9]
+        assert arrays["best_bid"].tolist() == [10_006, 10_007, 10_008, 10_009]
+        assert arrays["bid_levels"][0] == [[1, 10_006, 200], [2, 9_990, 200]]
+        assert (
+            (arrays["_receive_us"] >= start_us) & (arrays["_receive_us"] <= end_us)
+        ).all()
+        sliced = list(reader.iter_rows(symbol="000001", start_us=start_us))
+        assert [row["source_sequence"] for row in sliced] == [6, 7, 8, 9, 10, 11, 12]
+        assert sliced[0]["route_depth_totals"]["NXT"] == {"ask": None, "bid": None}
+
+
+def test_converter_applies_provenance_validation_and_reader_skips_torn_tail(tmp_path):
+    partition, rows = _write_partition(tmp_path)
+    broken = dict(rows[-1], best_ask=1)
+    partition.with_name("market_depth_stream.part-000001.jsonl").write_text(
+        json.dumps(broken) + "\n", encoding="utf-8"
+    )
+    with pytest.raises(ValueError):
+        convert_partition_to_columnar(partition)
+
+    shard = tmp_path / "torn.mrcol"
+    write_columnar_shard(shard, rows, block_rows=16)
+    shard.write_bytes(shard.read_bytes()[:-7])
+    with ColumnarShardReader(shard) as reader:
+        assert [block.rows for block in reader.blocks] == [16, 16]
+        assert list(reader.iter_rows()) == rows[:32]
+
+
+def test_cli_converts_partitions_skips_existing_and_reports_failures(tmp_path, capsys):
+    partition, rows = _write_partition(tmp_path / "good")
+    broken_partition, broken_rows = _write_partition(tmp_path / "broken")
+    broken_partition.with_name("market_depth_stream.part-000001.jsonl").write_text(
+        json.dumps(dict(broken_rows[-1], best_ask=1)) + "\n", encoding="utf-8"
+    )
+
+    assert main([str(partition), "--block-rows", "10"]) == 0
+    converted = json.loads(capsys.readouterr().out)
+    assert converted[0]["status"] == "converted"
+    assert converted[0]["rows"] == len(rows)
+    assert converted[0]["shards"] == 2
+    assert list(read_depth_rows(columnar_partition_files(partition))) == rows
+
+    assert main([str(partition), str(broken_partition), "--skip-existing"]) == 1
+    statuses = [row["status"] for row in json.loads(capsys.readouterr().out)]
+    assert statuses == ["skipped_existing", "failed"]
@@ -3,8 +3,12 @@ import json
 import pytest
 
 from src.engine.scalping.micro_reversion.depth_join import (
+    benchmark_depth_join,
+    iter_depth_rows,
     join_latest_past_depth,
+    merge_by_receive_time,
     read_depth_rows,
+    stream_join_latest_past_depth,
 )
 from src.engine.scalping.micro_reversion.path_journal import (
     MarketDepthPoint,
@@ -212,3 +216,97 @@ def test_depth_writer_order_rejects_local_receive_time_regression() -> None:
 
     with pytest.raises(ValueError, match="increase"):
         _validate_batch_order((first, second))
+
+
+def _series_fixture() -> tuple[list[list[dict]], list[list[dict]]]:
+    depth_series = [
+        [
+            _depth_row(received=f"2026-08-08T09:00:0{second}.100+09:00", sequence=n)
+            for n, second in enumerate((0, 1, 4), start=1)
+        ],
+        [
+            _depth_row(
+                received=f"2026-08-08T09:00:0{second}.050+09:00",
+                sequence=n,
+                venue="NXT",
+            )
+            for n, second in enumerate((1, 2), start=1)
+        ],
+    ]
+    market_series = [
+        [
+            _market_row(received=f"2026-08-08T09:00:0{second}.{ms}+09:00", sequence=n)
+            for n, (second, ms) in enumerate(
+                ((0, "050"), (0, "100"), (1, "300"), (3, "200"), (4, "150")), start=1
+            )
+        ],
+        [
+            _market_row(
+                received=f"2026-08-08T09:00:0{second}.050+09:00",
+                venue="NXT",
+                sequence=n,
+            )
+            for n, second in enumerate((0, 2, 5), start=1)
+        ],
+    ]
+    return market_series, depth_series
+
+
+def test_stream_join_matches_materialized_join_byte_for_byte(tmp_path) -> None:
+    market_series, depth_series = _series_fixture()
+    market = list(merge_by_receive_time(*market_series))
+    depth = [row for series in depth_series for row in series]
+    shards = []
+    for index, series in enumerate(depth_series):
+        shard = tmp_path / f"market_depth_stream.part-{index:06d}.jsonl"
+        shard.write_text(
+            "".join(json.dumps(row) + "\n" for row in series), encoding="utf-8"
+        )
+        shards.append(shard)
+
+    expected = join_latest_past_depth(market, depth, max_age_ms=1_000)
+    streamed = stream_join_latest_past_depth(
+        iter(market),
+        merge_by_receive_time(*(iter_depth_rows((shard,)) for shard in shards)),
+        max_age_ms=1_000,
+    )
+
+    assert [json.dumps(row, sort_keys=True) for row in streamed] == [
+        json.dumps(row, sort_keys=True) for row in expected
+    ]
+    assert {row["depth_join_status"] for row in expected} == {
+        "missing_same_series_depth",
+        "joined_fresh_past_depth",
+        "stale_past_depth",
+    }
+
+
+def test_stream_join_rejects_unordered_input_and_trailing_sequence_gap() -> None:
+    market_series, depth_series = _series_fixture()
+    market = list(merge_by_receive_time(*market_series))
+
+    with pytest.raises(ValueError, match="market rows must be ordered"):
+        list(
+            stream_join_latest_past_depth(
+                reversed(market), merge_by_receive_time(*depth_series)
+            )
+        )
+    with pytest.raises(ValueError, match="depth rows must be ordered"):
+        list(stream_join_latest_past_depth(market, reversed(depth_series[0])))
+
+    gapped = depth_series[0] + [
+        _depth_row(received="2026-08-08T09:00:09.000+09:00", sequence=5)
+    ]
+    with pytest.raises(ValueError, match="gap"):
+        join_latest_past_depth(market, gapped)
+    with pytest.raises(ValueError, match="gap"):
+        list(stream_join_latest_past_depth(market, gapped))
+
+
+def test_benchmark_depth_join_reports_both_paths() -> None:
+    result = benchmark_depth_join(symbols=3, depth_rows=20, market_rows=15)
+
+    assert result["market_rows"] == 45
+    assert result["materialized"]["joined_rows"] == 45
+    assert result["streaming"]["joined_rows"] == 45
+    assert result["streaming"]["peak_mib"] > 0
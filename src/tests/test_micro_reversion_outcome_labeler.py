@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from src.engine.scalping.micro_reversion.contracts import (
@@ -10,6 +12,8 @@ from src.engine.scalping.micro_reversion.contracts import (
 from src.engine.scalping.micro_reversion.outcome_labeler import (
     OutcomeLabeler,
     OutcomeLabelerConfig,
+    benchmark_outcome_labeling,
+    build_benchmark_events,
 )
 
 BASE_MS = 1_786_000_000_000
@@ -110,3 +114,59 @@ def test_labeler_rejects_sparse_path_that_would_understate_mae() -> None:
     assert label.mature_horizon_count == 0
     assert label.outcomes[0].path_continuity_status == "internal_gap_exceeded"
     assert label.outcomes[0].max_path_gap_ms == 15_000
+
+
+def test_indexed_labeling_equals_per_event_scan() -> None:
+    rng = random.Random(11)
+    observations = []
+    offset_ms = 0
+    price = 100.0
+    for _ in range(900):
+        offset_ms += rng.choice((0, 500, 1_000, 1_000, 2_000, 7_000, 11_000))
+        price = round(max(90.0, min(110.0, price + rng.uniform(-0.6, 0.6))), 1)
+        observations.append(
+            PriceObservation(
+                symbol="000001",
+                observed_at_ms=BASE_MS + offset_ms,
+                price=int(price) if rng.random() < 0.1 else price,
+                trade_date="2026-08-07",
+                venue="KRX",
+                session_bucket="KRX_REGULAR",
+            )
+        )
+    observations.append(
+        PriceObservation(
+            symbol="000001",
+            observed_at_ms=BASE_MS + 1_000,
+            price=99.0,
+            trade_date="2026-08-07",
+            venue="NXT",
+            session_bucket="NXT_REGULAR",
+        )
+    )
+    rng.shuffle(observations)
+    events = build_benchmark_events(
+        sorted(
+            (row for row in observations if row.venue == "KRX"),
+            key=lambda row: row.observed_at_ms,
+        ),
+        count=120,
+    )
+    labeler = OutcomeLabeler(OutcomeLabelerConfig(max_internal_gap_ms=10_000))
+
+    indexed = labeler.label_many(events, observations)
+
+    assert indexed == tuple(labeler.label(event, observations) for event in events)
+    statuses = {
+        outcome.path_continuity_status
+        for label in indexed
+        for outcome in label.outcomes
+    }
+    assert {"pass", "internal_gap_exceeded", "not_evaluated"} <= statuses
+
+
+def test_outcome_labeling_benchmark_reports_equal_labels() -> None:
+    result = benchmark_outcome_labeling(series_length=300, events_per_series=(3, 30))
+
+    assert [row["events"] for row in result["rows"]] == [3, 30]
+    assert all(row["labels_equal"] for row in result["rows"])
@@ -0,0 +1,161 @@
+import json
+import random
+
+import pytest
+
+from src.engine.scalping.micro_reversion.p2_grid import (
+    is_grid_vectorizable,
+    replay_policy_grid,
+)
+from src.engine.scalping.micro_reversion.p2_replay import (
+    EntryPolicy,
+    ExitPolicy,
+    FillBound,
+    P2ReplayPoint,
+    P2ReplayPolicy,
+    SameTimestampPolicy,
+    replay_path,
+)
+
+BASE_MS = 1_786_147_200_000
+
+
+def _random_path(rng: random.Random, length: int) -> tuple[P2ReplayPoint, ...]:
+    points = []
+    exchange_ms = receive_ms = BASE_MS
+    price = 10_000
+    for sequence in range(1, length + 1):
+        exchange_ms += rng.choice((0, 100, 250, 500, 1_000))
+        price = max(9_000, min(11_000, price + rng.choice((-20, -10, 0, 10, 20))))
+        receive_ms = max(receive_ms, exchange_ms + rng.choice((0, 5, 40)))
+        has_quote = rng.random() < 0.85
+        has_trade = rng.random() < 0.8 or not has_quote
+        has_range = rng.random() < 0.2
+        points.append(
+            P2ReplayPoint(
+                exchange_timestamp_ms=exchange_ms,
+                local_receive_timestamp_ms=receive_ms,
+                source_sequence=sequence,
+                trade_price=price if has_trade else None,
+                trade_qty=rng.choice((0, 1, 2, 5)) if has_trade else None,
+                best_bid=price - 10 if has_quote else None,
+                best_ask=price + 10 if has_quote else None,
+                low_price=price - 20 if has_range else None,
+                high_price=price + 20 if has_range else None,
+                quote_age_ms=rng.choice((None, 10.0, 500.0, 4_000.0)),
+            )
+        )
+    return tuple(points)
+
+
+def _policy_grid() -> list[P2ReplayPolicy]:
+    policies = []
+    for entry in (
+        EntryPolicy.MARKETABLE_NEXT_ASK,
+        EntryPolicy.PASSIVE_EVENT_BID,
+        EntryPolicy.RECLAIM_ENTRY,
+        EntryPolicy.HYBRID_ENTRY,
+    ):
+        for exit_policy in (ExitPolicy.SINGLE_TP, ExitPolicy.PARTIAL_TP_RUNNER):
+            for bound in (FillBound.UPPER_TOUCH, FillBound.LOWER_TRADE_THROUGH):
+                for quantity in (1, 3):
+                    for take_profit_bps, holding_ttl_ms in ((20, 20_000), (35, 1_500)):
+                        for same_timestamp in SameTimestampPolicy:
+                            runner = exit_policy is ExitPolicy.PARTIAL_TP_RUNNER
+                            policies.append(
+                                P2ReplayPolicy(
+                                    policy_id=(
+                                        f"{entry.value}-{exit_policy.value}-"
+                                        f"{bound.value}-{quantity}-"
+                                        f"{take_profit_bps}-{same_timestamp.value}"
+                                    ),
+                                    policy_version="grid-v1",
+                                    entry_policy=entry,
+                                    exit_policy=exit_policy,
+                                    fill_bound=bound,
+                                    entry_ttl_ms=4_000,
+                                    holding_ttl_ms=holding_ttl_ms,
+                                    take_profit_bps=take_profit_bps,
+                                    stop_loss_bps=20,
+                                    all_in_cost_bps=23.0,
+                                    target_quantity=quantity,
+                                    partial_take_profit_fraction=0.5 if runner else 1.0,
+                                    same_timestamp_policy=same_timestamp,
+                                    runner_max_ttl_ms=5_000 if runner else None,
+                                    runner_trailing_bps=10.0 if runner else None,
+                                    runner_exit_trigger=(
+                                        "TRAILING_OR_TTL" if runner else None
+                                    ),
+                                    reclaim_trigger_bps=(
+                                        15.0
+                                        if entry
+                                        in {
+                                            EntryPolicy.RECLAIM_ENTRY,
+                                            EntryPolicy.HYBRID_ENTRY,
+                                        }
+                                        else None
+                                    ),
+                                    hybrid_passive_ttl_ms=(
+                                        1_000
+                                        if entry is EntryPolicy.HYBRID_ENTRY
+                                        else None
+                                    ),
+                                )
+                            )
+    return policies
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_policy_grid_matches_scalar_replay_on_random_paths(seed: int) -> None:
+    rng = random.Random(seed)
+    path = _random_path(rng, rng.choice((3, 40, 160)))
+    watermark = path[min(2, len(path) - 1)]
+    policies = _policy_grid()
+    kwargs = {
+        "decision_watermark_timestamp_ms": watermark.exchange_timestamp_ms,
+        "decision_watermark_local_receive_timestamp_ms": (
+            watermark.local_receive_timestamp_ms
+        ),
+        "decision_watermark_source_sequence": watermark.source_sequence,
+        "event_trade_price": 10_000.0,
+        "event_bid_price": float(rng.choice((9_960, 9_990, 10_000))),
+        "event_bid_quote_age_ms": 20.0,
+    }
+
+    grid = replay_policy_grid(path, policies=policies, **kwargs)
+    scalar = tuple(replay_path(path, policy=policy, **kwargs) for policy in policies)
+
+    assert grid == scalar
+    assert [json.dumps(row.as_dict(), sort_keys=True) for row in grid] == [
+        json.dumps(row.as_dict(), sort_keys=True) for row in scalar
+    ]
+    assert sum(is_grid_vectorizable(policy) for policy in policies) == 24
+
+
+def test_policy_grid_keeps_scalar_watermark_and_event_bid_errors() -> None:
+    path = _random_path(random.Random(1), 10)
+    policy = _policy_grid()[0]
+
+    with pytest.raises(ValueError, match="watermark"):
+        replay_policy_grid(
+            path,
+            policies=[policy],
+            decision_watermark_timestamp_ms=0,
+            decision_watermark_local_receive_timestamp_ms=0,
+            decision_watermark_source_sequence=0,
+        )
+    passive = next(
+        policy
+        for policy in _policy_grid()
+        if policy.entry_policy is EntryPolicy.PASSIVE_EVENT_BID
+    )
+    with pytest.raises(ValueError, match="fresh event bid"):
+        replay_policy_grid(
+            path,
+            policies=[passive],
+            decision_watermark_timestamp_ms=BASE_MS,
+            decision_watermark_local_receive_timestamp_ms=BASE_MS,
+            decision_watermark_source_sequence=0,
+            event_bid_price=9_990.0,
+            event_bid_quote_age_ms=10_000.0,
+        )
@@ -7,7 +7,12 @@ from pathlib import Path
 
 import pytest
 
+from src.engine.scalping.micro_reversion import replay as replay_module
 from src.engine.scalping.micro_reversion.contracts import HorizonOutcome
+from src.engine.scalping.micro_reversion.detector import DetectorConfig
+from src.engine.scalping.micro_reversion.observation_cache import (
+    ParsedObservationCache,
+)
 from src.engine.scalping.micro_reversion.replay import (
     ReplayConfig,
     replay_paths,
@@ -298,6 +303,74 @@ def test_replay_excludes_non_object_json_rows(tmp_path: Path) -> None:
     assert result.observations == ()
 
 
+def test_replay_parse_cache_reuses_observations_across_config_sweep(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "pipeline_events_2026-08-07.jsonl"
+    _write_fixture(source)
+    micro_row = _row(
+        "000001", datetime.fromisoformat("2026-08-07T09:20:00+09:00"), 10_010
+    )
+    micro_row["fields"].update({"aggressive_sell_ratio": "0.7", "ofi": "-1.5"})
+    with source.open("a", encoding="utf-8") as handle:
+        handle.write("\nnot-json\n" + json.dumps(micro_row) + "\n")
+    cache_root = tmp_path / "parse_cache"
+    baseline = replay_paths([source])
+
+    first = replay_paths(
+        [source], observation_cache=ParsedObservationCache(root=cache_root)
+    )
+    assert first.parse_cache_stats["misses"] == 1
+    assert first.parse_cache_stats["writes"] == 1
+    assert first.as_dict(include_observations=True) == {
+        **baseline.as_dict(include_observations=True),
+        "parse_cache_stats": first.parse_cache_stats,
+    }
+
+    configs = [
+        ReplayConfig(
+            detector=DetectorConfig(cooldown_ms=cooldown_ms), dedupe_interval_ms=2_000
+        )
+        for cooldown_ms in (30_000, 60_000)
+    ]
+    expected = [replay_paths([source], config=config) for config in configs]
+
+    def _unexpected_parse(*args, **kwargs):
+        raise AssertionError("cached input must not be parsed again")
+
+    monkeypatch.setattr(replay_module, "_parse_input", _unexpected_parse)
+    sweep_cache = ParsedObservationCache(root=cache_root)
+    for config, reference in zip(configs, expected):
+        cached = replay_paths([source], config=config, observation_cache=sweep_cache)
+        assert cached.input_stats == reference.input_stats
+        assert cached.observations == reference.observations
+        assert cached.events == reference.events
+        assert cached.labels == reference.labels
+    assert sweep_cache.stats.as_dict()["disk_hits"] == 1
+    assert sweep_cache.stats.as_dict()["memory_hits"] == 1
+    assert sweep_cache.stats.as_dict()["misses"] == 0
+    monkeypatch.undo()
+
+    changed_fields = replay_paths(
+        [source],
+        config=ReplayConfig(current_price_fields=("current_price",)),
+        observation_cache=sweep_cache,
+    )
+    assert changed_fields.parse_cache_stats["misses"] == 1
+    assert changed_fields.observations == ()
+
+    entries = sorted(cache_root.glob("*.npz"))
+    assert len(entries) == 2
+    for entry in entries:
+        entry.write_bytes(b"torn")
+    recovered = replay_paths(
+        [source], observation_cache=ParsedObservationCache(root=cache_root)
+    )
+    assert recovered.parse_cache_stats["unreadable_entries"] == 1
+    assert recovered.parse_cache_stats["misses"] == 1
+    assert recovered.observations == baseline.observations
+
+
 def test_replay_does_not_consult_manual_control_exclusion(tmp_path: Path) -> None:
     source = tmp_path / "pipeline_events_2026-08-07.jsonl"
     _write_fixture(source)
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from xgboost import XGBClassifier
+
+from src.engine import ml_predictor
+from src.scanners import kosdaq_scanner
+
+
+@pytest.fixture(scope="module")
+def trained_models():
+    frames = ml_predictor.build_benchmark_frames(80, seed=11)
+    features = pd.concat(
+        [
+            ml_predictor.build_model_feature_row(df)[ml_predictor.MODEL_FEATURES]
+            for df in frames.values()
+        ],
+        ignore_index=True,
+    )
+    target = (features["rsi"] > features["rsi"].median()).astype(int)
+
+    def fit(model, columns):
+        return model.fit(features[columns], target)
+
+    base = (
+        fit(XGBClassifier(n_estimators=8, max_depth=3), ml_predictor.FEATURES_XGB),
+        fit(
+            LGBMClassifier(n_estimators=8, min_child_samples=5, verbose=-1),
+            ml_predictor.FEATURES_LGBM,
+        ),
+        fit(XGBClassifier(n_estimators=5, max_depth=2), ml_predictor.FEATURES_XGB),
+        fit(
+            LGBMClassifier(n_estimators=5, min_child_samples=5, verbose=-1),
+            ml_predictor.FEATURES_LGBM,
+        ),
+    )
+    stacking = pd.DataFrame(
+        {
+            name: model.predict_proba(
+                features[
+                    (
+                        ml_predictor.FEATURES_XGB
+                        if index % 2 == 0
+                        else ml_predictor.FEATURES_LGBM
+                    )
+                ]
+            )[:, 1]
+            for index, (name, model) in enumerate(
+                zip(ml_predictor.STACKING_COLUMNS, base)
+            )
+        }
+    )
+    return base, stacking, target
+
+
+def _candidate_frames():
+    frames = ml_predictor.build_benchmark_frames(120, seed=3)
+    keys = list(frames)
+    frames[keys[0]] = frames[keys[0]].iloc[:3]
+    frames[keys[1]] = frames[keys[1]].drop(columns=["Close"])
+    frames[keys[2]] = None
+    return frames
+
+
+@pytest.mark.parametrize("meta_cls", [LogisticRegression, GaussianNB])
+def test_batch_inference_matches_single_row_path(trained_models, meta_cls):
+    base, stacking, target = trained_models
+    models = (*base, meta_cls().fit(stacking, target))
+    frames = _candidate_frames()
+
+    batch = ml_predictor.predict_probs_for_dfs(frames, models)
+    single = {
+        key: ml_predictor.predict_prob_for_df(df, models) for key, df in frames.items()
+    }
+
+    assert list(batch) == list(frames)
+    assert batch == single
+    assert [batch[key] for key in list(frames)[:3]] == [0.0, 0.0, 0.0]
+    assert len(set(batch.values())) > 1
+
+
+def test_batch_inference_falls_back_per_row_when_batch_fails(trained_models):
+    base, stacking, target = trained_models
+    meta = LogisticRegression().fit(stacking, target)
+
+    class _SingleRowOnly:
+        def __init__(self, model):
+            self.model = model
+
+        def predict_proba(self, frame):
+            if len(frame) > 1:
+                raise ValueError("batch not supported")
+            return self.model.predict_proba(frame)
+
+    frames = dict(list(_candidate_frames().items())[3:10])
+    models = (_SingleRowOnly(base[0]), *base[1:], meta)
+
+    assert ml_predictor.predict_probs_for_dfs(frames, models) == {
+        key: ml_predictor.predict_prob_for_df(df, models) for key, df in frames.items()
+    }
+    assert ml_predictor.predict_probs_for_dfs(frames, None) == dict.fromkeys(
+        frames, 0.0
+    )
+
+
+def test_batch_inference_benchmark_reports_parity(trained_models):
+    base, stacking, target = trained_models
+    models = (*base, LogisticRegression().fit(stacking, target))
+
+    report = ml_predictor.benchmark_batch_inference(models, sizes=(4, 12), single_cap=5)
+
+    assert set(report) == {"4", "12"}
+    assert report["12"]["single_measured_candidates"] == 5
+    assert all(row["parity"] for row in report.values())
+
+
+def test_select_kosdaq_picks_applies_threshold_to_batch_probs():
+    def candidate(code, net_amt, source="TOP"):
+        return {
+            "item": {"spike_rate": 12.5, "source": source},
+            "code": code,
+            "name": f"종목{code}",
+            "curr_price": 1000,
+            "prm_data": {"net_amt": net_amt},
+            "p_status": "status",
+        }
+
+    analyzed = [
+        candidate("000001", 10),
+        candidate("000002", 10, source="SUPERNOVA"),
+        candidate("000003", -5),
+        candidate("000004", 10),
+    ]
+    probs = {"000001": 0.59, "000002": 0.61, "000003": 0.9}
+
+    live = kosdaq_scanner.select_kosdaq_picks(analyzed, probs)
+    test_mode = kosdaq_scanner.select_kosdaq_picks(analyzed, probs, is_test_mode=True)
+
+    assert [pick["Code"] for pick in live] == ["000001", "000002"]
+    assert live[1]["IsSupernova"] is True
+    assert live[0]["Prob"] == 0.59
+    assert [pick["Code"] for pick in test_mode] == ["000002"]
@@ -0,0 +1,172 @@
+import json
+
+from src.engine.ai.prompt_payload_encoding import (
+    PROMPT_PAYLOAD_ENCODING_VERSION,
+    PromptPayloadBudget,
+    PromptPayloadMetrics,
+    compact_prompt_text,
+    decode_tabular_rows,
+    encode_prompt_payload,
+    encode_tabular_rows,
+    estimate_prompt_tokens,
+    round_payload_fields,
+)
+
+
+def _tick_rows(count):
+    return [
+        {
+            "time": f"09:00:{59 - index:02d}",
+            "dir": "BUY" if index % 2 else "SELL",
+            "price": 10100.0 + index,
+            "volume": 100 + index,
+            "strength": 131.234567,
+        }
+        for index in range(count)
+    ]
+
+
+def _candle_rows(count):
+    return [
+        {
+            "time": f"09:{index:02d}:00",
+            "open": 10000,
+            "high": 10100,
+            "low": 9990,
+            "close": 10050 + index,
+            "volume": 1000 * (index + 1),
+        }
+        for index in range(count)
+    ]
+
+
+def test_tabular_rows_round_trip_and_keep_column_union():
+    rows = [{"time": "09:00:01", "price": 100}, {"price": 101, "volume": 5}]
+
+    table = encode_tabular_rows(rows)
+
+    assert table == {
+        "cols": ["time", "price", "volume"],
+        "rows": [["09:00:01", 100, None], [None, 101, 5]],
+    }
+    assert decode_tabular_rows(table) == [
+        {"time": "09:00:01", "price": 100, "volume": None},
+        {"time": None, "price": 101, "volume": 5},
+    ]
+    assert encode_tabular_rows([]) == []
+    assert encode_tabular_rows(["raw"]) == ["raw"]
+
+
+def test_round_payload_fields_applies_field_family_rules_and_skips_protected():
+    payload = {
+        "features": {
+            "spread_bp": 9.876543,
+            "price_change_10t_pct": 0.123456,
+            "quote_age_ms": 152.7,
+            "micro_price": 10105.44444,
+            "payload_hash": 1.23456789,
+            "tick_acceleration_ratio": 1.0,
+            "would_fill_now": True,
+        },
+        "entry_candle_context": {"structure": {"slope_pct": 0.123456789}},
+    }
+
+    rounded = round_payload_fields(payload)
+
+    assert rounded["features"] == {
+        "spread_bp": 9.88,
+        "price_change_10t_pct": 0.123,
+        "quote_age_ms": 153,
+        "micro_price": 10105.4,
+        "payload_hash": 1.23456789,
+        "tick_acceleration_ratio": 1,
+        "would_fill_now": True,
+    }
+    assert rounded["entry_candle_context"] is payload["entry_candle_context"]
+
+
+def test_encode_prompt_payload_keeps_all_keys_and_shrinks_windows():
+    payload = {
+        "input_schema": "entry_screen_v2",
+        "features": {"spread_bp": 9.876543, "quote_stale": False},
+        "recent_ticks_latest_first": _tick_rows(5),
+        "recent_candles_latest_window": _candle_rows(5),
+        "orderbook_top3": {"asks": _tick_rows(3), "bids": _tick_rows(3)},
+    }
+    plain = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    encoded = encode_prompt_payload(payload)
+    decoded = json.loads(encoded.text)
+
+    assert encoded.contract == "entry_screen_v2"
+    assert encoded.within_budget is True
+    assert encoded.payload_bytes < len(plain.encode("utf-8"))
+    assert encoded.source_bytes == len(plain.encode("utf-8"))
+    assert set(payload) <= set(decoded)
+    assert decoded["payload_encoding"]["version"] == PROMPT_PAYLOAD_ENCODING_VERSION
+    assert len(decode_tabular_rows(decoded["recent_ticks_latest_first"])) == 5
+    assert decoded["orderbook_top3"]["asks"]["cols"][0] == "time"
+
+
+def test_encode_prompt_payload_trims_oldest_rows_to_fit_budget():
+    payload = {
+        "input_schema": "entry_screen_v2",
+        "features": {"quote_stale": False},
+        "recent_ticks_latest_first": _tick_rows(20),
+        "recent_candles_latest_window": _candle_rows(10),
+    }
+    budget = PromptPayloadBudget("entry_screen_v2", max_bytes=700, max_tokens=10_000)
+
+    encoded = encode_prompt_payload(payload, budget=budget)
+    decoded = json.loads(encoded.text)
+    candles = decode_tabular_rows(decoded["recent_candles_latest_window"])
+    ticks = decode_tabular_rows(decoded["recent_ticks_latest_first"])
+
+    assert encoded.trimmed_rows["recent_candles_latest_window"] == 9
+    assert candles == [_candle_rows(10)[-1]]
+    assert ticks[0]["time"] == "09:00:59"
+    assert decoded["payload_encoding"]["trimmed_rows"] == dict(encoded.trimmed_rows)
+    assert encoded.log_fields()["prompt_payload_trimmed_rows"] == sum(
+        encoded.trimmed_rows.values()
+    )
+
+
+def test_encode_prompt_payload_reports_over_budget_when_rows_are_exhausted():
+    payload = {
+        "input_schema": "tiny",
+        "recent_ticks_latest_first": _tick_rows(2),
+        "notes": "x" * 400,
+    }
+    budget = PromptPayloadBudget("tiny", max_bytes=100, max_tokens=10_000)
+
+    encoded = encode_prompt_payload(payload, budget=budget)
+
+    assert encoded.within_budget is False
+    assert json.loads(encoded.text)["notes"] == "x" * 400
+    assert len(json.loads(encoded.text)["recent_ticks_latest_first"]["rows"]) == 1
+
+
+def test_estimate_tokens_and_text_compaction():
+    assert estimate_prompt_tokens("") == 0
+    assert estimate_prompt_tokens("abcd" * 10) == 10
+    assert estimate_prompt_tokens("현재가") == 3
+    assert compact_prompt_text("[a]  \n\n\n- b: 1   \n\n") == "[a]\n\n- b: 1"
+
+
+def test_prompt_payload_metrics_reports_per_endpoint_percentiles():
+    metrics = PromptPayloadMetrics(sample_limit=4)
+    for size in (100, 200, 300, 400, 500):
+        metrics.record(
+            "analyze_target",
+            payload_bytes=size,
+            estimated_tokens=size // 4,
+            within_budget=size < 500,
+        )
+
+    snapshot = metrics.snapshot()["analyze_target"]
+
+    assert snapshot["count"] == 5
+    assert snapshot["over_budget"] == 1
+    assert snapshot["bytes_p50"] == 300
+    assert snapshot["bytes_p95"] == 500
+    assert snapshot["tokens_p50"] == 75
@@ -1,4 +1,5 @@
 import json
+from dataclasses import replace
 from datetime import datetime, timedelta
 
 from src.engine import ai_engine_openai as openai_module
@@ -1324,3 +1325,47 @@ def test_feature_packet_accepts_epoch_seconds_for_frozen_decision_time():
     assert (
         epoch_packet["tick_context_quality"] == datetime_packet["tick_context_quality"]
     )
+
+
+def test_openai_market_packet_compact_encoding_keeps_every_contract_key(
+    monkeypatch,
+):
+    engine = GPTSniperEngine.__new__(GPTSniperEngine)
+    feature_packet = extract_scalping_feature_packet(
+        _sample_ws_data(),
+        _sample_ticks(),
+        _sample_candles(),
+        now=datetime.strptime("09:00:12", "%H:%M:%S"),
+    )
+    plain = engine._format_market_data(
+        _sample_ws_data(),
+        _sample_ticks(),
+        _sample_candles(),
+        feature_packet=feature_packet,
+    )
+    monkeypatch.setattr(
+        openai_module,
+        "TRADING_RULES",
+        replace(
+            openai_module.TRADING_RULES,
+            OPENAI_PROMPT_PAYLOAD_COMPACT_ENCODING_ENABLED=True,
+        ),
+    )
+    compact = engine._format_market_data(
+        _sample_ws_data(),
+        _sample_ticks(),
+        _sample_candles(),
+        feature_packet=feature_packet,
+    )
+    plain_payload = json.loads(plain)
+    compact_payload = json.loads(compact)
+
+    assert len(compact.encode("utf-8")) < len(plain.encode("utf-8"))
+    assert set(plain_payload) <= set(compact_payload)
+    assert set(plain_payload["features"]) == set(compact_payload["features"])
+    assert set(plain_payload["source_quality"]) == set(
+        compact_payload["source_quality"]
+    )
+    ticks = compact_payload["recent_ticks_latest_first"]
+    assert ticks["cols"][:2] == ["time", "dir"]
+    assert len(ticks["rows"]) == len(plain_payload["recent_ticks_latest_first"])
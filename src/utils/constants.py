@@ -1220,6 +1220,27 @@ class TradingConfig:
     OPENAI_TRANSPORT_MODE: str = "http"  # http | responses_ws
     OPENAI_RESPONSES_WS_ENABLED: bool = False  # Responses WebSocket shadow-first 토글
     OPENAI_RESPONSES_WS_POOL_SIZE: int = 2  # persistent Responses WebSocket worker 수
+    OPENAI_RESPONSES_WS_AUTOSCALE_ENABLED: bool = (
+        False  # queue depth/queue wait 기반 WS worker 수 자동 조절
+    )
+    OPENAI_RESPONSES_WS_POOL_MIN_SIZE: int = 1  # autoscale 하한
+    OPENAI_RESPONSES_WS_POOL_MAX_SIZE: int = 4  # autoscale 상한 (key budget 추가 적용)
+    OPENAI_RESPONSES_WS_MAX_WORKERS_PER_KEY: int = 2  # API key당 WS worker 상한
+    OPENAI_RESPONSES_WS_SCALE_UP_QUEUE_WAIT_MS: int = 150  # scale-up queue wait EWMA
+    OPENAI_RESPONSES_WS_SCALE_COOLDOWN_SEC: float = 10.0  # scale 변경 최소 간격
+    OPENAI_RESPONSES_WS_PREWARM_ENABLED: bool = (
+        False  # scalping buy window 직전 WS 연결 pre-warm
+    )
+    OPENAI_RESPONSES_WS_HEALTH_CHECK_IDLE_SEC: float = (
+        30.0  # idle 연결 재연결 점검 기준
+    )
+    OPENAI_RESPONSES_WS_KEEPALIVE_PING_INTERVAL_SEC: float = (
+        20.0  # websocket client keepalive ping 간격
+    )
+    OPENAI_RESPONSES_WS_KEEPALIVE_PING_TIMEOUT_SEC: float = (
+        20.0  # keepalive pong 대기 상한 (초과 시 client가 연결 종료)
+    )
+    OPENAI_RESPONSES_WS_MAINTENANCE_INTERVAL_SEC: float = 5.0  # pre-warm/health loop
     OPENAI_RESPONSES_WS_TIMEOUT_MS: int = 700  # hot path 판단 timeout
     OPENAI_RESPONSES_WS_HTTP_FALLBACK_RESERVE_MS: int = (
         2000  # WS 실패 후 HTTP fallback에 남길 목표 예산
@@ -1283,6 +1304,22 @@ class TradingConfig:
     OPENAI_HOLDING_FLOW_V2_INPUT_ENABLED: bool = (
         False  # holding_flow structured v2 input canary
     )
+    OPENAI_PROMPT_PAYLOAD_COMPACT_ENCODING_ENABLED: bool = (
+        False  # tabular window + field-family rounding prompt encoding canary
+    )
+    OPENAI_PROMPT_PAYLOAD_METRICS_ENABLED: bool = (
+        False  # 호출별 payload byte/token 계측 (compact encoding canary 시 자동 on)
+    )
+    OPENAI_ENTRY_SCREEN_BATCH_ENABLED: bool = (
+        False  # V2.14 entry screen cross-symbol burst batching canary
+    )
+    OPENAI_ENTRY_SCREEN_BATCH_WINDOW_MS: int = 150  # batch 합류 대기 window
+    OPENAI_ENTRY_SCREEN_BATCH_SOLO_WAIT_MS: int = 10  # 단독 요청의 합류 대기 상한
+    OPENAI_ENTRY_SCREEN_BATCH_MAX_SIZE: int = 6  # batch 1건당 최대 종목 수
+    OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_PER_ITEM_MS: int = (
+        500  # 단건 timeout 위에 2번째 종목부터 더하는 batch timeout
+    )
+    OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_MAX_MS: int = 8000  # batch timeout 상한
     OPENAI_PREVIOUS_RESPONSE_ID_ENABLED: bool = False  # phase1: stateless 유지
     OPENAI_DUAL_PERSONA_ENABLED: bool = (
         False  # Plan Rebase: AI 엔진 A/B/shadow 비교는 기본 튜닝 로직 정렬 이후 재개
@@ -5763,6 +5800,12 @@ def _build_trading_rules() -> TradingConfig:
     )
     env_openai_ws_enabled = _env_bool("KORSTOCKSCAN_OPENAI_RESPONSES_WS_ENABLED")
     env_openai_ws_pool_size = _env_int("KORSTOCKSCAN_OPENAI_RESPONSES_WS_POOL_SIZE")
+    env_openai_ws_autoscale = _env_bool(
+        "KORSTOCKSCAN_OPENAI_RESPONSES_WS_AUTOSCALE_ENABLED"
+    )
+    env_openai_ws_prewarm = _env_bool(
+        "KORSTOCKSCAN_OPENAI_RESPONSES_WS_PREWARM_ENABLED"
+    )
     env_openai_ws_timeout_ms = _env_int("KORSTOCKSCAN_OPENAI_RESPONSES_WS_TIMEOUT_MS")
     env_openai_ws_http_fallback_reserve_ms = _env_int(
         "KORSTOCKSCAN_OPENAI_RESPONSES_WS_HTTP_FALLBACK_RESERVE_MS"
@@ -5839,6 +5882,30 @@ def _build_trading_rules() -> TradingConfig:
     env_openai_holding_flow_v2_input = _env_bool(
         "KORSTOCKSCAN_OPENAI_HOLDING_FLOW_V2_INPUT_ENABLED"
     )
+    env_openai_prompt_payload_compact_encoding = _env_bool(
+        "KORSTOCKSCAN_OPENAI_PROMPT_PAYLOAD_COMPACT_ENCODING_ENABLED"
+    )
+    env_openai_prompt_payload_metrics = _env_bool(
+        "KORSTOCKSCAN_OPENAI_PROMPT_PAYLOAD_METRICS_ENABLED"
+    )
+    env_openai_entry_screen_batch = _env_bool(
+        "KORSTOCKSCAN_OPENAI_ENTRY_SCREEN_BATCH_ENABLED"
+    )
+    env_openai_entry_screen_batch_window_ms = _env_int(
+        "KORSTOCKSCAN_OPENAI_ENTRY_SCREEN_BATCH_WINDOW_MS"
+    )
+    env_openai_entry_screen_batch_solo_wait_ms = _env_int(
+        "KORSTOCKSCAN_OPENAI_ENTRY_SCREEN_BATCH_SOLO_WAIT_MS"
+    )
+    env_openai_entry_screen_batch_max_size = _env_int(
+        "KORSTOCKSCAN_OPENAI_ENTRY_SCREEN_BATCH_MAX_SIZE"
+    )
+    env_openai_entry_screen_batch_timeout_per_item_ms = _env_int(
+        "KORSTOCKSCAN_OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_PER_ITEM_MS"
+    )
+    env_openai_entry_screen_batch_timeout_max_ms = _env_int(
+        "KORSTOCKSCAN_OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_MAX_MS"
+    )
     env_openai_previous_response_id = _env_bool(
         "KORSTOCKSCAN_OPENAI_PREVIOUS_RESPONSE_ID_ENABLED"
     )
@@ -5854,6 +5921,8 @@ def _build_trading_rules() -> TradingConfig:
         or env_openai_transport_mode
         or env_openai_ws_enabled is not None
         or env_openai_ws_pool_size is not None
+        or env_openai_ws_autoscale is not None
+        or env_openai_ws_prewarm is not None
         or env_openai_ws_timeout_ms is not None
         or env_openai_ws_http_fallback_reserve_ms is not None
         or env_openai_analyze_target_timeout_ms is not None
@@ -5882,6 +5951,10 @@ def _build_trading_rules() -> TradingConfig:
         or env_openai_entry_screen_v2_input is not None
         or env_openai_entry_price_v2_input is not None
         or env_openai_holding_flow_v2_input is not None
+        or env_openai_prompt_payload_compact_encoding is not None
+        or env_openai_entry_screen_batch is not None
+        or env_openai_entry_screen_batch_window_ms is not None
+        or env_openai_entry_screen_batch_max_size is not None
         or env_openai_previous_response_id is not None
         or env_openai_threshold_correction_model is not None
         or env_openai_threshold_correction_fallback_models is not None
@@ -5910,6 +5983,16 @@ def _build_trading_rules() -> TradingConfig:
                 if env_openai_ws_pool_size is not None
                 else config.OPENAI_RESPONSES_WS_POOL_SIZE
             ),
+            OPENAI_RESPONSES_WS_AUTOSCALE_ENABLED=(
+                env_openai_ws_autoscale
+                if env_openai_ws_autoscale is not None
+                else config.OPENAI_RESPONSES_WS_AUTOSCALE_ENABLED
+            ),
+            OPENAI_RESPONSES_WS_PREWARM_ENABLED=(
+                env_openai_ws_prewarm
+                if env_openai_ws_prewarm is not None
+                else config.OPENAI_RESPONSES_WS_PREWARM_ENABLED
+            ),
             OPENAI_RESPONSES_WS_TIMEOUT_MS=(
                 env_openai_ws_timeout_ms
                 if env_openai_ws_timeout_ms is not None
@@ -6050,6 +6133,46 @@ def _build_trading_rules() -> TradingConfig:
                 if env_openai_holding_flow_v2_input is not None
                 else config.OPENAI_HOLDING_FLOW_V2_INPUT_ENABLED
             ),
+            OPENAI_PROMPT_PAYLOAD_COMPACT_ENCODING_ENABLED=(
+                env_openai_prompt_payload_compact_encoding
+                if env_openai_prompt_payload_compact_encoding is not None
+                else config.OPENAI_PROMPT_PAYLOAD_COMPACT_ENCODING_ENABLED
+            ),
+            OPENAI_PROMPT_PAYLOAD_METRICS_ENABLED=(
+                env_openai_prompt_payload_metrics
+                if env_openai_prompt_payload_metrics is not None
+                else config.OPENAI_PROMPT_PAYLOAD_METRICS_ENABLED
+            ),
+            OPENAI_ENTRY_SCREEN_BATCH_ENABLED=(
+                env_openai_entry_screen_batch
+                if env_openai_entry_screen_batch is not None
+                else config.OPENAI_ENTRY_SCREEN_BATCH_ENABLED
+            ),
+            OPENAI_ENTRY_SCREEN_BATCH_WINDOW_MS=(
+                env_openai_entry_screen_batch_window_ms
+                if env_openai_entry_screen_batch_window_ms is not None
+                else config.OPENAI_ENTRY_SCREEN_BATCH_WINDOW_MS
+            ),
+            OPENAI_ENTRY_SCREEN_BATCH_SOLO_WAIT_MS=(
+                env_openai_entry_screen_batch_solo_wait_ms
+                if env_openai_entry_screen_batch_solo_wait_ms is not None
+                else config.OPENAI_ENTRY_SCREEN_BATCH_SOLO_WAIT_MS
+            ),
+            OPENAI_ENTRY_SCREEN_BATCH_MAX_SIZE=(
+                env_openai_entry_screen_batch_max_size
+                if env_openai_entry_screen_batch_max_size is not None
+                else config.OPENAI_ENTRY_SCREEN_BATCH_MAX_SIZE
+            ),
+            OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_PER_ITEM_MS=(
+                env_openai_entry_screen_batch_timeout_per_item_ms
+                if env_openai_entry_screen_batch_timeout_per_item_ms is not None
+                else config.OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_PER_ITEM_MS
+            ),
+            OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_MAX_MS=(
+                env_openai_entry_screen_batch_timeout_max_ms
+                if env_openai_entry_screen_batch_timeout_max_ms is not None
+                else config.OPENAI_ENTRY_SCREEN_BATCH_TIMEOUT_MAX_MS
+            ),
             OPENAI_PREVIOUS_RESPONSE_ID_ENABLED=(
                 env_openai_previous_response_id
                 if env_openai_previous_response_id is not None
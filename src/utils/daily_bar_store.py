@@ -0,0 +1,347 @@
+"""
+[ka10081 일봉 로컬 저장소 (Daily Bar Store)]
+
+스윙 스캐너와 update_kospi 가 매번 REST(ka10081 연속조회)로 같은 과거 일봉을 다시 받는 것을 줄입니다.
+
+- 종목별 parquet(`{root}/bars/{code}.parquet`) + 메타 JSON(`{root}/meta/{code}.json`)으로 보관합니다.
+- 저장된 종목은 연속조회 없이 첫 페이지(최근 구간) 1회만 받아 뒤쪽 누락일만 채웁니다.
+- 첫 페이지와 겹치는 과거 봉의 수정주가(OHLC)가 저장본과 다르면 권리락/액면분할 등으로 보고
+  해당 종목만 전체 재조회합니다. 저장본 마지막 봉은 장중 미완성일 수 있어 비교하지 않고 덮어씁니다.
+- final_through(해당 일자까지 봉이 확정됨)가 이미 기록된 종목은 REST 없이 저장본을 반환합니다.
+- 반환 프레임은 마지막 전체 조회와 같은 행 수로 잘라 기존 REST 결과와 모양을 맞춥니다.
+  read_many 는 N종목 x M일 전체 이력을 한 프레임으로 돌려줍니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, time as dtime
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from src.utils.constants import DATA_DIR
+
+DAILY_BAR_STORE_DIR_ENV = "KORSTOCKSCAN_DAILY_BAR_STORE_DIR"
+DAILY_BAR_FINAL_AFTER_ENV = "KORSTOCKSCAN_DAILY_BAR_FINAL_AFTER"
+DEFAULT_DAILY_BAR_STORE_DIR = DATA_DIR / "cache" / "daily_bars_ka10081"
+DEFAULT_FINAL_AFTER = "16:00"
+STORE_SCHEMA_VERSION = "daily_bar_store_ka10081_v1"
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+DB_COLUMN_MAP = {
+    "Date": "quote_date",
+    "Code": "stock_code",
+    "Open": "open_price",
+    "High": "high_price",
+    "Low": "low_price",
+    "Close": "close_price",
+    "Volume": "volume",
+}
+
+
+@dataclass(slots=True)
+class DailyBarStoreStats:
+    requests: int = 0
+    store_only: int = 0
+    incremental_fetches: int = 0
+    full_fetches: int = 0
+    revision_refetches: int = 0
+    gap_refetches: int = 0
+    rest_pages: int = 0
+    rest_pages_avoided: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "store_only": self.store_only,
+            "incremental_fetches": self.incremental_fetches,
+            "full_fetches": self.full_fetches,
+            "revision_refetches": self.revision_refetches,
+            "gap_refetches": self.gap_refetches,
+            "rest_pages": self.rest_pages,
+            "rest_pages_avoided": self.rest_pages_avoided,
+        }
+
+
+def final_through_for(now: datetime | None = None) -> str | None:
+    """
+    장 마감 확정 시각(기본 16:00, env 로 조정) 이후면 오늘 날짜를, 아니면 None 을 반환합니다.
+    None 이면 저장소는 항상 첫 페이지 1회 조회로 최신 봉을 갱신합니다.
+    """
+    now = now or datetime.now()
+    raw = os.getenv(DAILY_BAR_FINAL_AFTER_ENV, DEFAULT_FINAL_AFTER).strip()
+    try:
+        cutoff = dtime.fromisoformat(raw or DEFAULT_FINAL_AFTER)
+    except ValueError:
+        cutoff = dtime.fromisoformat(DEFAULT_FINAL_AFTER)
+    return now.strftime("%Y-%m-%d") if now.time() >= cutoff else None
+
+
+def _default_fetch(token, code, max_pages=None):
+    from src.utils import kiwoom_utils
+
+    return kiwoom_utils.get_daily_ohlcv_ka10081_df(token, code, max_pages=max_pages)
+
+
+def _page_count(df: pd.DataFrame) -> int:
+    meta = df.attrs.get("kiwoom_source_meta") or {}
+    try:
+        return max(1, int(meta.get("page_count") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _prices_match(stored: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+    """겹치는 일자(저장본 마지막 봉 제외)의 수정주가 OHLC 가 같은지 확인합니다."""
+    overlap = stored.index[:-1].intersection(fresh.index)
+    columns = [c for c in PRICE_COLUMNS if c in stored.columns and c in fresh.columns]
+    if overlap.empty or not columns:
+        return True
+    left = stored.loc[overlap, columns].apply(pd.to_numeric, errors="coerce")
+    right = fresh.loc[overlap, columns].apply(pd.to_numeric, errors="coerce")
+    return bool(
+        np.allclose(
+            left.to_numpy(float),
+            right.to_numpy(float),
+            rtol=0.0,
+            atol=1e-6,
+            equal_nan=True,
+        )
+    )
+
+
+@dataclass
+class DailyBarStore:
+    """ka10081 일봉 종목별 parquet 저장소. 증분 조회/수정주가 재조회/일괄 조회를 담당합니다."""
+
+    root: Path = DEFAULT_DAILY_BAR_STORE_DIR
+    stats: DailyBarStoreStats = field(default_factory=DailyBarStoreStats)
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+
+    @classmethod
+    def from_env(cls) -> "DailyBarStore | None":
+        root = os.getenv(DAILY_BAR_STORE_DIR_ENV, "").strip()
+        return cls(root=Path(root)) if root else None
+
+    def bars_path(self, code: str) -> Path:
+        return self.root / "bars" / f"{code}.parquet"
+
+    def meta_path(self, code: str) -> Path:
+        return self.root / "meta" / f"{code}.json"
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get_daily_bars(
+        self,
+        token,
+        code,
+        *,
+        final_through: str | None = None,
+        fetch: Callable[..., pd.DataFrame] | None = None,
+        run_stats: DailyBarStoreStats | None = None,
+    ) -> pd.DataFrame:
+        """
+        get_daily_ohlcv_ka10081_df 와 같은 모양(Date 인덱스, 오름차순)의 일봉을 반환합니다.
+        run_stats 에는 self.stats 와 같은 집계가 더해져 실행 단위 지표로 쓸 수 있습니다.
+        """
+        fetch = fetch or _default_fetch
+        code = str(code).strip().zfill(6)
+        targets = [self.stats] if run_stats is None else [self.stats, run_stats]
+        self._bump(targets, requests=1)
+
+        stored = self._read_bars(code)
+        meta = self._read_meta(code) if stored is not None else {}
+        if not meta:
+            # 메타가 없거나 스키마가 다르면 전체 조회 창/확정일을 알 수 없으므로 새로 받는다.
+            stored = None
+        full_pages = int(meta.get("full_page_count") or 1)
+
+        if (
+            stored is not None
+            and final_through
+            and str(meta.get("final_through") or "") >= str(final_through)
+        ):
+            self._bump(targets, store_only=1, rest_pages_avoided=full_pages)
+            return self._serve(stored, meta)
+
+        if stored is not None:
+            fresh = fetch(token, code, max_pages=1)
+            pages = _page_count(fresh) if not fresh.empty else 1
+            self._bump(targets, rest_pages=pages)
+            if fresh.empty:
+                return fresh
+            fresh = fresh.sort_index()
+            if fresh.index.min() > stored.index.max():
+                # 첫 페이지가 저장본 이후만 담고 있으면 중간 일자가 비므로 전체 재조회
+                self._bump(targets, gap_refetches=1)
+            elif not _prices_match(stored, fresh):
+                self._bump(targets, revision_refetches=1)
+            else:
+                merged = pd.concat([stored[stored.index < fresh.index.min()], fresh])
+                meta.update(
+                    {
+                        "updated_at": datetime.now().isoformat(timespec="seconds"),
+                        "last_date": merged.index.max().strftime("%Y-%m-%d"),
+                    }
+                )
+                if final_through:
+                    meta["final_through"] = str(final_through)
+                self._write(code, merged, meta)
+                self._bump(
+                    targets,
+                    incremental_fetches=1,
+                    rest_pages_avoided=max(0, full_pages - pages),
+                )
+                served = self._serve(merged, meta)
+                served.attrs.update(fresh.attrs)
+                return served
+
+        full = fetch(token, code)
+        if full.empty:
+            self._bump(targets, full_fetches=1, rest_pages=_page_count(full))
+            return full
+        full = full.sort_index()
+        pages = _page_count(full)
+        self._bump(targets, full_fetches=1, rest_pages=pages)
+        meta = {
+            "schema": STORE_SCHEMA_VERSION,
+            "code": code,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "full_fetched_at": datetime.now().isoformat(timespec="seconds"),
+            "full_page_count": pages,
+            "window_rows": int(len(full)),
+            "last_date": full.index.max().strftime("%Y-%m-%d"),
+        }
+        if final_through:
+            meta["final_through"] = str(final_through)
+        self._write(code, full, meta)
+        return full
+
+    def read_many(
+        self,
+        codes: Iterable[str],
+        start=None,
+        end=None,
+        *,
+        db_schema: bool = False,
+    ) -> pd.DataFrame:
+        """
+        저장된 N종목 x M일 일봉 전체 이력을 (Date, Code) 정렬 한 프레임으로 반환합니다.
+        db_schema=True 면 daily_stock_quotes 컬럼명(quote_date, stock_code, *_price)으로 바꿉니다.
+        """
+        frames = []
+        for code in dict.fromkeys(str(c).strip().zfill(6) for c in codes):
+            bars = self._read_bars(code)
+            if bars is None:
+                continue
+            if start is not None:
+                bars = bars[bars.index >= pd.Timestamp(start)]
+            if end is not None:
+                bars = bars[bars.index <= pd.Timestamp(end)]
+            if bars.empty:
+                continue
+            frame = bars.reset_index()
+            frame.insert(1, "Code", code)
+            frames.append(frame)
+        if not frames:
+            result = pd.DataFrame(columns=["Date", "Code", *PRICE_COLUMNS, "Volume"])
+        else:
+            result = pd.concat(frames, ignore_index=True)
+            result = result.sort_values(["Date", "Code"], kind="mergesort")
+            result = result.reset_index(drop=True)
+        if db_schema:
+            result = result.rename(columns=DB_COLUMN_MAP)
+        return result
+
+    # ------------------------------------------------------------------
+    # 내부 입출력
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _bump(targets: list[DailyBarStoreStats], **counts: int) -> None:
+        for stats in targets:
+            for name, value in counts.items():
+                setattr(stats, name, getattr(stats, name) + int(value))
+
+    @staticmethod
+    def _serve(bars: pd.DataFrame, meta: dict[str, Any]) -> pd.DataFrame:
+        window = int(meta.get("window_rows") or 0)
+        served = bars.tail(window).copy() if window > 0 else bars.copy()
+        served.attrs = {}
+        return served
+
+    def _read_bars(self, code: str) -> pd.DataFrame | None:
+        path = self.bars_path(code)
+        if not path.exists():
+            return None
+        try:
+            bars = pd.read_parquet(path)
+        except Exception as e:
+            print(
+                f"⚠️ [daily bar store] 저장본 읽기 실패, 전체 재조회: {path.name} ({e})"
+            )
+            return None
+        if "Date" not in bars.columns or bars.empty:
+            return None
+        bars["Date"] = pd.to_datetime(bars["Date"])
+        return bars.set_index("Date").sort_index()
+
+    def _read_meta(self, code: str) -> dict[str, Any]:
+        try:
+            meta = json.loads(self.meta_path(code).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(meta, dict) or meta.get("schema") != STORE_SCHEMA_VERSION:
+            return {}
+        return meta
+
+    def _write(self, code: str, bars: pd.DataFrame, meta: dict[str, Any]) -> None:
+        frame = bars.copy()
+        frame.attrs = {}
+        frame.index.name = "Date"
+        frame = frame[~frame.index.duplicated(keep="last")].reset_index()
+        _atomic_write(
+            self.bars_path(code), lambda path: frame.to_parquet(path, index=False)
+        )
+        payload = json.dumps(meta, ensure_ascii=False, indent=2, sort_keys=True)
+        _atomic_write(
+            self.meta_path(code),
+            lambda path: Path(path).write_text(payload, encoding="utf-8"),
+        )
+
+
+def _atomic_write(path: Path, write: Callable[[str], Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    os.close(fd)
+    try:
+        write(temporary)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+
+
+def fetch_daily_bars(
+    token,
+    code,
+    store: DailyBarStore | None = None,
+    *,
+    final_through: str | None = None,
+    run_stats: DailyBarStoreStats | None = None,
+) -> pd.DataFrame:
+    """저장소가 있으면 증분 조회, 없으면 기존 ka10081 REST 조회로 일봉을 반환합니다."""
+    if store is None:
+        return _default_fetch(token, code)
+    return store.get_daily_bars(
+        token, code, final_through=final_through, run_stats=run_stats
+    )
@@ -480,6 +480,12 @@ def get_kiwoom_base_url():
     자동으로 모의투자 URL 또는 실투자 URL을 세팅합니다.
     """
 
+    # Load tests point every REST transport at the local stand-in server.
+    override = str(os.getenv("KORSTOCKSCAN_KIWOOM_BASE_URL", "") or "").strip()
+    if override:
+        print(f"⚙️ Kiwoom API 스위치 온: 🧪 [OVERRIDE] 목적지 -> {override}")
+        return override.rstrip("/")
+
     # GCP에는 dev_path가 있고, AWS에는 없으므로 알아서 분기됩니다!
     target_path = CONFIG_PATH if os.path.exists(CONFIG_PATH) else DEV_PATH
 
@@ -1689,11 +1695,17 @@ def _fetch_kiwoom_api_continuous_with_meta(**kwargs):
         return results, meta
 
 
-def get_daily_ohlcv_ka10081_df(token, code, end_date=""):
-    """[ka10081] 주식일봉차트조회요청 (과거 데이터 연속조회 지원)"""
+def get_daily_ohlcv_ka10081_df(token, code, end_date="", max_pages=None):
+    """
+    [ka10081] 주식일봉차트조회요청 (과거 데이터 연속조회 지원)
+    max_pages 미지정 시 KIWOOM_DAILY_OHLCV_MAX_PAGES(기본 2)를 따르며,
+    daily_bar_store 증분 갱신은 max_pages=1 로 최근 구간 한 페이지만 받습니다.
+    """
     if not end_date:
         end_date = datetime.now().strftime("%Y%m%d")
-    cache_key = (str(code), str(end_date))
+    if max_pages is None:
+        max_pages = int(os.getenv("KIWOOM_DAILY_OHLCV_MAX_PAGES", "2") or "2")
+    cache_key = (str(code), str(end_date), int(max_pages))
     cached_df = _cache_get("ka10081_daily_df", cache_key)
     if cached_df is not None:
         return cached_df
@@ -1702,7 +1714,6 @@ def get_daily_ohlcv_ka10081_df(token, code, end_date=""):
 
     payload = {"stk_cd": str(code), "base_dt": end_date, "upd_stkpc_tp": "1"}
 
-    max_pages = int(os.getenv("KIWOOM_DAILY_OHLCV_MAX_PAGES", "2") or "2")
     results, source_meta = _fetch_kiwoom_api_continuous_with_meta(
         url=url,
         token=token,
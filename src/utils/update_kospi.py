@@ -22,6 +22,12 @@ import FinanceDataReader as fdr
 
 # --- [Level 2: 공통 모듈 명시적 상대 경로 반영] ---
 from src.utils import kiwoom_utils
+from src.utils.daily_bar_store import (
+    DailyBarStore,
+    DailyBarStoreStats,
+    fetch_daily_bars,
+    final_through_for,
+)
 from src.model.common_v2 import calculate_all_features
 from src.database.db_manager import DBManager
 from src.database.models import DailyStockQuote
@@ -308,14 +314,31 @@ def _normalize_stock_code(code) -> str:
 # ==========================================
 # 3. 메인 업데이트 로직
 # ==========================================
-def process_and_save_stock(code, token, session, is_nxt=False) -> pd.DataFrame:
-    """단일 종목 데이터를 키움 API로 병합하고 DB에 적재합니다."""
+def process_and_save_stock(
+    code,
+    token,
+    session,
+    is_nxt=False,
+    bar_store=None,
+    bar_stats=None,
+    final_through=None,
+) -> pd.DataFrame:
+    """
+    단일 종목 데이터를 키움 API로 병합하고 DB에 적재합니다.
+    bar_store 가 주어지면 ka10081 일봉은 로컬 저장소에서 증분 조회합니다.
+    """
     try:
         # 💡 [안전 장치 1] Margin_Rate API(ka10013)는 무조건 6자리 문자열을 요구합니다.
         code_str = str(code).zfill(6)
 
-        # 1. API 순차 호출
-        df_ohlcv = kiwoom_utils.get_daily_ohlcv_ka10081_df(token, code_str)
+        # 1. API 순차 호출 (일봉은 저장소가 있으면 누락 구간만 REST 조회)
+        df_ohlcv = fetch_daily_bars(
+            token,
+            code_str,
+            bar_store,
+            final_through=final_through,
+            run_stats=bar_stats,
+        )
         if df_ohlcv.empty:
             return pd.DataFrame()
         # 💡 [안전 장치 2] 조인(Join) 실패를 막기 위해 인덱스를 날짜형(Datetime)으로 강제 통일
@@ -608,6 +631,11 @@ def update_kospi_data():
     # 💡 [핵심] 900개 종목의 데이터를 담을 거대한 빈 리스트
     all_stocks_data = []
 
+    # 💡 ka10081 일봉 로컬 저장소 (KORSTOCKSCAN_DAILY_BAR_STORE_DIR 설정 시에만 사용)
+    bar_store = DailyBarStore.from_env()
+    bar_stats = DailyBarStoreStats()
+    final_through = final_through_for()
+
     logger.info(f"\n📦 총 {total_count}개 종목 메모리 적재를 시작합니다.\n")
 
     # [PHASE 1] 메모리에 데이터 차곡차곡 모으기
@@ -615,7 +643,13 @@ def update_kospi_data():
         for i, code in enumerate(kospi_codes):
             code_str = _normalize_stock_code(code)
             df_stock = process_and_save_stock(
-                code_str, kiwoom_token, session, is_nxt=nxt_map.get(code_str, False)
+                code_str,
+                kiwoom_token,
+                session,
+                is_nxt=nxt_map.get(code_str, False),
+                bar_store=bar_store,
+                bar_stats=bar_stats,
+                final_through=final_through,
             )
 
             if df_stock is not None and not df_stock.empty:
@@ -627,6 +661,11 @@ def update_kospi_data():
 
             time.sleep(API_DELAY_SECONDS)  # API 제재 방지용 대기
 
+    if bar_store is not None:
+        logger.info(
+            f"🗄️ [daily bar store] ka10081 REST 절감 지표: {json.dumps(bar_stats.as_dict())}"
+        )
+
     # [PHASE 2] 대망의 일괄 DB 삽입 (Bulk Insert)
     if all_stocks_data:
         logger.info(
@@ -744,6 +783,7 @@ def update_kospi_data():
         "successful_count": int(len(successful_codes)),
         "inserted_rows": inserted_rows,
         "nxt_count": int(nxt_count),
+        "daily_bar_store": bar_stats.as_dict() if bar_store is not None else None,
     }
 
 
@@ -23,6 +23,7 @@ from zoneinfo import ZoneInfo
 import requests
 from flask import Blueprint, jsonify, request
 
+from src.engine.infrastructure.kiwoom_ws_snapshot_store import read_ws_snapshot_row
 from src.engine.monitoring import samsung_widget_contract
 from src.engine.sniper_config import CONF
 from src.trading.order.tick_utils import get_tick_size
@@ -97,6 +98,26 @@ def _ws_snapshot_path() -> Path:
     return Path(configured) if configured else _DEFAULT_WS_SNAPSHOT_PATH
 
 
+def _load_ws_snapshot_payload(code: str) -> dict | None:
+    """Read one symbol from the WS snapshot slot table, else ``latest.json``."""
+
+    snapshot_path = _ws_snapshot_path()
+    slot = read_ws_snapshot_row(code, directory=snapshot_path.parent)
+    if slot is not None:
+        row, published_at = slot
+        return {
+            "schema_version": "kiwoom_ws_dashboard_snapshot_v1",
+            "generated_at_epoch": published_at,
+            "decision_authority": "source_quality_only",
+            "runtime_effect": False,
+            "stocks": {code: row},
+        }
+    try:
+        return json.loads(snapshot_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
 def _websocket_price_comparison(*, reference_price: int, observed_at: datetime) -> dict:
     """Build a fail-closed, display-only comparison from shared 0B state."""
 
@@ -118,9 +139,8 @@ def _websocket_price_comparison(*, reference_price: int, observed_at: datetime)
         "used_for_manual_order": False,
         "reason": "snapshot_missing_or_invalid",
     }
-    try:
-        payload = json.loads(_ws_snapshot_path().read_text(encoding="utf-8"))
-    except (OSError, ValueError, TypeError):
+    payload = _load_ws_snapshot_payload(_SAMSUNG_CODE)
+    if payload is None:
         return result
     if (
         not isinstance(payload, dict)